@@ -0,0 +1,146 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from typing import Optional
+
+import numpy as np
+
+from app.core.metrics import phase
+from app.services.registry import get_stock_service
+from app.services.stock_service import StockService
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+)
+
+# 한 번에 계산할 수 있는 최대 종목 수
+MAX_MATRIX_SYMBOLS = 1000
+# 이동(rolling) 계산 응답의 최대 값 개수 (구간 수 × 종목 수²)
+MAX_ROLLING_VALUES = 2_000_000
+
+
+def _matrix_to_json(matrix: np.ndarray) -> list:
+    """행렬을 JSON 으로 직렬화 가능한 중첩 리스트로 변환합니다. (NaN -> null)"""
+    return np.where(np.isnan(matrix), None, matrix).tolist()
+
+
+def _resolve_symbols(service: StockService, symbols: str) -> tuple[list[str], list[str]]:
+    """쉼표로 구분된 티커 목록을 검증하고 (패널에 있는 종목, 없는 종목) 을 반환합니다."""
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
+    if len(symbol_list) < 2:
+        raise HTTPException(status_code=400, detail="symbols 파라미터에 최소 2개 이상의 티커가 필요합니다.")
+    if len(symbol_list) > MAX_MATRIX_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_MATRIX_SYMBOLS}개 종목까지 계산할 수 있습니다.")
+    found, missing = service.get_returns_panel().resolve(symbol_list)
+    if not found:
+        raise HTTPException(status_code=404, detail="요청한 종목들에 대한 데이터를 찾을 수 없습니다.")
+    return found, missing
+
+
+def _statistics_response(service: StockService, kind: str, symbols: str, start_date: Optional[str],
+                         end_date: Optional[str], min_periods: int) -> JSONResponse:
+    found, missing = _resolve_symbols(service, symbols)
+    panel = service.get_returns_panel()
+    try:
+        with phase("filter"):
+            lo, hi = panel.date_range(start_date, end_date)
+            matrix, counts = panel.statistics(found, kind, start_date, end_date, min_periods)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 날짜 형식입니다: {e}")
+    if hi <= lo:
+        raise HTTPException(status_code=404, detail="요청한 기간에 수익률 데이터가 없습니다.")
+
+    with phase("serialize"):
+        content = {
+            "data_version": panel.data_version,
+            "kind": kind,
+            "symbols": found,
+            "missing": missing,
+            "start_date": str(panel.dates[lo]),
+            "end_date": str(panel.dates[hi - 1]),
+            "observations": int(hi - lo),
+            "matrix": _matrix_to_json(matrix),
+        }
+        return JSONResponse(content=content)
+
+
+@router.get("/correlation")
+def get_correlation(
+    symbols: str = Query(..., description="쉼표로 구분된 티커 목록 (예: AAPL,MSFT,NVDA)"),
+    service: StockService = Depends(get_stock_service),
+    start_date: Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD)"),
+    min_periods: int = Query(2, ge=2, description="종목 쌍별 최소 관측 수 (미만이면 null)"),
+):
+    """
+    **[Analytics] 일간 수익률 상관계수 행렬**
+
+    종목들의 일간 수익률 상관계수 행렬을 `symbols` 순서로 반환합니다.
+    두 종목 모두 수익률이 있는 날짜만 사용합니다. 데이터가 없는 종목은 `missing` 에 표시됩니다.
+
+    응답 예: `{"symbols": ["AAPL", "MSFT"], "matrix": [[1.0, 0.62], [0.62, 1.0]], ...}`
+    """
+    return _statistics_response(service, "correlation", symbols, start_date, end_date, min_periods)
+
+
+@router.get("/covariance")
+def get_covariance(
+    symbols: str = Query(..., description="쉼표로 구분된 티커 목록 (예: AAPL,MSFT,NVDA)"),
+    service: StockService = Depends(get_stock_service),
+    start_date: Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD)"),
+    min_periods: int = Query(2, ge=2, description="종목 쌍별 최소 관측 수 (미만이면 null)"),
+):
+    """
+    **[Analytics] 일간 수익률 공분산 행렬**
+
+    `/analytics/correlation` 과 같은 방식으로 일간 수익률 공분산(표본 공분산, n-1) 행렬을 반환합니다.
+    """
+    return _statistics_response(service, "covariance", symbols, start_date, end_date, min_periods)
+
+
+@router.get("/rolling")
+def get_rolling_statistics(
+    symbols: str = Query(..., description="쉼표로 구분된 티커 목록 (예: AAPL,MSFT,NVDA)"),
+    service: StockService = Depends(get_stock_service),
+    kind: str = Query("correlation", pattern="^(correlation|covariance)$", description="correlation 또는 covariance"),
+    window: int = Query(60, ge=2, le=2520, description="이동 구간 길이 (거래일)"),
+    step: int = Query(1, ge=1, description="구간 간격 (거래일)"),
+    start_date: Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD)"),
+    min_periods: Optional[int] = Query(None, ge=2, description="구간 내 종목 쌍별 최소 관측 수 (기본값: window)"),
+):
+    """
+    **[Analytics] 이동(rolling) 상관계수/공분산 행렬**
+
+    `window` 거래일 구간의 상관계수 또는 공분산 행렬을 `step` 거래일마다 계산하여,
+    구간 끝 날짜(`dates`)와 날짜별 행렬(`matrices`)로 반환합니다.
+
+    - 예: `/analytics/rolling?symbols=AAPL,MSFT,NVDA&window=60&step=5`
+    """
+    found, missing = _resolve_symbols(service, symbols)
+    panel = service.get_returns_panel()
+    try:
+        lo, hi = panel.date_range(start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 날짜 형식입니다: {e}")
+    windows = max(0, (hi - lo - window) // step + 1)
+    if windows == 0:
+        raise HTTPException(status_code=404, detail="요청한 기간이 이동 구간(window)보다 짧습니다.")
+    if windows * len(found) ** 2 > MAX_ROLLING_VALUES:
+        raise HTTPException(status_code=400, detail="응답이 너무 큽니다. 종목 수를 줄이거나 기간/step 을 조정하세요.")
+
+    with phase("filter"):
+        dates, matrices = panel.rolling(found, window, kind, step, start_date, end_date, min_periods)
+    with phase("serialize"):
+        content = {
+            "data_version": panel.data_version,
+            "kind": kind,
+            "window": window,
+            "step": step,
+            "symbols": found,
+            "missing": missing,
+            "dates": [str(d) for d in dates],
+            "matrices": _matrix_to_json(matrices),
+        }
+        return JSONResponse(content=content)
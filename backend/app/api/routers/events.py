@@ -0,0 +1,79 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core import events
+from app.core.config import settings
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+)
+
+# 한 번에 묶어 보낼 최대 이벤트 수 (밀린 이벤트를 write 한 번으로 보냅니다)
+MAX_EVENTS_PER_WRITE = 256
+
+
+@router.get("/stream")
+async def stream_events(
+    symbols: Optional[str] = Query(None, description="쉼표로 구분된 구독 티커 목록 (생략하면 모든 종목)"),
+    channels: str = Query(",".join(events.CHANNELS), description="구독 채널 (bars, alerts, news, version)"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    **[Events] 데이터 변경분 푸시 (Server-Sent Events)**
+
+    데이터가 새 버전으로 로드될 때마다 변경분만 이벤트로 보냅니다. 전체 엔드포인트를 다시 폴링할 필요가 없습니다.
+
+    - `bars`: 구독 종목의 새 일봉 (컬럼형, `/stocks/batch` 와 같은 형식)
+    - `alerts`: 알림 규칙을 새로 만족하게 된 종목
+    - `news`: 새 뉴스
+    - `version`: 데이터셋 버전 변경
+    - `reset`: 놓친 이벤트가 있으니 전체 데이터를 다시 조회하라는 신호
+
+    브라우저의 `EventSource` 는 재연결할 때 `Last-Event-ID` 헤더를 보내며, 그 이후의 이벤트를 이어서 받습니다.
+    예: `new EventSource("/events/stream?symbols=AAPL,MSFT&channels=bars,alerts")`
+    """
+    channel_list = [c.strip() for c in channels.split(",") if c.strip()]
+    unknown = [c for c in channel_list if c not in events.CHANNELS]
+    if unknown or not channel_list:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 채널입니다: {', '.join(unknown) or channels} "
+                                                    f"(가능한 값: {', '.join(events.CHANNELS)})")
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else None
+
+    subscriber = events.Subscriber(asyncio.get_running_loop(), channel_list, symbol_list,
+                                   settings.SSE_MAX_PENDING_EVENTS)
+    replay = events.bus.subscribe(subscriber, last_event_id)
+
+    async def stream():
+        try:
+            if replay:
+                yield b"".join(replay)
+            while True:
+                try:
+                    payload = await asyncio.wait_for(subscriber.queue.get(), settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield events.KEEPALIVE
+                    continue
+                # 이미 도착한 이벤트는 한 번에 묶어서 보냅니다. (None 은 스트림 종료이며 항상 마지막에 옵니다)
+                chunk = [payload]
+                while len(chunk) < MAX_EVENTS_PER_WRITE and not subscriber.queue.empty():
+                    chunk.append(subscriber.queue.get_nowait())
+                finished = chunk[-1] is None
+                if finished:
+                    chunk.pop()
+                if chunk:
+                    yield b"".join(chunk)
+                if finished:
+                    break
+        finally:
+            events.bus.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # 프록시가 응답을 버퍼링하거나 캐시하지 않도록 합니다.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,18 +1,39 @@
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
 
-from app.services.local_news_service import local_news_service
-from app.schemas.news import NewsItem
+from app.services.local_news_service import LocalNewsService
+from app.services.registry import get_news_service
+from app.schemas.news import NewsItem, NewsSearchItem
 
 router = APIRouter()
 
+@router.get("/news/search", response_model=List[NewsSearchItem], response_model_exclude_none=True)
+def search_news(
+    q: str = Query(..., min_length=1, description="검색어. 공백은 AND, 'OR' 는 OR (예: apple earnings OR recall)"),
+    symbols: Optional[str] = Query(None, description="쉼표로 구분된 티커 목록 (예: AAPL,MSFT)"),
+    since: Optional[str] = Query(None, description="이 시각 이후 발행된 뉴스만 (예: 2024-01-01, 2024-01-01T09:30:00Z)"),
+    sort: str = Query("recency", pattern="^(recency|relevance)$", description="recency(최신순) 또는 relevance(BM25)"),
+    limit: int = Query(50, ge=1, le=500, description="최대 반환 개수"),
+    service: LocalNewsService = Depends(get_news_service),
+):
+    """
+    뉴스 제목을 검색합니다. 로드 시 만들어 둔 제목 역색인을 사용하므로 요청마다 전체 제목을 훑지 않습니다.
+    - **q**: 대소문자를 구분하지 않는 단어 검색. `earnings recall` 은 두 단어를 모두 포함, `earnings OR recall` 은 둘 중 하나
+    - **sort=relevance**: BM25 점수순으로 정렬하며 각 결과에 `score` 를 포함합니다.
+    """
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else None
+    try:
+        return service.search_news(q, symbol_list, since, sort, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/news/{symbol}", response_model=List[NewsItem])
-def read_news_by_symbol(symbol: str):
+def read_news_by_symbol(symbol: str, service: LocalNewsService = Depends(get_news_service)):
     """
     특정 주식 심볼(Symbol)에 대한 뉴스 기사 목록을 반환합니다.
     - **symbol**: 주식 심볼 (예: AAPL, MSFT)
     """
-    news_list = local_news_service.get_news_by_symbol(symbol)
+    news_list = service.get_news_by_symbol(symbol)
     if not news_list:
         # 주석 처리: 뉴스가 없는 경우 404 대신 빈 목록을 반환하는 것이 더 일반적일 수 있습니다.
         # raise HTTPException(status_code=404, detail=f"News for symbol '{symbol}' not found")
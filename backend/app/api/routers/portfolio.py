@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+
+from app.core.metrics import phase
+from app.schemas.portfolio import PortfolioRequest
+from app.services.registry import get_stock_service
+from app.services.stock_service import StockService
+
+router = APIRouter(
+    prefix="/portfolio",
+    tags=["portfolio"],
+)
+
+
+@router.post("/evaluate")
+def evaluate_portfolio(request: PortfolioRequest, service: StockService = Depends(get_stock_service)):
+    """
+    **[Portfolio] 포트폴리오 가치/위험 평가**
+
+    보유 종목(비중 `weight` 또는 수량 `shares`)과 리밸런싱 규칙(`rebalance`)으로 포트폴리오를 평가하여
+    가치 시계열(`value`), 낙폭(`drawdown`), 연환산 수익률/변동성, 최대 낙폭, 종목별 수익 기여도(`assets`)를 반환합니다.
+    모든 종목의 가격이 있는 첫 거래일부터 계산하며, 같은 요청은 데이터 버전이 바뀔 때까지 캐시된 결과를 반환합니다.
+
+    요청 예:
+    `{"holdings": [{"symbol": "AAPL", "weight": 0.6}, {"symbol": "MSFT", "weight": 0.4}], "rebalance": "monthly"}`
+    """
+    holdings = [h.model_dump() for h in request.holdings]
+    _, missing = service.get_returns_panel().resolve([h["symbol"] for h in holdings])
+    if missing:
+        raise HTTPException(status_code=404, detail=f"데이터를 찾을 수 없는 종목입니다: {', '.join(missing)}")
+
+    try:
+        result = service.evaluate_portfolio(
+            holdings,
+            request.rebalance,
+            None if request.start_date is None else str(request.start_date),
+            None if request.end_date is None else str(request.end_date),
+            request.initial_value,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="요청한 기간에 모든 종목의 가격이 있는 거래일이 없습니다.")
+
+    with phase("serialize"):
+        return JSONResponse(content=result)
@@ -1,35 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 from typing import List, Optional
 
+from app.core.response_cache import cached_response, response_cache
+
 # --- 스키마 임포트 --- #
-from app.schemas.stock import StockPrice, Financials
+from app.schemas.stock import StockPrice, StockRanking, Financials
 
 # --- 서비스 임포트 --- #
+# 서비스 인스턴스는 프로세스 전역 데이터 레지스트리가 데이터셋별로 한 번만 생성하여 보관합니다.
 from app.services.disclosure_service import DisclosureService
+from app.services.registry import get_disclosure_service, get_stock_service
 from app.services.stock_service import StockService
 
 
-# --- 서비스 인스턴스 최적화 --- #
-# 애플리케이션 시작 시 서비스 인스턴스를 한 번만 생성합니다.
-# API가 호출될 때마다 파일을 새로 읽는 것을 방지하여 성능이 향상됩니다.
-stock_service_instance = StockService()
-disclosure_service_instance = DisclosureService()
-
-# --- 의존성 주입 --- #
-# 의존성 주입 함수는 미리 생성된 인스턴스를 반환하는 역할만 합니다.
-def get_stock_service() -> StockService:
-    return stock_service_instance
-
-def get_disclosure_service() -> DisclosureService:
-    return disclosure_service_instance
-
-
 # --- 라우터 설정 --- #
 router = APIRouter(
     prefix="/stocks",
     tags=["stocks_v2_integrated"], 
 )
 
+# 응답 캐시에 넣을 본문을 FastAPI 의 response_model 직렬화와 같은 형식으로 만듭니다.
+_stock_price_list = TypeAdapter(List[StockPrice])
+
+
+def _stock_price_body(stocks: list[dict]) -> bytes:
+    return _stock_price_list.dump_json(_stock_price_list.validate_python(stocks), by_alias=True)
+
+
+def _cache_key(kind: str, symbols: list[str], start_date: Optional[str], end_date: Optional[str], *options) -> str:
+    """
+    응답 캐시 키. 서비스가 같은 결과를 돌려주는 요청은 같은 키가 되도록 정규화합니다.
+    (티커는 대문자로 바꾸고 중복을 없애며, 날짜는 서비스와 같은 방식으로 해석합니다. 잘못된 날짜는 지정하지 않은 것과 같습니다.)
+    """
+    tickers = ",".join(dict.fromkeys(s.upper() for s in symbols))
+    dates = [StockService._parse_date(value) for value in (start_date, end_date)]
+    return "|".join([f"{kind}:{tickers}", *map(str, dates), *map(str, options)])
+
 
 # --- API 엔드포인트 (DisclosureService 사용) --- #
 
@@ -57,27 +66,170 @@ async def get_quarterly_financials(service: DisclosureService = Depends(get_disc
         raise HTTPException(status_code=404, detail="분기별 재무 데이터를 찾을 수 없거나 로드에 실패했습니다.")
     return data.head().to_dict(orient="records")
 
+@router.get("/financials/statements")
+async def get_financial_statements(
+    service: DisclosureService = Depends(get_disclosure_service),
+    symbols: Optional[str] = Query(None, description="쉼표로 구분된 티커 목록 (미지정 시 전체)"),
+    items: Optional[str] = Query(None, description="쉼표로 구분된 항목 목록 (예: Total Revenue,Net Income)"),
+    period: str = Query("annual", pattern="^(annual|quarterly)$", description="annual(연간) 또는 quarterly(분기)"),
+    statement: Optional[str] = Query(None, pattern="^(income|balance_sheet|cash_flow)$", description="제표 종류"),
+    start_date: Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD)"),
+):
+    """
+    **[Disclosure] 재무제표 항목 조회 (pivot)**
+
+    긴 형식 재무제표 저장소에서 요청한 종목과 항목만 골라 종목/날짜별 행으로 반환합니다.
+    `items`를 지정하지 않으면 조건에 맞는 모든 항목을 반환합니다.
+
+    - 예: `/stocks/financials/statements?symbols=AAPL,MSFT&items=Total Revenue,Net Income&period=quarterly`
+    """
+    symbol_list = [s.strip().upper() for s in symbols.split(",") if s.strip()] if symbols else None
+    item_list = [i.strip() for i in items.split(",") if i.strip()] if items else None
+    try:
+        data = service.get_statements(period, symbol_list, item_list, statement, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 날짜 형식입니다: {e}")
+    if data is None:
+        raise HTTPException(status_code=404, detail="재무제표 데이터를 찾을 수 없거나 로드에 실패했습니다.")
+    if data.empty:
+        raise HTTPException(status_code=404, detail="요청한 조건에 맞는 재무제표 데이터가 없습니다.")
+    data['Date'] = data['Date'].dt.strftime('%Y-%m-%d')
+    records = data.astype(object).where(data.notna(), None).to_dict(orient="records")
+    return JSONResponse(content=records)
+
+@router.get("/financials/line-items", response_model=List[str])
+async def get_financial_line_items(
+    service: DisclosureService = Depends(get_disclosure_service),
+    period: Optional[str] = Query(None, pattern="^(annual|quarterly)$", description="annual(연간) 또는 quarterly(분기)"),
+    statement: Optional[str] = Query(None, pattern="^(income|balance_sheet|cash_flow)$", description="제표 종류"),
+):
+    """
+    **[Disclosure] 재무제표 항목 목록 조회**
+
+    `/stocks/financials/statements`의 `items`에 쓸 수 있는 항목 이름 목록을 반환합니다.
+    """
+    line_items = service.get_line_items(period, statement)
+    if line_items is None:
+        raise HTTPException(status_code=404, detail="재무제표 데이터를 찾을 수 없거나 로드에 실패했습니다.")
+    return line_items
+
 
 # --- API 엔드포인트 (StockService 사용) --- #
 
 @router.get("/", response_model=List[StockPrice])
-async def get_all_stocks(service: StockService = Depends(get_stock_service)):
+async def get_all_stocks(request: Request, service: StockService = Depends(get_stock_service)):
     """
     **[Stock] 모든 주식 데이터 조회**
 
     `nasdaq_all_stocks.csv` 파일의 모든 데이터를 반환합니다.
+    직렬화/압축한 본문은 데이터 버전마다 한 번만 만들어 캐시합니다.
+    """
+    cached = response_cache.get("prices", service.data_version, "all")
+    if cached is None:
+        stocks = await run_in_threadpool(service.get_all_stocks)
+        if not stocks:
+            raise HTTPException(status_code=404, detail="주식 데이터를 찾을 수 없습니다.")
+        # 데이터 버전마다 거의 모든 클라이언트가 받는 본문이므로 높은 수준으로 한 번 압축해 둡니다.
+        cached = response_cache.put("prices", service.data_version, "all",
+                                    await run_in_threadpool(_stock_price_body, stocks), hot=True)
+    return await cached_response(request, cached)
+
+@router.get("/screener", response_model=List[StockPrice])
+async def screen_stocks(
+    service: StockService = Depends(get_stock_service),
+    filters: Optional[str] = Query(None, description="쉼표로 구분된 조건 (예: RSI_14<30,Close>MA_60)"),
+    sort: Optional[str] = Query(None, description="정렬 컬럼, '-' 접두사는 내림차순 (예: -거래액)"),
+    limit: int = Query(50, ge=1, le=1000, description="최대 반환 종목 수"),
+    date: Optional[str] = Query(None, description="기준일 (YYYY-MM-DD), 미지정 시 종목별 최신일"),
+):
+    """
+    **[Stock] 종목 스크리너**
+
+    종목별 기준일(기본: 최신) 행으로 이루어진 스냅샷에서 조건에 맞는 종목을 찾습니다.
+    조건은 모두 AND로 결합되며, 우변에는 숫자 또는 다른 컬럼 이름을 쓸 수 있습니다.
+
+    - 예: `/stocks/screener?filters=RSI_14<30,Close>MA_60&sort=RSI_14&limit=20`
+    """
+    try:
+        return service.screen_stocks(filters, sort, limit, date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/rankings", response_model=List[StockRanking])
+async def get_stock_rankings(
+    service: StockService = Depends(get_stock_service),
+    metric: str = Query("change_pct", pattern="^(change_pct|volume|trading_value)$",
+                        description="순위 지표: change_pct(등락률), volume(거래량), trading_value(거래액)"),
+    date: Optional[str] = Query(None, description="기준일 (YYYY-MM-DD), 미지정 시 최근 거래일"),
+    top: int = Query(10, ge=1, le=500, description="반환할 종목 수"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc: 상위(상승/대량), asc: 하위(하락)"),
+):
+    """
+    **[Stock] 일자별 종목 순위 (상승률/거래량/거래액)**
+
+    데이터 로드 시 한 번 만들어 둔 일자별 집계에서 상위 N개 종목만 골라 반환합니다.
+
+    - 예: `/stocks/rankings?metric=trading_value&top=20`
+    - 하락률 상위: `/stocks/rankings?metric=change_pct&order=asc`
+    """
+    try:
+        return service.get_rankings(metric, date, top, ascending=(order == "asc"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/batch")
+async def get_stocks_batch(
+    request: Request,
+    symbols: str = Query(..., description="쉼표로 구분된 티커 목록 (예: AAPL,MSFT,NVDA)"),
+    service: StockService = Depends(get_stock_service),
+    start_date: Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="쉼표로 구분된 반환 컬럼 목록 (예: Close,Volume)"),
+    interval: str = Query("1d", pattern="^(1d|1w|1M)$", description="봉 간격: 1d(일봉), 1w(주봉), 1M(월봉)"),
+    max_points: Optional[int] = Query(None, ge=3, description="최대 반환 점 개수 (LTTB 다운샘플링)"),
+):
+    """
+    **[Stock] 여러 종목 데이터 일괄 조회 (컬럼형 응답)**
+
+    여러 종목을 한 번의 요청으로 조회합니다. 종목마다 컬럼 이름을 키로 하는 배열을 반환하며,
+    `fields`를 지정하면 요청한 컬럼(+ Date)만 직렬화합니다.
+    `interval`, `max_points`는 `/stocks/{ticker}`와 동일하게 동작합니다.
+
+    응답 예: `{"AAPL": {"Date": ["2024-01-02", ...], "Close": [185.6, ...]}}`
     """
-    stocks = service.get_all_stocks()
-    if not stocks:
-        raise HTTPException(status_code=404, detail="주식 데이터를 찾을 수 없습니다.")
-    return stocks
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="symbols 파라미터에 최소 1개 이상의 티커가 필요합니다.")
+
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    if field_list:
+        unknown = [f for f in field_list if f not in service.available_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"알 수 없는 컬럼입니다: {', '.join(unknown)}")
+
+    key = _cache_key("batch", symbol_list, start_date, end_date,
+                     ",".join(field_list) if field_list else None, interval, max_points)
+    cached = response_cache.get("prices", service.data_version, key)
+    if cached is None:
+        data = await run_in_threadpool(service.get_stocks_batch, symbol_list, start_date, end_date, field_list,
+                                       interval, max_points)
+        if not data:
+            raise HTTPException(status_code=404, detail="요청한 종목들에 대한 데이터를 찾을 수 없습니다.")
+        # 이미 JSON 호환 타입으로 변환된 컬럼형 데이터이므로 별도의 변환 없이 바로 직렬화합니다.
+        body = await run_in_threadpool(lambda: JSONResponse(content=data).body)
+        cached = response_cache.put("prices", service.data_version, key, body)
+    return await cached_response(request, cached)
 
 @router.get("/{ticker}", response_model=List[StockPrice])
 async def get_stock_by_ticker(
+    request: Request,
     ticker: str, 
     service: StockService = Depends(get_stock_service),
     start_date: Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
-    end_date: Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD)")
+    end_date: Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD)"),
+    interval: str = Query("1d", pattern="^(1d|1w|1M)$", description="봉 간격: 1d(일봉), 1w(주봉), 1M(월봉)"),
+    max_points: Optional[int] = Query(None, ge=3, description="최대 반환 점 개수 (LTTB 다운샘플링)"),
 ):
     """
     **[Stock] 특정 종목 데이터 조회 (날짜 필터링 가능)**
@@ -85,8 +237,16 @@ async def get_stock_by_ticker(
     - **ticker**: 조회할 주식의 티커 (예: AAPL)
     - **start_date** (선택): 조회 시작 날짜
     - **end_date** (선택): 조회 종료 날짜
+    - **interval** (선택): 봉 간격 (1d, 1w, 1M). 주봉/월봉의 지표 값은 기간 마지막 거래일 기준입니다.
+    - **max_points** (선택): 긴 기간 조회 시 화면 해상도에 맞게 최대 점 개수를 제한합니다.
     """
-    stocks = service.get_stock_by_ticker_and_date_range(ticker, start_date, end_date)
-    if not stocks:
-        raise HTTPException(status_code=404, detail=f"종목 '{ticker}'에 대한 데이터를 찾을 수 없습니다.")
-    return stocks
+    key = _cache_key("ticker", [ticker], start_date, end_date, interval, max_points)
+    cached = response_cache.get("prices", service.data_version, key)
+    if cached is None:
+        stocks = await run_in_threadpool(service.get_stock_by_ticker_and_date_range, ticker, start_date, end_date,
+                                         interval, max_points)
+        if not stocks:
+            raise HTTPException(status_code=404, detail=f"종목 '{ticker}'에 대한 데이터를 찾을 수 없습니다.")
+        cached = response_cache.put("prices", service.data_version, key,
+                                    await run_in_threadpool(_stock_price_body, stocks))
+    return await cached_response(request, cached)
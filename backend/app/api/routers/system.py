@@ -0,0 +1,91 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.core import metrics
+from app.core.config import settings
+from app.services.registry import registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    """
+    라우트별 지연 시간 및 처리 단계(filter/serialize/compress/other) 히스토그램을
+    Prometheus 텍스트 형식으로 반환합니다.
+    """
+    return PlainTextResponse(metrics.registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/health")
+def read_health():
+    """
+    서버 상태를 반환합니다. 데이터 로드 여부와 관계없이 즉시 응답하며,
+    각 데이터셋의 상태(state), 진행 단계와 진행률, 버전, 로드 시간(초)을 함께 알려줍니다.
+    """
+    return {
+        "status": "ok",
+        "ready": registry.all_ready(),
+        "datasets": {name: registry.describe(name, with_memory=False) for name in registry.names()},
+    }
+
+
+@router.get("/healthz")
+def read_liveness():
+    """
+    Liveness 프로브입니다. 프로세스가 요청을 처리할 수 있으면 항상 200을 반환합니다.
+    (데이터 로드 중에도 200 이므로 로드 중인 워커가 재시작되지 않습니다.)
+    """
+    return {"status": "alive"}
+
+
+@router.get("/readyz")
+def read_readiness():
+    """
+    Readiness 프로브입니다. 데이터 로드가 끝나면 200과 데이터 버전을,
+    아직 로드 중이면 503과 Retry-After 헤더, 진행 상황을 반환합니다.
+    로드에 실패한 서비스가 있으면 200이지만 status 가 'degraded' 입니다.
+    """
+    datasets = {name: registry.describe(name, with_memory=False) for name in registry.names()}
+    if not registry.all_ready():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "loading", "datasets": datasets},
+            headers={"Retry-After": str(settings.READINESS_RETRY_AFTER)},
+        )
+    return {
+        "status": "degraded" if registry.any_failed() else "ready",
+        # 주가 데이터셋의 버전 (재로드할 때마다 증가)
+        "data_version": datasets["prices"]["version"],
+        "datasets": datasets,
+    }
+
+
+@router.post("/datasets/{name}/reload")
+def reload_dataset(name: str):
+    """
+    데이터셋을 다시 로드합니다. (DATASET_RELOAD_ENABLED 설정으로 켠 경우에만 사용 가능)
+    새 버전이 완성될 때까지 기존 데이터로 응답하며, 로드가 끝나면 변경분이 /events/stream 으로 발행됩니다.
+    """
+    if not settings.DATASET_RELOAD_ENABLED:
+        raise HTTPException(status_code=403, detail="데이터셋 재로드가 비활성화되어 있습니다.")
+    if name not in registry:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 데이터셋입니다: {name}")
+    try:
+        registry.reload(name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터셋을 다시 로드하지 못했습니다: {e}")
+    return registry.describe(name, with_memory=False)
+
+
+@router.get("/datasets")
+def read_datasets():
+    """
+    데이터 레지스트리가 보유한 데이터셋 목록을 반환합니다.
+    데이터셋별 상태, 버전, 로드 시간(초), 추정 메모리 사용량(바이트)을 포함합니다.
+    """
+    datasets = {name: registry.describe(name) for name in registry.names()}
+    return {
+        "datasets": datasets,
+        "total_memory_bytes": sum(status["memory_bytes"] or 0 for status in datasets.values()),
+    }
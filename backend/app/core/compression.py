@@ -0,0 +1,113 @@
+"""
+HTTP 응답 압축(Content-Encoding) 모듈입니다.
+
+- negotiate()        : Accept-Encoding 헤더로 응답 인코딩을 고릅니다. (q 값을 따르고, 같으면 서버 선호 순서 zstd > br > gzip)
+- compress()         : 본문 전체를 한 번에 압축합니다. 응답 캐시(app.core.response_cache)는 데이터 버전마다
+                       인코딩별로 한 번만 호출하며, 많은 요청이 다시 쓰는 항목(hot)만 한 단계 높은 중간 압축 수준(CACHED_LEVELS)을 사용합니다.
+- StreamCompressor   : 스트리밍 응답을 청크 단위로 압축합니다. 청크마다 flush 하므로 SSE 이벤트가 압축기 안에 머물지 않습니다.
+
+brotli, zstandard 는 선택 의존성이며, 설치되어 있지 않으면 해당 인코딩은 협상 대상에서 빠집니다. (gzip 은 항상 사용 가능)
+"""
+import gzip
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+# 서버 선호 순서 (압축률과 압축 해제 속도 기준)
+PREFERENCE = ('zstd', 'br', 'gzip')
+# 응답 캐시에서 많은 요청이 다시 쓰는 본문(hot)의 압축 수준.
+# hot 본문(/stocks/ 전체 목록 등)은 데이터 버전이 바뀐 뒤 첫 요청이 스레드풀에서 압축하므로 중간 수준으로 둡니다.
+# (최고 수준은 20MB 본문에 수 초~수십 초가 걸려 그동안 스레드풀 워커를 붙잡지만 크기는 몇 %만 줄어듭니다.
+#  gzip 예: 18MB JSON 에서 6 은 0.5초, 9 는 1.9초이며 압축 결과 크기 차이는 5% 입니다.)
+CACHED_LEVELS = {'zstd': 11, 'br': 5, 'gzip': 6}
+# 요청마다 압축하는 동적/스트리밍 응답의 압축 수준 (CPU 사용을 줄이기 위해 낮게 둡니다)
+DYNAMIC_LEVELS = {'zstd': 3, 'br': 4, 'gzip': 4}
+
+
+def available_encodings() -> tuple[str, ...]:
+    """이 서버에서 사용할 수 있는 인코딩 (선호 순서)"""
+    return tuple(e for e in PREFERENCE
+                 if e == 'gzip' or (e == 'br' and brotli is not None) or (e == 'zstd' and zstandard is not None))
+
+
+def negotiate(accept_encoding: Optional[str], available: tuple[str, ...] = None) -> Optional[str]:
+    """
+    Accept-Encoding 헤더 값에서 사용할 인코딩을 고릅니다. 압축하지 않아야 하면 None.
+    예: "gzip, br;q=0.9" -> 'gzip', "*;q=0.5, gzip;q=0" -> (br/zstd 중 사용 가능한 것)
+    """
+    if not accept_encoding:
+        return None
+    available = available_encodings() if available is None else available
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int = None) -> bytes:
+    """본문 전체를 압축합니다. (gzip 은 mtime=0 으로 고정하여 같은 입력이면 같은 결과가 나옵니다)"""
+    level = CACHED_LEVELS[encoding] if level is None else level
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"지원하지 않는 인코딩입니다: {encoding}")
+
+
+class StreamCompressor:
+    """청크 단위 증분 압축기. compress() 결과는 그 자리에서 풀 수 있도록 flush 된 바이트입니다."""
+
+    def __init__(self, encoding: str, level: int = None):
+        self.encoding = encoding
+        level = DYNAMIC_LEVELS[encoding] if level is None else level
+        if encoding == 'gzip':
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == 'br':
+            self._obj = brotli.Compressor(quality=level)
+        elif encoding == 'zstd':
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            raise ValueError(f"지원하지 않는 인코딩입니다: {encoding}")
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == 'gzip':
+            return self._obj.compress(chunk) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == 'br':
+            return self._obj.process(chunk) + self._obj.flush()
+        return self._obj.compress(chunk) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'gzip':
+            return self._obj.flush(zlib.Z_FINISH)
+        if self.encoding == 'br':
+            return self._obj.finish()
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
@@ -16,6 +16,60 @@ class Settings(BaseSettings):
     QUARTERLY_FINANCIALS_PATH: str = os.getenv("QUARTERLY_FINANCIALS_PATH")
     NEWS_PATH: str = os.getenv("NEWS_PATH")
     FINANCIALS_INFO_PATH: str = os.getenv("FINANCIALS_INFO_PATH")
+    # 긴(long) 형식 재무제표 저장소 (파이프라인의 nasdaq_financial_statements.csv/.parquet).
+    # 설정하지 않으면 파이프라인이 함께 저장하는 ANNUAL_FINANCIALS_PATH 폴더의 nasdaq_financial_statements.csv 를 사용하고,
+    # 그 파일도 없으면 ANNUAL/QUARTERLY_FINANCIALS_PATH 의 기존 wide CSV 를 변환하여 사용합니다.
+    FINANCIAL_STATEMENTS_PATH: str = os.getenv("FINANCIAL_STATEMENTS_PATH") or (
+        os.path.join(os.path.dirname(os.getenv("ANNUAL_FINANCIALS_PATH")), "nasdaq_financial_statements.csv")
+        if os.getenv("ANNUAL_FINANCIALS_PATH") else ""
+    )
+
+    # 요청 단위 프로파일링 (X-Profile: 1 헤더 또는 ?profile=1 로 요청한 경우에만 동작)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_OUTPUT_DIR: str = os.getenv("PROFILE_OUTPUT_DIR", "profiles")
+
+    # 서버 시작 시 백그라운드 스레드에서 데이터 서비스를 미리 로드할지 여부
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+    # warm-up 중 데이터 라우트가 503 으로 응답할 때 Retry-After 헤더 값 (초)
+    READINESS_RETRY_AFTER: int = int(os.getenv("READINESS_RETRY_AFTER", "5"))
+    # 로드에 실패한 데이터셋을 요청 경로에서 다시 로드하기까지 기다리는 시간 (초)
+    # (그 전까지는 503 + Retry-After 로 응답하며, POST /datasets/{name}/reload 로는 바로 다시 로드할 수 있습니다)
+    DATASET_RETRY_BACKOFF: int = int(os.getenv("DATASET_RETRY_BACKOFF", "60"))
+
+    # 이 크기(MB) 이상의 CSV는 메모리를 아끼는 방식으로 읽습니다.
+    # (pyarrow 가 있으면 컬럼별 해제 변환, 없으면 CSV_CHUNK_ROWS 행씩 나누어 읽기)
+    CSV_CHUNK_THRESHOLD_MB: int = int(os.getenv("CSV_CHUNK_THRESHOLD_MB", "256"))
+    CSV_CHUNK_ROWS: int = int(os.getenv("CSV_CHUNK_ROWS", "500000"))
+    # CSV 옆에 같은 이름의 최신 Parquet 파일이 있으면 Parquet 를 읽습니다.
+    PREFER_PARQUET: bool = os.getenv("PREFER_PARQUET", "true").lower() == "true"
+
+    # 지표 계산(enrichment) 작업자 수 (0 이면 CPU 수), 실행기('thread' 또는 'process')
+    ENRICHMENT_WORKERS: int = int(os.getenv("ENRICHMENT_WORKERS", "0"))
+    ENRICHMENT_EXECUTOR: str = os.getenv("ENRICHMENT_EXECUTOR", "thread")
+    # 지정하면 종목 파티션별 지표 계산 결과를 이 폴더에 Parquet 파일로 저장합니다.
+    ENRICHMENT_OUTPUT_DIR: str = os.getenv("ENRICHMENT_OUTPUT_DIR", "")
+
+    # /events/stream (Server-Sent Events) 설정
+    # 연결 유지용 주석을 보내는 간격(초), 구독자별 최대 대기 이벤트 수, 재연결(Last-Event-ID)용으로 보관할 최근 이벤트 수
+    SSE_HEARTBEAT_SECONDS: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_MAX_PENDING_EVENTS: int = int(os.getenv("SSE_MAX_PENDING_EVENTS", "1000"))
+    SSE_REPLAY_BUFFER: int = int(os.getenv("SSE_REPLAY_BUFFER", "10000"))
+    # 새 데이터 버전에서 새로 조건을 만족한 종목을 알림(alerts) 이벤트로 보냅니다. (이름 -> 스크리너 필터 표현식)
+    SSE_ALERT_RULES: dict[str, str] = {
+        "rsi_oversold": "RSI_14<30",
+        "rsi_overbought": "RSI_14>70",
+        "above_ma_60": "Close>MA_60",
+    }
+    # 종목별 bars 이벤트에 담을 최대 봉 수 (넘으면 최근 봉만 보내고 truncated=true 로 표시)
+    SSE_MAX_BARS_PER_EVENT: int = int(os.getenv("SSE_MAX_BARS_PER_EVENT", "100"))
+    # POST /datasets/{name}/reload 로 데이터셋을 다시 로드할 수 있게 할지 여부
+    DATASET_RELOAD_ENABLED: bool = os.getenv("DATASET_RELOAD_ENABLED", "false").lower() == "true"
+
+    # 응답 압축 (Accept-Encoding 협상: zstd, br, gzip). 이 크기(바이트)보다 작은 응답은 압축하지 않습니다.
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    # 데이터 버전별 응답 본문(+ 압축 본문) 캐시의 최대 크기 (바이트)
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
     
     #main_v2.py에서 CORS 설정에 사용할 출처 목록
     ALLOWED_ORIGINS: list[str] = [
@@ -0,0 +1,191 @@
+"""
+Server-Sent Events(SSE) 이벤트 버스입니다.
+
+데이터가 새 버전으로 바뀔 때 만들어지는 작은 변경분(새 봉, 새로 발생한 알림, 새 뉴스)을
+구독 중인 클라이언트(/events/stream)에 밀어 보냅니다.
+
+- 이벤트는 발행할 때 한 번만 SSE 텍스트(bytes)로 직렬화하고, 모든 구독자가 같은 bytes 객체를 공유합니다.
+- 이벤트는 채널(bars, alerts, news, version)과 선택적인 종목(symbol)을 가지며,
+  종목별 구독자 인덱스로 해당 종목을 구독한 클라이언트에게만 전달합니다.
+- 발행은 데이터 로드 스레드에서 일어나므로, 이벤트 묶음마다 이벤트 루프당 한 번만 call_soon_threadsafe 로 넘깁니다.
+- 최근 이벤트를 링 버퍼에 보관하여, 재연결한 클라이언트가 Last-Event-ID 이후 이벤트를 다시 받을 수 있습니다.
+- 처리하지 못한 이벤트가 너무 많이 쌓인 구독자에게는 reset 이벤트를 보내고 연결을 끝냅니다.
+  (클라이언트는 전체 데이터를 다시 조회한 뒤 재연결합니다.)
+"""
+import asyncio
+import itertools
+import json
+import threading
+from collections import deque
+from typing import Iterable, NamedTuple, Optional
+
+from app.core.config import settings
+
+# 구독 가능한 채널
+CHANNELS = ('bars', 'alerts', 'news', 'version')
+
+# 연결 유지를 위한 주석 줄과 밀린 구독자에게 보내는 reset 이벤트 (미리 직렬화해 둡니다)
+KEEPALIVE = b": keep-alive\n\n"
+RESET = b"event: reset\ndata: {}\n\n"
+
+
+class Event(NamedTuple):
+    id: int
+    channel: str
+    symbol: Optional[str]
+    payload: bytes
+
+
+def _json_default(value):
+    """날짜/시각은 ISO 8601 문자열로, 그 밖의 값은 str() 로 변환합니다."""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def encode_event(event_id: int, channel: str, data) -> bytes:
+    """SSE 텍스트 형식으로 직렬화합니다. (JSON 은 한 줄이므로 data 줄 하나로 충분합니다)"""
+    body = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+    return f"id: {event_id}\nevent: {channel}\ndata: {body}\n\n".encode('utf-8')
+
+
+class Subscriber:
+    """스트림 하나의 구독 정보와 전달 대기열입니다. 대기열은 구독자의 이벤트 루프에서만 다룹니다."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, channels: Iterable[str],
+                 symbols: Optional[Iterable[str]] = None, max_pending: int = 1000):
+        self.loop = loop
+        self.channels = frozenset(channels)
+        # None 이면 모든 종목의 이벤트를 받습니다.
+        self.symbols = None if symbols is None else frozenset(s.upper() for s in symbols)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.closed = False
+
+    def wants(self, event: Event) -> bool:
+        return event.channel in self.channels and (
+            event.symbol is None or self.symbols is None or event.symbol in self.symbols)
+
+    def _deliver(self, payloads: list[bytes]):
+        """이벤트 루프에서 실행됩니다. 대기열이 가득 차면 밀린 이벤트를 버리고 reset 후 닫습니다."""
+        if self.closed:
+            return
+        for payload in payloads:
+            if self.queue.full():
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait(RESET)
+                self.queue.put_nowait(None)
+                self.closed = True
+                return
+            self.queue.put_nowait(payload)
+
+    def _close(self):
+        """이벤트 루프에서 실행됩니다. 스트림에 종료(None)를 알립니다."""
+        if not self.closed:
+            self.closed = True
+            if self.queue.full():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class EventBus:
+    """이벤트를 한 번 직렬화하여 구독자들에게 나누어 전달합니다. (스레드 안전)"""
+
+    def __init__(self, buffer_size: int = 10000):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._buffer: deque[Event] = deque(maxlen=buffer_size)
+        self._subscribers: set[Subscriber] = set()
+        # 종목 -> 그 종목을 구독한 구독자들, 그리고 모든 종목을 구독한 구독자들
+        self._by_symbol: dict[str, set[Subscriber]] = {}
+        self._all_symbols: set[Subscriber] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    @property
+    def last_event_id(self) -> int:
+        with self._lock:
+            return self._buffer[-1].id if self._buffer else 0
+
+    def subscribe(self, subscriber: Subscriber, last_event_id: Optional[int] = None) -> list[bytes]:
+        """
+        구독자를 등록하고, last_event_id 가 주어지면 그 이후에 발행된 (구독 조건에 맞는) 이벤트를 반환합니다.
+        버퍼에서 이미 밀려난 이벤트가 있으면 첫 항목으로 reset 이벤트가 포함됩니다.
+        """
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if subscriber.symbols is None:
+                self._all_symbols.add(subscriber)
+            else:
+                for symbol in subscriber.symbols:
+                    self._by_symbol.setdefault(symbol, set()).add(subscriber)
+            if last_event_id is None:
+                return []
+            replay = [event.payload for event in self._buffer if event.id > last_event_id and subscriber.wants(event)]
+            if self._buffer and self._buffer[0].id > last_event_id + 1:
+                replay.insert(0, RESET)
+            return replay
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            self._all_symbols.discard(subscriber)
+            for symbol in subscriber.symbols or ():
+                subscribers = self._by_symbol.get(symbol)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._by_symbol[symbol]
+
+    def publish(self, channel: str, data, symbol: Optional[str] = None) -> int:
+        """이벤트 하나를 발행하고 이벤트 id 를 반환합니다."""
+        return self.publish_many([(channel, data, symbol)])[-1]
+
+    def publish_many(self, events: Iterable[tuple[str, object, Optional[str]]]) -> list[int]:
+        """
+        (channel, data, symbol) 이벤트 묶음을 발행합니다.
+        이벤트마다 한 번만 직렬화하고, 구독자별 전달 목록을 모아 이벤트 루프마다 한 번에 넘깁니다.
+        """
+        deliveries: dict[asyncio.AbstractEventLoop, dict[Subscriber, list[bytes]]] = {}
+        ids = []
+        with self._lock:
+            for channel, data, symbol in events:
+                event_id = next(self._ids)
+                event = Event(event_id, channel, symbol, encode_event(event_id, channel, data))
+                self._buffer.append(event)
+                ids.append(event_id)
+                if symbol is None:
+                    candidates = self._subscribers
+                else:
+                    candidates = self._all_symbols | self._by_symbol.get(symbol, set())
+                for subscriber in candidates:
+                    if channel in subscriber.channels:
+                        deliveries.setdefault(subscriber.loop, {}).setdefault(subscriber, []).append(event.payload)
+
+        for loop, batch in deliveries.items():
+            try:
+                loop.call_soon_threadsafe(_deliver_batch, batch)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫혔으면 (서버 종료 중) 버립니다.
+                pass
+        return ids
+
+    def close_all(self):
+        """모든 구독자의 스트림을 끝냅니다. (서버 종료 시)"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber._close)
+            except RuntimeError:
+                pass
+
+
+def _deliver_batch(batch: dict[Subscriber, list[bytes]]):
+    for subscriber, payloads in batch.items():
+        subscriber._deliver(payloads)
+
+
+# 애플리케이션 전역 이벤트 버스
+bus = EventBus(settings.SSE_REPLAY_BUFFER)
@@ -0,0 +1,174 @@
+"""
+서비스 지연 생성 도우미입니다.
+
+라우터 모듈을 import 하는 것만으로 CSV 로드/지표 계산이 실행되지 않도록,
+서비스 인스턴스는 처음 필요할 때(첫 요청 또는 시작 시 warm-up) 한 번만 생성합니다.
+LazyService 는 데이터 레지스트리(app.services.registry)가 데이터셋마다 하나씩 보유합니다.
+
+warm-up 이 시작된 뒤에는 데이터 라우트가 require() 로 서비스를 가져오며,
+아직 로드 중이면 ServiceNotReady 를 발생시켜 503 + Retry-After 로 응답합니다.
+(로드 중인 워커로 요청이 몰려 연결이 막히지 않도록 하여 무중단 롤링 재시작을 돕습니다.)
+로드에 실패한 데이터셋도 요청마다 다시 로드하지 않고, DATASET_RETRY_BACKOFF 초가 지날 때까지 503 으로 응답합니다.
+"""
+import math
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# 서비스 상태
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ServiceNotReady(Exception):
+    """warm-up 중이거나 로드에 실패하여 서비스를 사용할 수 없을 때 발생합니다. (503 + Retry-After 로 변환)"""
+
+    def __init__(self, name: str, retry_after: int, message: Optional[str] = None):
+        super().__init__(message or f"'{name}' 데이터를 로드하는 중입니다.")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class LazyService(Generic[T]):
+    """
+    factory 를 처음 get() 할 때 한 번만 호출하여 인스턴스를 보관합니다. (스레드 안전)
+    with_progress=True 이면 factory(progress=콜백) 형태로 호출하여 진행 상황을 전달받습니다.
+    """
+
+    def __init__(self, name: str, factory: Callable[..., T], with_progress: bool = False):
+        self.name = name
+        self.factory = factory
+        self.with_progress = with_progress
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+        self.state = PENDING
+        self.step: Optional[str] = None
+        self.progress = 0.0
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        # 마지막으로 로드에 실패한(또는 요청 경로에서 재시도를 시작한) 시각 (time.monotonic)
+        self.failed_at: Optional[float] = None
+        # 로드(또는 재로드)에 성공할 때마다 1씩 증가합니다. (0 = 아직 로드되지 않음)
+        self.version = 0
+        # warm-up 이 예약되었는지 여부 (이후 로드 전 요청은 503 으로 응답)
+        self.warmup_scheduled = False
+        # 로드(또는 재로드)에 성공할 때마다 새 인스턴스로 호출할 함수들 (예: SSE 변경분 발행)
+        self._listeners: list[Callable[[T], None]] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    @property
+    def current(self) -> Optional[T]:
+        """현재 인스턴스 (없으면 None). get() 과 달리 로드하지 않습니다."""
+        return self._instance
+
+    def add_listener(self, listener: Callable[[T], None]):
+        """로드(또는 재로드)가 끝날 때마다 새 인스턴스로 호출할 함수를 등록합니다."""
+        self._listeners.append(listener)
+
+    def _notify(self, instance: T):
+        """등록된 함수를 호출합니다. (락 밖에서 호출하며, 함수의 예외는 로드 결과에 영향을 주지 않습니다)"""
+        for listener in list(self._listeners):
+            try:
+                listener(instance)
+            except Exception as e:
+                print(f"경고: '{self.name}' 로드 알림 처리 중 오류 발생: {e}")
+
+    def report_progress(self, step: str, fraction: float):
+        """factory 가 호출하는 진행 상황 콜백입니다."""
+        self.step = step
+        self.progress = fraction
+
+    def _build(self) -> T:
+        """factory 를 호출하여 새 인스턴스를 만들고 상태/로드 시간을 기록합니다. (self._lock 안에서 호출)"""
+        self.state, self.error = LOADING, None
+        start = time.perf_counter()
+        try:
+            if self.with_progress:
+                instance = self.factory(progress=self.report_progress)
+            else:
+                instance = self.factory()
+        except Exception as e:
+            # 재로드 실패 시에는 기존 인스턴스로 계속 서비스합니다.
+            self.state, self.error = (READY if self._instance is not None else FAILED), str(e)
+            if self.state == FAILED:
+                self.failed_at = time.monotonic()
+            raise
+        self.load_seconds = time.perf_counter() - start
+        self.state, self.progress = READY, 1.0
+        self.version += 1
+        return instance
+
+    def get(self) -> T:
+        """인스턴스를 반환합니다. 아직 없으면 생성합니다. 생성 중 예외가 나면 다음 호출에서 다시 시도합니다."""
+        if self._instance is None:
+            built = None
+            with self._lock:
+                if self._instance is None:
+                    self._instance = built = self._build()
+            if built is not None:
+                self._notify(built)
+        return self._instance
+
+    def reload(self) -> T:
+        """
+        인스턴스를 새로 생성하여 교체합니다. 새 인스턴스가 완성될 때까지 기존 인스턴스로 계속 응답하며,
+        교체는 참조 한 번으로 이루어지므로 요청 도중 데이터가 섞이지 않습니다.
+        """
+        with self._lock:
+            self._instance = instance = self._build()
+        self._notify(instance)
+        return instance
+
+    def require(self) -> T:
+        """
+        요청 처리용으로 인스턴스를 반환합니다.
+        warm-up 이 진행 중이고 아직 로드되지 않았다면 기다리지 않고 ServiceNotReady 를 발생시킵니다.
+        로드에 실패한 상태라면 DATASET_RETRY_BACKOFF 초 동안 ServiceNotReady 를 발생시키고,
+        그 뒤 처음 도착한 요청 하나만 get() 으로 다시 로드를 시도합니다. (나머지 요청은 계속 503)
+        (warm-up 을 사용하지 않는 경우에는 get() 으로 직접 로드하며, 실패하면 마찬가지로 ServiceNotReady 입니다.)
+        """
+        if self._instance is not None:
+            return self._instance
+        if self.warmup_scheduled and self.state in (PENDING, LOADING):
+            raise ServiceNotReady(self.name, settings.READINESS_RETRY_AFTER)
+        if self.state == FAILED:
+            now = time.monotonic()
+            with self._lock:
+                remaining = (self.failed_at or 0.0) + settings.DATASET_RETRY_BACKOFF - now
+                if remaining <= 0:
+                    # 이 요청이 재시도를 맡습니다. 동시에 도착한 다른 요청은 다시 대기 시간을 적용받습니다.
+                    self.failed_at = now
+            if remaining > 0:
+                raise self._failed(max(1, math.ceil(remaining)))
+        try:
+            return self.get()
+        except Exception as e:
+            if self.state != FAILED:
+                raise
+            raise self._failed(settings.DATASET_RETRY_BACKOFF) from e
+
+    def _failed(self, retry_after: int) -> ServiceNotReady:
+        """로드 실패 상태를 알리는 ServiceNotReady 를 만듭니다."""
+        return ServiceNotReady(self.name, retry_after, f"'{self.name}' 데이터를 로드하지 못했습니다: {self.error}")
+
+    def status(self) -> dict:
+        """/health, /readyz 응답용 상태 정보"""
+        status = {
+            "state": self.state,
+            "step": self.step,
+            "progress": round(self.progress, 3),
+            "version": self.version,
+            "load_seconds": self.load_seconds,
+        }
+        if self.error:
+            status["error"] = self.error
+        return status
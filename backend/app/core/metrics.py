@@ -0,0 +1,135 @@
+"""
+요청 단위 성능 지표 수집 모듈입니다.
+
+- 라우트별 지연 시간 히스토그램 (http_request_duration_seconds)
+- 라우트별 처리 단계(phase) 히스토그램 (http_request_phase_duration_seconds)
+    * filter    : 서비스 계층의 데이터 조회/필터링
+    * serialize : DataFrame -> dict/list 변환
+    * compress  : 응답 본문 압축 (CompressionMiddleware, 응답 캐시의 인코딩별 첫 압축)
+    * other     : 나머지 처리 시간 (응답 모델 검증, JSON 렌더링, 라우팅/의존성 주입, 미들웨어 등)
+                  따로 측정하지 않은 구간을 모두 합친 값이므로 특정 작업 하나의 시간으로 읽으면 안 됩니다.
+
+서비스 코드에서는 `with phase("filter"):` 처럼 구간을 표시하기만 하면 되고,
+요청 범위는 TimingMiddleware 가 contextvars 로 관리합니다.
+수집된 지표는 /metrics 엔드포인트에서 Prometheus 텍스트 형식으로 노출됩니다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# 히스토그램 버킷 경계 (초)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 현재 요청에서 기록 중인 단계별 누적 시간 (요청 밖에서는 None)
+_current_phases: ContextVar[Optional[dict]] = ContextVar("current_phases", default=None)
+
+
+class Histogram:
+    """누적 버킷 방식의 간단한 히스토그램입니다."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """라우트/단계별 히스토그램을 보관하고 Prometheus 텍스트 형식으로 출력합니다."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests: dict[tuple, Histogram] = {}
+        self._phases: dict[tuple, Histogram] = {}
+
+    def _histogram(self, store: dict, key: tuple) -> Histogram:
+        histogram = store.get(key)
+        if histogram is None:
+            histogram = store[key] = Histogram(self.buckets)
+        return histogram
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, phases: dict = None):
+        """요청 1건의 전체 지연 시간과 단계별 시간을 기록합니다."""
+        phases = dict(phases or {})
+        # 명시적으로 기록되지 않은 나머지 시간은 other 단계로 집계합니다.
+        phases["other"] = max(0.0, seconds - sum(phases.values()))
+        with self._lock:
+            self._histogram(self._requests, (method, route, str(status))).observe(seconds)
+            for name, value in phases.items():
+                self._histogram(self._phases, (method, route, name)).observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._requests.clear()
+            self._phases.clear()
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def _render_histograms(self, name: str, help_text: str, label_names: tuple, store: dict) -> list[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, histogram in sorted(store.items()):
+            labels = ",".join(f'{label}="{self._escape(value)}"' for label, value in zip(label_names, key))
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return lines
+
+    def render_prometheus(self) -> str:
+        """모든 히스토그램을 Prometheus 텍스트 노출 형식(0.0.4)으로 반환합니다."""
+        with self._lock:
+            lines = self._render_histograms(
+                "http_request_duration_seconds", "HTTP request latency by route.",
+                ("method", "route", "status"), self._requests,
+            )
+            lines += self._render_histograms(
+                "http_request_phase_duration_seconds", "HTTP request latency by route and processing phase.",
+                ("method", "route", "phase"), self._phases,
+            )
+        return "\n".join(lines) + "\n"
+
+
+# 애플리케이션 전역 레지스트리
+registry = MetricsRegistry()
+
+
+def start_request():
+    """요청 단위 단계 기록을 시작합니다. 반환된 토큰은 finish_request 에 전달합니다."""
+    return _current_phases.set({})
+
+
+def finish_request(token) -> dict:
+    """요청 단위 단계 기록을 끝내고 단계별 누적 시간을 반환합니다."""
+    phases = _current_phases.get() or {}
+    _current_phases.reset(token)
+    return phases
+
+
+@contextmanager
+def phase(name: str):
+    """
+    현재 요청의 처리 단계 시간을 기록합니다. 요청 밖(예: 테스트, 배치)에서는 아무 것도 하지 않습니다.
+    같은 단계가 여러 번 기록되면 누적됩니다.
+    """
+    phases = _current_phases.get()
+    if phases is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
@@ -0,0 +1,202 @@
+"""
+요청 타이밍 및 프로파일링 미들웨어입니다.
+
+- TimingMiddleware: 모든 HTTP 요청의 라우트별 지연 시간과 처리 단계별 시간을 metrics.registry 에 기록합니다.
+- CompressionMiddleware: Accept-Encoding 으로 협상한 인코딩(zstd, br, gzip)으로 응답을 압축합니다.
+  이미 Content-Encoding 이 있는 응답(응답 캐시의 미리 압축된 본문)은 그대로 보내고,
+  한 번에 오는 본문은 이벤트 루프를 막지 않도록 스레드 풀에서 압축하며,
+  스트리밍 응답(SSE 등)은 청크마다 증분 압축하여 바로 내보냅니다.
+  압축한 응답의 강한 ETag 는 약한 ETag(W/)로 바꿉니다. (원본과 바이트가 다르므로)
+- ProfilingMiddleware: 설정(PROFILING_ENABLED)으로 켠 경우에만 동작하며, 요청에 `X-Profile: 1` 헤더나
+  `?profile=1` 쿼리 파라미터가 있으면 해당 요청을 프로파일링하여 결과 파일을 저장합니다.
+  pyinstrument 가 설치되어 있으면 speedscope 형식(플레임그래프)으로, 없으면 cProfile(.prof)로 저장하며
+  저장 경로는 `X-Profile-File` 응답 헤더로 알려줍니다.
+  (프로파일러는 이벤트 루프 스레드만 측정하므로 동기(def) 엔드포인트의 스레드풀 작업은 포함되지 않습니다.)
+"""
+import os
+import time
+import uuid
+from urllib.parse import parse_qs
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core import compression, metrics
+
+try:
+    import pyinstrument
+except ImportError:  # 선택 의존성
+    pyinstrument = None
+
+
+class TimingMiddleware:
+    """라우트별 지연 시간과 단계별 시간을 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app, registry: metrics.MetricsRegistry = None):
+        self.app = app
+        self.registry = registry or metrics.registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500, "event_stream": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                content_type = dict(message.get("headers") or []).get(b"content-type", b"")
+                status["event_stream"] = content_type.startswith(b"text/event-stream")
+            await send(message)
+
+        token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            phases = metrics.finish_request(token)
+            # 연결이 유지되는 동안 계속 열려 있는 SSE 스트림은 지연 시간 분포를 왜곡하므로 기록하지 않습니다.
+            if not status["event_stream"]:
+                # 경로 파라미터가 채워진 실제 경로 대신 라우트 템플릿(/stocks/{ticker})으로 집계합니다.
+                route = scope.get("route")
+                route_path = getattr(route, "path", None) or "unmatched"
+                self.registry.observe_request(scope["method"], route_path, status["code"], elapsed, phases)
+
+
+class CompressionMiddleware:
+    """응답 압축 ASGI 미들웨어 (한 번에 오는 본문은 통째로, 스트리밍 본문은 청크 단위로 압축)"""
+
+    # 압축할 Content-Type (이미 압축된 이미지/폰트 등은 제외)
+    COMPRESSIBLE_TYPES = (b"application/json", b"text/", b"application/javascript", b"image/svg+xml",
+                          b"application/xml")
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = dict(scope.get("headers") or [])
+        encoding = compression.negotiate(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "compressor": None, "passthrough": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers") or [])
+                content_type = headers.get(b"content-type", b"")
+                if b"content-encoding" in headers or not content_type.startswith(self.COMPRESSIBLE_TYPES):
+                    state["passthrough"] = True
+                    await send(message)
+                else:
+                    # 본문의 첫 조각을 보고 통째로 압축할지, 스트리밍으로 압축할지 정합니다.
+                    state["start"] = message
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if state["compressor"] is None:
+                start = state["start"]
+                if not more_body:
+                    if len(body) < self.minimum_size:
+                        state["passthrough"] = True
+                        await send(start)
+                        await send(message)
+                        return
+                    with metrics.phase("compress"):
+                        body = await run_in_threadpool(compression.compress, body, encoding,
+                                                       compression.DYNAMIC_LEVELS[encoding])
+                    await send(self._encoded_start(start, encoding, len(body)))
+                    await send({"type": "http.response.body", "body": body, "more_body": False})
+                    return
+                state["compressor"] = compression.StreamCompressor(encoding)
+                await send(self._encoded_start(start, encoding, None))
+
+            compressor = state["compressor"]
+            with metrics.phase("compress"):
+                chunk = compressor.compress(body) if body else b""
+                if not more_body:
+                    chunk += compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _encoded_start(start: dict, encoding: str, length) -> dict:
+        """
+        Content-Encoding, Vary 를 추가하고 Content-Length 를 압축 후 길이로 바꾼(스트리밍이면 뺀) 시작 메시지.
+        강한 ETag 는 약한 ETag 로 바꿉니다.
+        """
+        headers = [
+            (k, b"W/" + v if k.lower() == b"etag" and not v.startswith(b"W/") else v)
+            for k, v in start.get("headers", []) if k.lower() not in (b"content-length", b"vary")
+        ]
+        vary = [v for k, v in start.get("headers", []) if k.lower() == b"vary"]
+        headers.append((b"content-encoding", encoding.encode("latin-1")))
+        headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+        return {**start, "headers": headers}
+
+
+class ProfilingMiddleware:
+    """요청 단위 옵트인(opt-in) 프로파일링 ASGI 미들웨어"""
+
+    def __init__(self, app, output_dir: str = "profiles"):
+        self.app = app
+        self.output_dir = output_dir
+
+    @staticmethod
+    def _requested(scope) -> bool:
+        headers = dict(scope.get("headers") or [])
+        if headers.get(b"x-profile", b"").lower() in (b"1", b"true"):
+            return True
+        query = parse_qs(scope.get("query_string", b"").decode())
+        return query.get("profile", [""])[0].lower() in ("1", "true")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        if pyinstrument is not None:
+            path = os.path.join(self.output_dir, f"{name}.speedscope.json")
+            profiler = pyinstrument.Profiler(async_mode="enabled")
+        else:
+            import cProfile
+            path = os.path.join(self.output_dir, f"{name}.prof")
+            profiler = cProfile.Profile()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-file", path.encode())]
+            await send(message)
+
+        if pyinstrument is not None:
+            profiler.start()
+        else:
+            profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if pyinstrument is not None:
+                profiler.stop()
+                from pyinstrument.renderers import SpeedscopeRenderer
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profiler.output(renderer=SpeedscopeRenderer()))
+            else:
+                profiler.disable()
+                profiler.dump_stats(path)
+            print(f"정보: 요청 프로파일을 {path} 에 저장했습니다.")
@@ -0,0 +1,181 @@
+"""
+직렬화된 응답 본문 캐시입니다.
+
+같은 데이터 버전에서 같은 요청은 같은 본문을 돌려주므로, 크기가 큰 응답(/stocks/, /stocks/{ticker}, /stocks/batch)은
+JSON 본문을 한 번만 만들어 (데이터셋, 데이터 버전, 요청 키) 로 보관합니다.
+압축 본문도 인코딩(gzip, br, zstd)별로 처음 요청될 때 한 번만 만들어 같은 항목에 함께 보관하므로,
+이후 요청은 직렬화도 압축도 하지 않고 저장된 바이트를 그대로 보냅니다.
+
+- 데이터셋의 새 버전 항목이 들어오면 이전 버전 항목은 모두 버립니다.
+- 전체 크기(원본 + 압축 본문)가 max_bytes 를 넘으면 가장 오래 사용하지 않은 항목부터 버립니다.
+- 압축 수준: 데이터 버전마다 거의 모든 요청이 다시 쓰는 항목(hot=True, 예: 전체 목록)만 한 단계 높은 중간 수준(CACHED_LEVELS)으로,
+  나머지는 요청마다 압축하는 응답과 같은 수준(DYNAMIC_LEVELS)으로 압축합니다.
+  처음 압축은 이벤트 루프를 막지 않도록 스레드 풀에서 실행합니다.
+- 본문의 해시로 약한(weak) ETag 를 만들어, If-None-Match 가 일치하면 304 로 응답합니다.
+  (같은 ETag 를 원본과 압축 본문에 함께 쓰므로 바이트 단위로 같다는 강한 ETag 는 쓸 수 없습니다)
+"""
+import hashlib
+import threading
+from typing import Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+
+from app.core import compression, metrics
+from app.core.config import settings
+
+
+class CachedBody:
+    """캐시된 응답 본문과 인코딩별 압축 본문"""
+
+    def __init__(self, body: bytes, version: int, media_type: str = "application/json", levels: dict = None):
+        self.body = body
+        self.media_type = media_type
+        # 인코딩별 압축 수준 (기본값: 요청마다 압축하는 응답과 같은 수준)
+        self.levels = compression.DYNAMIC_LEVELS if levels is None else levels
+        self.etag = f'W/"{version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+        self.variants: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(v) for v in self.variants.values())
+
+    def variant(self, encoding: Optional[str]) -> tuple[bytes, int]:
+        """
+        인코딩에 해당하는 본문과 이번 호출로 새로 늘어난 바이트 수를 반환합니다.
+        같은 인코딩을 동시에 처음 요청해도 압축은 한 번만 합니다.
+        """
+        if encoding is None:
+            return self.body, 0
+        data = self.variants.get(encoding)
+        if data is not None:
+            return data, 0
+        with self._lock:
+            data = self.variants.get(encoding)
+            if data is not None:
+                return data, 0
+            with metrics.phase("compress"):
+                data = compression.compress(self.body, encoding, self.levels[encoding])
+            self.variants[encoding] = data
+            return data, len(data)
+
+
+class ResponseCache:
+    """(데이터셋, 데이터 버전, 요청 키) -> CachedBody. 크기 제한이 있는 LRU 캐시입니다. (스레드 안전)"""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # (데이터셋, 요청 키) -> [데이터 버전, 본문, 캐시 크기에 반영한 바이트 수]
+        self._entries: dict[tuple[str, str], list] = {}
+        # 데이터셋별로 캐시에 들어온 가장 최근 데이터 버전
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, dataset: str, version: int, key: str) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get((dataset, key))
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            # 최근에 사용한 항목이 가장 늦게 버려지도록 뒤로 옮깁니다.
+            self._entries[(dataset, key)] = self._entries.pop((dataset, key))
+            self.hits += 1
+            return entry[1]
+
+    def put(self, dataset: str, version: int, key: str, body: bytes,
+            media_type: str = "application/json", hot: bool = False) -> CachedBody:
+        """
+        본문을 캐시에 넣고 CachedBody 를 반환합니다. 이전 데이터 버전으로 만든 본문은 반환만 하고 저장하지 않습니다.
+        hot=True 이면 한 단계 높은 중간 압축 수준(CACHED_LEVELS)으로 압축합니다. (데이터 버전마다 많은 요청이 다시 쓰는 항목용)
+        """
+        cached = CachedBody(body, version, media_type,
+                            compression.CACHED_LEVELS if hot else compression.DYNAMIC_LEVELS)
+        with self._lock:
+            current = self._versions.get(dataset, version)
+            if version < current:
+                return cached
+            if version > current:
+                # 새 데이터 버전이 들어오면 이전 버전 항목을 모두 버립니다.
+                for cache_key in [k for k in self._entries if k[0] == dataset]:
+                    self._discard(cache_key)
+            self._versions[dataset] = version
+            self._discard((dataset, key))
+            self._entries[(dataset, key)] = [version, cached, cached.size]
+            self.total_bytes += cached.size
+            self._evict()
+        return cached
+
+    def variant(self, cached: CachedBody, encoding: Optional[str]) -> bytes:
+        """인코딩별 본문을 반환합니다. 새로 압축한 본문의 크기도 캐시 크기에 더합니다."""
+        data, added = cached.variant(encoding)
+        if added:
+            with self._lock:
+                for entry in self._entries.values():
+                    if entry[1] is cached:
+                        entry[2] += added
+                        self.total_bytes += added
+                        self._evict()
+                        break
+        return data
+
+    def _discard(self, cache_key: tuple[str, str]):
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._discard(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.total_bytes = 0
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더가 ETag 와 일치하는지 약한 비교(W/ 접두사 무시)로 확인합니다."""
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith('W/') else tag) == opaque:
+            return True
+    return False
+
+
+async def cached_response(request: Request, cached: CachedBody, cache: 'ResponseCache' = None) -> Response:
+    """
+    캐시된 본문으로 응답을 만듭니다.
+    If-None-Match 가 ETag 와 같으면 304, 아니면 Accept-Encoding 으로 협상한 (미리 압축된) 본문을 보냅니다.
+    아직 압축하지 않은 인코딩이면 스레드 풀에서 압축합니다.
+    """
+    cache = cache or response_cache
+    headers = {"ETag": cached.etag, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = None
+    if settings.COMPRESSION_ENABLED and len(cached.body) >= settings.COMPRESSION_MIN_SIZE:
+        encoding = compression.negotiate(request.headers.get("accept-encoding"))
+    if encoding is None:
+        content = cached.body
+    else:
+        headers["Content-Encoding"] = encoding
+        content = cached.variants.get(encoding)
+        if content is None:
+            content = await run_in_threadpool(cache.variant, cached, encoding)
+    return Response(content=content, media_type=cached.media_type, headers=headers)
+
+
+# 애플리케이션 전역 응답 캐시
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_BYTES)
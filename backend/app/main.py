@@ -1,21 +1,27 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse
 import uvicorn
 from typing import Annotated # Python 3.9+ 에서는 list[dict] 등으로 사용 가능
-from services.stock_service import StockService # 새로 만든 서비스 클래스 임포트
+
+from app.core.lazy import ServiceNotReady
+from app.services.stock_service import StockService # 새로 만든 서비스 클래스 임포트
 
 # FastAPI 애플리케이션 초기화
 app = FastAPI()
 
-# StockService 인스턴스를 전역으로 생성합니다.
-# 애플리케이션 시작 시 한 번만 CSV 파일을 로드하게 됩니다.
-global_stock_service = StockService() 
+# StockService 인스턴스는 프로세스 전역 데이터 레지스트리가 한 번만 생성하여 보관합니다.
+# main_v2 와 같은 프로세스에서 실행되어도 주가 데이터를 두 번 로드하지 않습니다.
+from app.services.registry import get_stock_service
+
 
-# 의존성 주입을 위한 헬퍼 함수
-# 이 함수는 각 엔드포인트가 호출될 때마다 StockService 인스턴스를 제공합니다.
-# 하지만 위에서 global_stock_service를 이미 생성했으므로, 
-# FastAPI는 같은 인스턴스를 재사용하게 됩니다.
-def get_stock_service() -> StockService:
-    return global_stock_service
+@app.exception_handler(ServiceNotReady)
+async def service_not_ready_handler(request: Request, exc: ServiceNotReady):
+    """warm-up 중이거나 로드에 실패한 데이터 라우트 요청에 503 과 Retry-After 헤더로 응답합니다. (main_v2 와 동일)"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 # 1. 모든 주식 데이터 반환 API
 @app.get("/stocks")
@@ -1,19 +1,40 @@
 from app.core.config import settings
+from app.core.events import bus as event_bus
+from app.core.lazy import ServiceNotReady
+from app.services.registry import registry
+from app.core.middleware import CompressionMiddleware, TimingMiddleware, ProfilingMiddleware
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from pathlib import Path
 # api/routers 폴더에 있는 라우터 객체들을 가져옵니다.
-from app.api.routers import stock_v2, news, financial_info
+from app.api.routers import stock_v2, news, financial_info, system, analytics, portfolio, events
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 시작 시 데이터 서비스를 백그라운드 스레드에서 미리 로드합니다.
+    로드가 끝나기 전에도 서버는 요청을 받을 수 있으므로 /healthz 는 즉시 응답하고,
+    /readyz 와 데이터 라우트는 로드가 끝날 때까지 503 으로 응답합니다.
+    """
+    if settings.WARMUP_ON_STARTUP:
+        registry.start_warm_up()
+    yield
+    # 열려 있는 SSE 스트림을 끝내 서버가 바로 종료될 수 있도록 합니다.
+    event_bus.close_all()
 
 # FastAPI 애플리케이션 인스턴스를 생성합니다.
 app = FastAPI(
     title="Stock Project API v2",
     description="라우터 분리 및 서비스 계층을 적용한 API",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 # --- 정적 파일 마운트 ---
@@ -33,6 +54,15 @@ mounts = [
 ]
 mount_static(app, mounts)
 
+@app.exception_handler(ServiceNotReady)
+async def service_not_ready_handler(request: Request, exc: ServiceNotReady):
+    """warm-up 중이거나 로드에 실패한 데이터 라우트 요청에 503 과 Retry-After 헤더로 응답합니다."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # CORS 미들웨어 추가
 app.add_middleware(
     CORSMiddleware,
@@ -42,10 +72,25 @@ app.add_middleware(
     allow_headers=["*"],  # 모든 HTTP 헤더 허용
 )
 
+# 응답 압축 미들웨어 (응답 캐시를 거치지 않는 응답과 스트리밍 응답을 압축합니다)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# 요청 타이밍 미들웨어 (라우트별 지연 시간 -> /metrics)
+app.add_middleware(TimingMiddleware)
+
+# 요청 단위 프로파일링 미들웨어 (설정으로 켠 경우에만 추가)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, output_dir=settings.PROFILE_OUTPUT_DIR)
+
 # 정의한 라우터들을 애플리케이션에 포함시킵니다.
 app.include_router(stock_v2.router)
 app.include_router(news.router, prefix="/api", tags=["news"])
 app.include_router(financial_info.router, prefix="/api", tags=["financial-info"])
+app.include_router(system.router, tags=["system"])
+app.include_router(analytics.router)
+app.include_router(portfolio.router)
+app.include_router(events.router)
 
 @app.get("/", tags=["root"])
 async def read_root():
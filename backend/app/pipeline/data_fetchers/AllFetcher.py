@@ -1,4 +1,4 @@
-from companiesCollector import get_nasdaq_companies
+from companiesCollector import get_nasdaq_companies, get_universe_diff
 from datareader_fdr import fetch_and_save_data
 from datareader_yfinance import fetch_and_save_all_financial_data
 from info_datareader_yfinance_NYrs import fetch_and_save_historical_info
@@ -10,6 +10,13 @@ from news_crawler import fetch_and_save_news_urls
 print("나스닥 기업 목록을 가져오는 중...")
 nasdaq_companies_df = get_nasdaq_companies(limit=10)
 
+if not nasdaq_companies_df.empty:
+    # 직전 유니버스 스냅샷 대비 바뀐 종목 (신규 상장/상장 폐지/티커 변경)
+    universe_diff = get_universe_diff()
+    print(f"AllFetcher: 유니버스 버전 {universe_diff['from_version']} -> {universe_diff['to_version']} "
+          f"(추가 {len(universe_diff['added'])}, 삭제 {len(universe_diff['removed'])}, "
+          f"티커 변경 {len(universe_diff['renamed'])}, 이름 변경 {len(universe_diff['name_changed'])})")
+
 if not nasdaq_companies_df.empty:
     fetch_and_save_data(nasdaq_companies_df)
     print("AllFetcher: 주식목록 데이터의 모든 작업이 완료되었습니다.")
@@ -2,6 +2,9 @@ import FinanceDataReader as fdr
 import yfinance as yf
 import os
 
+from provider_client import CircuitOpenError, get_client
+from writers import save_table
+
 def fetch_nasdaq_companies_field():
     """
     Fetches NASDAQ company listings using a hybrid approach:
@@ -12,7 +15,7 @@ def fetch_nasdaq_companies_field():
     print("Fetching initial company data from FinanceDataReader...")
     try:
         # 1. Get base data from fdr
-        nasdaq_fdr = fdr.StockListing('NASDAQ')
+        nasdaq_fdr = get_client('fdr').call(fdr.StockListing, 'NASDAQ')
         
         # Select relevant columns and drop rows with missing essential data
         nasdaq_df = nasdaq_fdr[['Symbol', 'Name', 'Industry']].dropna().reset_index(drop=True)
@@ -22,19 +25,24 @@ def fetch_nasdaq_companies_field():
         print("This process can still take a significant amount of time.")
 
         # 2. Get Sector from yfinance for each symbol
+        # Yahoo calls are paced by the shared provider client (token bucket + 429 backoff).
+        yahoo = get_client('yahoo')
         sectors = []
         for i, symbol in enumerate(symbols):
             try:
                 ticker = yf.Ticker(symbol)
-                info = ticker.info
+                info = yahoo.call(lambda: ticker.info)
                 sector = info.get('sector', 'N/A') # Provide a default value
                 sectors.append(sector)
+            except CircuitOpenError:
+                # Provider keeps failing: stop instead of filling the rest with 'N/A'.
+                raise
             except Exception as e:
                 print(f"{e}: {symbol} failed to fetch - skipping.")
                 sectors.append('N/A') # Append default value on error
             
             if (i + 1) % 100 == 0:
-                print(f"Processed {i + 1}/{len(symbols)} symbols for Sector info...")
+                print(f"Processed {i + 1}/{len(symbols)} symbols for Sector info... {yahoo.readout()}")
 
         # 3. Add the sectors list as a new column to the DataFrame
         nasdaq_df['Sector'] = sectors
@@ -42,18 +50,18 @@ def fetch_nasdaq_companies_field():
         # Reorder columns for clarity
         nasdaq_df = nasdaq_df[['Symbol', 'Name', 'Sector', 'Industry']]
 
-        # 4. Save to CSV
+        # 4. Save to CSV (and/or Parquet, see writers.OUTPUT_FORMATS)
         output_dir = 'data'
         
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
             
-        output_path = os.path.join(output_dir, 'nasdaq_companies_hybrid.csv')
+        base_path = os.path.join(output_dir, 'nasdaq_companies_hybrid')
 
         nasdaq_df.index.name = 'id'
-        nasdaq_df.to_csv(output_path, index=True, encoding='utf-8')
+        paths = save_table(nasdaq_df, base_path, index=True)
 
-        print(f"\nSuccessfully saved combined company data to {output_path}")
+        print(f"\nSuccessfully saved combined company data to {', '.join(paths.values())}")
 
     except Exception as e:
         print(f"An error occurred: {e}")
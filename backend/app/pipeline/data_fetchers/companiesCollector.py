@@ -1,18 +1,214 @@
+"""
+NASDAQ 상장 기업 목록(유니버스) 수집 모듈
+
+fdr.StockListing('NASDAQ') 결과를 버전별 스냅샷으로 data/universe/ 폴더에 저장하고,
+TTL(UNIVERSE_TTL_HOURS, 기본 24시간) 이내에는 네트워크 대신 최신 스냅샷을 사용합니다.
+    data/universe/index.json          버전 목록 (버전, 수집/확인 시각, 파일, 종목 수)
+    data/universe/nasdaq_v0001.csv    버전별 스냅샷
+
+목록이 바뀐 경우에만 새 버전을 만들며, 바뀌지 않았으면 최신 버전의 확인 시각(checked_at)만 갱신합니다.
+diff_universe / get_universe_diff 로 두 버전 사이에 추가/삭제/티커 변경(renamed)/이름 변경된 종목을 구할 수 있어,
+후속 단계가 전체 유니버스 대신 바뀐 종목만 처리(신규 상장 종목 백필, 상장 폐지 종목 정리 등)할 수 있습니다.
+"""
+import json
+import os
+from datetime import datetime, timezone
+
 import pandas as pd
 import FinanceDataReader as fdr
 
-def get_nasdaq_companies(limit=None):
+from provider_client import get_client
+
+UNIVERSE_DIR = os.path.join('data', 'universe')
+UNIVERSE_TTL_HOURS = float(os.getenv('UNIVERSE_TTL_HOURS', '24'))
+INDEX_FILE = 'index.json'
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def load_index(universe_dir: str = None) -> dict:
+    """스냅샷 버전 목록을 읽습니다. 없으면 빈 목록."""
+    path = os.path.join(universe_dir or UNIVERSE_DIR, INDEX_FILE)
+    if not os.path.exists(path):
+        return {'versions': []}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_index(index: dict, universe_dir: str):
+    with open(os.path.join(universe_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+
+def _find_version(index: dict, version: int = None) -> dict:
+    """버전 항목을 찾습니다. version 이 None 이면 최신 버전. 음수면 최신에서 거꾸로 (-1 = 최신, -2 = 직전)."""
+    versions = index['versions']
+    if not versions:
+        raise LookupError("저장된 유니버스 스냅샷이 없습니다.")
+    if version is None or version < 0:
+        position = -1 if version is None else version
+        if -position > len(versions):
+            raise LookupError(f"유니버스 스냅샷이 {len(versions)}개뿐입니다.")
+        return versions[position]
+    for entry in versions:
+        if entry['version'] == version:
+            return entry
+    raise LookupError(f"유니버스 스냅샷 버전 {version} 이 없습니다.")
+
+
+def load_snapshot(version: int = None, universe_dir: str = None) -> pd.DataFrame:
+    """버전별 스냅샷을 읽습니다. (version 이 None 이면 최신 버전)"""
+    universe_dir = universe_dir or UNIVERSE_DIR
+    entry = _find_version(load_index(universe_dir), version)
+    # 'NA' 같은 티커가 결측값으로 바뀌지 않도록 문자열 그대로 읽습니다.
+    return pd.read_csv(os.path.join(universe_dir, entry['file']), dtype=str, keep_default_na=False)
+
+
+def _same_listing(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    columns = [c for c in ('Symbol', 'Name') if c in a.columns and c in b.columns]
+    left = a[columns].fillna('').astype(str).sort_values(columns).reset_index(drop=True)
+    right = b[columns].fillna('').astype(str).sort_values(columns).reset_index(drop=True)
+    return left.equals(right)
+
+
+def save_snapshot(listing_df: pd.DataFrame, universe_dir: str = None) -> dict:
+    """
+    목록을 새 스냅샷 버전으로 저장하고 버전 항목을 반환합니다.
+    최신 버전과 종목/이름이 같으면 새 버전을 만들지 않고 최신 버전의 checked_at 만 갱신합니다.
+    """
+    universe_dir = universe_dir or UNIVERSE_DIR
+    os.makedirs(universe_dir, exist_ok=True)
+    index = load_index(universe_dir)
+    now = _now().isoformat()
+
+    if index['versions'] and _same_listing(load_snapshot(universe_dir=universe_dir), listing_df):
+        entry = index['versions'][-1]
+        entry['checked_at'] = now
+    else:
+        version = index['versions'][-1]['version'] + 1 if index['versions'] else 1
+        entry = {
+            'version': version,
+            'fetched_at': now,
+            'checked_at': now,
+            'file': f'nasdaq_v{version:04d}.csv',
+            'count': len(listing_df),
+        }
+        listing_df.to_csv(os.path.join(universe_dir, entry['file']), index=False, encoding='utf-8')
+        index['versions'].append(entry)
+    _save_index(index, universe_dir)
+    return entry
+
+
+def is_fresh(entry: dict, max_age_hours: float) -> bool:
+    """스냅샷을 마지막으로 확인한 시각이 max_age_hours 이내인지 여부"""
+    checked_at = datetime.fromisoformat(entry['checked_at'])
+    return (_now() - checked_at).total_seconds() < max_age_hours * 3600
+
+
+def get_universe(max_age_hours: float = None, refresh: bool = False, universe_dir: str = None) -> pd.DataFrame:
+    """
+    NASDAQ 유니버스를 반환합니다.
+    최신 스냅샷이 TTL 이내이면 스냅샷을, 아니면 새로 수집하여 저장한 뒤 반환합니다.
+    수집에 실패하면 오래된 스냅샷이라도 있으면 그것을 사용합니다.
+    """
+    universe_dir = universe_dir or UNIVERSE_DIR
+    max_age_hours = UNIVERSE_TTL_HOURS if max_age_hours is None else max_age_hours
+    index = load_index(universe_dir)
+    latest = index['versions'][-1] if index['versions'] else None
+
+    if latest and not refresh and is_fresh(latest, max_age_hours):
+        return load_snapshot(universe_dir=universe_dir)
+
+    try:
+        listing_df = get_client('fdr').call(fdr.StockListing, 'NASDAQ')
+    except Exception as e:
+        if latest is None:
+            raise
+        print(f"경고: NASDAQ 목록 수집 실패({e}). 버전 {latest['version']} 스냅샷을 사용합니다.")
+        return load_snapshot(universe_dir=universe_dir)
+
+    if listing_df.empty:
+        return listing_df
+    entry = save_snapshot(listing_df, universe_dir)
+    print(f"정보: NASDAQ 유니버스 스냅샷 버전 {entry['version']} ({entry['count']}개 종목)")
+    return load_snapshot(entry['version'], universe_dir)
+
+
+def get_nasdaq_companies(limit=None, max_age_hours=None, refresh=False):
     """
     NASDAQ에 상장된 모든 회사의 정보를 DataFrame으로 반환합니다.
+    TTL 이내에 저장한 스냅샷이 있으면 네트워크 요청 없이 스냅샷을 사용합니다.
     """
-    nasdaq_df = fdr.StockListing('NASDAQ')
-    
+    nasdaq_df = get_universe(max_age_hours=max_age_hours, refresh=refresh)
+
     if nasdaq_df.empty:
         print("NASDAQ 목록을 가져오는 데 실패했습니다.")
         return pd.DataFrame()
-    
+
     if limit:
         nasdaq_df = nasdaq_df.head(limit)
 
     return nasdaq_df
 
+
+def diff_universe(old_df: pd.DataFrame, new_df: pd.DataFrame) -> dict:
+    """
+    두 유니버스의 차이를 반환합니다.
+        added:        새로 생긴 종목
+        removed:      사라진 종목
+        renamed:      티커가 바뀐 종목 (사라진 종목과 새 종목의 회사 이름이 같은 경우)
+        name_changed: 티커는 같고 회사 이름이 바뀐 종목
+    """
+    old_names = dict(zip(old_df['Symbol'], old_df['Name']))
+    new_names = dict(zip(new_df['Symbol'], new_df['Name']))
+    added = sorted(set(new_names) - set(old_names))
+    removed = sorted(set(old_names) - set(new_names))
+
+    # 사라진 종목과 같은 이름의 새 종목은 티커 변경으로 봅니다.
+    added_by_name = {}
+    for symbol in added:
+        if new_names[symbol]:
+            added_by_name.setdefault(new_names[symbol], []).append(symbol)
+    renamed = []
+    for symbol in removed:
+        candidates = added_by_name.get(old_names[symbol])
+        if candidates:
+            renamed.append({'old_symbol': symbol, 'new_symbol': candidates.pop(0), 'name': old_names[symbol]})
+    renamed_old = {r['old_symbol'] for r in renamed}
+    renamed_new = {r['new_symbol'] for r in renamed}
+
+    name_changed = [
+        {'symbol': symbol, 'old_name': old_names[symbol], 'new_name': new_names[symbol]}
+        for symbol in sorted(set(old_names) & set(new_names))
+        if old_names[symbol] != new_names[symbol]
+    ]
+    return {
+        'added': [s for s in added if s not in renamed_new],
+        'removed': [s for s in removed if s not in renamed_old],
+        'renamed': renamed,
+        'name_changed': name_changed,
+    }
+
+
+def get_universe_diff(from_version: int = None, to_version: int = None, universe_dir: str = None) -> dict:
+    """
+    두 스냅샷 버전의 차이를 반환합니다. 기본값은 직전 버전 -> 최신 버전입니다.
+    (스냅샷이 하나뿐이면 모든 종목이 added 입니다.)
+    """
+    universe_dir = universe_dir or UNIVERSE_DIR
+    index = load_index(universe_dir)
+    to_entry = _find_version(index, to_version)
+    if from_version is None:
+        position = index['versions'].index(to_entry)
+        from_entry = index['versions'][position - 1] if position > 0 else None
+    else:
+        from_entry = _find_version(index, from_version)
+
+    new_df = load_snapshot(to_entry['version'], universe_dir)
+    old_df = load_snapshot(from_entry['version'], universe_dir) if from_entry else new_df.iloc[0:0]
+    diff = diff_universe(old_df, new_df)
+    diff['from_version'] = from_entry['version'] if from_entry else None
+    diff['to_version'] = to_entry['version']
+    return diff
@@ -5,14 +5,17 @@ from tqdm import tqdm
 import pandas as pd
 
 from companiesCollector import get_nasdaq_companies
+from provider_client import CircuitOpenError, get_client, provider_stats
+from stage_metrics import stage_run
+from writers import save_table
 
-def fetch_and_save_data(stock_list_df, start_date='2020-01-01'):
+def fetch_and_save_data(stock_list_df, start_date='2020-01-01', output_dir='data'):
     """
     기업 목록에 대해 주식 데이터를 가져오고 단일 CSV로 저장합니다.
     :param stock_list_df: 기업 목록 DataFrame
     :param start_date: 데이터 시작 날짜
+    :param output_dir: 저장 폴더 (샤드 실행 시 샤드별 폴더, 리포트는 <output_dir>/reports)
     """
-    output_dir = 'data'
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
@@ -20,55 +23,65 @@ def fetch_and_save_data(stock_list_df, start_date='2020-01-01'):
     all_stocks_df = pd.DataFrame()
 
     print(f"총 {len(stock_list_df)}개 나스닥 기업의 데이터를 수집합니다.")
-    
-    for _, row in tqdm(
-        stock_list_df.iterrows(), 
-        total=len(stock_list_df), 
-        desc="데이터 수집 중"
-        ):
-        symbol = row['Symbol']
-        name = row['Name']
-        
-        try:
-            # 일별 주식 데이터 가져오기
-            df_stock = fdr.DataReader(symbol, start=start_date)
 
-            if df_stock.empty:
-                print(f"[{symbol}] {name} 데이터가 존재하지 않습니다. 건너뜁니다.")
-                continue
+    with stage_run('fetch_and_save_data', reports_dir=os.path.join(output_dir, 'reports'),
+                   symbols_total=len(stock_list_df), start_date=start_date) as metrics:
+        progress = tqdm(
+            stock_list_df.iterrows(), 
+            total=len(stock_list_df), 
+            desc="데이터 수집 중"
+            )
+        for _, row in progress:
+            symbol = row['Symbol']
+            name = row['Name']
+            
+            try:
+                # 일별 주식 데이터 가져오기 (호출 속도는 공유 클라이언트가 제한)
+                df_stock = get_client('fdr').call(fdr.DataReader, symbol, start=start_date, metrics=metrics)
 
-            # 거래액 계산
-            df_stock['거래액'] = df_stock['Close'] * df_stock['Volume']
+                if df_stock.empty:
+                    print(f"[{symbol}] {name} 데이터가 존재하지 않습니다. 건너뜁니다.")
+                    metrics.count('symbols_empty')
+                    continue
 
-            # 종목 코드를 식별하기 위해 'Symbol' 컬럼을 추가합니다.
-            df_stock['Symbol'] = symbol
+                with metrics.timer('parse'):
+                    # 거래액 계산
+                    df_stock['거래액'] = df_stock['Close'] * df_stock['Volume']
 
-            # 필요한 컬럼만 선택
-            df_stock = df_stock[[
-                'Symbol', 'Open', 'High', 
-                'Low', 'Close', 'Volume', 
-                '거래액'
-                ]]
+                    # 종목 코드를 식별하기 위해 'Symbol' 컬럼을 추가합니다.
+                    df_stock['Symbol'] = symbol
 
-            # 가져온 데이터를 all_stocks_df에 추가합니다.
-            all_stocks_df = pd.concat([all_stocks_df, df_stock])
+                    # 필요한 컬럼만 선택
+                    df_stock = df_stock[[
+                        'Symbol', 'Open', 'High', 
+                        'Low', 'Close', 'Volume', 
+                        '거래액'
+                        ]]
 
-            # API 호출 제한을 피하기 위해 잠시 대기
-            time.sleep(1)
+                    # 가져온 데이터를 all_stocks_df에 추가합니다.
+                    all_stocks_df = pd.concat([all_stocks_df, df_stock])
+                metrics.count('symbols_succeeded')
+                # 진행률 표시줄에 실시간 호출 속도/오류율 표시
+                progress.set_postfix(get_client('fdr').readout())
 
-        except Exception as e:
-            print(f"[{symbol}] {name} 데이터를 가져오는 중 오류 발생: {e}")
-            continue
+            except CircuitOpenError:
+                # 제공자 장애가 계속되면 나머지 종목을 건너뛰지 않고 단계를 실패로 끝냅니다.
+                raise
+            except Exception as e:
+                print(f"[{symbol}] {name} 데이터를 가져오는 중 오류 발생: {e}")
+                metrics.count('symbols_failed')
+                continue
 
-    # 모든 데이터 수집이 완료된 후, 하나의 CSV 파일로 저장합니다.
-    if not all_stocks_df.empty:
-        file_path = os.path.join(output_dir, 'nasdaq_all_stocks.csv')
-        all_stocks_df = all_stocks_df.reset_index(names=['Date'])
-        all_stocks_df.to_csv(file_path, encoding='utf-8', index=False)
-        print(f"\n모든 나스닥 기업의 데이터가 {file_path}에 성공적으로 저장되었습니다.")
-    else:
-        print("\n데이터를 저장할 내용이 없습니다.")
+        metrics.details['providers'] = provider_stats()
 
+        # 모든 데이터 수집이 완료된 후, 설정된 형식(CSV/Parquet)의 파일로 저장합니다.
+        if not all_stocks_df.empty:
+            all_stocks_df = all_stocks_df.reset_index(names=['Date'])
+            paths = save_table(all_stocks_df, os.path.join(output_dir, 'nasdaq_all_stocks'), metrics=metrics)
+            metrics.count('rows_written', len(all_stocks_df))
+            print(f"\n모든 나스닥 기업의 데이터가 {', '.join(paths.values())}에 성공적으로 저장되었습니다.")
+        else:
+            print("\n데이터를 저장할 내용이 없습니다.")
 
 if __name__ == '__main__':
     print("나스닥 기업 목록을 가져오는 중...")
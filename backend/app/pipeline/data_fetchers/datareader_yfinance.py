@@ -5,111 +5,204 @@ import time
 from tqdm import tqdm
 
 from companiesCollector import get_nasdaq_companies
+from provider_client import CircuitOpenError, get_client, provider_stats
+from stage_metrics import stage_run
+from writers import save_table
 
-def process_all_financials(ticker, period='annual', start_date='2020-01-01'):
+# 재무제표 종류 -> (연간 속성, 분기 속성)
+STATEMENTS = {
+    'income': ('financials', 'quarterly_financials'),
+    'balance_sheet': ('balance_sheet', 'quarterly_balance_sheet'),
+    'cash_flow': ('cashflow', 'quarterly_cashflow'),
+}
+# 저장 컬럼. 문자열 컬럼은 category 로 저장하여 Parquet 에서 사전(dictionary) 인코딩됩니다.
+STATEMENT_COLUMNS = ['Symbol', 'Name', 'Date', 'period', 'statement', 'line_item', 'value']
+CATEGORY_COLUMNS = ['Symbol', 'Name', 'period', 'statement', 'line_item']
+# 기존 wide 재무제표 파일 (기간 -> 파일 이름). DisclosureService 의 기본 경로와 Redshift 적재 설정이
+# 아직 이 파일들을 읽으므로, 모든 소비자가 긴 형식으로 옮길 때까지 함께 저장합니다.
+LEGACY_WIDE_OUTPUTS = {
+    'annual': 'nasdaq_financials_annual_all',
+    'quarterly': 'nasdaq_financials_quarterly_all',
+}
+# 기존 wide 파일에서 제표를 합칠 때 같은 항목 이름에 붙이던 접미사 (재무상태표, 현금흐름표 순서)
+LEGACY_SUFFIXES = {
+    'balance_sheet': ('_fin', '_bal'),
+    'cash_flow': ('_comb', '_cash'),
+}
+
+
+def process_all_financials(ticker, period='annual', start_date='2020-01-01', metrics=None):
     """
-    yfinance 티커 객체로부터 연간 또는 분기별 재무제표 전체를 가져와서 합칩니다.
+    yfinance 티커 객체로부터 연간 또는 분기별 재무제표(손익계산서, 재무상태표, 현금흐름표)를 가져와
+    (Symbol, Name, Date, period, statement, line_item, value) 형태의 긴(long) DataFrame 으로 반환합니다.
+    값이 없는 항목은 행을 만들지 않으므로, 제표마다 항목이 달라도 컬럼 충돌(_fin/_bal 접미사)이나 빈 칸이 생기지 않습니다.
     :param ticker: yfinance.Ticker 객체
     :param period: 'annual' 또는 'quarterly'
     :param start_date: 데이터 시작 날짜 (ISO 8601 형식)
+    :param metrics: 단계 지표(StageMetrics). 주어지면 네트워크/대기 구간 시간을 기록합니다.
     :return: 가공된 DataFrame 또는 None
     """
+    # yfinance 는 속성에 처음 접근할 때 데이터를 요청하므로 속성 접근을 공유 Yahoo 클라이언트로 감쌉니다.
+    yahoo = get_client('yahoo')
+    attr_position = 0 if period == 'annual' else 1
     try:
-        if period == 'annual':
-            financials_df = ticker.financials.T
-            balance_sheet_df = ticker.balance_sheet.T
-            cash_flow_df = ticker.cashflow.T
-        else:
-            financials_df = ticker.quarterly_financials.T
-            balance_sheet_df = ticker.quarterly_balance_sheet.T
-            cash_flow_df = ticker.quarterly_cashflow.T
-        
-        # 날짜 인덱스를 datetime 형식으로 변환
-        financials_df.index = pd.to_datetime(financials_df.index)
-        balance_sheet_df.index = pd.to_datetime(balance_sheet_df.index)
-        cash_flow_df.index = pd.to_datetime(cash_flow_df.index)
-        
-        # 시작 날짜 이후의 데이터만 필터링
-        financials_filtered = financials_df[financials_df.index >= start_date]
-        balance_sheet_filtered = balance_sheet_df[balance_sheet_df.index >= start_date]
-        cash_flow_filtered = cash_flow_df[cash_flow_df.index >= start_date]
-        
-        if financials_filtered.empty and balance_sheet_filtered.empty and cash_flow_filtered.empty:
+        frames = []
+        for statement, attrs in STATEMENTS.items():
+            raw_df = yahoo.call(lambda attr=attrs[attr_position]: getattr(ticker, attr), metrics=metrics)
+            if raw_df is None or raw_df.empty:
+                continue
+            # 행: 날짜, 열: 항목
+            statement_df = raw_df.T
+            statement_df.index = pd.to_datetime(statement_df.index)
+
+            # 시작 날짜 이후의 데이터만 필터링
+            statement_df = statement_df[statement_df.index >= start_date]
+
+            long_df = statement_df.rename_axis('Date').reset_index().melt(
+                id_vars='Date', var_name='line_item', value_name='value')
+            long_df['value'] = pd.to_numeric(long_df['value'], errors='coerce')
+            long_df = long_df.dropna(subset=['value'])
+            long_df['statement'] = statement
+            frames.append(long_df)
+
+        if not frames or all(frame.empty for frame in frames):
             return None
+        combined_df = pd.concat(frames, ignore_index=True)
+
+        # 'Symbol', 'Name', 'period' 컬럼 추가
+        info = yahoo.call(lambda: ticker.info, metrics=metrics)
+        combined_df['Symbol'] = info['symbol']
+        combined_df['Name'] = info['shortName']
+        combined_df['period'] = period
 
-        # 데이터 합치기
-        combined_df = financials_filtered.join(balance_sheet_filtered, how='outer', lsuffix='_fin', rsuffix='_bal')
-        combined_df = combined_df.join(cash_flow_filtered, how='outer', lsuffix='_comb', rsuffix='_cash')
-        
-        # 'Date', 'Symbol', 'Name' 컬럼 추가
-        combined_df['Date'] = combined_df.index
-        combined_df['Symbol'] = ticker.info['symbol']
-        combined_df['Name'] = ticker.info['shortName']
-
-        # 컬럼 순서 재정렬
-        cols = ['Symbol', 'Name', 'Date'] + [col for col in combined_df.columns if col not in ['Symbol', 'Name', 'Date']]
-        combined_df = combined_df[cols]
-        
-        return combined_df
+        return combined_df[STATEMENT_COLUMNS]
 
+    except CircuitOpenError:
+        raise
     except Exception as e:
-        print(f"[{ticker.info.get('symbol')}] 재무 데이터를 가져오는 중 오류 발생: {e}")
+        print(f"[{ticker.ticker}] 재무 데이터를 가져오는 중 오류 발생: {e}")
         return None
 
-def fetch_and_save_all_financial_data(stock_list_df, start_date='2020-01-01'):
+
+def to_statement_store(frames: list) -> pd.DataFrame:
+    """
+    종목별 긴 재무제표들을 하나로 합쳐 저장용 테이블로 만듭니다.
+    (Symbol, period, Date) 순으로 정렬하고(같은 날짜 안에서는 손익계산서, 재무상태표, 현금흐름표 순서 유지)
+    문자열 컬럼은 category 로 바꿉니다.
+    """
+    store_df = pd.concat(frames, ignore_index=True)
+    store_df['Date'] = pd.to_datetime(store_df['Date']).dt.normalize()
+    store_df = store_df.sort_values(['Symbol', 'period', 'Date'], kind='stable', ignore_index=True)
+    for column in CATEGORY_COLUMNS:
+        store_df[column] = store_df[column].astype('category')
+    return store_df
+
+
+def to_legacy_wide(store_df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    긴 형식 테이블에서 한 기간(period)의 기존 wide 재무제표(Symbol, Name, Date, 항목...)를 만듭니다.
+    제표별로 (Symbol, Name, Date) x 항목으로 펼친 뒤 기존과 같은 순서(손익계산서, 재무상태표, 현금흐름표)와
+    접미사(LEGACY_SUFFIXES)로 합칩니다.
+    """
+    period_df = store_df[store_df['period'] == period]
+    wide_df = None
+    for statement in STATEMENTS:
+        statement_df = period_df[period_df['statement'] == statement]
+        if statement_df.empty:
+            continue
+        statement_wide = statement_df.pivot_table(index=['Symbol', 'Name', 'Date'], columns='line_item',
+                                                  values='value', aggfunc='first', observed=True)
+        statement_wide.columns = [str(column) for column in statement_wide.columns]
+        if wide_df is None:
+            wide_df = statement_wide
+        else:
+            lsuffix, rsuffix = LEGACY_SUFFIXES[statement]
+            wide_df = wide_df.join(statement_wide, how='outer', lsuffix=lsuffix, rsuffix=rsuffix)
+    if wide_df is None:
+        return pd.DataFrame(columns=['Symbol', 'Name', 'Date'])
+    wide_df = wide_df.reset_index()
+    for column in ('Symbol', 'Name'):
+        wide_df[column] = wide_df[column].astype(str)
+    return wide_df
+
+
+def fetch_and_save_all_financial_data(stock_list_df, start_date='2020-01-01', output_dir='data'):
     """
-    모든 기업의 연간 및 분기별 재무 데이터를 수집하고 단일 CSV로 저장합니다.
+    모든 기업의 연간 및 분기별 재무제표를 수집하여 하나의 긴(long) 형식 테이블
+    nasdaq_financial_statements (Symbol, Name, Date, period, statement, line_item, value) 로 저장합니다.
+    기존 소비자를 위해 같은 데이터를 wide 형식(nasdaq_financials_{annual,quarterly}_all)으로도 저장합니다.
     :param stock_list_df: 기업 목록 DataFrame
     :param start_date: 데이터 시작 날짜 (ISO 8601 형식)
+    :param output_dir: 저장 폴더 (샤드 실행 시 샤드별 폴더, 리포트는 <output_dir>/reports)
     """
-    output_dir = 'data'
     os.makedirs(output_dir, exist_ok=True)
     
-    # 모든 연간 데이터를 담을 빈 DataFrame
-    all_annual_df = pd.DataFrame()
-    # 모든 분기별 데이터를 담을 빈 DataFrame
-    all_quarterly_df = pd.DataFrame()
+    # 종목별 연간/분기 재무제표 (마지막에 한 번만 합칩니다.)
+    statement_frames = []
 
     print(f"총 {len(stock_list_df)}개 나스닥 기업의 재무 데이터를 수집합니다.")
-    
-    for _, row in tqdm(stock_list_df.iterrows(), total=len(stock_list_df), desc="데이터 수집 중"):
-        symbol = row['Symbol']
-        
-        try:
-            ticker = yf.Ticker(symbol)
-            
-            # 연간 데이터 처리 및 추가
-            annual_df = process_all_financials(ticker, period='annual', start_date=start_date)
-            if annual_df is not None and not annual_df.empty:
-                all_annual_df = pd.concat([all_annual_df, annual_df], ignore_index=True)
-                # tqdm 진행률 표시를 위해 print 대신 log를 사용하거나,
-                # 별도 로그 파일을 만들어야 합니다. 여기서는 간결성을 위해 생략.
-
-            # 분기별 데이터 처리 및 추가
-            quarterly_df = process_all_financials(ticker, period='quarterly', start_date=start_date)
-            if quarterly_df is not None and not quarterly_df.empty:
-                all_quarterly_df = pd.concat([all_quarterly_df, quarterly_df], ignore_index=True)
-            
-            time.sleep(1)
+
+    with stage_run('fetch_and_save_all_financial_data', reports_dir=os.path.join(output_dir, 'reports'),
+                   symbols_total=len(stock_list_df),
+                   start_date=start_date) as metrics:
+        progress = tqdm(stock_list_df.iterrows(), total=len(stock_list_df), desc="데이터 수집 중")
+        for _, row in progress:
+            symbol = row['Symbol']
             
-        except Exception as e:
-            print(f"[{symbol}] 데이터 처리 중 오류 발생: {e}")
-            continue
+            try:
+                ticker = yf.Ticker(symbol)
+                
+                # 연간 데이터 처리 및 추가 (네트워크/대기 시간은 process_all_financials 내부에서 따로 기록)
+                tracked_before = metrics.timers.get('network', 0.0) + metrics.timers.get('sleep', 0.0)
+                parse_start = time.perf_counter()
+                annual_df = process_all_financials(ticker, period='annual', start_date=start_date,
+                                                   metrics=metrics)
+                if annual_df is not None and not annual_df.empty:
+                    statement_frames.append(annual_df)
 
-    # 모든 데이터 수집 후 CSV 파일로 저장
-    if not all_annual_df.empty:
-        file_path_annual = os.path.join(output_dir, 'nasdaq_financials_annual_all.csv')
-        all_annual_df.to_csv(file_path_annual, index=False, encoding='utf-8')
-        print(f"\n모든 연간 재무 데이터가 {file_path_annual}에 저장되었습니다.")
-    else:
-        print("\n저장할 연간 재무 데이터가 없습니다.")
+                # 분기별 데이터 처리 및 추가
+                quarterly_df = process_all_financials(ticker, period='quarterly', start_date=start_date,
+                                                      metrics=metrics)
+                if quarterly_df is not None and not quarterly_df.empty:
+                    statement_frames.append(quarterly_df)
+                # 위 구간에서 네트워크/대기 시간을 뺀 나머지를 가공(parse) 시간으로 기록합니다.
+                tracked = metrics.timers.get('network', 0.0) + metrics.timers.get('sleep', 0.0) - tracked_before
+                metrics.add_time('parse', time.perf_counter() - parse_start - tracked)
 
-    if not all_quarterly_df.empty:
-        file_path_quarterly = os.path.join(output_dir, 'nasdaq_financials_quarterly_all.csv')
-        all_quarterly_df.to_csv(file_path_quarterly, index=False, encoding='utf-8')
-        print(f"모든 분기별 재무 데이터가 {file_path_quarterly}에 저장되었습니다.")
-    else:
-        print("저장할 분기별 재무 데이터가 없습니다.")
+                if annual_df is None and quarterly_df is None:
+                    metrics.count('symbols_empty')
+                else:
+                    metrics.count('symbols_succeeded')
+                
+                # 진행률 표시줄에 실시간 호출 속도/오류율 표시
+                progress.set_postfix(get_client('yahoo').readout())
+                
+            except CircuitOpenError:
+                # 제공자 장애가 계속되면 나머지 종목을 건너뛰지 않고 단계를 실패로 끝냅니다.
+                raise
+            except Exception as e:
+                print(f"[{symbol}] 데이터 처리 중 오류 발생: {e}")
+                metrics.count('symbols_failed')
+                continue
+        metrics.details['providers'] = provider_stats()
+
+        # 모든 데이터 수집 후 설정된 형식(CSV/Parquet)의 파일로 저장
+        if statement_frames:
+            store_df = to_statement_store(statement_frames)
+            paths = save_table(store_df, os.path.join(output_dir, 'nasdaq_financial_statements'), metrics=metrics)
+            metrics.count('rows_written', len(store_df))
+            metrics.details['line_items'] = int(store_df['line_item'].nunique())
+            print(f"\n모든 재무제표 데이터({len(store_df)}행)가 {', '.join(paths.values())}에 저장되었습니다.")
+
+            for period, name in LEGACY_WIDE_OUTPUTS.items():
+                wide_df = to_legacy_wide(store_df, period)
+                if wide_df.empty:
+                    continue
+                paths = save_table(wide_df, os.path.join(output_dir, name), metrics=metrics)
+                metrics.count('legacy_rows_written', len(wide_df))
+                print(f"기존 wide 형식 {period} 재무 데이터가 {', '.join(paths.values())}에 저장되었습니다.")
+        else:
+            print("\n저장할 재무제표 데이터가 없습니다.")
 
 if __name__ == '__main__':
     # 1. 나스닥 기업 목록 가져오기
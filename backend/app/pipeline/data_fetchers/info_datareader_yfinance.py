@@ -2,7 +2,8 @@ import yfinance as yf
 import pandas as pd
 import os
 from tqdm import tqdm
-import time
+from provider_client import CircuitOpenError, get_client
+from writers import save_table
 
 def get_financial_info(ticker_symbol: str) -> dict:
     """
@@ -13,7 +14,8 @@ def get_financial_info(ticker_symbol: str) -> dict:
     """
     try:
         ticker = yf.Ticker(ticker_symbol)
-        info = ticker.info
+        # Yahoo 호출은 공유 클라이언트가 호출 속도를 제한합니다.
+        info = get_client('yahoo').call(lambda: ticker.info)
 
         # yfinance의 info 딕셔너리에서 필요한 지표를 추출합니다.
         # .get() 메서드를 사용하여 키가 없는 경우에도 오류 없이 None을 반환합니다.
@@ -31,6 +33,9 @@ def get_financial_info(ticker_symbol: str) -> dict:
         }
         return financial_metrics
 
+    except CircuitOpenError:
+        # 제공자 장애가 계속되면 나머지 종목을 건너뛰지 않고 수집을 중단합니다.
+        raise
     except Exception as e:
         print(f"[{ticker_symbol}] 정보를 가져오는 중 오류 발생: {e}")
         return None
@@ -49,11 +54,12 @@ def fetch_and_save_financial_info(ticker_list: list, output_filename: str = 'nas
 
     print(f"총 {len(ticker_list)}개 기업의 재무 정보를 수집합니다.")
     
-    for symbol in tqdm(ticker_list, desc="재무 정보 수집 중"):
+    progress = tqdm(ticker_list, desc="재무 정보 수집 중")
+    for symbol in progress:
         info = get_financial_info(symbol)
         if info:
             all_financial_info.append(info)
-        time.sleep(0.5) # To avoid getting blocked
+        progress.set_postfix(get_client('yahoo').readout())
 
     if not all_financial_info:
         print("수집된 재무 정보가 없습니다.")
@@ -66,10 +72,10 @@ def fetch_and_save_financial_info(ticker_list: list, output_filename: str = 'nas
     columns_order = ['Symbol', 'Name', 'EPS', 'PER', 'BPS', 'PBR', 'ROE', 'ROA', 'EBITDA', 'EV']
     df = df[columns_order]
 
-    # CSV 파일로 저장
-    file_path = os.path.join(output_dir, output_filename)
-    df.to_csv(file_path, index=False, encoding='utf-8')
-    print(f"\n모든 재무 정보가 {file_path}에 저장되었습니다.")
+    # 설정된 형식(CSV/Parquet)의 파일로 저장 (output_filename 의 확장자는 형식에 따라 정해집니다.)
+    base_path = os.path.splitext(os.path.join(output_dir, output_filename))[0]
+    paths = save_table(df, base_path)
+    print(f"\n모든 재무 정보가 {', '.join(paths.values())}에 저장되었습니다.")
 
 
 if __name__ == '__main__':
@@ -4,27 +4,33 @@ import os
 from tqdm import tqdm
 import time
 from companiesCollector import get_nasdaq_companies
+from provider_client import CircuitOpenError, get_client, provider_stats
+from stage_metrics import stage_run
+from writers import save_table
 
-def get_historical_financial_info(ticker_symbol: str, years: int) -> list:
+def get_historical_financial_info(ticker_symbol: str, years: int, metrics=None) -> list:
     """
     yfinance를 사용하여 특정 티커의 과거 N년간 주요 재무 지표를 가져옵니다.
     :param ticker_symbol: 주식 티커 심볼 (e.g., 'AAPL')
     :param years: 가져올 연도 수
+    :param metrics: 단계 지표(StageMetrics). 주어지면 네트워크/대기 구간 시간을 기록합니다.
     :return: 각 연도의 재무 지표 딕셔너리를 담은 리스트.
     """
+    # Yahoo 호출은 공유 클라이언트가 호출 속도를 제한합니다. (고정 sleep 대신)
+    yahoo = get_client('yahoo')
     try:
         ticker = yf.Ticker(ticker_symbol)
         
         # 연간 재무제표 데이터 가져오기
-        financials = ticker.financials
-        balance_sheet = ticker.balance_sheet
+        financials = yahoo.call(lambda: ticker.financials, metrics=metrics)
+        balance_sheet = yahoo.call(lambda: ticker.balance_sheet, metrics=metrics)
         
         if financials.empty or balance_sheet.empty:
             print(f"[{ticker_symbol}] 재무제표 데이터를 찾을 수 없습니다.")
             return []
             
         # 회사 이름 가져오기
-        info = ticker.info
+        info = yahoo.call(lambda: ticker.info, metrics=metrics)
         name = info.get('shortName')
         
         # 사용 가능한 연도만큼만 데이터를 가져오도록 제한
@@ -55,10 +61,10 @@ def get_historical_financial_info(ticker_symbol: str, years: int) -> list:
                 
                 # 해당 연도 마지막 거래일의 종가 가져오기
                 end_of_year_date = year_column.strftime('%Y-%m-%d')
-                hist = ticker.history(start=end_of_year_date, period="1d")
+                hist = yahoo.call(ticker.history, start=end_of_year_date, period="1d", metrics=metrics)
                 if hist.empty:
                     next_day = year_column + pd.Timedelta(days=1)
-                    hist = ticker.history(start=next_day.strftime('%Y-%m-%d'), period="1d")
+                    hist = yahoo.call(ticker.history, start=next_day.strftime('%Y-%m-%d'), period="1d", metrics=metrics)
                     
                 close_price = hist['Close'].iloc[0] if not hist.empty else None
                 
@@ -88,8 +94,9 @@ def get_historical_financial_info(ticker_symbol: str, years: int) -> list:
                     'EV': ev
                 }
                 all_yearly_metrics.append(yearly_metrics)
-                time.sleep(0.1)
                 
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 # 개별 연도 처리 중 오류가 발생해도 계속 진행
                 print(f"[{ticker_symbol}] {year_column.year}년도 데이터 처리 중 오류 발생: {e}")
@@ -97,51 +104,72 @@ def get_historical_financial_info(ticker_symbol: str, years: int) -> list:
                 
         return all_yearly_metrics
         
+    except CircuitOpenError:
+        # 제공자 장애가 계속되면 빈 결과로 넘기지 않고 단계를 실패로 끝냅니다.
+        raise
     except Exception as e:
         print(f"[{ticker_symbol}] 정보를 가져오는 중 오류 발생: {e}")
         return []
 
-def fetch_and_save_historical_info(companies_df: pd.DataFrame, years: int, output_filename: str = 'nasdaq_financial_info_n_yrs.csv'):
+def fetch_and_save_historical_info(companies_df: pd.DataFrame, years: int, output_filename: str = 'nasdaq_financial_info_n_yrs.csv',
+                                   output_dir: str = 'data'):
     """
     주어진 티커 목록에 대해 과거 N년간의 재무 정보를 수집하고 CSV 파일로 저장합니다.
 
     :param companies_df: 주식 티커와 산업 정보가 포함된 데이터프레임
     :param years: 수집할 연도 수
     :param output_filename: 저장할 CSV 파일 이름
+    :param output_dir: 저장 폴더 (샤드 실행 시 샤드별 폴더, 리포트는 <output_dir>/reports)
     """
-    output_dir = 'data'
     os.makedirs(output_dir, exist_ok=True)
     
     all_financial_info = []
 
     print(f"총 {len(companies_df)}개 기업의 {years}년간 재무 정보를 수집합니다.")
     
-    for index, row in tqdm(companies_df.iterrows(), total=companies_df.shape[0], desc="재무 정보 수집 중"):
-        symbol = row['Symbol']
-        industry = row.get('Industry')
-        industry_code = row.get('IndustryCode')
-        
-        info_list = get_historical_financial_info(symbol, years)
-        if info_list:
-            for info in info_list:
-                info['Industry'] = industry
-                info['IndustryCode'] = industry_code
-            all_financial_info.extend(info_list)
-        time.sleep(0.5)
+    with stage_run('fetch_and_save_historical_info', reports_dir=os.path.join(output_dir, 'reports'),
+                   symbols_total=len(companies_df), years=years) as metrics:
+        progress = tqdm(companies_df.iterrows(), total=companies_df.shape[0], desc="재무 정보 수집 중")
+        for index, row in progress:
+            symbol = row['Symbol']
+            industry = row.get('Industry')
+            industry_code = row.get('IndustryCode')
+            
+            # get_historical_financial_info 내부에서 네트워크/대기 시간을 따로 기록하므로
+            # 전체 소요 시간에서 이를 뺀 나머지를 가공(parse) 시간으로 봅니다.
+            tracked_before = metrics.timers.get('network', 0.0) + metrics.timers.get('sleep', 0.0)
+            start = time.perf_counter()
+            info_list = get_historical_financial_info(symbol, years, metrics=metrics)
+            tracked = metrics.timers.get('network', 0.0) + metrics.timers.get('sleep', 0.0) - tracked_before
+            metrics.add_time('parse', time.perf_counter() - start - tracked)
+            if info_list:
+                for info in info_list:
+                    info['Industry'] = industry
+                    info['IndustryCode'] = industry_code
+                all_financial_info.extend(info_list)
+                metrics.count('symbols_succeeded')
+            else:
+                # 오류는 get_historical_financial_info 내부에서 처리되어 빈 리스트로 반환됩니다.
+                metrics.count('symbols_empty')
+            # 진행률 표시줄에 실시간 호출 속도/오류율 표시
+            progress.set_postfix(get_client('yahoo').readout())
+        metrics.details['providers'] = provider_stats()
 
-    if not all_financial_info:
-        print("수집된 재무 정보가 없습니다.")
-        return
+        if not all_financial_info:
+            print("수집된 재무 정보가 없습니다.")
+            return
 
-    df = pd.DataFrame(all_financial_info)
-    
-    # 컬럼 순서 지정
-    columns_order = ['Date', 'Symbol', 'Name', 'EPS', 'PER', 'BPS', 'PBR', 'ROE', 'ROA', 'EBITDA', 'EV']
-    df = df.reindex(columns=columns_order)
+        df = pd.DataFrame(all_financial_info)
+        
+        # 컬럼 순서 지정
+        columns_order = ['Date', 'Symbol', 'Name', 'EPS', 'PER', 'BPS', 'PBR', 'ROE', 'ROA', 'EBITDA', 'EV']
+        df = df.reindex(columns=columns_order)
 
-    file_path = os.path.join(output_dir, output_filename)
-    df.to_csv(file_path, index=False, encoding='utf-8')
-    print(f"\n모든 재무 정보가 {file_path}에 저장되었습니다.")
+        # output_filename 의 확장자는 저장 형식(CSV/Parquet)에 따라 정해집니다.
+        base_path = os.path.splitext(os.path.join(output_dir, output_filename))[0]
+        paths = save_table(df, base_path, metrics=metrics)
+        metrics.count('rows_written', len(df))
+        print(f"\n모든 재무 정보가 {', '.join(paths.values())}에 저장되었습니다.")
 
 
 if __name__ == '__main__':
@@ -7,6 +7,9 @@ from datetime import datetime, timedelta
 import configparser
 
 from companiesCollector import get_nasdaq_companies
+from provider_client import CircuitOpenError, get_client, provider_stats
+from stage_metrics import stage_run
+from writers import save_table
 
 def load_api_key(section="news_api",config_path='pipeline.conf'):
     """
@@ -20,12 +23,14 @@ def load_api_key(section="news_api",config_path='pipeline.conf'):
         print(f"API 키를 불러오는 중 오류 발생: {e}")
         return None
 
-def get_news_from_api(query, start_date, end_date):
+def get_news_from_api(query, start_date, end_date, metrics=None):
     """
     NewsAPI를 사용하여 지정된 검색어와 기간의 뉴스를 가져옵니다.
+    호출 속도는 공유 NewsAPI 클라이언트(provider_client)가 제한합니다.
     :param query: 검색어 (기업명)
     :param start_date: 검색 시작 날짜
     :param end_date: 검색 종료 날짜
+    :param metrics: 단계 지표(StageMetrics). 주어지면 네트워크/대기 구간 시간을 기록합니다.
     :return: 뉴스 기사 리스트 (성공 시), None (오류 발생 시)
     """
     try:
@@ -37,7 +42,9 @@ def get_news_from_api(query, start_date, end_date):
 
         NEWS_API_KEY = load_api_key()
         newsapi = NewsApiClient(api_key=NEWS_API_KEY)
-        all_articles = newsapi.get_everything(
+        all_articles = get_client('newsapi').call(
+            newsapi.get_everything,
+            metrics=metrics,
             q=query,
             from_param=start_date.strftime('%Y-%m-%d'),
             to=end_date.strftime('%Y-%m-%d'),
@@ -45,6 +52,9 @@ def get_news_from_api(query, start_date, end_date):
             sort_by='relevancy'
         )
         return all_articles.get('articles', [])
+    except CircuitOpenError:
+        # 제공자 장애가 계속되면 None(종목 실패)으로 넘기지 않고 단계를 실패로 끝냅니다.
+        raise
     except Exception as e:
         print(f"NewsAPI 요청 중 오류 발생: {e}")
         return None
@@ -71,11 +81,11 @@ def process_and_save_news(symbol, name, articles):
     df_news = pd.DataFrame(news_list)
     return df_news
 
-def fetch_and_save_news_urls(stock_list_df, days=30):
+def fetch_and_save_news_urls(stock_list_df, days=30, output_dir='data'):
     """
     모든 기업에 대한 뉴스 URL을 수집하고 하나의 CSV로 저장합니다.
+    output_dir 는 저장 폴더입니다. (샤드 실행 시 샤드별 폴더, 리포트는 <output_dir>/reports)
     """
-    output_dir = 'data'
     os.makedirs(output_dir, exist_ok=True)
     
     end_date = datetime.now()
@@ -86,28 +96,42 @@ def fetch_and_save_news_urls(stock_list_df, days=30):
 
     print(f"총 {len(stock_list_df)}개 나스닥 기업의 뉴스를 수집합니다. 기간: {days}일")
 
-    for _, row in tqdm(stock_list_df.iterrows(), total=len(stock_list_df), desc="뉴스 URL 수집 중"):
-        symbol = row['Symbol']
-        name = row['Name']
-        
-        articles = get_news_from_api(name, start_date, end_date)
-        
-        if articles is not None:
-            df_news = process_and_save_news(symbol, name, articles)
-            if df_news is not None:
-                # 개별 기업의 뉴스 데이터를 전체 데이터프레임에 추가합니다.
-                all_news_df = pd.concat([all_news_df, df_news], ignore_index=True)
-        
-        time.sleep(1) # API 호출 빈도 제어
+    with stage_run('fetch_and_save_news_urls', reports_dir=os.path.join(output_dir, 'reports'),
+                   symbols_total=len(stock_list_df), days=days) as metrics:
+        progress = tqdm(stock_list_df.iterrows(), total=len(stock_list_df), desc="뉴스 URL 수집 중")
+        for _, row in progress:
+            symbol = row['Symbol']
+            name = row['Name']
+            
+            articles = get_news_from_api(name, start_date, end_date, metrics=metrics)
+            
+            if articles is None:
+                # API 요청 오류는 get_news_from_api 내부에서 출력하고 None 을 반환합니다.
+                metrics.count('symbols_failed')
+            else:
+                with metrics.timer('parse'):
+                    df_news = process_and_save_news(symbol, name, articles)
+                    if df_news is not None:
+                        # 개별 기업의 뉴스 데이터를 전체 데이터프레임에 추가합니다.
+                        all_news_df = pd.concat([all_news_df, df_news], ignore_index=True)
+                if df_news is None:
+                    metrics.count('symbols_empty')
+                else:
+                    metrics.count('symbols_succeeded')
+                    metrics.count('articles', len(df_news))
+            
+            # 진행률 표시줄에 실시간 호출 속도/오류율 표시
+            progress.set_postfix(get_client('newsapi').readout())
+        metrics.details['providers'] = provider_stats()
 
-    # 모든 데이터 수집 후 하나의 CSV 파일로 저장
-    if not all_news_df.empty:
-        file_path = os.path.join(output_dir, 'nasdaq_news_all.csv')
-        all_news_df.index.name = 'id'
-        all_news_df.to_csv(file_path, index=True, encoding='utf-8')
-        print(f"\n모든 나스닥 기업의 뉴스 URL이 {file_path}에 성공적으로 저장되었습니다.")
-    else:
-        print("\n저장할 뉴스 데이터가 없습니다.")
+        # 모든 데이터 수집 후 설정된 형식(CSV/Parquet)의 파일로 저장
+        if not all_news_df.empty:
+            all_news_df.index.name = 'id'
+            paths = save_table(all_news_df, os.path.join(output_dir, 'nasdaq_news_all'), index=True, metrics=metrics)
+            metrics.count('rows_written', len(all_news_df))
+            print(f"\n모든 나스닥 기업의 뉴스 URL이 {', '.join(paths.values())}에 성공적으로 저장되었습니다.")
+        else:
+            print("\n저장할 뉴스 데이터가 없습니다.")
 
 if __name__ == '__main__':
     print("나스닥 기업 목록을 가져오는 중...")
@@ -0,0 +1,403 @@
+"""
+데이터 제공자(provider) 호출 관리 모듈
+
+Yahoo(yfinance), FinanceDataReader, NewsAPI 처럼 호출 제한이 있는 제공자마다 ProviderClient 를 하나씩 두고,
+같은 프로세스의 모든 수집기가 `get_client(이름)` 으로 같은 클라이언트를 공유합니다.
+(수집기를 스레드로 동시에 실행해도 제공자별 호출 속도가 합쳐서 제한됩니다.)
+
+- 토큰 버킷: 초당 rate 개의 토큰이 쌓이고(최대 burst 개) 호출마다 하나씩 사용합니다.
+  각 수집기에 있던 고정 sleep 대신 토큰이 생길 때까지만 기다립니다.
+- 적응형 속도 조절(AIMD): 호출이 성공하면 rate 를 조금씩(increase) max_rate 까지 올리고,
+  429(Too Many Requests)를 받으면 rate 를 절반으로 줄인 뒤 지수 백오프 후 다시 시도합니다.
+- 서킷 브레이커: 제공자 장애(429, 5xx, 연결/타임아웃 오류)가 연속 failure_threshold 번 나면 reset_timeout 초 동안 호출을 막고,
+  그 뒤 한 번 시험 호출(half-open)하여 성공하면 다시 엽니다. 없는 종목/상장 폐지 같은 종목별 오류는 장애로 세지 않습니다.
+  호출은 서킷이 열려 있는 동안 기다렸다가 다시 시도하며, 시험 호출까지 연속 max_trips 번 실패하면
+  CircuitOpenError 를 발생시킵니다. 수집기는 이 예외를 종목별로 건너뛰지 않고 그대로 올려 단계를 실패로 끝냅니다.
+- 실시간 지표: stats() / readout() 으로 최근 window 초의 초당 요청 수와 오류율을 제공합니다.
+  수집기는 tqdm 진행률 표시줄의 postfix 와 단계 리포트(details['providers'])에 이 값을 남깁니다.
+
+제공자별 기본값은 PROVIDER_DEFAULTS 에 있으며 환경 변수로 바꿀 수 있습니다.
+    PROVIDER_YAHOO_RATE=2 PROVIDER_YAHOO_MAX_RATE=8 python datareader_yfinance.py
+
+여러 프로세스가 함께 쓰는 호출 제한:
+    토큰 버킷은 기본적으로 프로세스마다 따로 있으므로, 수집기 스크립트나 샤드 워커를 여러 프로세스로 동시에 실행하면
+    프로세스마다 전체 호출 한도를 쓰게 됩니다. PROVIDER_QUOTA_DB 에 SQLite 파일 경로를 지정하면
+    버킷(토큰 수와 AIMD 로 조절한 rate)을 그 파일에 두고 모든 프로세스가 공유합니다. (SharedTokenBucket)
+    한도를 워커 수로 미리 나누는 방식과 달리 워커 수가 바뀌거나 일부 워커가 먼저 끝나도 한도를 그대로 다 쓸 수 있습니다.
+    샤드 워커(sharding.py)는 따로 지정하지 않으면 코디네이터 파일을 사용합니다.
+    서킷 브레이커와 호출 지표는 계속 프로세스별입니다.
+    PROVIDER_QUOTA_DB=data/shards/coordinator.db python datareader_fdr.py
+
+사용 예:
+    yahoo = get_client('yahoo')
+    info = yahoo.call(lambda: ticker.info, metrics=metrics)
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing, nullcontext
+
+# 상태
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# 제공자별 기본 설정 (rate/max_rate: 초당 요청 수)
+PROVIDER_DEFAULTS = {
+    'yahoo': {'rate': 2.0, 'max_rate': 8.0, 'burst': 4},
+    'fdr': {'rate': 1.0, 'max_rate': 4.0, 'burst': 2},
+    'newsapi': {'rate': 1.0, 'max_rate': 1.0, 'burst': 1},
+}
+
+
+class CircuitOpenError(Exception):
+    """제공자 장애가 계속되어 서킷 브레이커가 max_trips 번 연속 열렸을 때 발생합니다. (단계를 중단해야 합니다)"""
+
+
+class RateLimitError(Exception):
+    """재시도 후에도 429 응답이 계속될 때 발생합니다."""
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """예외가 호출 제한(429) 응답인지 확인합니다. (requests 응답 코드, yfinance/NewsAPI 오류 메시지)"""
+    response = getattr(error, 'response', None)
+    if getattr(response, 'status_code', None) == 429:
+        return True
+    if type(error).__name__ == 'YFRateLimitError':
+        return True
+    message = str(error).lower()
+    return '429' in message or 'too many requests' in message or 'rate limit' in message or 'ratelimited' in message
+
+
+def is_provider_failure(error: Exception) -> bool:
+    """
+    예외가 제공자 장애(429, 5xx 응답, 연결/타임아웃 오류)인지 확인합니다. 서킷 브레이커는 이 경우만 실패로 셉니다.
+    없는 종목, 상장 폐지, 4xx 응답처럼 요청 자체의 문제는 제공자가 정상 응답한 것이므로 장애가 아닙니다.
+    """
+    if is_rate_limited(error):
+        return True
+    # requests.HTTPError 는 OSError 의 하위 클래스이므로 응답 코드를 먼저 확인합니다.
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status >= 500
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # requests / curl_cffi / urllib3 의 연결, 타임아웃 예외 (ConnectionError, ReadTimeout, ConnectTimeoutError 등)
+    return any('Timeout' in cls.__name__ or 'ConnectionError' in cls.__name__ for cls in type(error).__mro__)
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷. rate 는 실행 중에 바꿀 수 있습니다."""
+
+    def __init__(self, rate: float, burst: int, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """토큰 하나를 사용합니다. 토큰이 없으면 생길 때까지 기다리고, 기다린 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class SharedTokenBucket:
+    """
+    SQLite 파일 하나로 여러 프로세스(노드)가 공유하는 토큰 버킷입니다. TokenBucket 과 같은 방식으로 사용합니다.
+    제공자별 한 행에 (rate, 남은 토큰, 마지막 갱신 시각) 을 두고, 토큰을 쓸 때마다 쓰기 잠금(BEGIN IMMEDIATE) 안에서 갱신합니다.
+    프로세스마다 monotonic 시계가 다르므로 벽시계(time.time)를 사용합니다.
+    """
+
+    def __init__(self, path: str, name: str, rate: float, burst: int, clock=time.time, sleep=time.sleep):
+        self.path = path
+        self.name = name
+        self.capacity = burst
+        self._clock = clock
+        self._sleep = sleep
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS provider_buckets (
+                    name TEXT PRIMARY KEY,
+                    rate REAL NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            # 먼저 시작한 프로세스의 상태를 그대로 이어 씁니다.
+            conn.execute('INSERT OR IGNORE INTO provider_buckets VALUES (?, ?, ?, ?)', (name, rate, float(burst), clock()))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @property
+    def rate(self) -> float:
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT rate FROM provider_buckets WHERE name = ?', (self.name,)).fetchone()[0]
+
+    @rate.setter
+    def rate(self, value: float):
+        with closing(self._connect()) as conn:
+            conn.execute('UPDATE provider_buckets SET rate = ? WHERE name = ?', (value, self.name))
+
+    def acquire(self) -> float:
+        """토큰 하나를 사용합니다. 토큰이 없으면 생길 때까지 기다리고, 기다린 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with closing(self._connect()) as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                rate, tokens, updated = conn.execute(
+                    'SELECT rate, tokens, updated FROM provider_buckets WHERE name = ?', (self.name,)).fetchone()
+                now = self._clock()
+                tokens = min(self.capacity, tokens + max(0.0, now - updated) * rate)
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+                conn.execute('UPDATE provider_buckets SET tokens = ?, updated = ? WHERE name = ?',
+                             (tokens - 1 if tokens >= 1 else tokens, now, self.name))
+                conn.execute('COMMIT')
+            if not wait:
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        # 성공 없이 연속으로 열린 횟수 (시험 호출 실패로 다시 열린 경우 포함)
+        self.trips = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """호출해도 되는지 여부. 열린 뒤 reset_timeout 이 지나면 시험 호출(half-open) 하나를 허용합니다."""
+        with self._lock:
+            if self.state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                return True
+            return self.state == CLOSED
+
+    def retry_after(self) -> float:
+        """열린 상태에서 시험 호출이 가능해질 때까지 남은 시간(초)"""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.failures, self.trips = CLOSED, 0, 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state, self._opened_at = OPEN, self._clock()
+                self.trips += 1
+
+
+class ProviderClient:
+    """
+    제공자 하나에 대한 호출 속도 제한, 429 백오프, 서킷 브레이커, 호출 지표를 담당합니다.
+    bucket 을 주면(SharedTokenBucket 등) rate/burst 대신 그 버킷으로 호출 속도를 제한합니다.
+    """
+
+    def __init__(self, name: str, rate: float = 1.0, max_rate: float = None, burst: int = 1,
+                 increase: float = 0.05, min_rate: float = 0.1, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 failure_threshold: int = 5, reset_timeout: float = 60.0, max_trips: int = 3,
+                 window: float = 60.0, clock=time.monotonic, sleep=time.sleep, bucket=None):
+        self.name = name
+        self.max_rate = max_rate or rate
+        self.increase = increase
+        self.min_rate = min_rate
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_trips = max_trips
+        self.window = window
+        self.bucket = bucket or TokenBucket(rate, burst, clock=clock, sleep=sleep)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock=clock)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # 최근 호출 기록: (시각, 성공 여부)
+        self._events: deque = deque()
+        self.totals = {'requests': 0, 'errors': 0, 'rate_limited': 0, 'rejected': 0}
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def _record(self, ok: bool, rate_limited: bool = False):
+        now = self._clock()
+        with self._lock:
+            self._events.append((now, ok))
+            while self._events and now - self._events[0][0] > self.window:
+                self._events.popleft()
+            self.totals['requests'] += 1
+            if not ok:
+                self.totals['errors'] += 1
+            if rate_limited:
+                self.totals['rate_limited'] += 1
+                # 429: 속도를 절반으로 (multiplicative decrease)
+                self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+            elif ok:
+                # 성공: 속도를 조금씩 올림 (additive increase)
+                self.bucket.rate = min(self.max_rate, self.bucket.rate + self.increase)
+
+    def _wait(self, seconds: float, metrics=None):
+        if metrics is not None:
+            with metrics.timer('sleep'):
+                self._sleep(seconds)
+        else:
+            self._sleep(seconds)
+
+    def _wait_for_circuit(self, metrics=None):
+        """
+        서킷이 열려 있으면 시험 호출이 가능해질 때까지 기다립니다.
+        성공 없이 max_trips 번 연속 열렸으면 기다리지 않고 CircuitOpenError 를 발생시킵니다.
+        """
+        while not self.breaker.allow():
+            if self.breaker.trips >= self.max_trips:
+                with self._lock:
+                    self.totals['rejected'] += 1
+                raise CircuitOpenError(
+                    f"'{self.name}' 제공자 장애가 계속되어 호출을 중단합니다. "
+                    f"(서킷 {self.breaker.trips}번 연속 열림, 연속 실패 {self.breaker.failures}번)")
+            # 다른 스레드가 시험 호출 중(half-open)이면 토큰 하나 간격만큼 기다렸다가 다시 확인합니다.
+            wait = self.breaker.retry_after() or 1.0 / self.rate
+            if self.breaker.state == OPEN:
+                print(f"경고: '{self.name}' 제공자 장애로 서킷이 열렸습니다 - {wait:.1f}초 후 다시 시도합니다.")
+            if metrics is not None:
+                metrics.count(f'{self.name}_circuit_waits')
+            self._wait(wait, metrics)
+
+    def call(self, func, *args, metrics=None, **kwargs):
+        """
+        func(*args, **kwargs) 를 호출 제한에 맞춰 실행합니다.
+        429 이면 백오프 후 최대 max_retries 번 다시 시도하고, 다른 예외는 그대로 발생시킵니다.
+        서킷이 열려 있으면 reset_timeout 이 지날 때까지 기다렸다가 시험 호출하며,
+        제공자 장애가 계속되면 CircuitOpenError 를 발생시킵니다.
+        metrics(StageMetrics)가 주어지면 토큰/백오프 대기 시간은 'sleep', 호출 시간은 'network' 구간에 기록합니다.
+        """
+        network = (lambda: metrics.timer('network')) if metrics is not None else nullcontext
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_circuit(metrics)
+
+            waited = self.bucket.acquire()
+            if metrics is not None and waited:
+                metrics.add_time('sleep', waited)
+
+            try:
+                with network():
+                    result = func(*args, **kwargs)
+            except Exception as e:
+                rate_limited = is_rate_limited(e)
+                self._record(ok=False, rate_limited=rate_limited)
+                if not is_provider_failure(e):
+                    # 종목별 오류: 제공자는 정상 응답했으므로 서킷 브레이커에는 성공으로 기록합니다.
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if not rate_limited:
+                    raise
+                if attempt == self.max_retries:
+                    raise RateLimitError(f"'{self.name}' 제공자 호출 제한(429)이 계속됩니다: {e}") from e
+                # 지수 백오프 + 지터
+                backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt) * (0.5 + random.random() / 2)
+                print(f"경고: '{self.name}' 호출 제한(429) - {backoff:.1f}초 후 다시 시도합니다. (속도 {self.rate:.2f}/s)")
+                if metrics is not None:
+                    metrics.count(f'{self.name}_rate_limited')
+                self._wait(backoff, metrics)
+                continue
+
+            self._record(ok=True)
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> dict:
+        """최근 window 초의 초당 요청 수, 오류율과 누적 호출 수"""
+        now = self._clock()
+        with self._lock:
+            while self._events and now - self._events[0][0] > self.window:
+                self._events.popleft()
+            events = list(self._events)
+            totals = dict(self.totals)
+        errors = sum(1 for _, ok in events if not ok)
+        span = min(self.window, max(now - events[0][0], 1.0)) if events else self.window
+        return {
+            'provider': self.name,
+            'rate_limit': round(self.rate, 3),
+            'requests_per_sec': round(len(events) / span, 3),
+            'error_rate': round(errors / len(events), 3) if events else 0.0,
+            'circuit': self.breaker.state,
+            **totals,
+        }
+
+    def readout(self) -> dict:
+        """tqdm postfix 용 짧은 지표"""
+        stats = self.stats()
+        return {'rps': stats['requests_per_sec'], 'err': stats['error_rate'], 'limit': stats['rate_limit']}
+
+
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def get_client(name: str) -> ProviderClient:
+    """
+    제공자 이름별로 하나의 ProviderClient 를 만들어 공유합니다.
+    PROVIDER_QUOTA_DB 가 지정되어 있으면 다른 프로세스와 그 파일의 토큰 버킷을 공유합니다.
+    """
+    with _clients_lock:
+        if name not in _clients:
+            defaults = PROVIDER_DEFAULTS.get(name, {'rate': 1.0, 'max_rate': 1.0, 'burst': 1})
+            prefix = f"PROVIDER_{name.upper()}_"
+            rate = _env_float(prefix + 'RATE', defaults['rate'])
+            burst = int(_env_float(prefix + 'BURST', defaults['burst']))
+            quota_db = os.getenv('PROVIDER_QUOTA_DB')
+            _clients[name] = ProviderClient(
+                name,
+                rate=rate,
+                max_rate=_env_float(prefix + 'MAX_RATE', defaults['max_rate']),
+                burst=burst,
+                bucket=SharedTokenBucket(quota_db, name, rate, burst) if quota_db else None,
+            )
+        return _clients[name]
+
+
+def provider_stats() -> dict:
+    """지금까지 사용한 모든 제공자의 지표 (단계 리포트용)"""
+    with _clients_lock:
+        clients = list(_clients.values())
+    return {client.name: client.stats() for client in clients}
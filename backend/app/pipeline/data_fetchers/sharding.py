@@ -0,0 +1,374 @@
+"""
+종목 샤드 단위 분산 수집 모듈
+
+유니버스(get_nasdaq_companies)를 종목 코드의 안정적인 해시(sha1)로 K 개 샤드로 나누고,
+여러 노드(또는 테스트용 로컬 프로세스)의 워커가 SQLite 코디네이터에서 샤드를 임대(lease)하여 수집합니다.
+
+- 코디네이터: 모든 워커가 접근할 수 있는 경로의 SQLite 파일 (기본값 data/shards/coordinator.db).
+  실행 ID(run_id)별로 샤드 상태(pending / leased / done / failed), 임대한 워커, 임대 만료 시각, 시도 횟수를 기록합니다.
+  샤드를 임대한 워커는 작업하는 동안 주기적으로 임대를 연장(heartbeat)하며,
+  워커가 죽어 임대가 만료된 샤드는 다른 워커가 다시 가져갑니다. (max_attempts 번 실패하면 failed)
+  제공자 장애로 서킷 브레이커가 열리면(CircuitOpenError) 샤드를 시도 횟수 차감 없이 반납하고 워커를 멈춥니다.
+- 유니버스: 처음 시작한 워커의 기업 목록을 실행 ID 별로 코디네이터에 저장하고, 모든 노드가 같은 목록으로 샤드를 나눕니다.
+  (노드마다 유니버스 스냅샷이 달라도 샤드 구성이 어긋나지 않습니다)
+- 출력: 각 샤드는 data/shards/<run_id>/<stage>/shard=<k>/ 폴더에 자기 파일(과 리포트)을 씁니다.
+- 병합: merge_shards 가 샤드 폴더의 같은 이름 파일들을 합쳐 최종 폴더(data/)에 저장합니다.
+
+사용 예 (노드마다 같은 실행 ID 를 --run-id 또는 PIPELINE_RUN_ID 로 지정하여 실행):
+    python sharding.py worker --stage prices --shards 16 --worker-id node-1 --run-id 20240101-daily
+    python sharding.py merge --stage prices --run-id 20240101-daily
+"""
+import argparse
+import glob
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from io import StringIO
+from typing import Optional
+
+import pandas as pd
+
+from provider_client import CircuitOpenError
+from stage_metrics import RUN_ID
+from writers import save_table
+
+SHARDS_DIR = os.path.join('data', 'shards')
+COORDINATOR_PATH = os.path.join(SHARDS_DIR, 'coordinator.db')
+
+# 샤드 상태
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+# 병합할 때 문자열 그대로 읽어야 하는 식별 컬럼 ('NA' 종목 코드가 빈 값으로 바뀌지 않도록)
+ID_COLUMNS = ['Symbol', 'Name']
+
+
+def shard_of(symbol: str, num_shards: int) -> int:
+    """종목 코드의 샤드 번호. 프로세스/노드가 달라도 항상 같은 값입니다. (내장 hash() 는 프로세스마다 다름)"""
+    digest = hashlib.sha1(str(symbol).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % num_shards
+
+
+def split_universe(companies_df: pd.DataFrame, num_shards: int) -> dict:
+    """유니버스를 {샤드 번호: 기업 목록 DataFrame} 으로 나눕니다. (빈 샤드 포함)"""
+    shards = companies_df['Symbol'].map(lambda symbol: shard_of(symbol, num_shards))
+    return {shard: companies_df[shards == shard] for shard in range(num_shards)}
+
+
+def shard_output_dir(run_id: str, stage: str, shard: int, root: str = None) -> str:
+    return os.path.join(root or SHARDS_DIR, run_id, stage, f'shard={shard}')
+
+
+class ShardCoordinator:
+    """SQLite 기반 샤드 임대 코디네이터"""
+
+    def __init__(self, db_path: str = None, run_id: str = None, stage: str = 'prices',
+                 lease_seconds: float = 300.0, max_attempts: int = 3, clock=time.time):
+        self.db_path = db_path or COORDINATOR_PATH
+        self.run_id = run_id or RUN_ID
+        self.stage = stage
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._clock = clock
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shards (
+                    run_id TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    shard INTEGER NOT NULL,
+                    num_shards INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    output_dir TEXT,
+                    error TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (run_id, stage, shard)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS universes (
+                    run_id TEXT PRIMARY KEY,
+                    companies TEXT NOT NULL,
+                    created_at REAL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: BEGIN IMMEDIATE 로 직접 쓰기 잠금을 잡습니다.
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def init_run(self, num_shards: int):
+        """실행의 샤드 목록을 만듭니다. 여러 노드가 동시에 호출해도 한 번만 만들어집니다."""
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            existing = conn.execute(
+                'SELECT DISTINCT num_shards FROM shards WHERE run_id = ? AND stage = ?', (self.run_id, self.stage)
+            ).fetchall()
+            if existing and existing[0][0] != num_shards:
+                conn.execute('ROLLBACK')
+                raise ValueError(f"실행 {self.run_id} 은 이미 샤드 {existing[0][0]}개로 시작되었습니다. (요청: {num_shards})")
+            conn.executemany(
+                'INSERT OR IGNORE INTO shards (run_id, stage, shard, num_shards, status, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                [(self.run_id, self.stage, shard, num_shards, PENDING, self._clock()) for shard in range(num_shards)],
+            )
+            conn.execute('COMMIT')
+
+    def pin_universe(self, companies_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        실행의 유니버스(기업 목록)를 고정합니다. 처음 호출한 노드의 목록을 저장하고, 저장된 목록을 반환합니다.
+        빈 목록(유니버스 수집 실패)은 저장하지 않습니다.
+        """
+        if not companies_df.empty:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    'INSERT OR IGNORE INTO universes (run_id, companies, created_at) VALUES (?, ?, ?)',
+                    (self.run_id, companies_df.to_json(orient='split', index=False), self._clock()),
+                )
+        pinned = self.universe()
+        return companies_df if pinned is None else pinned
+
+    def universe(self) -> Optional[pd.DataFrame]:
+        """고정된 유니버스. 아직 없으면 None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT companies FROM universes WHERE run_id = ?', (self.run_id,)).fetchone()
+        # dtype=False: 'NA' 같은 종목 코드를 포함해 저장한 값을 그대로 읽습니다.
+        return None if row is None else pd.read_json(StringIO(row[0]), orient='split', dtype=False)
+
+    def claim(self, worker_id: str):
+        """
+        처리할 샤드 하나를 임대하고 샤드 번호를 반환합니다. 남은 샤드가 없으면 None.
+        대기 중인 샤드 또는 임대가 만료된 샤드(워커가 죽은 경우)를 가져옵니다.
+        """
+        now = self._clock()
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            # 시도 횟수를 다 쓴 만료 샤드는 실패로 처리합니다.
+            conn.execute(
+                'UPDATE shards SET status = ?, error = ?, updated_at = ? '
+                'WHERE run_id = ? AND stage = ? AND status = ? AND lease_expires < ? AND attempts >= ?',
+                (FAILED, 'lease expired', now, self.run_id, self.stage, LEASED, now, self.max_attempts),
+            )
+            row = conn.execute(
+                'SELECT shard FROM shards WHERE run_id = ? AND stage = ? '
+                'AND (status = ? OR (status = ? AND lease_expires < ?)) ORDER BY attempts, shard LIMIT 1',
+                (self.run_id, self.stage, PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            conn.execute(
+                'UPDATE shards SET status = ?, owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? '
+                'WHERE run_id = ? AND stage = ? AND shard = ?',
+                (LEASED, worker_id, now + self.lease_seconds, now, self.run_id, self.stage, row[0]),
+            )
+            conn.execute('COMMIT')
+            return row[0]
+
+    def _update_owned(self, worker_id: str, shard: int, sql: str, params: tuple) -> bool:
+        """worker_id 가 아직 임대 중인 샤드만 갱신합니다. (임대를 빼앗긴 워커의 늦은 갱신 방지)"""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                f'UPDATE shards SET {sql}, updated_at = ? WHERE run_id = ? AND stage = ? AND shard = ? AND owner = ? AND status = ?',
+                params + (self._clock(), self.run_id, self.stage, shard, worker_id, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, worker_id: str, shard: int) -> bool:
+        """임대를 연장합니다. 임대를 잃었으면 False."""
+        return self._update_owned(worker_id, shard, 'lease_expires = ?', (self._clock() + self.lease_seconds,))
+
+    def complete(self, worker_id: str, shard: int, output_dir: str) -> bool:
+        return self._update_owned(worker_id, shard, 'status = ?, output_dir = ?, error = NULL', (DONE, output_dir))
+
+    def fail(self, worker_id: str, shard: int, error: str) -> bool:
+        """작업 실패. 시도 횟수가 남아 있으면 다시 대기 상태로 돌립니다."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT attempts FROM shards WHERE run_id = ? AND stage = ? AND shard = ?', (self.run_id, self.stage, shard)
+            ).fetchone()
+        status = FAILED if row and row[0] >= self.max_attempts else PENDING
+        return self._update_owned(worker_id, shard, 'status = ?, owner = NULL, lease_expires = NULL, error = ?', (status, error))
+
+    def release(self, worker_id: str, shard: int, error: str) -> bool:
+        """샤드를 시도 횟수를 차감하지 않고 대기 상태로 돌려놓습니다. (작업이 아니라 제공자 장애로 멈춘 경우)"""
+        return self._update_owned(
+            worker_id, shard, 'status = ?, owner = NULL, lease_expires = NULL, attempts = attempts - 1, error = ?',
+            (PENDING, error),
+        )
+
+    def status(self) -> dict:
+        """샤드 상태별 개수"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT status, COUNT(*) FROM shards WHERE run_id = ? AND stage = ? GROUP BY status', (self.run_id, self.stage)
+            ).fetchall()
+        return dict(rows)
+
+    def done_outputs(self) -> list:
+        """완료된 샤드의 출력 폴더 목록 (샤드 번호 순)"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT output_dir FROM shards WHERE run_id = ? AND stage = ? AND status = ? ORDER BY shard',
+                (self.run_id, self.stage, DONE),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+class _Heartbeat:
+    """샤드 작업 동안 백그라운드에서 임대를 연장합니다."""
+
+    def __init__(self, coordinator: ShardCoordinator, worker_id: str, shard: int):
+        self.coordinator, self.worker_id, self.shard = coordinator, worker_id, shard
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        interval = max(self.coordinator.lease_seconds / 3, 0.01)
+        while not self._stop.wait(interval):
+            if not self.coordinator.heartbeat(self.worker_id, self.shard):
+                print(f"경고: 샤드 {self.shard} 의 임대를 잃었습니다. (다른 워커가 다시 가져갔습니다.)")
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def run_worker(stage_func, companies_df: pd.DataFrame, coordinator: ShardCoordinator, num_shards: int,
+               worker_id: str = None, output_root: str = None) -> list:
+    """
+    샤드를 더 가져올 수 없을 때까지 임대 -> stage_func(샤드 기업 목록, output_dir=샤드 폴더) -> 완료 를 반복합니다.
+    샤드는 코디네이터에 고정된 유니버스로 나누며(없으면 companies_df 를 고정), 처리한 샤드 번호 목록을 반환합니다.
+    서킷 브레이커가 열려 단계가 중단되면(CircuitOpenError) 샤드를 반납하고 더 가져오지 않습니다.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    coordinator.init_run(num_shards)
+    shards = split_universe(coordinator.pin_universe(companies_df), num_shards)
+    processed = []
+
+    while True:
+        shard = coordinator.claim(worker_id)
+        if shard is None:
+            break
+        output_dir = shard_output_dir(coordinator.run_id, coordinator.stage, shard, output_root)
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"[{worker_id}] 샤드 {shard}/{num_shards} ({len(shards[shard])}개 종목) 처리 시작")
+        try:
+            with _Heartbeat(coordinator, worker_id, shard):
+                if not shards[shard].empty:
+                    stage_func(shards[shard], output_dir=output_dir)
+        except CircuitOpenError as e:
+            # 제공자 장애는 샤드의 문제가 아니므로 시도 횟수를 쓰지 않습니다. 다른 샤드도 같은 제공자를 쓰므로 멈춥니다.
+            print(f"[{worker_id}] 제공자 장애로 샤드 {shard} 를 반납하고 중단합니다: {e}")
+            coordinator.release(worker_id, shard, repr(e))
+            break
+        except Exception as e:
+            print(f"[{worker_id}] 샤드 {shard} 처리 중 오류 발생: {e}")
+            coordinator.fail(worker_id, shard, repr(e))
+            continue
+        if coordinator.complete(worker_id, shard, output_dir):
+            processed.append(shard)
+    return processed
+
+
+def _read_partition(path: str) -> pd.DataFrame:
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    df = pd.read_csv(path)
+    # 식별 컬럼은 결측값 변환 없이 문자열로 다시 읽습니다. (기본 설정은 'NA', 'NULL' 같은 종목 코드를 NaN 으로 읽습니다.)
+    id_columns = [column for column in ID_COLUMNS if column in df.columns]
+    if id_columns:
+        df[id_columns] = pd.read_csv(path, usecols=id_columns, dtype=str, keep_default_na=False)[id_columns]
+    return df
+
+
+def merge_shards(shard_dirs: list, output_dir: str = 'data') -> dict:
+    """
+    샤드 폴더들의 같은 이름 파일(CSV/Parquet)을 합쳐 output_dir 에 저장하고 {파일 이름: 저장 경로} 를 반환합니다.
+    샤드마다 0 부터 시작하는 id 컬럼(뉴스)은 합친 뒤 다시 매깁니다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = sorted({
+        os.path.basename(path)
+        for shard_dir in shard_dirs
+        for path in glob.glob(os.path.join(shard_dir, '*.csv')) + glob.glob(os.path.join(shard_dir, '*.parquet'))
+    })
+    merged = {}
+    for name in names:
+        parts = [_read_partition(os.path.join(d, name)) for d in shard_dirs if os.path.exists(os.path.join(d, name))]
+        df = pd.concat(parts, ignore_index=True)
+        if 'id' in df.columns:
+            df['id'] = range(len(df))
+        base, ext = os.path.splitext(name)
+        merged[name] = save_table(df, os.path.join(output_dir, base), formats=[ext.lstrip('.')])[ext.lstrip('.')]
+        print(f"병합: {name} ({len(parts)}개 샤드, {len(df)}행) -> {merged[name]}")
+    return merged
+
+
+def _stages() -> dict:
+    """샤드 실행을 지원하는 단계 (제공자 라이브러리는 필요할 때만 import 합니다.)"""
+    from datareader_fdr import fetch_and_save_data
+    from datareader_yfinance import fetch_and_save_all_financial_data
+    from info_datareader_yfinance_NYrs import fetch_and_save_historical_info
+    from news_crawler import fetch_and_save_news_urls
+    return {
+        'prices': fetch_and_save_data,
+        'financials': fetch_and_save_all_financial_data,
+        'historical_info': lambda df, output_dir: fetch_and_save_historical_info(df, years=5, output_dir=output_dir),
+        'news': lambda df, output_dir: fetch_and_save_news_urls(df, days=10, output_dir=output_dir),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='종목 샤드 단위 분산 수집')
+    parser.add_argument('command', choices=['worker', 'merge', 'status'])
+    parser.add_argument('--stage', default='prices', choices=['prices', 'financials', 'historical_info', 'news'])
+    parser.add_argument('--shards', type=int, default=8)
+    parser.add_argument('--db', default=COORDINATOR_PATH, help='모든 노드가 접근할 수 있는 코디네이터 SQLite 경로')
+    parser.add_argument('--run-id', default=os.getenv('PIPELINE_RUN_ID'),
+                        help='필수. 노드들이 같은 값을 써야 합니다. (기본값: PIPELINE_RUN_ID 환경 변수)')
+    parser.add_argument('--worker-id', default=None)
+    parser.add_argument('--lease-seconds', type=float, default=300.0)
+    parser.add_argument('--limit', type=int, default=None, help='유니버스 앞쪽 N개 종목만 (테스트용)')
+    parser.add_argument('--output-dir', default='data', help='병합 결과 저장 폴더')
+    args = parser.parse_args()
+    if not args.run_id:
+        # 프로세스 시작 시각으로 정한 실행 ID 는 노드마다 달라 서로 다른 실행의 샤드를 보게 됩니다.
+        parser.error('--run-id 또는 PIPELINE_RUN_ID 로 모든 노드에 같은 실행 ID 를 지정해야 합니다.')
+
+    coordinator = ShardCoordinator(args.db, args.run_id, args.stage, lease_seconds=args.lease_seconds)
+    if args.command == 'worker':
+        # 같은 코디네이터를 쓰는 워커들이 제공자 호출 한도를 나누어 쓰도록 토큰 버킷도 코디네이터 파일에 둡니다.
+        os.environ.setdefault('PROVIDER_QUOTA_DB', os.path.abspath(args.db))
+        # 다른 노드가 이미 고정한 유니버스가 있으면 그대로 사용합니다.
+        companies_df = coordinator.universe()
+        if companies_df is None:
+            from companiesCollector import get_nasdaq_companies
+            companies_df = get_nasdaq_companies(limit=args.limit)
+        processed = run_worker(_stages()[args.stage], companies_df, coordinator, args.shards, args.worker_id)
+        print(f"처리한 샤드: {processed} / 상태: {coordinator.status()}")
+    elif args.command == 'merge':
+        status = coordinator.status()
+        if status.get(PENDING) or status.get(LEASED):
+            print(f"경고: 아직 끝나지 않은 샤드가 있습니다. {status}")
+        merge_shards(coordinator.done_outputs(), args.output_dir)
+    else:
+        print(coordinator.status())
+
+
+if __name__ == '__main__':
+    main()
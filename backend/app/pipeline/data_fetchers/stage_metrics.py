@@ -0,0 +1,105 @@
+"""
+파이프라인 단계별 지표 수집 및 실행 리포트 모듈
+
+각 수집/적재 단계(fetch_and_save_data, copy_s3_to_redshift 등)를 `stage_run` 으로 감싸면
+카운터(성공/실패 종목 수, 저장 행 수 등)와 구간별 누적 시간(network / parse / write / sleep)을 기록하고,
+단계가 끝날 때(오류로 중단된 경우 포함) `data/reports/` 폴더에 JSON 리포트를 남깁니다.
+
+같은 실행에서 만들어진 리포트는 실행 ID(PIPELINE_RUN_ID 환경 변수, 없으면 프로세스 시작 시각)로 묶이며,
+파일 이름은 `<실행 ID>_<단계 이름>.json` 입니다.
+
+사용 예:
+    with stage_run('fetch_and_save_data', symbols_total=len(df)) as metrics:
+        with metrics.timer('network'):
+            df_stock = fdr.DataReader(symbol)
+        metrics.count('symbols_succeeded')
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+REPORTS_DIR = os.path.join('data', 'reports')
+RUN_ID = os.getenv('PIPELINE_RUN_ID') or datetime.now().strftime('%Y%m%d-%H%M%S')
+
+
+class StageMetrics:
+    """한 단계 실행 동안의 카운터와 구간별 누적 시간을 보관합니다."""
+
+    def __init__(self, stage: str, **params):
+        self.stage = stage
+        self.params = params
+        self.counters: dict[str, int] = {}
+        self.timers: dict[str, float] = {}
+        self.details: dict = {}
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+
+    def count(self, name: str, n: int = 1):
+        """카운터를 n 만큼 증가시킵니다."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, name: str, seconds: float):
+        """구간 시간을 누적합니다."""
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, name: str):
+        """with 블록의 실행 시간을 name 구간에 누적합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def report(self, status: str = 'completed', error: str = None) -> dict:
+        """현재까지의 지표를 리포트 딕셔너리로 만듭니다."""
+        duration = time.perf_counter() - self._start
+        succeeded = self.counters.get('symbols_succeeded', 0)
+        report = {
+            'run_id': RUN_ID,
+            'stage': self.stage,
+            'status': status,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            'duration_sec': round(duration, 6),
+            'params': self.params,
+            'counters': dict(self.counters),
+            'timers_sec': {name: round(value, 6) for name, value in self.timers.items()},
+            # 어느 구간에도 속하지 않는 시간 (DataFrame 병합, 진행률 표시 등)
+            'untracked_sec': round(max(0.0, duration - sum(self.timers.values())), 6),
+            'symbols_per_sec': round(succeeded / duration, 3) if duration > 0 else None,
+        }
+        if self.details:
+            report['details'] = self.details
+        if error:
+            report['error'] = error
+        return report
+
+
+def write_report(report: dict, reports_dir: str = None) -> str:
+    """리포트를 JSON 파일로 저장하고 경로를 반환합니다."""
+    reports_dir = reports_dir or REPORTS_DIR
+    os.makedirs(reports_dir, exist_ok=True)
+    file_path = os.path.join(reports_dir, f"{report['run_id']}_{report['stage']}.json")
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    return file_path
+
+
+@contextmanager
+def stage_run(stage: str, reports_dir: str = None, **params):
+    """
+    단계 실행을 감싸 지표를 수집하고, 종료 시 리포트를 저장합니다.
+    예외가 발생하면 status='failed' 로 리포트를 남긴 뒤 예외를 다시 발생시킵니다.
+    """
+    metrics = StageMetrics(stage, **params)
+    try:
+        yield metrics
+    except BaseException as e:
+        file_path = write_report(metrics.report(status='failed', error=repr(e)), reports_dir)
+        print(f"[{stage}] 실행 리포트(실패)가 {file_path}에 저장되었습니다.")
+        raise
+    file_path = write_report(metrics.report(), reports_dir)
+    print(f"[{stage}] 실행 리포트가 {file_path}에 저장되었습니다.")
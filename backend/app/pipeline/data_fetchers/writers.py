@@ -0,0 +1,112 @@
+"""
+파이프라인 출력 파일 저장(writer) 모듈
+
+수집 단계가 만든 DataFrame 을 설정된 형식(CSV, Parquet)으로 저장합니다.
+저장 형식은 PIPELINE_OUTPUT_FORMATS 환경 변수(쉼표 구분, 기본값 'csv')로 고르며,
+'csv,parquet' 처럼 여러 형식을 함께 저장할 수 있습니다. 파일 이름은 확장자만 다릅니다.
+    data/nasdaq_all_stocks.csv, data/nasdaq_all_stocks.parquet
+
+Parquet 는 컬럼 타입을 보존하고 압축(PARQUET_COMPRESSION: snappy 기본, zstd 등)되어
+CSV 보다 쓰기/읽기가 빠르고 S3 용량도 작습니다. 종목(Symbol) 컬럼이 있으면 종목 순으로 정렬한 뒤
+한 종목이 여러 row group 에 나뉘지 않도록 종목 경계에서 row group 을 나눕니다.
+(row group 당 약 PARQUET_ROW_GROUP_ROWS 행. row group 별 Symbol min/max 통계로 종목 필터 시 읽을 범위가 줄어듭니다.)
+
+새 형식은 WRITERS 에 `이름: 함수(df, base_path, index) -> 저장 경로` 로 등록하면 됩니다.
+
+사용 예:
+    save_table(all_stocks_df, os.path.join(output_dir, 'nasdaq_all_stocks'), metrics=metrics)
+"""
+import os
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+OUTPUT_FORMATS = [f.strip().lower() for f in os.getenv('PIPELINE_OUTPUT_FORMATS', 'csv').split(',') if f.strip()]
+PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'snappy')
+PARQUET_ROW_GROUP_ROWS = int(os.getenv('PARQUET_ROW_GROUP_ROWS', '250000'))
+
+
+def write_csv(df: pd.DataFrame, base_path: str, index: bool = False) -> str:
+    """UTF-8 CSV 로 저장합니다. (기존 to_csv 저장과 동일)"""
+    file_path = f"{base_path}.csv"
+    df.to_csv(file_path, index=index, encoding='utf-8')
+    return file_path
+
+
+def row_group_bounds(groups, target_rows: int) -> list[tuple[int, int]]:
+    """
+    정렬된 그룹 값 배열을 약 target_rows 행씩 나눈 (시작, 끝) 구간 목록을 반환합니다.
+    구간은 항상 그룹 경계에서 나뉘므로, 한 그룹이 target_rows 보다 크면 그 그룹 하나가 한 구간이 됩니다.
+    """
+    values = np.asarray(groups)
+    n = len(values)
+    if n == 0:
+        return []
+    # 그룹이 바뀌는 위치(각 그룹의 시작 인덱스)
+    starts = np.flatnonzero(values[1:] != values[:-1]) + 1
+    bounds = []
+    start = 0
+    for boundary in starts:
+        if boundary - start >= target_rows:
+            bounds.append((start, int(boundary)))
+            start = int(boundary)
+    bounds.append((start, n))
+    return bounds
+
+
+def write_parquet(df: pd.DataFrame, base_path: str, index: bool = False, group_by: str = 'Symbol',
+                  compression: str = None, row_group_rows: int = None) -> str:
+    """
+    Parquet 로 저장합니다. group_by 컬럼이 있으면 그 값 순으로 정렬하고 그룹 경계에서 row group 을 나눕니다.
+    (같은 그룹 안의 행 순서는 유지됩니다.)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    compression = compression or PARQUET_COMPRESSION
+    row_group_rows = row_group_rows or PARQUET_ROW_GROUP_ROWS
+    file_path = f"{base_path}.parquet"
+
+    if index:
+        df = df.reset_index()
+    if group_by in df.columns:
+        df = df.sort_values(group_by, kind='stable')
+        bounds = row_group_bounds(df[group_by].to_numpy(), row_group_rows)
+    else:
+        bounds = [(start, min(start + row_group_rows, len(df))) for start in range(0, len(df), row_group_rows)]
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Redshift COPY 는 나노초 timestamp 를 읽지 못하므로 마이크로초로 저장합니다.
+    with pq.ParquetWriter(file_path, table.schema, compression=compression,
+                          coerce_timestamps='us', allow_truncated_timestamps=True) as writer:
+        for start, end in bounds or [(0, 0)]:
+            writer.write_table(table.slice(start, end - start), row_group_size=max(end - start, 1))
+    return file_path
+
+
+WRITERS = {
+    'csv': write_csv,
+    'parquet': write_parquet,
+}
+
+
+def save_table(df: pd.DataFrame, base_path: str, formats: list[str] = None, index: bool = False, metrics=None) -> dict:
+    """
+    DataFrame 을 formats(기본값 OUTPUT_FORMATS)의 각 형식으로 저장하고 {형식: 저장 경로} 를 반환합니다.
+    metrics(StageMetrics)가 주어지면 저장 시간을 'write' 구간에 누적하고, 파일별 크기를 리포트에 남깁니다.
+    """
+    formats = formats or OUTPUT_FORMATS
+    unknown = [fmt for fmt in formats if fmt not in WRITERS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {unknown} (지원 형식: {list(WRITERS)})")
+
+    paths = {}
+    for fmt in formats:
+        with metrics.timer('write') if metrics else nullcontext():
+            paths[fmt] = WRITERS[fmt](df, base_path, index=index)
+        if metrics:
+            metrics.details.setdefault('outputs', []).append(
+                {'format': fmt, 'path': paths[fmt], 'bytes': os.path.getsize(paths[fmt])}
+            )
+    return paths
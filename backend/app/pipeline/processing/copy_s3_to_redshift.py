@@ -5,6 +5,11 @@ import time
 import sys
 from typing import Dict, List
 
+# 단계 지표 모듈(stage_metrics)은 data_fetchers 폴더에 있습니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_fetchers'))
+from stage_metrics import stage_run
+from upload_to_s3 import MANIFEST_PATH, load_previous_manifest
+
 def load_config(config_path='pipeline.conf'):
     """설정 파일을 로드합니다."""
     parser = configparser.ConfigParser()
@@ -31,6 +36,9 @@ def load_config(config_path='pipeline.conf'):
         conf_data['aws_access_key'] = creds.get('access_key')
         conf_data['aws_secret_key'] = creds.get('secret_key')
         
+        # 증분 적재 이력 테이블 (같은 파일을 두 번 적재하지 않도록 적재한 객체를 기록)
+        conf_data['load_history_table'] = config.get("load_history_table", "etl_load_history")
+
         # 테이블 목록 설정 (동적 섹션) 로드
         table_configs: List[Dict[str, str]] = []
         # 'table_1', 'table_2' 와 같은 패턴의 섹션을 찾습니다.
@@ -49,8 +57,15 @@ def load_config(config_path='pipeline.conf'):
             temp_conf = {key: table_conf.get(key) for key in required_keys}
             
             # 파싱된 테이블 설정에 추가적인 Redshift COPY 옵션 (예: FORMAT, IGNOREHEADER)도 포함 가능
+            # format = PARQUET 이면 writers.py 가 만든 Parquet 파일을 FORMAT AS PARQUET 로 적재합니다.
             temp_conf['format'] = table_conf.get('format', 'CSV') # 기본값 CSV
             temp_conf['ignoreheader'] = table_conf.get('ignoreheader', '1') # 기본값 1
+            # 업로드 단계(upload_to_s3)가 올린 로컬 파일 이름. 지정하면 업로드 manifest 로 적재합니다.
+            temp_conf['source_file'] = table_conf.get('source_file')
+            # full: 대상 테이블에 바로 COPY (기존 방식)
+            # incremental: 아직 적재하지 않은 객체만 staging 테이블로 COPY 한 뒤 merge_keys 기준으로 upsert
+            temp_conf['load_mode'] = table_conf.get('load_mode', 'full').lower()
+            temp_conf['merge_keys'] = [k.strip() for k in table_conf.get('merge_keys', 'Symbol,Date').split(',') if k.strip()]
             
             table_configs.append(temp_conf)
             
@@ -61,6 +76,112 @@ def load_config(config_path='pipeline.conf'):
         print(f"설정 파일 읽기 실패: {e}")
         sys.exit(1)
 
+def is_parquet_format(file_format: str) -> bool:
+    """테이블 설정의 format 값이 Parquet 인지 확인합니다. ('PARQUET', 'FORMAT AS PARQUET' 모두 허용)"""
+    return (file_format or '').upper().split()[-1:] == ['PARQUET']
+
+def build_copy_command(conf, table_conf, manifest_url=None):
+    """
+    테이블 설정으로 COPY 명령어를 만듭니다.
+    manifest_url 이 주어지면 s3_file_path 대신 업로드 단계가 만든 Redshift manifest 로 적재합니다.
+    Parquet 는 컬럼 타입이 파일에 들어 있으므로 헤더/시간 형식 옵션(IGNOREHEADER, TIMEFORMAT)을 쓰지 않습니다.
+    (Parquet COPY 는 이 옵션들을 허용하지 않으며, 파일 컬럼 순서가 테이블 컬럼 순서와 같아야 합니다.)
+    """
+    source_url = manifest_url or f"s3://{conf['s3_bucket_name']}/{table_conf['s3_file_path']}"
+    source = f"""
+                COPY {table_conf['target_table']}
+                FROM '{source_url}'
+                IAM_ROLE '{conf['b_account_iam_role_arn']}'
+                REGION '{conf['region_name']}'"""
+    if manifest_url:
+        source += """
+                MANIFEST"""
+    if is_parquet_format(table_conf['format']):
+        return source + """
+                FORMAT AS PARQUET;
+            """
+    return source + f"""
+                {table_conf['format']}
+                IGNOREHEADER {table_conf['ignoreheader']}
+                TIMEFORMAT 'auto';
+            """
+
+def load_history_ddl(history_table):
+    """적재 이력 테이블 생성 SQL"""
+    return f"""
+                CREATE TABLE IF NOT EXISTS {history_table} (
+                    target_table VARCHAR(256) NOT NULL,
+                    s3_key VARCHAR(1024) NOT NULL,
+                    etag VARCHAR(128) NOT NULL,
+                    sha256 VARCHAR(64),
+                    run_id VARCHAR(64),
+                    loaded_at TIMESTAMP DEFAULT GETDATE()
+                );
+            """
+
+def sql_literal(value):
+    """SQL 문자열 리터럴 (작은따옴표 이스케이프)"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+def build_incremental_sqls(conf, table_conf, objects, manifest_url, run_id):
+    """
+    증분 적재 SQL 목록을 만듭니다. batch_execute_statement 로 한 트랜잭션에서 실행됩니다.
+        1. 대상 테이블과 같은 구조의 임시 staging 테이블 생성
+        2. manifest 에 있는 새 객체만 staging 으로 COPY
+        3. merge_keys 가 같은 기존 행을 삭제한 뒤 staging 의 행을 삽입 (upsert)
+        4. 적재한 객체를 이력 테이블에 기록
+    중간에 실패하면 전체가 롤백되므로 대상 테이블과 이력이 어긋나지 않습니다.
+    """
+    target = table_conf['target_table']
+    staging = f"{target.replace('.', '_')}_staging"
+    join = ' AND '.join(f'{target}."{key}" = {staging}."{key}"' for key in table_conf['merge_keys'])
+    history_rows = ',\n                    '.join(
+        f"({sql_literal(target)}, {sql_literal(obj['key'])}, {sql_literal(obj['etag'])}, "
+        f"{sql_literal(obj.get('sha256', ''))}, {sql_literal(run_id)})"
+        for obj in objects
+    )
+    return [
+        f"CREATE TEMP TABLE {staging} (LIKE {target});",
+        build_copy_command(conf, {**table_conf, 'target_table': staging}, manifest_url),
+        f"DELETE FROM {target} USING {staging} WHERE {join};",
+        f"INSERT INTO {target} SELECT * FROM {staging};",
+        f"""INSERT INTO {conf['load_history_table']} (target_table, s3_key, etag, sha256, run_id)
+                VALUES {history_rows};""",
+    ]
+
+def select_new_objects(objects, loaded):
+    """이력 테이블에 (s3_key, etag) 가 없는 객체만 골라냅니다."""
+    return [obj for obj in objects if (obj['key'], obj['etag']) not in loaded]
+
+def execute(client, conf, sql=None, sqls=None):
+    """SQL 하나(sql) 또는 한 트랜잭션의 SQL 목록(sqls)을 제출하고 쿼리 ID 를 반환합니다."""
+    params = dict(
+        WorkgroupName=conf['workgroup_name'],
+        Database=conf['database_name'],
+        SecretArn=conf['b_account_secret_arn'],
+    )
+    if sqls:
+        return client.batch_execute_statement(Sqls=sqls, **params)['Id']
+    return client.execute_statement(Sql=sql, **params)['Id']
+
+def fetch_loaded_objects(client, conf, target_table):
+    """대상 테이블에 이미 적재한 (s3_key, etag) 집합을 이력 테이블에서 읽습니다."""
+    query_id = execute(client, conf, sql=(
+        f"SELECT s3_key, etag FROM {conf['load_history_table']} "
+        f"WHERE target_table = {sql_literal(target_table)};"
+    ))
+    if not check_query_status(client, query_id):
+        raise RuntimeError(f"{conf['load_history_table']} 적재 이력 조회 실패")
+
+    loaded = set()
+    kwargs = {'Id': query_id}
+    while True:
+        result = client.get_statement_result(**kwargs)
+        loaded.update((row[0]['stringValue'], row[1]['stringValue']) for row in result['Records'])
+        if not result.get('NextToken'):
+            return loaded
+        kwargs['NextToken'] = result['NextToken']
+
 def check_query_status(client, query_id):
     """쿼리가 끝날 때까지 기다리고 결과를 확인합니다."""
     print(f"🔄 쿼리 실행 중... (ID: {query_id})")
@@ -86,6 +207,7 @@ def copy_s3_to_redshift():
     # 설정 로드
     success_count = 0
     fail_count = 0
+    skip_count = 0
     conf = load_config()
 
     # Redshift Data API 클라이언트 생성
@@ -96,50 +218,97 @@ def copy_s3_to_redshift():
         aws_secret_access_key=conf['aws_secret_key'],
     )
     
+    # 업로드 단계의 manifest (source_file 을 지정한 테이블이 사용)
+    upload_manifest = load_previous_manifest()
+    
     # 각 테이블에 대해 COPY 명령 실행
-    for table_conf in conf['table_configs']:
-        target_table = table_conf['target_table']
-        s3_path = table_conf['s3_file_path']
-        file_format = table_conf['format']
-        ignore_header = table_conf['ignoreheader']
+    with stage_run('copy_s3_to_redshift', tables_total=len(conf['table_configs'])) as metrics:
+        metrics.details['tables'] = []
         
-        print("\n=======================================================")
-        print(f"🚀 {target_table} 테이블로 데이터 적재 시작...")
-        print(f"📦 S3 경로: s3://{conf['s3_bucket_name']}/{s3_path}")
+        # 증분 적재 테이블이 있으면 적재 이력 테이블을 먼저 준비합니다.
+        if any(t['load_mode'] == 'incremental' for t in conf['table_configs']):
+            with metrics.timer('history'):
+                if not check_query_status(client, execute(client, conf, sql=load_history_ddl(conf['load_history_table']))):
+                    raise RuntimeError(f"{conf['load_history_table']} 적재 이력 테이블 생성 실패")
         
-        # COPY 명령어 생성 (테이블별 옵션 적용)
-        copy_command = f"""
-            COPY {target_table}
-            FROM 's3://{conf['s3_bucket_name']}/{s3_path}'
-            IAM_ROLE '{conf['b_account_iam_role_arn']}'
-            REGION '{conf['region_name']}'
-            {file_format}
-            IGNOREHEADER {ignore_header}
-            TIMEFORMAT 'auto';
-        """
-        
-        try:
-            # 5. 실행 (비동기)
-            response = client.execute_statement(
-                WorkgroupName=conf['workgroup_name'],    
-                Database=conf['database_name'],
-                SecretArn=conf['b_account_secret_arn'],
-                Sql=copy_command
-            )
-            query_id = response['Id']
+        for table_conf in conf['table_configs']:
+            target_table = table_conf['target_table']
+            s3_path = table_conf['s3_file_path']
+            file_format = table_conf['format']
+            incremental = table_conf['load_mode'] == 'incremental'
+            
+            # source_file 이 업로드 manifest 에 있으면 그 manifest 의 객체를 적재합니다.
+            manifest_url = None
+            uploaded = upload_manifest['files'].get(table_conf['source_file']) if table_conf['source_file'] else None
+            upload_failed = bool(uploaded) and uploaded['status'] == 'failed'
+            if upload_failed:
+                uploaded = None
+            elif uploaded:
+                manifest_url = uploaded['copy_manifest_url']
+                s3_path = uploaded['key']
+            elif table_conf['source_file']:
+                print(f"⚠️ {table_conf['source_file']} 파일이 업로드 manifest({MANIFEST_PATH})에 없어 s3_file_path 로 적재합니다.")
+            
+            print("\n=======================================================")
+            print(f"🚀 {target_table} 테이블로 데이터 적재 시작... ({table_conf['load_mode']})")
+            print(f"📦 S3 경로: s3://{conf['s3_bucket_name']}/{s3_path} ({file_format})")
             
-            if check_query_status(client, query_id):
-                success_count += 1
-            else:
+            table_start = time.perf_counter()
+            table_result = {'table': target_table, 's3_path': s3_path, 'format': file_format,
+                            'load_mode': table_conf['load_mode'], 'status': 'failed'}
+            try:
+                if upload_failed:
+                    # s3_file_path 의 이전 데이터를 적재하지 않도록 이 테이블은 실패로 처리합니다.
+                    raise RuntimeError(f"{table_conf['source_file']} 파일의 업로드가 실패하여 적재하지 않습니다.")
+                if incremental:
+                    # 증분 적재는 업로드 manifest 의 객체(키, ETag)로 적재 여부를 판단합니다.
+                    if not uploaded:
+                        raise ValueError(f"증분 적재에는 업로드 manifest 에 있는 source_file 이 필요합니다: {table_conf['source_file']}")
+                    with metrics.timer('history'):
+                        loaded = fetch_loaded_objects(client, conf, target_table)
+                    new_objects = select_new_objects([uploaded], loaded)
+                    if not new_objects:
+                        print("⏭️ 이미 적재한 객체입니다. 건너뜁니다.")
+                        skip_count += 1
+                        table_result['status'] = 'skipped'
+                        continue
+                    sqls = build_incremental_sqls(conf, table_conf, new_objects, manifest_url, upload_manifest['run_id'])
+                    table_result['objects'] = [obj['key'] for obj in new_objects]
+                
+                # 5. 실행 (비동기)
+                with metrics.timer('submit'):
+                    if incremental:
+                        query_id = execute(client, conf, sqls=sqls)
+                    else:
+                        # COPY 명령어 생성 (테이블별 옵션 적용)
+                        query_id = execute(client, conf, sql=build_copy_command(conf, table_conf, manifest_url))
+                table_result['query_id'] = query_id
+                
+                # COPY 실행 완료까지 폴링하며 기다린 시간
+                with metrics.timer('wait'):
+                    finished = check_query_status(client, query_id)
+                if finished:
+                    success_count += 1
+                    table_result['status'] = 'succeeded'
+                else:
+                    fail_count += 1
+
+            except Exception as e:
+                print(f"🔥 {target_table} 테이블 작업 중 에러 발생: {e}")
                 fail_count += 1
+                table_result['error'] = str(e)
 
-        except Exception as e:
-            print(f"🔥 {target_table} 테이블 작업 중 에러 발생: {e}")
-            fail_count += 1
+            finally:
+                table_result['duration_sec'] = round(time.perf_counter() - table_start, 6)
+                metrics.details['tables'].append(table_result)
+        
+        metrics.count('tables_succeeded', success_count)
+        metrics.count('tables_failed', fail_count)
+        metrics.count('tables_skipped', skip_count)
     
     # 6. 최종 요약 출력
     print("\n=======================================================")
-    print(f"✨ 모든 테이블 적재 작업 완료 (성공: {success_count}, 실패: {fail_count})")
+    print(f"✨ 모든 테이블 적재 작업 완료 (성공: {success_count}, 실패: {fail_count}, 건너뜀: {skip_count})")
 
 if __name__ == "__main__":
     copy_s3_to_redshift()
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+수집 결과(data/ 폴더의 CSV/Parquet 파일)를 S3에 업로드하는 단계입니다.
+
+- 파일은 `<prefix>/dt=<실행 날짜>/<파일 이름>` 키로 업로드합니다. (날짜 파티션)
+  종목 단위 조회는 Parquet row group(종목 경계, writers.py)으로 처리하므로 종목별로 파일을 나누지 않습니다.
+- 큰 파일은 multipart 로, 여러 파일은 스레드 풀에서 동시에 업로드합니다.
+- 파일 내용의 sha256 을 객체 메타데이터(sha256)로 저장하고, 업로드 전에
+    * 같은 키의 객체가 이미 같은 내용이면(sha256 메타데이터 또는 multipart ETag 비교) 건너뛰고,
+    * 이전 실행의 manifest 에 같은 내용의 객체가 있으면 그 객체를 그대로 재사용합니다.
+- 업로드 결과는 manifest 로 저장합니다.
+    * 로컬: data/manifests/upload_manifest.json (COPY 단계가 읽음)
+    * S3: <prefix>/manifests/<실행 ID>.json, 파일별 Redshift COPY manifest(<prefix>/manifests/<실행 ID>/<파일 이름>.manifest)
+"""
+import configparser
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+# 단계 지표 모듈(stage_metrics)은 data_fetchers 폴더에 있습니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_fetchers'))
+from stage_metrics import stage_run, RUN_ID
+
+MANIFEST_DIR = os.path.join('data', 'manifests')
+MANIFEST_PATH = os.path.join(MANIFEST_DIR, 'upload_manifest.json')
+UPLOAD_EXTENSIONS = ('.csv', '.parquet')
+
+
+def load_upload_config(config_path='pipeline.conf') -> dict:
+    """
+    업로드 설정을 로드합니다.
+    [s3_upload] 섹션은 선택이며, 버킷/리전이 없으면 [redshift_copy] 섹션의 값을 사용합니다.
+    """
+    parser = configparser.ConfigParser()
+
+    if not os.path.exists(config_path):
+        print(f"Error: 설정 파일이 없습니다 -> {config_path}")
+        sys.exit(1)
+
+    parser.read(config_path)
+    upload = parser['s3_upload'] if parser.has_section('s3_upload') else {}
+    copy_conf = parser['redshift_copy'] if parser.has_section('redshift_copy') else {}
+    creds = parser['B_aws_credentials']
+
+    files = upload.get('files')
+    return {
+        'region_name': upload.get('region_name') or copy_conf.get('region_name'),
+        's3_bucket_name': upload.get('s3_bucket_name') or copy_conf.get('s3_bucket_name'),
+        'aws_access_key': creds.get('access_key'),
+        'aws_secret_key': creds.get('secret_key'),
+        'local_dir': upload.get('local_dir', 'data'),
+        'prefix': upload.get('prefix', 'nasdaq').strip('/'),
+        # 업로드할 파일 이름 목록 (쉼표 구분). 없으면 local_dir 의 모든 CSV/Parquet 파일
+        'files': [f.strip() for f in files.split(',') if f.strip()] if files else None,
+        'max_workers': int(upload.get('max_workers', '4')),
+        'multipart_threshold_mb': int(upload.get('multipart_threshold_mb', '64')),
+        'multipart_chunksize_mb': int(upload.get('multipart_chunksize_mb', '16')),
+        'max_concurrency': int(upload.get('max_concurrency', '8')),
+    }
+
+
+def list_upload_files(local_dir: str, files: Optional[List[str]] = None) -> List[str]:
+    """업로드할 로컬 파일 경로 목록 (하위 폴더(reports, manifests 등)는 제외)"""
+    if files:
+        return [os.path.join(local_dir, name) for name in files]
+    return sorted(
+        os.path.join(local_dir, name) for name in os.listdir(local_dir)
+        if name.endswith(UPLOAD_EXTENSIONS) and os.path.isfile(os.path.join(local_dir, name))
+    )
+
+
+def file_digests(path: str, chunksize: int, multipart_threshold: int) -> Dict[str, str]:
+    """
+    파일을 한 번 읽으면서 sha256 과 S3 가 계산할 ETag 를 함께 구합니다.
+    multipart 업로드의 ETag 는 파트별 MD5 를 이어 붙인 값의 MD5 + '-파트 수' 입니다.
+    """
+    sha256 = hashlib.sha256()
+    whole_md5 = hashlib.md5()
+    part_md5s = []
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunksize)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            whole_md5.update(chunk)
+            part_md5s.append(hashlib.md5(chunk).digest())
+
+    if os.path.getsize(path) >= multipart_threshold and len(part_md5s) > 0:
+        etag = f"{hashlib.md5(b''.join(part_md5s)).hexdigest()}-{len(part_md5s)}"
+    else:
+        etag = whole_md5.hexdigest()
+    return {'sha256': sha256.hexdigest(), 'etag': etag}
+
+
+def object_key(prefix: str, file_name: str, run_date: str) -> str:
+    """날짜 파티션 객체 키: <prefix>/dt=<YYYY-MM-DD>/<파일 이름>"""
+    return f"{prefix}/dt={run_date}/{file_name}"
+
+
+def head_object(client, bucket: str, key: str) -> Optional[dict]:
+    """객체 메타데이터를 조회합니다. 객체가 없으면 None."""
+    try:
+        return client.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
+
+
+def is_same_content(head: Optional[dict], digests: Dict[str, str]) -> bool:
+    """S3 객체가 로컬 파일과 같은 내용인지 (sha256 메타데이터 우선, 없으면 ETag 비교)"""
+    if head is None:
+        return False
+    stored_sha256 = head.get('Metadata', {}).get('sha256')
+    if stored_sha256:
+        return stored_sha256 == digests['sha256']
+    return head.get('ETag', '').strip('"') == digests['etag']
+
+
+def load_previous_manifest(path: str = None) -> dict:
+    """이전 실행의 업로드 manifest 를 읽습니다. 없으면 빈 manifest."""
+    path = path or MANIFEST_PATH
+    if not os.path.exists(path):
+        return {'files': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def upload_file(client, bucket: str, path: str, key: str, transfer_config: TransferConfig,
+                previous_entry: Optional[dict] = None, metrics=None) -> dict:
+    """
+    파일 하나를 업로드하고 manifest 항목을 반환합니다.
+    같은 내용의 객체가 이미 있으면(같은 키 또는 이전 manifest 의 객체) 업로드하지 않습니다.
+    """
+    file_name = os.path.basename(path)
+    size = os.path.getsize(path)
+    with metrics.timer('hash') if metrics else nullcontext():
+        digests = file_digests(path, transfer_config.multipart_chunksize, transfer_config.multipart_threshold)
+    entry = {'file': file_name, 'size': size, 'sha256': digests['sha256']}
+
+    # 이전 실행에서 올린 같은 내용의 객체가 아직 있으면 그대로 사용합니다.
+    if previous_entry and previous_entry.get('sha256') == digests['sha256']:
+        head = head_object(client, bucket, previous_entry['key'])
+        if is_same_content(head, digests):
+            return {**entry, 'key': previous_entry['key'], 'etag': head['ETag'].strip('"'), 'status': 'skipped'}
+
+    head = head_object(client, bucket, key)
+    if is_same_content(head, digests):
+        return {**entry, 'key': key, 'etag': head['ETag'].strip('"'), 'status': 'skipped'}
+
+    with metrics.timer('upload') if metrics else nullcontext():
+        client.upload_file(path, bucket, key, Config=transfer_config,
+                           ExtraArgs={'Metadata': {'sha256': digests['sha256']}})
+    head = head_object(client, bucket, key)
+    return {**entry, 'key': key, 'etag': head['ETag'].strip('"'), 'status': 'uploaded'}
+
+
+def copy_manifest(bucket: str, entries: List[dict]) -> dict:
+    """Redshift COPY 용 manifest (Parquet COPY 는 meta.content_length 가 필요합니다.)"""
+    return {
+        'entries': [
+            {'url': f"s3://{bucket}/{entry['key']}", 'mandatory': True, 'meta': {'content_length': entry['size']}}
+            for entry in entries
+        ]
+    }
+
+
+def write_manifests(client, bucket: str, prefix: str, manifest: dict, local_path: str = None) -> dict:
+    """
+    파일별 Redshift COPY manifest 와 실행 manifest 를 S3 에 올리고, 실행 manifest 를 로컬에 저장합니다.
+    각 파일 항목에는 COPY 단계가 사용할 copy_manifest_url 이 추가됩니다.
+    """
+    run_id = manifest['run_id']
+    for file_name, entry in manifest['files'].items():
+        # 업로드에 실패한 파일은 COPY manifest 를 만들지 않습니다. (COPY 단계는 이 파일의 적재를 거부합니다)
+        if entry['status'] == 'failed':
+            continue
+        manifest_key = f"{prefix}/manifests/{run_id}/{file_name}.manifest"
+        client.put_object(Bucket=bucket, Key=manifest_key,
+                          Body=json.dumps(copy_manifest(bucket, [entry])).encode('utf-8'))
+        entry['copy_manifest_url'] = f"s3://{bucket}/{manifest_key}"
+
+    body = json.dumps(manifest, ensure_ascii=False, indent=2)
+    client.put_object(Bucket=bucket, Key=f"{prefix}/manifests/{run_id}.json", Body=body.encode('utf-8'))
+
+    local_path = local_path or MANIFEST_PATH
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    with open(local_path, 'w', encoding='utf-8') as f:
+        f.write(body)
+    return manifest
+
+
+def upload_files(client, bucket: str, paths: List[str], prefix: str, run_date: str = None,
+                 previous: dict = None, max_workers: int = 4, transfer_config: TransferConfig = None,
+                 metrics=None) -> dict:
+    """
+    여러 파일을 동시에 업로드하고 실행 manifest({run_id, run_date, bucket, files}) 를 반환합니다.
+    업로드에 실패한 파일도 status='failed' 와 error 로 manifest 에 남깁니다.
+    """
+    run_date = run_date or datetime.now().strftime('%Y-%m-%d')
+    previous_files = (previous or {}).get('files', {})
+    transfer_config = transfer_config or TransferConfig()
+
+    files = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                upload_file, client, bucket, path, object_key(prefix, os.path.basename(path), run_date),
+                transfer_config, previous_files.get(os.path.basename(path)), metrics,
+            ): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                print(f"🔥 {path} 업로드 중 에러 발생: {e}")
+                if metrics:
+                    metrics.count('files_failed')
+                files[os.path.basename(path)] = {'file': os.path.basename(path), 'status': 'failed', 'error': str(e)}
+                continue
+            files[entry['file']] = entry
+            if metrics:
+                metrics.count(f"files_{entry['status']}")
+                if entry['status'] == 'uploaded':
+                    metrics.count('bytes_uploaded', entry['size'])
+            print(f"{'⬆️' if entry['status'] == 'uploaded' else '⏭️'} {entry['file']} -> s3://{bucket}/{entry['key']} ({entry['status']})")
+
+    return {'run_id': RUN_ID, 'run_date': run_date, 'bucket': bucket, 'files': dict(sorted(files.items()))}
+
+
+def upload_to_s3(config_path='pipeline.conf'):
+    conf = load_upload_config(config_path)
+
+    client = boto3.client(
+        's3',
+        region_name=conf['region_name'],
+        aws_access_key_id=conf['aws_access_key'],
+        aws_secret_access_key=conf['aws_secret_key'],
+    )
+    transfer_config = TransferConfig(
+        multipart_threshold=conf['multipart_threshold_mb'] * 1024 * 1024,
+        multipart_chunksize=conf['multipart_chunksize_mb'] * 1024 * 1024,
+        max_concurrency=conf['max_concurrency'],
+    )
+
+    paths = list_upload_files(conf['local_dir'], conf['files'])
+    with stage_run('upload_to_s3', files_total=len(paths), bucket=conf['s3_bucket_name'], prefix=conf['prefix']) as metrics:
+        manifest = upload_files(
+            client, conf['s3_bucket_name'], paths, conf['prefix'],
+            previous=load_previous_manifest(), max_workers=conf['max_workers'],
+            transfer_config=transfer_config, metrics=metrics,
+        )
+        with metrics.timer('manifest'):
+            write_manifests(client, conf['s3_bucket_name'], conf['prefix'], manifest)
+        metrics.details['files'] = list(manifest['files'].values())
+        # 실패한 파일이 있으면 manifest 를 남긴 뒤 단계를 실패로 끝냅니다. (이전 데이터가 적재되지 않도록)
+        failed = [name for name, entry in manifest['files'].items() if entry['status'] == 'failed']
+        if failed:
+            raise RuntimeError(f"S3 업로드에 실패한 파일이 있습니다: {', '.join(failed)}")
+
+    print("\n=======================================================")
+    print(f"✨ S3 업로드 완료 (업로드: {metrics.counters.get('files_uploaded', 0)}, "
+          f"건너뜀: {metrics.counters.get('files_skipped', 0)}, 실패: {metrics.counters.get('files_failed', 0)})")
+    print(f"📄 manifest: {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    upload_to_s3()
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class NewsItem(BaseModel):
     Symbol: str
@@ -10,3 +11,10 @@ class NewsItem(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class NewsSearchItem(NewsItem):
+    """
+    A news article matched by the title search, with its BM25 score when sorted by relevance.
+    """
+    score: Optional[float] = None
@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field, model_validator
+from datetime import date
+from typing import List, Literal, Optional
+
+
+class Holding(BaseModel):
+    """
+    A single portfolio position, given either as a target weight or as a number of shares.
+    """
+    symbol: str
+    weight: Optional[float] = Field(None, gt=0)
+    shares: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def check_weight_or_shares(self):
+        if (self.weight is None) == (self.shares is None):
+            raise ValueError("exactly one of 'weight' or 'shares' must be set")
+        return self
+
+
+class PortfolioRequest(BaseModel):
+    """
+    Schema for a portfolio evaluation request.
+    Weights are normalized to sum to 1; all holdings must use the same kind (weight or shares).
+    """
+    holdings: List[Holding] = Field(..., min_length=1, max_length=500)
+    rebalance: Literal["none", "daily", "weekly", "monthly", "quarterly", "yearly"] = "none"
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    initial_value: float = Field(10000.0, gt=0)
+
+    @model_validator(mode="after")
+    def check_holdings(self):
+        if len({h.weight is None for h in self.holdings}) > 1:
+            raise ValueError("holdings must all use 'weight' or all use 'shares'")
+        if len({h.symbol.upper() for h in self.holdings}) != len(self.holdings):
+            raise ValueError("each symbol may appear only once")
+        return self
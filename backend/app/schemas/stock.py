@@ -19,6 +19,8 @@ class StockPrice(BaseModel):
     ma_5: Optional[float] = Field(None, alias="MA_5")
     ma_20: Optional[float] = Field(None, alias="MA_20")
     ma_60: Optional[float] = Field(None, alias="MA_60")
+    ema_12: Optional[float] = Field(None, alias="EMA_12")
+    ema_26: Optional[float] = Field(None, alias="EMA_26")
     rsi_14: Optional[float] = Field(None, alias="RSI_14")
 
     class Config:
@@ -26,6 +28,24 @@ class StockPrice(BaseModel):
         populate_by_name = True
 
 
+class StockRanking(BaseModel):
+    """
+    Schema for a single entry of the daily ranking (top movers, volume leaders, ...).
+    """
+    rank: int
+    symbol: str = Field(..., alias="Symbol")
+    Date: date = Field(..., alias="Date")
+    close: float = Field(..., alias="Close")
+    value: float
+    change_pct: Optional[float] = None
+    volume: Optional[float] = None
+    trading_value: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True
+
+
 class Financials(BaseModel):
     """
     Schema for company financials.
@@ -0,0 +1,271 @@
+"""
+공통 CSV 로더입니다.
+
+파일별로 선언한 스키마(CsvSchema: 컬럼 타입, 날짜 컬럼, 읽을 컬럼)에 따라 CSV를 읽습니다.
+    - 타입을 미리 지정하므로 pandas 가 파일 전체에 대해 타입 추론을 하지 않습니다.
+    - 날짜 컬럼은 읽는 동안 함께 변환합니다. (별도의 pd.to_datetime 패스 없음)
+    - pyarrow 가 설치되어 있으면 pyarrow CSV 엔진으로 여러 스레드에서 블록 단위로 병렬 파싱합니다.
+      이때 날짜 컬럼은 parse_dates 대신 datetime dtype 으로 지정해야 pyarrow 가 직접 변환합니다.
+      (parse_dates 를 쓰면 pyarrow 가 만든 date 객체를 pandas 가 다시 변환하여 오히려 느려집니다.)
+    - 큰 파일(CSV_CHUNK_THRESHOLD_MB 이상)은 최대 메모리 사용량을 줄이도록 읽습니다.
+        * pyarrow 가 있으면 pyarrow.csv 로 직접 읽고 to_pandas(self_destruct=True) 로 변환하여,
+          Arrow 테이블과 DataFrame 이 동시에 메모리에 올라가지 않도록 컬럼별로 해제합니다.
+        * pyarrow 가 없으면 기본(C) 엔진으로 CSV_CHUNK_ROWS 행씩 나누어 읽습니다.
+    - 스키마에 없는 컬럼은 default_dtype 으로 읽고(None 이면 추론), 파일에 없는 컬럼은 무시합니다.
+    - 빈 값이 있을 수 있는 정수 컬럼(거래량 등)은 float64 로 읽고, 빈 값이 없을 때만 int64 로 바꿉니다. (integer_columns)
+    - 문자열('str', 'category')로 선언한 컬럼은 빈 칸만 빈 값으로 보고 'NA', 'NULL' 같은 값은 그대로 읽습니다.
+      (종목 코드 'NA' 등이 NaN 이 되어 종목별 조회에서 빠지지 않도록 합니다.
+       pyarrow 로 읽을 때는 추론한 문자열 컬럼에도 같은 규칙이 적용됩니다.)
+      pandas 의 pyarrow 엔진은 컬럼별 na_values 를 지원하지 않으므로 빈 칸만 빈 값으로 읽고
+      (숫자 컬럼의 'NaN' 은 pyarrow 가 직접 NaN 으로 읽습니다), 숫자 컬럼에 'NA' 같은 값이 있어
+      변환에 실패하면 기본(C) 엔진과 컬럼별 na_values 로 다시 읽습니다.
+
+read_table() 은 CSV 경로 옆에 같은 이름의 Parquet 파일(파이프라인 writers.py 가 저장)이 있고
+CSV 보다 오래되지 않았다면 Parquet 를 읽습니다. (PREFER_PARQUET 설정으로 끌 수 있습니다.)
+Parquet 는 타입이 저장되어 있어 파싱이 없으므로 CSV 보다 빠르게 로드됩니다.
+"""
+import csv
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pandas as pd
+
+from app.core.config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+    PYARROW_AVAILABLE = True
+except ImportError:  # 선택 의존성
+    pa = pa_csv = pa_parquet = None
+    PYARROW_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class CsvSchema:
+    """CSV 파일 하나의 스키마 선언"""
+    # 컬럼 이름 -> pandas dtype
+    dtypes: dict = field(default_factory=dict)
+    # 읽는 동안 datetime 으로 변환할 컬럼 -> datetime dtype
+    date_columns: dict = field(default_factory=dict)
+    # 기본(C) 엔진에서 날짜 컬럼을 변환할 때 사용할 형식
+    date_format: Optional[str] = None
+    # True 이면 dtypes/date_columns 에 선언한 컬럼만 읽습니다.
+    declared_only: bool = False
+    # 선언되지 않은 컬럼의 dtype (None 이면 pandas 추론)
+    default_dtype: Optional[str] = None
+    # float64 로 읽은 뒤 빈 값(NaN)이 없으면 int64 로 바꿀 컬럼
+    integer_columns: tuple = ()
+
+
+# 문자열로 읽는 컬럼의 dtype. 이 컬럼들은 빈 칸만 빈 값으로 봅니다.
+TEXT_DTYPES = ('str', 'category')
+
+# pandas 가 기본으로 빈 값으로 보는 문자열 (문자열이 아닌 컬럼에는 계속 적용합니다)
+DEFAULT_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+
+# --- 파일별 스키마 --- #
+
+STOCK_PRICES = CsvSchema(
+    dtypes={
+        'Symbol': 'str', 'Open': 'float64', 'High': 'float64', 'Low': 'float64',
+        'Close': 'float64', 'Volume': 'float64', '거래액': 'float64',
+    },
+    date_columns={'Date': 'datetime64[ns]'},
+    date_format='%Y-%m-%d',
+    declared_only=True,
+    # 거래량이 빈 행이 있어도 읽기에 실패하지 않도록 float64 로 읽습니다.
+    integer_columns=('Volume',),
+)
+
+NEWS = CsvSchema(
+    dtypes={'id': 'int64', 'Symbol': 'str', 'Name': 'str', 'title': 'str', 'url': 'str'},
+    date_columns={'publishedAt': 'datetime64[ns, UTC]'},
+    date_format='ISO8601',
+)
+
+# 재무정보 응답 스키마(FinancialInfo)는 Date 를 문자열로 반환하므로 날짜로 변환하지 않습니다.
+FINANCIAL_INFO = CsvSchema(
+    dtypes={'Date': 'str', 'Symbol': 'str', 'Name': 'str', 'Industry': 'str', 'IndustryCode': 'str'},
+    default_dtype='float64',
+)
+
+# 재무제표(연간/분기)는 항목 컬럼이 많고 종목마다 다르므로, 식별 컬럼 외에는 모두 실수로 읽습니다.
+FINANCIAL_STATEMENTS = CsvSchema(
+    dtypes={'Symbol': 'str', 'Name': 'str', 'Date': 'str'},
+    default_dtype='float64',
+)
+
+# 긴(long) 형식 재무제표 저장소 (Symbol, Name, Date, period, statement, line_item, value).
+# 반복되는 문자열 컬럼은 사전(category) 인코딩하여 읽습니다.
+FINANCIAL_STATEMENTS_LONG = CsvSchema(
+    dtypes={
+        'Symbol': 'category', 'Name': 'category', 'period': 'category',
+        'statement': 'category', 'line_item': 'category', 'value': 'float64',
+    },
+    date_columns={'Date': 'datetime64[ns]'},
+    date_format='%Y-%m-%d',
+    declared_only=True,
+)
+
+
+def _read_header(path: str) -> Optional[list[str]]:
+    """파일의 헤더(첫 줄)만 읽습니다. 파일이 없으면 None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, newline='', encoding='utf-8') as f:
+        return next(csv.reader(f), [])
+
+
+def _read_options(header: Optional[list[str]], schema: CsvSchema, use_pyarrow: bool) -> dict:
+    """헤더와 스키마로 pd.read_csv 옵션(usecols, dtype, parse_dates, na_values)을 만듭니다."""
+    declared = set(schema.dtypes) | set(schema.date_columns)
+    if header is None:
+        # 헤더를 알 수 없으면(파일이 없는 경우 등) 선언된 컬럼이 모두 있다고 보고 옵션을 만듭니다.
+        header = list(schema.dtypes) + [c for c in schema.date_columns if c not in schema.dtypes]
+
+    columns = [c for c in header if c in declared] if schema.declared_only else list(header)
+    dtype = {c: schema.dtypes[c] for c in columns if c in schema.dtypes}
+    if schema.default_dtype:
+        dtype.update({c: schema.default_dtype for c in columns if c not in declared})
+
+    date_columns = [c for c in schema.date_columns if c in columns]
+    options = {'usecols': columns if schema.declared_only else None, 'dtype': dtype}
+    if use_pyarrow:
+        dtype.update({c: schema.date_columns[c] for c in date_columns})
+    elif date_columns:
+        options.update(parse_dates=date_columns, date_format=schema.date_format)
+
+    # 문자열 컬럼은 기본 빈 값 목록을 빼고 읽습니다.
+    if any(dtype.get(c) in TEXT_DTYPES for c in columns):
+        if use_pyarrow:
+            na_values = ['']
+        else:
+            na_values = {c: [''] if dtype.get(c) in TEXT_DTYPES else DEFAULT_NA_VALUES for c in columns}
+        options.update(keep_default_na=False, na_values=na_values)
+    return options
+
+
+def _arrow_type(dtype: str):
+    """스키마의 pandas dtype 문자열을 pyarrow 타입으로 변환합니다."""
+    if dtype.startswith('datetime64[ns'):
+        return pa.timestamp('ns', tz='UTC' if 'UTC' in dtype else None)
+    if dtype == 'category':
+        return pa.dictionary(pa.int32(), pa.string())
+    return {'str': pa.string(), 'float64': pa.float64(), 'int64': pa.int64()}[dtype]
+
+
+def _read_large_with_arrow(path: str, options: dict) -> pd.DataFrame:
+    """
+    pyarrow.csv 로 큰 파일을 읽습니다.
+    변환한 컬럼의 Arrow 버퍼를 바로 해제하므로(self_destruct) 최대 메모리가 DataFrame 크기 근처로 유지됩니다.
+    문자열 컬럼은 빈 값 목록을 적용하지 않고(strings_can_be_null=False) 읽은 뒤 빈 칸만 NaN 으로 바꿉니다.
+    """
+    convert_options = pa_csv.ConvertOptions(
+        column_types={c: _arrow_type(t) for c, t in options['dtype'].items()},
+        include_columns=options['usecols'] or [],
+        strings_can_be_null=False,
+    )
+    table = pa_csv.read_csv(path, convert_options=convert_options)
+    text_columns = [
+        name for name, column_type in zip(table.column_names, table.schema.types)
+        if pa.types.is_string(column_type) or pa.types.is_dictionary(column_type)
+    ]
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    del table
+    for column in text_columns:
+        blank = df[column] == ''
+        if blank.any():
+            df[column] = df[column].mask(blank)
+    return df
+
+
+def read_csv(path: str, schema: CsvSchema) -> pd.DataFrame:
+    """
+    스키마에 따라 CSV 파일을 읽어 DataFrame 으로 반환합니다.
+    파일이 없으면 pd.read_csv 와 같이 FileNotFoundError 를 발생시킵니다.
+    """
+    path = str(path)
+    options = _read_options(_read_header(path), schema, PYARROW_AVAILABLE)
+
+    large = os.path.exists(path) and os.path.getsize(path) >= settings.CSV_CHUNK_THRESHOLD_MB * 1024 * 1024
+
+    if PYARROW_AVAILABLE and large:
+        df = _read_large_with_arrow(path, options)
+    elif PYARROW_AVAILABLE:
+        try:
+            df = pd.read_csv(path, engine='pyarrow', **options)
+        except ValueError:
+            # 숫자 컬럼에 'NA' 같은 빈 값 표시가 있어 변환하지 못한 경우입니다.
+            df = pd.read_csv(path, **_read_options(_read_header(path), schema, use_pyarrow=False))
+    elif large:
+        chunks = pd.read_csv(path, chunksize=settings.CSV_CHUNK_ROWS, **options)
+        df = pd.concat(chunks, ignore_index=True)
+    else:
+        df = pd.read_csv(path, **options)
+
+    return _finalize(df, schema)
+
+
+def _finalize(df: pd.DataFrame, schema: CsvSchema) -> pd.DataFrame:
+    """
+    엔진이 날짜를 변환하지 못한 경우(형식이 섞인 경우 등)에만 한 번 더 변환하고,
+    빈 값이 없는 integer_columns 를 int64 로 바꿉니다.
+    """
+    for column, dtype in schema.date_columns.items():
+        if column not in df.columns:
+            continue
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column])
+        if str(df[column].dtype) != dtype:
+            df[column] = df[column].astype(dtype)
+    for column in schema.integer_columns:
+        if column in df.columns and df[column].dtype.kind == 'f' and not df[column].isna().any():
+            df[column] = df[column].astype('int64')
+    return df
+
+
+def parquet_path_for(path: str) -> str:
+    """CSV 경로에 대응하는 Parquet 경로 (확장자만 다름)"""
+    return os.path.splitext(str(path))[0] + '.parquet'
+
+
+def _use_parquet(path: str) -> bool:
+    """CSV 대신 같은 이름의 Parquet 파일을 읽을지 여부"""
+    if not (PYARROW_AVAILABLE and settings.PREFER_PARQUET):
+        return False
+    parquet_path = parquet_path_for(path)
+    if not os.path.exists(parquet_path):
+        return False
+    # CSV 만 새로 저장된 경우에는 오래된 Parquet 대신 CSV 를 읽습니다.
+    return not os.path.exists(path) or os.path.getmtime(parquet_path) >= os.path.getmtime(path)
+
+
+def read_parquet(path: str, schema: CsvSchema) -> pd.DataFrame:
+    """스키마에 따라 Parquet 파일을 읽습니다. 저장된 타입이 스키마와 다른 컬럼만 변환합니다."""
+    header = pa_parquet.read_schema(path).names
+    options = _read_options(header, schema, use_pyarrow=True)
+    table = pa_parquet.read_table(path, columns=options['usecols'])
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    del table
+
+    for column, dtype in options['dtype'].items():
+        if column in schema.date_columns or str(df[column].dtype) == dtype:
+            continue
+        df[column] = df[column].astype(dtype)
+    return _finalize(df, schema)
+
+
+def read_table(path: str, schema: CsvSchema) -> pd.DataFrame:
+    """
+    데이터 파일을 읽습니다. 최신 Parquet 파일이 있으면 Parquet 를, 없으면 CSV 를 읽습니다.
+    """
+    if _use_parquet(str(path)):
+        return read_parquet(parquet_path_for(path), schema)
+    return read_csv(path, schema)
@@ -2,51 +2,99 @@ import pandas as pd
 import os
 from typing import Optional
 from app.core.config import settings
+from app.services import csv_loader
+from app.services.statement_store import StatementStore, wide_to_long
 
 class DisclosureService:
     """
-    금융 공시 데이터를 불러오는 서비스를 담당하는 클래스입니다.
+    금융 공시(재무제표) 데이터를 불러오는 서비스를 담당하는 클래스입니다.
+    재무제표는 긴(long) 형식 저장소(StatementStore)로 한 번만 불러오고, 요청한 항목만 pivot 하여 반환합니다.
     """
 
+    # /stocks/financials/annual, /stocks/financials/quarterly 응답(Financials 스키마)에 포함되는 항목
+    FINANCIALS_LINE_ITEMS = [
+        'Total Revenue', 'Cost Of Revenue', 'Gross Profit', 'Operating Income', 'Operating Expense',
+        'Net Income', 'Diluted EPS', 'Total Liabilities Net Minority Interest', 'Stockholders Equity',
+        'Working Capital', 'Net Debt',
+    ]
+
     def __init__(self):
         """
-        설정(settings)에 명시된 경로를 사용하여 서비스를 초기화합니다.
+        설정(settings)에 명시된 경로를 사용하여 서비스를 초기화하고 재무제표 저장소를 불러옵니다.
+        FINANCIAL_STATEMENTS_PATH 가 있으면 긴 형식 파일을, 없으면 기존 연간/분기 wide CSV 를 변환하여 사용합니다.
         """
+        self.statements_path = settings.FINANCIAL_STATEMENTS_PATH
         self.annual_path = settings.ANNUAL_FINANCIALS_PATH
         self.quarterly_path = settings.QUARTERLY_FINANCIALS_PATH
+        self.store: Optional[StatementStore] = None
+        self.load_store()
 
-    def get_annual_financials(self) -> Optional[pd.DataFrame]:
-        """
-        설정에 정의된 경로에서 연간 재무 데이터를 불러와 반환합니다.
+    @staticmethod
+    def _exists(path: Optional[str]) -> bool:
+        """CSV 또는 같은 이름의 Parquet 파일이 있는지 여부"""
+        return bool(path) and (os.path.exists(path) or os.path.exists(csv_loader.parquet_path_for(path)))
 
-        반환값:
-            Optional[pd.DataFrame]: 연간 재무 데이터가 담긴 pandas DataFrame, 
-                                    파일을 찾거나 읽을 수 없는 경우 None을 반환합니다.
+    def load_store(self) -> Optional[StatementStore]:
+        """
+        재무제표 저장소를 불러옵니다. 이미 불러왔으면 그대로 반환하고, 불러올 파일이 없거나 읽지 못하면 None 을 반환합니다.
         """
+        if self.store is not None:
+            return self.store
         try:
-            if not self.annual_path or not os.path.exists(self.annual_path):
-                print(f"오류: 연간 재무 데이터 파일을 찾을 수 없거나 경로가 설정되지 않았습니다. 경로: {self.annual_path}")
-                return None
-            df = pd.read_csv(self.annual_path)
-            return df
+            if self._exists(self.statements_path):
+                df = csv_loader.read_table(self.statements_path, csv_loader.FINANCIAL_STATEMENTS_LONG)
+                self.store = StatementStore(df)
+            else:
+                # 기존 wide CSV (nasdaq_financials_{annual,quarterly}_all.csv) 를 긴 형식으로 변환합니다.
+                frames = [
+                    wide_to_long(csv_loader.read_table(path, csv_loader.FINANCIAL_STATEMENTS), period)
+                    for period, path in (('annual', self.annual_path), ('quarterly', self.quarterly_path))
+                    if self._exists(path)
+                ]
+                if not frames:
+                    print(f"오류: 재무제표 데이터 파일을 찾을 수 없거나 경로가 설정되지 않았습니다. "
+                          f"경로: {self.statements_path or (self.annual_path, self.quarterly_path)}")
+                    return None
+                self.store = StatementStore.from_frames(frames)
         except Exception as e:
-            print(f"연간 재무 CSV 파일을 읽는 중 오류가 발생했습니다: {e}")
+            print(f"재무제표 데이터를 읽는 중 오류가 발생했습니다: {e}")
+            return None
+        return self.store
+
+    def get_statements(self, period: str = 'annual', symbols: Optional[list[str]] = None,
+                       line_items: Optional[list[str]] = None, statement: Optional[str] = None,
+                       start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        요청한 종목/항목만 wide 형태(Symbol, Name, Date, 항목...)로 반환합니다. 저장소가 없으면 None.
+        """
+        store = self.load_store()
+        if store is None:
+            return None
+        return store.pivot(period, symbols, line_items, statement, start_date, end_date)
+
+    def get_line_items(self, period: Optional[str] = None, statement: Optional[str] = None) -> Optional[list[str]]:
+        """저장된 재무제표 항목 이름 목록. 저장소가 없으면 None."""
+        store = self.load_store()
+        if store is None:
             return None
+        return store.line_items(period, statement)
+
+    def get_annual_financials(self, symbols: Optional[list[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        연간 재무 데이터(FINANCIALS_LINE_ITEMS 항목)를 반환합니다.
+
+        반환값:
+            Optional[pd.DataFrame]: 연간 재무 데이터가 담긴 pandas DataFrame,
+                                    파일을 찾거나 읽을 수 없는 경우 None을 반환합니다.
+        """
+        return self.get_statements('annual', symbols, self.FINANCIALS_LINE_ITEMS)
 
-    def get_quarterly_financials(self) -> Optional[pd.DataFrame]:
+    def get_quarterly_financials(self, symbols: Optional[list[str]] = None) -> Optional[pd.DataFrame]:
         """
-        설정에 정의된 경로에서 분기별 재무 데이터를 불러와 반환합니다.
+        분기별 재무 데이터(FINANCIALS_LINE_ITEMS 항목)를 반환합니다.
 
         반환값:
             Optional[pd.DataFrame]: 분기별 재무 데이터가 담긴 pandas DataFrame,
                                     파일을 찾거나 읽을 수 없는 경우 None을 반환합니다.
         """
-        try:
-            if not self.quarterly_path or not os.path.exists(self.quarterly_path):
-                print(f"오류: 분기별 재무 데이터 파일을 찾을 수 없거나 경로가 설정되지 않았습니다. 경로: {self.quarterly_path}")
-                return None
-            df = pd.read_csv(self.quarterly_path)
-            return df
-        except Exception as e:
-            print(f"분기별 재무 CSV 파일을 읽는 중 오류가 발생했습니다: {e}")
-            return None
+        return self.get_statements('quarterly', symbols, self.FINANCIALS_LINE_ITEMS)
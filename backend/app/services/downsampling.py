@@ -0,0 +1,103 @@
+"""
+차트용 시계열 리샘플링/다운샘플링 모듈입니다.
+
+- resample_ohlcv: (Symbol, Date) 순으로 정렬된 일봉 테이블을 주봉/월봉으로 한 번에 집계합니다.
+- lttb_indices: LTTB(Largest-Triangle-Three-Buckets) 알고리즘으로 시각적으로 중요한 점만 남깁니다.
+"""
+import numpy as np
+import pandas as pd
+
+# 지원하는 봉 간격
+INTERVALS = ('1d', '1w', '1M')
+
+# 컬럼별 집계 방식 (목록에 없는 수치 컬럼은 기간의 마지막 값을 사용합니다)
+_FIRST_COLUMNS = ('Symbol', 'Open')
+_MAX_COLUMNS = ('High',)
+_MIN_COLUMNS = ('Low',)
+_SUM_COLUMNS = ('Volume', '거래액')
+
+
+def _period_keys(dates: np.ndarray, interval: str) -> np.ndarray:
+    """날짜 배열을 기간(주/월) 키 정수 배열로 변환합니다."""
+    if interval == '1M':
+        return dates.astype('datetime64[M]').astype(np.int64)
+    # 1970-01-01은 목요일이므로 3일을 더해 월요일에 주가 바뀌도록 맞춥니다.
+    days = dates.astype('datetime64[D]').astype(np.int64)
+    return (days + 3) // 7
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    (Symbol, Date) 순으로 정렬된 일봉 DataFrame을 주봉('1w') 또는 월봉('1M')으로 집계합니다.
+
+    - Open: 기간 첫 값, High: 최대, Low: 최소, Close: 기간 마지막 값
+    - Volume, 거래액: 합계
+    - High, Low, 합계 컬럼은 pandas 집계처럼 빈 값(NaN)을 건너뜁니다. (하루가 비어도 기간 전체가 NaN 이 되지 않음)
+    - Date: 기간 내 마지막 거래일
+    - 그 외 컬럼(이동평균, RSI 등 지표): 기간 마지막 거래일의 값
+    """
+    if interval == '1d' or df.empty:
+        return df
+    if interval not in INTERVALS:
+        raise ValueError(f"지원하지 않는 interval 입니다: {interval}")
+
+    symbols = df['Symbol'].to_numpy()
+    keys = _period_keys(df['Date'].to_numpy(), interval)
+    boundary = np.ones(len(df), dtype=bool)
+    boundary[1:] = (symbols[1:] != symbols[:-1]) | (keys[1:] != keys[:-1])
+    starts = np.flatnonzero(boundary)
+    lasts = np.append(starts[1:], len(df)) - 1
+
+    result = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col in _FIRST_COLUMNS:
+            result[col] = values[starts]
+        elif col in _MAX_COLUMNS:
+            result[col] = np.fmax.reduceat(values, starts)
+        elif col in _MIN_COLUMNS:
+            result[col] = np.fmin.reduceat(values, starts)
+        elif col in _SUM_COLUMNS:
+            result[col] = np.add.reduceat(np.nan_to_num(values) if values.dtype.kind == 'f' else values, starts)
+        else:
+            result[col] = values[lasts]
+    return pd.DataFrame(result, columns=df.columns)
+
+
+def lttb_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    LTTB 알고리즘으로 y 시계열에서 남길 점의 인덱스를 반환합니다. (x 축은 행 순서)
+
+    첫 점과 마지막 점은 항상 포함되며, 나머지 구간을 (max_points - 2)개 버킷으로 나눈 뒤
+    버킷마다 이전 선택 점과 다음 버킷 평균점이 이루는 삼각형의 넓이가 가장 큰 점을 고릅니다.
+    각 버킷 내부 계산은 벡터 연산으로 처리합니다.
+    """
+    n = len(y)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 3:
+        raise ValueError("max_points는 3 이상이어야 합니다.")
+
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(n, dtype=np.float64)
+    n_buckets = max_points - 2
+    # 버킷 경계: 첫 점(0)과 마지막 점(n-1)을 제외한 [1, n-1) 구간을 균등 분할
+    edges = (np.arange(n_buckets + 1) * ((n - 2) / n_buckets)).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_buckets):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < n_buckets:
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.nanargmax(area)) if not np.isnan(area).all() else lo
+        selected[i + 1] = a
+    return selected
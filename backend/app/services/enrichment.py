@@ -0,0 +1,142 @@
+"""
+주가 테이블 지표 계산(enrichment) 엔진입니다.
+
+지표(이동 평균, EMA, RSI)는 모두 종목별로 독립적이므로, 종목 코드 순으로 유니버스를 연속된 구간(파티션)으로 나누고
+각 파티션을 작업자 풀에서 따로 계산합니다. 파티션은 종목 순서대로 나뉘므로 결과를 순서대로 이어 붙이면
+전체를 한 번에 계산한 것과 같은 (Symbol, Date) 순서의 테이블이 됩니다.
+
+- 'thread' 실행기(기본값): DuckDB 쿼리와 numpy 지표 커널은 GIL 을 놓고 실행되므로 스레드만으로 여러 코어를 씁니다.
+  (파티션마다 DuckDB 연결을 따로 만들고, 작업자가 여럿이면 연결당 DuckDB 스레드를 1개로 제한합니다.)
+- 'process' 실행기: 파티션을 프로세스 풀로 보냅니다. 파티션 직렬화 비용이 들지만 GIL 과 무관합니다.
+- output_dir 가 주어지면 각 작업자가 자기 파티션을 part-00000.parquet 형식의 파일로 따로 저장합니다.
+
+작업자 수는 settings.ENRICHMENT_WORKERS (0 이면 CPU 수) 로 정합니다.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from app.services import indicators
+
+# 작업자 하나당 파티션 수 (파티션 크기가 고르지 않아도 작업자가 쉬지 않도록 조금 잘게 나눕니다.)
+PARTITIONS_PER_WORKER = 4
+
+MOVING_AVERAGE_QUERY = """
+SELECT
+    *,
+    AVG("Close") OVER (
+        PARTITION BY "Symbol"
+        ORDER BY "Date" ROWS
+        BETWEEN 4 PRECEDING AND CURRENT ROW
+    ) AS MA_5,
+    AVG("Close") OVER (
+        PARTITION BY "Symbol"
+        ORDER BY "Date" ROWS
+        BETWEEN 19 PRECEDING AND CURRENT ROW
+    ) AS MA_20,
+    AVG("Close") OVER (
+        PARTITION BY "Symbol"
+        ORDER BY "Date" ROWS
+        BETWEEN 59 PRECEDING AND CURRENT ROW
+    ) AS MA_60
+FROM stocks
+ORDER BY "Symbol", "Date"
+"""
+
+
+def resolve_workers(workers: int = None) -> int:
+    """작업자 수를 정합니다. None 또는 0 이하이면 CPU 수를 사용합니다."""
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def split_by_symbol(df: pd.DataFrame, num_partitions: int) -> list[pd.DataFrame]:
+    """
+    종목 코드 순으로 정렬한 유니버스를 num_partitions 개의 연속 구간으로 나눕니다.
+    한 종목의 행은 항상 같은 파티션에 들어가며, 빈 파티션은 반환하지 않습니다.
+    """
+    codes, uniques = pd.factorize(df['Symbol'], sort=True)
+    num_partitions = max(1, min(num_partitions, len(uniques)))
+    if num_partitions == 1:
+        return [df] if len(df) else []
+
+    partition_of = codes.astype(np.int64) * num_partitions // len(uniques)
+    order = np.argsort(partition_of, kind='stable')
+    bounds = np.searchsorted(partition_of[order], np.arange(1, num_partitions))
+    return [df.iloc[rows] for rows in np.split(order, bounds) if len(rows)]
+
+
+def enrich_partition(df: pd.DataFrame, duckdb_threads: int = None) -> pd.DataFrame:
+    """
+    파티션 하나의 지표를 계산하여 (Symbol, Date) 순으로 정렬된 DataFrame 을 반환합니다.
+    이동 평균은 DuckDB 윈도 함수로, RSI(Wilder 평활)와 EMA는 재귀식이므로 지표 커널에서 종목별 단일 패스로 계산합니다.
+    """
+    # duckdb 는 지표 계산에만 쓰이므로 모듈 import 시간을 줄이기 위해 여기서 가져옵니다.
+    import duckdb
+    con = duckdb.connect(database=':memory:', read_only=False)
+    try:
+        if duckdb_threads:
+            con.execute(f"SET threads TO {int(duckdb_threads)}")
+        con.register('stocks', df)
+        df_enriched = con.execute(MOVING_AVERAGE_QUERY).fetchdf()
+    finally:
+        con.close()
+
+    close = df_enriched['Close'].to_numpy(dtype='float64')
+    starts = indicators.group_starts(df_enriched['Symbol'].to_numpy())
+    df_enriched['EMA_12'] = indicators.ema(close, 12, starts)
+    df_enriched['EMA_26'] = indicators.ema(close, 26, starts)
+    df_enriched['RSI_14'] = indicators.rsi_wilder(close, 14, starts)
+    return df_enriched
+
+
+def partition_path(output_dir: str, number: int) -> str:
+    return os.path.join(output_dir, f'part-{number:05d}.parquet')
+
+
+def _run_partition(task: tuple) -> pd.DataFrame:
+    """작업자에서 실행되는 단위 작업: (번호, 파티션, DuckDB 스레드 수, 저장 폴더)"""
+    number, df, duckdb_threads, output_dir = task
+    df_enriched = enrich_partition(df, duckdb_threads)
+    if output_dir:
+        df_enriched.to_parquet(partition_path(output_dir, number), index=False)
+    return df_enriched
+
+
+def enrich(df: pd.DataFrame, workers: int = None, executor: str = 'thread', output_dir: str = None,
+           num_partitions: int = None) -> pd.DataFrame:
+    """
+    전체 주가 테이블의 지표를 종목 파티션 단위로 병렬 계산하고 (Symbol, Date) 순으로 합친 결과를 반환합니다.
+    :param workers: 작업자 수 (None 또는 0 이면 CPU 수). 1 이면 파티션을 나누지 않고 현재 스레드에서 계산합니다.
+    :param executor: 'thread' 또는 'process'
+    :param output_dir: 지정하면 파티션별 결과를 part-NNNNN.parquet 로 저장합니다.
+    :param num_partitions: 파티션 수 (기본값: 작업자 수 × PARTITIONS_PER_WORKER)
+    """
+    if executor not in ('thread', 'process'):
+        raise ValueError(f"지원하지 않는 실행기입니다: {executor}")
+    workers = resolve_workers(workers)
+    if num_partitions is None:
+        num_partitions = 1 if workers == 1 else workers * PARTITIONS_PER_WORKER
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    partitions = split_by_symbol(df, num_partitions)
+    if not partitions:
+        return enrich_partition(df)
+
+    # 작업자가 하나면 DuckDB 가 자체 스레드를 모두 쓰도록 두고, 여럿이면 작업자끼리 코어를 나눠 씁니다.
+    duckdb_threads = None if workers == 1 else 1
+    tasks = [(number, part, duckdb_threads, output_dir) for number, part in enumerate(partitions)]
+    if workers == 1 or len(tasks) == 1:
+        results = [_run_partition(task) for task in tasks]
+    else:
+        pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        with pool_class(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_run_partition, tasks))
+
+    if len(results) == 1:
+        return results[0]
+    return pd.concat(results, ignore_index=True)
@@ -3,6 +3,8 @@ from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from app.core.config import settings
+from app.core.metrics import phase
+from app.services import csv_loader
 
 class FinancialsInfoService:
     def __init__(self):
@@ -15,7 +17,7 @@ class FinancialsInfoService:
             if not self.data_path.exists():
                 raise FileNotFoundError(f"CSV file not found at: {self.data_path}")
             
-            self.df = pd.read_csv(self.data_path)
+            self.df = csv_loader.read_table(self.data_path, csv_loader.FINANCIAL_INFO)
         
         return self.df
     
@@ -24,12 +26,13 @@ class FinancialsInfoService:
         if self.df is None:
             self.load_csv_data()
         
-        filtered_data = self.df[self.df['Symbol'] == symbol]
+        with phase("filter"):
+            filtered_data = self.df[self.df['Symbol'] == symbol]
         
         if filtered_data.empty:
             return []
         
         # NaN 값을 None으로 변환하여 JSON 직렬화 오류 방지
-        processed_data = filtered_data.astype(object).where(pd.notnull(filtered_data), None)
-        
-        return processed_data.to_dict('records')
\ No newline at end of file
+        with phase("serialize"):
+            processed_data = filtered_data.astype(object).where(pd.notnull(filtered_data), None)
+            return processed_data.to_dict('records')
\ No newline at end of file
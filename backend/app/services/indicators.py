@@ -0,0 +1,185 @@
+"""
+기술적 지표 계산 커널 모듈입니다.
+
+모든 함수는 (Symbol, Date) 순으로 정렬된 1차원 배열과 각 종목 그룹의 시작 위치(starts)를 받습니다.
+재귀식(EMA, Wilder 평활)은 종목별로 "그룹 내 위치"를 기준으로 정렬한 2차원 패널(종목 × 위치)로 펼친 뒤,
+시간 축을 한 번만 순회하면서 모든 종목을 동시에 벡터 연산으로 갱신합니다. (O(n) 단일 패스)
+패널은 종목을 길이 순으로 묶어 PANEL_CELLS 칸 이하로만 만들므로, 상장 기간이 크게 다른 종목이 섞여도
+(가장 긴 종목 길이 × 전체 종목 수) 크기의 패널을 한 번에 만들지 않습니다.
+
+값이 NaN 인 행(종가 누락 등)은 pandas 의 ewm(ignore_na=True) 처럼 건너뜁니다.
+평활값은 NaN 행에서 직전 값을 유지하고 다음 유효한 값부터 다시 갱신되며, 초기값(SMA)은 유효한 값만으로 계산합니다.
+"""
+import numpy as np
+
+# 패널 하나의 최대 칸 수 (float64 기준 32MB). 지표 하나를 계산하는 동안 이 크기의 패널 몇 개만 메모리에 둡니다.
+PANEL_CELLS = 1 << 22
+
+
+def group_starts(symbols: np.ndarray) -> np.ndarray:
+    """
+    정렬된 심볼 배열에서 각 그룹이 시작하는 위치를 반환합니다.
+    예: ['A', 'A', 'B'] -> [0, 2]
+    """
+    symbols = np.asarray(symbols)
+    if len(symbols) == 0:
+        return np.array([], dtype=np.int64)
+    changed = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+    return np.concatenate(([0], changed)).astype(np.int64)
+
+
+def _group_layout(n: int, starts) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """그룹 시작 위치로부터 (starts, lengths, 그룹 내 위치) 를 계산합니다."""
+    if starts is None:
+        starts = np.array([0], dtype=np.int64) if n else np.array([], dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.diff(np.append(starts, n))
+    positions = np.arange(n) - np.repeat(starts, lengths)
+    return starts, lengths, positions
+
+
+def _chunks(lengths: np.ndarray):
+    """
+    종목을 길이 순으로 묶어 (종목 번호 배열) 을 차례로 반환합니다.
+    묶음의 패널 크기(가장 긴 종목 길이 × 종목 수)는 PANEL_CELLS 이하입니다. (한 종목이 더 길면 그 종목만 묶음)
+    """
+    order = np.argsort(lengths, kind='stable')
+    order = order[lengths[order] > 0]
+    begin = 0
+    while begin < len(order):
+        end = begin + 1
+        # 길이 순이므로 묶음의 패널 폭은 마지막 종목의 길이입니다.
+        while end < len(order) and (end + 1 - begin) * lengths[order[end]] <= PANEL_CELLS:
+            end += 1
+        yield order[begin:end]
+        begin = end
+
+
+def _by_panel(values: np.ndarray, starts, kernel) -> np.ndarray:
+    """
+    종목 묶음마다 값을 (위치 × 종목) 패널로 펼쳐 kernel(패널) 을 계산하고, 결과를 원래 순서의 1차원 배열로 모읍니다.
+    kernel 은 같은 모양의 패널을 반환해야 합니다.
+    """
+    starts, lengths, _ = _group_layout(len(values), starts)
+    out = np.full(len(values), np.nan)
+    for groups in _chunks(lengths):
+        chunk_lengths = lengths[groups]
+        _, _, positions = _group_layout(int(chunk_lengths.sum()), np.cumsum(chunk_lengths) - chunk_lengths)
+        rows = np.repeat(starts[groups], chunk_lengths) + positions
+        panel = _to_panel(values[rows], chunk_lengths, positions)
+        out[rows] = _from_panel(kernel(panel), chunk_lengths, positions)
+    return out
+
+
+def _to_panel(values: np.ndarray, lengths: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """1차원 배열을 (위치 × 종목) 패널로 펼칩니다. 빈 칸은 NaN 입니다."""
+    width = int(lengths.max()) if len(lengths) else 0
+    panel = np.full((width, len(lengths)), np.nan)
+    group_ids = np.repeat(np.arange(len(lengths)), lengths)
+    panel[positions, group_ids] = values
+    return panel
+
+
+def _from_panel(panel: np.ndarray, lengths: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """패널을 다시 원래 순서의 1차원 배열로 되돌립니다."""
+    group_ids = np.repeat(np.arange(len(lengths)), lengths)
+    return panel[positions, group_ids]
+
+
+def _seeded_ewm(panel: np.ndarray, alpha: float, seed_len: int) -> np.ndarray:
+    """
+    패널의 각 열(종목)에 대해 SMA로 초기화된 지수 평활을 계산합니다.
+
+    처음 seed_len 개 유효한 값의 단순 평균을 seed_len 번째 유효한 값의 위치에 초기값으로 두고,
+    이후에는 y[t] = (1 - alpha) * y[t-1] + alpha * x[t] 를 적용합니다. 초기값 이전 위치는 NaN 입니다.
+    x[t] 가 NaN 이면 y[t] = y[t-1] 입니다. (패널의 빈 칸도 NaN 이므로 결과에 영향을 주지 않습니다)
+    """
+    out = np.full_like(panel, np.nan)
+    valid = ~np.isnan(panel)
+    counts = np.cumsum(valid, axis=0)
+    if not len(panel) or counts[-1].max() < seed_len:
+        return out
+
+    seeded = counts[-1] >= seed_len
+    columns = np.flatnonzero(seeded)
+    seed_rows = np.argmax(counts[:, columns] >= seed_len, axis=0)
+    sums = np.cumsum(np.where(valid[:, columns], panel[:, columns], 0.0), axis=0)
+    out[seed_rows, columns] = sums[seed_rows, np.arange(len(columns))] / seed_len
+    del sums
+
+    # 유효한 값이 열마다 끊김 없이 이어지고 초기값 위치가 모두 같으면 NaN 처리 없이 갱신합니다.
+    # (뒤쪽 빈 칸은 NaN 이 되지만 결과로 읽지 않습니다)
+    first = np.argmax(valid[:, columns], axis=0)
+    last = len(panel) - 1 - np.argmax(valid[::-1, columns], axis=0)
+    contiguous = (counts[-1, columns] == last - first + 1).all()
+    gaps = not (contiguous and seed_rows.min() == seed_rows.max())
+    decay = 1.0 - alpha
+    for t in range(seed_rows.min() + 1, panel.shape[0]):
+        step = decay * out[t - 1] + alpha * panel[t]
+        if gaps:
+            # NaN 값은 건너뛰고, 아직 초기값 전이거나 이번 행에서 초기화된 열은 그대로 둡니다.
+            step = np.where(valid[t], step, out[t - 1])
+            step = np.where(np.isnan(out[t]), step, out[t])
+        out[t] = step
+    return out
+
+
+def ema(values, span: int, starts=None) -> np.ndarray:
+    """
+    종목별 지수이동평균(EMA)을 계산합니다. alpha = 2 / (span + 1)
+
+    첫 값은 처음 span 개 값의 단순 평균이며, 그 이전 위치는 NaN 입니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return _by_panel(values, starts, lambda panel: _seeded_ewm(panel, 2.0 / (span + 1), span))
+
+
+def wilder_smooth(values, period: int, starts=None) -> np.ndarray:
+    """
+    Wilder 평활(RMA)을 계산합니다. alpha = 1 / period 인 EMA와 같습니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return _by_panel(values, starts, lambda panel: _seeded_ewm(panel, 1.0 / period, period))
+
+
+def rsi_wilder(close, period: int = 14, starts=None) -> np.ndarray:
+    """
+    Wilder 방식의 RSI를 계산합니다.
+
+    각 종목의 첫 period 개 가격 변화량의 단순 평균으로 평균 상승/하락폭을 초기화한 뒤
+    Wilder 평활을 적용합니다. 따라서 종목별 처음 period 개 행은 NaN 입니다.
+    상승폭과 하락폭이 모두 0이면 중립값 50을 반환합니다.
+    종가가 NaN 인 행은 건너뛰며(직전 RSI 유지), 다음 유효한 종가는 직전 유효한 종가와 비교합니다.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    return _by_panel(close, starts, lambda panel: _rsi_panel(panel, period))
+
+
+def _rsi_panel(panel: np.ndarray, period: int) -> np.ndarray:
+    """종가 패널의 열(종목)별 Wilder RSI"""
+    diff = np.full_like(panel, np.nan)
+    diff[1:] = panel[1:] - panel[:-1]
+    missing = np.isnan(diff[1:]) & ~np.isnan(panel[1:])
+    if missing.any():
+        # 직전 종가가 NaN 이면 그 전의 마지막 유효한 종가와 비교합니다.
+        rows = np.arange(len(panel))[:, None]
+        last_valid = np.maximum.accumulate(np.where(np.isnan(panel), 0, rows), axis=0)
+        diff[1:] = panel[1:] - np.take_along_axis(panel, last_valid, axis=0)[:-1]
+        del last_valid
+    del missing
+    with np.errstate(invalid="ignore"):
+        gains = np.where(diff > 0, diff, np.where(np.isnan(diff), np.nan, 0.0))
+        losses = np.where(diff < 0, -diff, np.where(np.isnan(diff), np.nan, 0.0))
+    del diff
+
+    alpha = 1.0 / period
+    avg_gain = _seeded_ewm(gains, alpha, period)
+    del gains
+    avg_loss = _seeded_ewm(losses, alpha, period)
+    del losses
+
+    total = avg_gain + avg_loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = np.where(total > 0, 100.0 * avg_gain / total, 50.0)
+    rsi[np.isnan(total)] = np.nan
+    return rsi
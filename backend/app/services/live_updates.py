@@ -0,0 +1,101 @@
+"""
+데이터 버전 변경분(delta) 발행 모듈입니다.
+
+데이터셋이 (재)로드될 때마다 레지스트리가 호출하며, 직전 버전에서 기억해 둔 상태와 비교하여
+바뀐 부분만 이벤트 버스(app.core.events)로 발행합니다.
+    - bars    : 종목별 새 일봉 (종목별 마지막 봉 날짜 이후의 행)
+    - alerts  : 알림 규칙(settings.SSE_ALERT_RULES)을 새로 만족하게 된 종목
+    - news    : 처음 보는 URL 의 뉴스
+    - version : 데이터셋 버전 변경 (종목 없이 모든 구독자에게)
+처음 로드할 때는 기준 상태만 기록하고 version 이벤트만 발행합니다.
+빈 데이터 버전은 기준 상태를 바꾸지 않습니다. (다음 정상 버전에서 모든 봉/알림이 새것으로 발행되지 않도록)
+"""
+import threading
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.events import EventBus
+from app.services import screener
+
+
+class LiveUpdatePublisher:
+    """직전 데이터 버전의 상태를 기억하고, 새 버전과의 차이를 이벤트로 발행합니다."""
+
+    def __init__(self, bus: EventBus, alert_rules: Optional[dict[str, str]] = None, max_bars: int = 100):
+        self.bus = bus
+        self.alert_rules = dict(settings.SSE_ALERT_RULES if alert_rules is None else alert_rules)
+        self.max_bars = max_bars
+        self._lock = threading.Lock()
+        # 직전 버전 상태 (None = 아직 로드된 적 없음)
+        self._last_bar_dates: Optional[dict[str, np.datetime64]] = None
+        self._alert_matches: Optional[dict[str, set[str]]] = None
+        self._news_urls: Optional[set[str]] = None
+
+    def _alert_state(self, service) -> dict[str, tuple[set[str], dict]]:
+        """규칙별 (조건을 만족하는 종목 집합, 종목 -> 스냅샷 행 정보)"""
+        state = {}
+        if service.df_stocks_enriched.empty:
+            return state
+        snapshot = service.get_snapshot()
+        for name, expression in self.alert_rules.items():
+            try:
+                mask = snapshot.filter_mask(screener.parse_filters(expression))
+            except ValueError as e:
+                print(f"경고: 알림 규칙 '{name}' ({expression}) 을 평가할 수 없습니다: {e}")
+                continue
+            rows = np.flatnonzero(mask)
+            symbols = snapshot.columns['Symbol'][rows]
+            dates = np.datetime_as_string(snapshot.columns['Date'][rows].astype('datetime64[D]'), unit='D')
+            closes = snapshot.columns['Close'][rows]
+            state[name] = (set(symbols.tolist()), {
+                s: {"Date": d, "Close": float(c)} for s, d, c in zip(symbols.tolist(), dates.tolist(), closes)
+            })
+        return state
+
+    def on_prices(self, service):
+        """주가 데이터셋이 (재)로드되면 호출됩니다."""
+        with self._lock:
+            version = service.data_version
+            if service.df_stocks_enriched.empty:
+                print(f"경고: 주가 데이터 버전 {version} 이 비어 있어 변경분 기준을 유지합니다.")
+                return
+            events = []
+            if self._last_bar_dates is not None:
+                for symbol, delta in service.get_bars_since(self._last_bar_dates, self.max_bars).items():
+                    events.append(("bars", {"symbol": symbol, "data_version": version, **delta}, symbol))
+
+            alerts = self._alert_state(service)
+            if self._alert_matches is not None:
+                for name, (matched, rows) in alerts.items():
+                    for symbol in sorted(matched - self._alert_matches.get(name, set())):
+                        events.append(("alerts", {
+                            "rule": name, "filter": self.alert_rules[name], "symbol": symbol,
+                            "data_version": version, **rows[symbol],
+                        }, symbol))
+
+            self._last_bar_dates = service.last_bar_dates()
+            self._alert_matches = {name: matched for name, (matched, _) in alerts.items()}
+            events.append(("version", {"dataset": "prices", "data_version": version}, None))
+            self.bus.publish_many(events)
+
+    def on_news(self, service):
+        """뉴스 데이터셋이 (재)로드되면 호출됩니다."""
+        with self._lock:
+            df = service._df
+            if df is None:
+                return
+            urls = df['url'].astype(str).to_numpy()
+            events = []
+            if self._news_urls is not None:
+                is_new = np.fromiter((url not in self._news_urls for url in urls), dtype=bool, count=len(urls))
+                new_rows = df[is_new].astype(object)
+                # NaN 은 JSON 에서 null 이 되도록 None 으로 바꿉니다.
+                for record in new_rows.where(new_rows.notna(), None).to_dict(orient="records"):
+                    symbol = record.get('Symbol')
+                    symbol = str(symbol).upper() if symbol else None
+                    events.append(("news", record, symbol))
+            self._news_urls = set(urls.tolist())
+            events.append(("version", {"dataset": "news", "count": len(df)}, None))
+            self.bus.publish_many(events)
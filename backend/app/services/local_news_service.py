@@ -1,41 +1,87 @@
+from typing import Optional
+
 import pandas as pd
 
 from app.core.config import settings
+from app.core.metrics import phase
+from app.services import csv_loader
+from app.services.news_index import NewsIndex
+
+# 응답 스키마(NewsItem)에서 문자열인 필드
+TEXT_FIELDS = ('Symbol', 'Name', 'title', 'url')
+
+
+def _to_records(df: pd.DataFrame) -> list:
+    """DataFrame 을 응답용 dictionary 리스트로 바꿉니다. 빈 문자열 필드(NaN)는 '' 로 바꿉니다."""
+    columns = [c for c in TEXT_FIELDS if c in df.columns and df[c].isna().any()]
+    if columns:
+        df = df.fillna({c: '' for c in columns})
+    return df.to_dict('records')
+
 
 class LocalNewsService:
-    _df = None
-    _csv_path = settings.NEWS_PATH
-
-    @classmethod
-    def _load_data(cls):
-        """CSV 파일에서 데이터를 로드하여 클래스 변수 _df에 저장합니다."""
-        if cls._df is None:
-            try:
-                cls._df = pd.read_csv(cls._csv_path)
-                # 날짜 형식 변환
-                cls._df['publishedAt'] = pd.to_datetime(cls._df['publishedAt'])
-                print(f"Successfully loaded news data from {cls._csv_path}")
-            except FileNotFoundError:
-                print(f"Error: News data file not found at {cls._csv_path}")
-                # 파일이 없을 경우 빈 데이터프레임 생성
-                cls._df = pd.DataFrame(columns=['Symbol', 'Name', 'title', 'url', 'publishedAt'])
-
-    @classmethod
-    def get_news_by_symbol(cls, symbol: str) -> list:
+    """
+    뉴스 CSV 를 읽어 보관하는 서비스입니다. 데이터 레지스트리가 로드(재로드)마다 새 인스턴스를 만들어 교체합니다.
+    previous(직전 버전 인스턴스)를 주면, 뉴스가 뒤에 추가되기만 한 경우 추가된 행만 제목 역색인에 더합니다.
+    """
+
+    def __init__(self, csv_path: str = None, previous: Optional['LocalNewsService'] = None):
+        self._csv_path = csv_path or settings.NEWS_PATH
+        self._df = self._read(required=previous is not None)
+        # 제목 역색인 (index.frame 은 _df 와 같은 데이터프레임입니다)
+        if previous is not None and previous._index.is_prefix_of(self._df):
+            self._index = previous._index.extend(self._df)
+        else:
+            self._index = NewsIndex(self._df)
+
+    def _read(self, required: bool = False) -> pd.DataFrame:
+        """
+        CSV 파일에서 뉴스 데이터를 읽습니다. 파일이 없으면 빈 데이터프레임을 반환합니다.
+        required=True(재로드)이면 FileNotFoundError 를 그대로 발생시켜 레지스트리가 기존 데이터를 유지하게 합니다.
+        """
+        try:
+            # 선언된 스키마로 읽으며 publishedAt 컬럼은 읽는 동안 datetime 으로 변환됩니다.
+            df = csv_loader.read_table(self._csv_path, csv_loader.NEWS)
+            print(f"Successfully loaded news data from {self._csv_path}")
+            return df
+        except FileNotFoundError:
+            print(f"Error: News data file not found at {self._csv_path}")
+            if required:
+                raise
+            # 파일이 없을 경우 빈 데이터프레임 생성
+            return pd.DataFrame(columns=['Symbol', 'Name', 'title', 'url', 'publishedAt'])
+
+    def get_news_by_symbol(self, symbol: str) -> list:
         """특정 심볼에 해당하는 뉴스 목록을 반환합니다."""
-        cls._load_data() # 데이터가 로드되었는지 확인
-        
-        if cls._df.empty:
+        if self._df.empty:
             return []
 
         # 심볼로 데이터 필터링 (대소문자 구분 없이)
-        result_df = cls._df[cls._df['Symbol'].str.lower() == symbol.lower()]
-        
+        with phase("filter"):
+            result_df = self._df[self._df['Symbol'].str.lower() == symbol.lower()]
+
         if result_df.empty:
             return []
-            
+
         # DataFrame을 dictionary 리스트로 변환하여 반환
-        return result_df.to_dict('records')
+        with phase("serialize"):
+            return _to_records(result_df)
+
+    def search_news(self, query: str, symbols: list[str] = None, since: str = None,
+                    sort: str = 'recency', limit: int = 50) -> list:
+        """
+        제목 역색인으로 뉴스를 검색합니다. (공백은 AND, 'OR' 는 OR)
+        sort='relevance' 이면 BM25 점수(score)를 함께 반환합니다.
+        검색어, since, sort 가 잘못되었으면 ValueError를 발생시킵니다.
+        """
+        with phase("filter"):
+            positions, scores = self._index.search(query, symbols, since, sort, limit)
+        if not len(positions):
+            return []
 
-# 서비스 인스턴스 생성 (싱글턴처럼 사용)
-local_news_service = LocalNewsService()
+        with phase("serialize"):
+            records = _to_records(self._index.frame.iloc[positions])
+            if scores is not None:
+                for record, score in zip(records, scores.tolist()):
+                    record['score'] = round(score, 6)
+            return records
@@ -0,0 +1,228 @@
+"""
+뉴스 제목 역색인(inverted index) 모듈입니다.
+
+뉴스를 로드할 때 제목을 토큰(소문자 단어)으로 나누어 (토큰 -> 문서 번호 배열, 출현 횟수 배열) 색인을 한 번 만들어 두고,
+검색 시에는 요청마다 제목 전체를 훑지 않고 검색어 토큰의 문서 목록만 교집합/합집합으로 결합합니다.
+문서 번호는 뉴스 데이터프레임의 행 위치이며, 토큰별 문서 배열은 항상 오름차순입니다.
+
+- 검색어 문법: 공백으로 구분한 단어는 AND, 'OR' 로 구분한 묶음은 OR 로 결합합니다.
+  예: "apple earnings OR recall" -> (apple AND earnings) OR recall
+- 정렬: recency(최신순) 또는 relevance(BM25 점수순, 같으면 최신순)
+- 뉴스가 뒤에 추가되기만 한 경우 extend() 로 추가된 행만 색인한 새 색인을 만듭니다.
+  (기존 색인은 바꾸지 않으므로 검색 중인 요청은 이전 색인을 그대로 사용합니다)
+"""
+import re
+from itertools import chain
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# 토큰: 유니코드 단어 문자(영문, 숫자, 한글 등)의 연속
+TOKEN_PATTERN = re.compile(r"\w+")
+# OR 연산자 (대문자로만 인식하여 일반 단어 'or' 와 구분합니다)
+OR_OPERATOR = "OR"
+SORT_ORDERS = ('recency', 'relevance')
+# BM25 매개변수
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 교집합을 구할 때 짧은 목록이 긴 목록의 이 비율보다 짧으면 이진 탐색, 아니면 전체 크기의 bool 마스크를 사용합니다.
+SEARCH_RATIO = 16
+
+
+def tokenize(text: str) -> list[str]:
+    """문자열을 소문자 토큰 목록으로 나눕니다."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query: str) -> list[list[str]]:
+    """
+    검색어를 OR 묶음별 AND 토큰 목록으로 바꿉니다.
+    예: "Apple earnings OR recall" -> [['apple', 'earnings'], ['recall']]
+    토큰이 하나도 없으면 ValueError를 발생시킵니다.
+    """
+    groups = []
+    for part in re.split(rf"\s+{OR_OPERATOR}\s+", query.strip()):
+        terms = list(dict.fromkeys(tokenize(part)))
+        if terms:
+            groups.append(terms)
+    if not groups:
+        raise ValueError(f"검색어에 검색할 단어가 없습니다: '{query}'")
+    return groups
+
+
+def _postings(titles: pd.Series, offset: int = 0) -> tuple[dict[str, tuple[np.ndarray, np.ndarray]], np.ndarray]:
+    """
+    제목 목록으로 (토큰 -> (문서 번호 배열, 출현 횟수 배열)) 과 제목별 토큰 수 배열을 만듭니다.
+    문서 번호는 offset 부터 시작합니다.
+    """
+    token_lists = [tokenize(title) for title in titles.fillna('').astype(str).tolist()]
+    lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+    if not lengths.sum():
+        return {}, lengths.astype(np.float64)
+    term_ids, terms = pd.factorize(np.fromiter(chain.from_iterable(token_lists), dtype=object, count=lengths.sum()),
+                                   sort=True)
+    doc_ids = np.repeat(np.arange(offset, offset + len(lengths), dtype=np.int64), lengths)
+    # (토큰, 문서) 쌍을 하나의 정수 키로 만들어 정렬/집계하면 토큰별로 문서 번호가 오름차순인 목록이 됩니다.
+    n_docs = offset + len(lengths)
+    keys, counts = np.unique(term_ids.astype(np.int64) * n_docs + doc_ids, return_counts=True)
+    key_terms = keys // n_docs
+    boundaries = np.flatnonzero(np.r_[True, key_terms[1:] != key_terms[:-1]])
+    ends = np.append(boundaries[1:], len(keys))
+    docs = (keys % n_docs).astype(np.int32)
+    tfs = counts.astype(np.int32)
+    terms = terms.tolist()
+    postings = {terms[key_terms[lo]]: (docs[lo:hi], tfs[lo:hi]) for lo, hi in zip(boundaries, ends)}
+    return postings, lengths.astype(np.float64)
+
+
+def _intersect(docs: np.ndarray, other: np.ndarray, n_docs: int) -> np.ndarray:
+    """오름차순 문서 번호 배열 docs 중 other 에도 있는 문서 (docs 가 더 짧다고 가정)"""
+    if not len(docs):
+        return docs
+    if len(docs) * SEARCH_RATIO < len(other):
+        positions = np.minimum(np.searchsorted(other, docs), len(other) - 1)
+        return docs[other[positions] == docs]
+    mask = np.zeros(n_docs, dtype=bool)
+    mask[other] = True
+    return docs[mask[docs]]
+
+
+class NewsIndex:
+    """뉴스 제목 역색인과 검색에 필요한 행별 배열(종목 코드, 발행 시각, 제목 길이)"""
+
+    def __init__(self, df: pd.DataFrame):
+        """뉴스 데이터프레임(행 위치 = 문서 번호)으로 색인을 만듭니다."""
+        self._postings, lengths = _postings(df['title'])
+        self._set_columns(df, lengths)
+
+    def _set_columns(self, df: pd.DataFrame, lengths: np.ndarray):
+        self.frame = df
+        codes, uniques = pd.factorize(df['Symbol'].fillna('').astype(str).str.upper())
+        # 종목 -> 해당 종목 뉴스의 문서 번호 배열 (오름차순). 종목 조건은 검색어 토큰과 같이 교집합으로 적용합니다.
+        order = np.argsort(codes, kind='stable').astype(np.int32)
+        boundaries = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self._symbol_docs = {
+            symbol: order[boundaries[code]:boundaries[code + 1]] for code, symbol in enumerate(uniques)
+        }
+        published = pd.to_datetime(df['publishedAt'], utc=True).dt.tz_localize(None)
+        # NaT 는 int64 최솟값이 되어 최신순 정렬에서 가장 뒤로 가고, since 조건에서는 제외됩니다.
+        self._published = published.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        self._lengths = lengths
+        self._avg_length = float(lengths.mean()) if len(lengths) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def is_prefix_of(self, df: pd.DataFrame) -> bool:
+        """df 가 이 색인의 뉴스 뒤에 행을 추가하기만 한 데이터인지 (url 로 비교) 확인합니다."""
+        n = len(self.frame)
+        if n == 0 or len(df) < n:
+            return False
+        return bool(np.array_equal(self.frame['url'].to_numpy(), df['url'].to_numpy()[:n]))
+
+    def extend(self, df: pd.DataFrame) -> 'NewsIndex':
+        """
+        df(이 색인의 뉴스 + 뒤에 추가된 행)에 대한 새 색인을 반환합니다.
+        추가된 행만 토큰화하고, 추가된 행에 나오는 토큰의 문서 배열만 새로 이어 붙입니다.
+        """
+        n = len(self.frame)
+        added, lengths = _postings(df['title'].iloc[n:], offset=n)
+        postings = dict(self._postings)
+        for term, (docs, tfs) in added.items():
+            current = postings.get(term)
+            postings[term] = (docs, tfs) if current is None else \
+                (np.concatenate([current[0], docs]), np.concatenate([current[1], tfs]))
+
+        index = NewsIndex.__new__(NewsIndex)
+        index._postings = postings
+        index._set_columns(df, np.concatenate([self._lengths, lengths]))
+        return index
+
+    def _docs(self, term: str) -> np.ndarray:
+        entry = self._postings.get(term)
+        return entry[0] if entry is not None else np.empty(0, dtype=np.int32)
+
+    def _match(self, groups: list[list[str]], restrict: Optional[np.ndarray] = None) -> np.ndarray:
+        """OR 묶음별 AND 결과의 합집합 (오름차순 문서 번호). restrict 가 있으면 그 문서들로 한정합니다."""
+        n_docs = len(self.frame)
+        matched = []
+        for terms in groups:
+            # 문서 수가 가장 적은 목록부터 차례로 교집합을 구합니다.
+            lists = [self._docs(term) for term in terms]
+            if restrict is not None:
+                lists.append(restrict)
+            lists.sort(key=len)
+            docs = lists[0]
+            for other in lists[1:]:
+                docs = _intersect(docs, other, n_docs)
+            matched.append(docs)
+        if len(matched) == 1:
+            return matched[0]
+        mask = np.zeros(n_docs, dtype=bool)
+        for docs in matched:
+            mask[docs] = True
+        return np.flatnonzero(mask).astype(np.int32)
+
+    def _bm25(self, docs: np.ndarray, terms: list[str]) -> np.ndarray:
+        """문서별 BM25 점수 (검색어의 모든 토큰 합)"""
+        scores = np.zeros(len(docs))
+        n_docs = len(self.frame)
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self._lengths[docs] / (self._avg_length or 1.0))
+        for term in terms:
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            term_docs, term_tfs = entry
+            idf = np.log1p((n_docs - len(term_docs) + 0.5) / (len(term_docs) + 0.5))
+            if len(docs) * SEARCH_RATIO < len(term_docs):
+                positions = np.minimum(np.searchsorted(term_docs, docs), len(term_docs) - 1)
+                tf = np.where(term_docs[positions] == docs, term_tfs[positions], 0)
+            else:
+                counts = np.zeros(n_docs, dtype=np.int32)
+                counts[term_docs] = term_tfs
+                tf = counts[docs]
+            scores += idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        return scores
+
+    def search(self, query: str, symbols: Optional[list[str]] = None, since=None,
+               sort: str = 'recency', limit: int = 50) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        검색어에 맞는 뉴스의 (행 위치 배열, BM25 점수 배열) 을 정렬 순서대로 최대 limit 개 반환합니다.
+        점수는 sort='relevance' 일 때만 계산하며, 아니면 None 입니다.
+        검색어나 since, sort 가 잘못되었으면 ValueError를 발생시킵니다.
+        """
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"지원하지 않는 정렬입니다: {sort} (가능한 값: {', '.join(SORT_ORDERS)})")
+        groups = parse_query(query)
+        restrict = None
+        if symbols:
+            symbol_docs = [self._symbol_docs[s] for s in dict.fromkeys(s.upper() for s in symbols)
+                           if s in self._symbol_docs]
+            restrict = np.sort(np.concatenate(symbol_docs)) if symbol_docs else np.empty(0, dtype=np.int32)
+        docs = self._match(groups, restrict)
+        if since is not None:
+            try:
+                since_ns = pd.Timestamp(since)
+            except ValueError:
+                raise ValueError(f"잘못된 since 형식입니다: {since} (예: 2024-01-01, 2024-01-01T09:30:00Z)")
+            since_ns = (since_ns.tz_localize('UTC') if since_ns.tzinfo is None else since_ns).value
+            docs = docs[self._published[docs] >= since_ns]
+        if not len(docs):
+            return docs, (np.empty(0) if sort == 'relevance' else None)
+
+        published = self._published[docs]
+        if sort == 'relevance':
+            scores = self._bm25(docs, list(dict.fromkeys(t for terms in groups for t in terms)))
+            primary = -scores
+        else:
+            scores = None
+            primary = -published.astype(np.float64)
+        # 상위 limit 개만 골라 정렬합니다. (같은 점수면 최신순, 같은 시각이면 나중에 추가된 뉴스 먼저)
+        top = np.argpartition(primary, limit - 1)[:limit] if len(docs) > limit else np.arange(len(docs))
+        top = top[np.lexsort((-docs[top], -published[top], primary[top]))]
+        return docs[top], (scores[top] if scores is not None else None)
@@ -0,0 +1,176 @@
+"""
+포트폴리오 평가(백테스트) 모듈입니다.
+
+보유 종목(비중 또는 수량)과 리밸런싱 규칙을 받아, 수익률 패널의 (날짜 × 종목) 종가 행렬 위에서
+포트폴리오 가치 시계열, 낙폭(drawdown), 변동성, 종목별 수익 기여도를 종목/날짜 루프 없이 계산합니다.
+
+리밸런싱 시점 B_0(=시작일) < B_1 < ... 에서 목표 비중 w 로 다시 맞춘다고 하면,
+날짜 t 의 기준 시점 base(t) = (t 보다 앞선 마지막 리밸런싱 시점) 에 대해
+    g(t) = (P[t] / P[base(t)]) · w,   V(t) = V(base(t)) · g(t)
+이고, 리밸런싱 시점의 가치 V(B_j) 는 g(B_j) 의 누적곱입니다. 따라서 행렬 나눗셈 한 번, 행렬-벡터 곱 한 번,
+리밸런싱 횟수 길이의 cumprod 로 전체 시계열이 나옵니다. 리밸런싱하지 않으면(rebalance='none') B 는 시작일 하나뿐입니다.
+"""
+import hashlib
+import json
+from typing import Optional
+
+import numpy as np
+
+from app.services.returns_panel import ReturnsPanel
+
+# 지원하는 리밸런싱 규칙 (각 기간의 마지막 거래일 종가로 목표 비중에 맞춥니다)
+REBALANCE_RULES = ('none', 'daily', 'weekly', 'monthly', 'quarterly', 'yearly')
+TRADING_DAYS_PER_YEAR = 252
+
+
+def holdings_key(holdings: list[dict], rebalance: str = 'none', start_date=None, end_date=None,
+                 initial_value: float = 10000.0) -> str:
+    """
+    평가 요청의 캐시 키 (정규화한 요청 내용의 SHA-1).
+    종목 순서는 응답 순서이므로 유지하고, 티커 대소문자와 숫자 표기 차이, 비중의 배율(1:1 과 0.5:0.5)은 무시합니다.
+    """
+    weight_total = sum(float(h['weight']) for h in holdings if h.get('weight') is not None) or 1.0
+    canonical = {
+        'holdings': [
+            [h['symbol'].upper(),
+             None if h.get('weight') is None else float(h['weight']) / weight_total,
+             None if h.get('shares') is None else float(h['shares'])]
+            for h in holdings
+        ],
+        'rebalance': rebalance,
+        'start_date': None if start_date is None else str(start_date),
+        'end_date': None if end_date is None else str(end_date),
+        'initial_value': float(initial_value),
+    }
+    return hashlib.sha1(json.dumps(canonical, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def rebalance_points(dates: np.ndarray, rule: str) -> np.ndarray:
+    """
+    리밸런싱 시점(행 위치)을 오름차순으로 반환합니다. 항상 시작일(0)을 포함합니다.
+    'weekly' 는 월요일 시작 주, 나머지는 달력 월/분기/연 단위의 마지막 거래일입니다.
+    """
+    if rule not in REBALANCE_RULES:
+        raise ValueError(f"지원하지 않는 리밸런싱 규칙입니다: {rule} (가능한 값: {', '.join(REBALANCE_RULES)})")
+    if rule == 'none' or len(dates) == 0:
+        return np.zeros(1, dtype=np.int64)
+    if rule == 'daily':
+        return np.arange(len(dates))
+
+    days = dates.astype('datetime64[D]')
+    if rule == 'weekly':
+        # 1970-01-01 은 목요일이므로 3일을 더해 월요일에 주가 바뀌도록 합니다.
+        period = (days.astype(np.int64) + 3) // 7
+    elif rule == 'monthly':
+        period = days.astype('datetime64[M]').astype(np.int64)
+    elif rule == 'quarterly':
+        period = days.astype('datetime64[M]').astype(np.int64) // 3
+    else:
+        period = days.astype('datetime64[Y]').astype(np.int64)
+    period_ends = np.flatnonzero(period[1:] != period[:-1])
+    return np.unique(np.r_[0, period_ends])
+
+
+def _forward_fill(prices: np.ndarray) -> np.ndarray:
+    """열(종목)별로 직전 종가를 채웁니다. (거래 정지일 등은 가격 변화 없음으로 봅니다)"""
+    rows = np.where(np.isnan(prices), 0, np.arange(len(prices))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return prices[rows, np.arange(prices.shape[1])]
+
+
+def evaluate(panel: ReturnsPanel, holdings: list[dict], rebalance: str = 'none', start_date=None, end_date=None,
+             initial_value: float = 10000.0) -> Optional[dict]:
+    """
+    포트폴리오를 평가하여 JSON 으로 직렬화 가능한 딕셔너리를 반환합니다.
+
+    :param holdings: [{'symbol': 'AAPL', 'weight': 0.6}, ...] 또는 [{'symbol': 'AAPL', 'shares': 10}, ...]
+                     비중은 합이 1 이 되도록 정규화합니다. 수량으로 주면 시작일 종가 기준 가치가 초기 금액이 되고,
+                     리밸런싱 시에는 시작일의 비중을 목표 비중으로 사용합니다.
+    :param rebalance: REBALANCE_RULES 중 하나
+    :param initial_value: 비중으로 줄 때의 초기 금액
+    모든 종목의 가격이 있는 첫 날부터 평가하며, 그런 날이 없으면 None 을 반환합니다.
+    잘못된 입력(규칙, 비중/수량 혼용, 패널에 없는 종목)은 ValueError 를 발생시킵니다.
+    """
+    if rebalance not in REBALANCE_RULES:
+        raise ValueError(f"지원하지 않는 리밸런싱 규칙입니다: {rebalance} (가능한 값: {', '.join(REBALANCE_RULES)})")
+    symbols = [h['symbol'].upper() for h in holdings]
+    if not symbols:
+        raise ValueError("보유 종목이 비어 있습니다.")
+    if len(set(symbols)) != len(symbols):
+        raise ValueError("같은 종목이 여러 번 포함되어 있습니다.")
+    use_shares = holdings[0].get('shares') is not None
+    if any((h.get('shares') is not None) != use_shares or (h.get('weight') is not None) == use_shares
+           for h in holdings):
+        raise ValueError("모든 종목을 비중(weight) 또는 수량(shares) 중 한 가지로만 지정해야 합니다.")
+    _, missing = panel.resolve(symbols)
+    if missing:
+        raise ValueError(f"데이터가 없는 종목입니다: {', '.join(missing)}")
+
+    dates, prices = panel.prices(symbols, start_date, end_date)
+    if len(dates) == 0:
+        return None
+    # 모든 종목의 가격이 있는 첫 날부터 평가합니다.
+    has_price = ~np.isnan(prices)
+    if not has_price.any(axis=0).all():
+        return None
+    first = int(has_price.argmax(axis=0).max())
+    dates = dates[first:]
+    prices = _forward_fill(prices[first:])
+    points = rebalance_points(dates, rebalance)
+
+    if use_shares:
+        shares = np.array([float(h['shares']) for h in holdings])
+        start_values = shares * prices[0]
+        initial_value = float(start_values.sum())
+        weights = start_values / initial_value
+    else:
+        weights = np.array([float(h['weight']) for h in holdings])
+        weights = weights / weights.sum()
+
+    # base(t): t 보다 앞선 마지막 리밸런싱 시점 (t=0 은 자기 자신)
+    rows = np.arange(len(dates))
+    segment = np.maximum(np.searchsorted(points, rows, side='left') - 1, 0)
+    base = points[segment]
+    growth = prices / prices[base]                    # 기준 시점 대비 종목별 가격 배수
+    portfolio_growth = growth @ weights               # g(t)
+    segment_values = initial_value * np.cumprod(np.r_[1.0, portfolio_growth[points[1:]]])  # V(B_j)
+    value = segment_values[segment] * portfolio_growth
+
+    # 종목별 일간 손익: V(base) · w · (P[t] - P[t-1]) / P[base]. 합은 포트폴리오 손익과 같습니다.
+    pnl = (segment_values[segment][1:, None] * weights) * (np.diff(prices, axis=0) / prices[base[1:]])
+    contribution = pnl.sum(axis=0) / initial_value
+    final_weights = segment_values[segment][-1] * weights * growth[-1] / value[-1]
+
+    drawdown = value / np.maximum.accumulate(value) - 1.0
+    trough = int(drawdown.argmin())
+    daily_returns = value[1:] / value[:-1] - 1.0
+    years = (len(dates) - 1) / TRADING_DAYS_PER_YEAR
+    total_return = value[-1] / initial_value - 1.0
+
+    return {
+        'rebalance': rebalance,
+        'start_date': str(dates[0]),
+        'end_date': str(dates[-1]),
+        'observations': len(dates),
+        'rebalance_count': len(points) - 1,
+        'initial_value': float(initial_value),
+        'final_value': float(value[-1]),
+        'total_return': float(total_return),
+        'annualized_return': float((1.0 + total_return) ** (1.0 / years) - 1.0) if years > 0 else None,
+        'annualized_volatility': float(daily_returns.std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR))
+        if len(daily_returns) > 1 else None,
+        'max_drawdown': float(drawdown[trough]),
+        'max_drawdown_date': str(dates[trough]),
+        'assets': [
+            {
+                'symbol': symbol,
+                'initial_weight': float(w),
+                'final_weight': float(fw),
+                'contribution': float(c),
+            }
+            for symbol, w, fw, c in zip(symbols, weights, final_weights, contribution)
+        ],
+        'dates': np.datetime_as_string(dates, unit='D').tolist(),
+        'value': value.tolist(),
+        'drawdown': drawdown.tolist(),
+    }
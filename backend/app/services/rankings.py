@@ -0,0 +1,115 @@
+"""
+일자별 종목 순위(상승률, 거래량, 거래액) 모듈입니다.
+
+데이터 버전마다 한 번, 이력 테이블 전체를 한 번의 벡터 연산으로 처리하여
+(일자 -> 행 범위) 인덱스와 지표별 배열을 만들어 둡니다.
+조회 시에는 해당 일자의 구간에서 argpartition 으로 상위 N개만 골라 정렬합니다.
+"""
+import numpy as np
+import pandas as pd
+
+# 원본 컬럼을 그대로 쓰는 순위 지표 이름 -> 컬럼 이름
+_SOURCE_COLUMNS = {
+    'volume': 'Volume',
+    'trading_value': '거래액',
+}
+
+# 지원하는 순위 지표 (change_pct: 전일 대비 등락률 %)
+METRICS = ('change_pct',) + tuple(_SOURCE_COLUMNS)
+
+
+class DailyRankings:
+    """일자별 순위 계산을 위한 사전 집계 구조입니다."""
+
+    def __init__(self, df: pd.DataFrame, data_version: int = 0):
+        """
+        (Symbol, Date) 순으로 정렬된 이력 테이블로부터 일자별 구간과 지표 배열을 만듭니다.
+        """
+        self.data_version = data_version
+        # 일자(1970-01-01 기준 일수) -> 날짜순 정렬 배열에서의 행 범위
+        self._date_slices: dict[int, tuple[int, int]] = {}
+        self.dates = np.array([], dtype='datetime64[D]')
+        if df.empty:
+            return
+
+        symbols = df['Symbol'].to_numpy()
+        close = df['Close'].to_numpy(dtype=np.float64)
+
+        # 종목별 전일 대비 등락률(%) 계산 (종목의 첫 행은 NaN)
+        prev_close = np.empty_like(close)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
+        prev_close[1:][symbols[1:] != symbols[:-1]] = np.nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            change_pct = (close / prev_close - 1.0) * 100.0
+
+        # 날짜 순으로 한 번 정렬하여 일자별 연속 구간을 만듭니다.
+        # 종가가 없는 행은 응답(Close)을 만들 수 없으므로 순위 대상에서 제외합니다.
+        all_dates = df['Date'].to_numpy().astype('datetime64[D]')
+        keep = np.flatnonzero(~np.isnan(close))
+        order = keep[np.argsort(all_dates[keep], kind='stable')]
+        dates = all_dates[order]
+        boundaries = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+        ends = np.append(boundaries[1:], len(order))
+        self.dates = dates[boundaries]
+        self._date_slices = {
+            int(day): (int(lo), int(hi)) for day, lo, hi in zip(self.dates.astype(np.int64), boundaries, ends)
+        }
+
+        self.symbols = symbols[order]
+        self.close = close[order]
+        self.values = {'change_pct': change_pct[order]}
+        for name, column in _SOURCE_COLUMNS.items():
+            source = df[column].to_numpy(dtype=np.float64) if column in df else np.full(len(df), np.nan)
+            self.values[name] = source[order]
+
+    @property
+    def latest_date(self):
+        """데이터가 존재하는 가장 최근 일자를 반환합니다."""
+        return self.dates[-1] if len(self.dates) else None
+
+    def top(self, metric: str = 'change_pct', date=None, top: int = 10, ascending: bool = False) -> list[dict]:
+        """
+        지정한 일자의 지표 상위(또는 하위) N개 종목을 반환합니다.
+        date 가 없으면 최근 일자를 사용합니다. 지원하지 않는 지표면 ValueError를 발생시킵니다.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"지원하지 않는 지표입니다: {metric} (가능한 값: {', '.join(METRICS)})")
+        if not self._date_slices:
+            return []
+
+        date = self.latest_date if date is None else np.datetime64(pd.to_datetime(date).date(), 'D')
+        bounds = self._date_slices.get(int(date.astype(np.int64)))
+        if bounds is None:
+            return []
+
+        lo, hi = bounds
+        values = self.values[metric][lo:hi]
+        # NaN은 어느 방향으로 정렬하든 순위에서 제외되도록 -inf 로 바꿉니다.
+        keys = -values if ascending else values
+        keys = np.where(np.isnan(keys), -np.inf, keys)
+        n = min(top, len(keys))
+        if n == 0:
+            return []
+
+        candidates = np.argpartition(-keys, n - 1)[:n]
+        ranked = candidates[np.argsort(-keys[candidates], kind='stable')]
+        ranked = ranked[~np.isnan(values[ranked])]
+
+        date_str = str(date)
+        return [
+            {
+                'rank': rank,
+                'Symbol': self.symbols[lo + i],
+                'Date': date_str,
+                'Close': float(self.close[lo + i]),
+                'value': float(values[i]),
+                **{name: _to_optional(arr[lo + i]) for name, arr in self.values.items()},
+            }
+            for rank, i in enumerate(ranked, start=1)
+        ]
+
+
+def _to_optional(value: float):
+    """NaN을 None으로 바꿉니다."""
+    return None if np.isnan(value) else float(value)
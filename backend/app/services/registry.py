@@ -0,0 +1,195 @@
+"""
+프로세스 전역 데이터 레지스트리입니다.
+
+주가(prices), 뉴스(news), 재무정보(financial_info), 공시(disclosures) 데이터셋을 이름별로 한 번만 로드하여 보관하고,
+데이터셋마다 로드 상태, 버전, 로드 시간, 메모리 사용량을 제공합니다.
+main.py, main_v2.py 와 모든 라우터는 이 모듈의 의존성 함수(get_*_service)로 서비스를 가져오므로,
+두 앱을 한 프로세스에서 import 해도 같은 데이터를 두 번 로드하지 않습니다.
+"""
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core import events
+from app.core.config import settings
+from app.core.lazy import LazyService, LOADING, PENDING, FAILED
+from app.services.disclosure_service import DisclosureService
+from app.services.financials_info_service import FinancialsInfoService
+from app.services.live_updates import LiveUpdatePublisher
+from app.services.local_news_service import LocalNewsService
+from app.services.stock_service import StockService
+
+
+def estimate_memory_bytes(obj, max_depth: int = 4) -> int:
+    """
+    객체가 참조하는 DataFrame/Series/ndarray 의 메모리 사용량(바이트)을 추정합니다.
+    속성(__dict__), dict, list/tuple 을 max_depth 단계까지 따라가며, 같은 객체와 다른 배열의 뷰는 한 번만 셉니다.
+    """
+    seen: set[int] = set()
+
+    def walk(value, depth: int) -> int:
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True, deep=True))
+        if isinstance(value, np.ndarray):
+            # 다른 배열의 뷰(base 가 있는 배열)는 원본에서 이미 계산됩니다.
+            return int(value.nbytes) if value.base is None else 0
+        if depth >= max_depth:
+            return 0
+        if isinstance(value, dict):
+            return sum(walk(item, depth + 1) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(walk(item, depth + 1) for item in value)
+        if hasattr(value, '__dict__') and not isinstance(value, type):
+            return sum(walk(item, depth + 1) for item in vars(value).values())
+        return 0
+
+    return walk(obj, 0)
+
+
+class DataRegistry:
+    """이름별 데이터셋(LazyService)을 보관하고 로드/버전/메모리 정보를 제공합니다."""
+
+    def __init__(self):
+        self._datasets: dict[str, LazyService] = {}
+        # (데이터셋 이름) -> (버전, 메모리 바이트). 메모리 계산은 비용이 있으므로 버전별로 한 번만 합니다.
+        self._memory_cache: dict[str, tuple[int, int]] = {}
+
+    def register(self, name: str, factory: Callable, with_progress: bool = False) -> LazyService:
+        """데이터셋을 등록합니다. 이미 등록된 이름이면 기존 항목을 반환합니다."""
+        if name not in self._datasets:
+            self._datasets[name] = LazyService(name, factory, with_progress=with_progress)
+        return self._datasets[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._datasets
+
+    def names(self) -> list[str]:
+        return list(self._datasets)
+
+    def dataset(self, name: str) -> LazyService:
+        return self._datasets[name]
+
+    def get(self, name: str):
+        """데이터셋 서비스를 반환합니다. 아직 로드되지 않았다면 지금 로드합니다."""
+        return self._datasets[name].get()
+
+    def require(self, name: str):
+        """요청 처리용으로 데이터셋 서비스를 반환합니다. warm-up 중이거나 로드에 실패했으면 ServiceNotReady 를 발생시킵니다."""
+        return self._datasets[name].require()
+
+    def reload(self, name: str):
+        """데이터셋을 다시 로드하고 새 버전의 서비스를 반환합니다."""
+        return self._datasets[name].reload()
+
+    def add_listener(self, name: str, listener: Callable):
+        """데이터셋이 로드(또는 재로드)될 때마다 새 서비스로 listener 를 호출합니다."""
+        self._datasets[name].add_listener(listener)
+
+    def memory_bytes(self, name: str) -> Optional[int]:
+        """데이터셋의 추정 메모리 사용량(바이트). 로드되지 않았으면 None."""
+        dataset = self._datasets[name]
+        if not dataset.loaded:
+            return None
+        cached = self._memory_cache.get(name)
+        if cached is None or cached[0] != dataset.version:
+            cached = (dataset.version, estimate_memory_bytes(dataset.get()))
+            self._memory_cache[name] = cached
+        return cached[1]
+
+    def describe(self, name: str, with_memory: bool = True) -> dict:
+        """데이터셋의 상태, 버전, 로드 시간, 메모리 사용량을 반환합니다."""
+        status = self._datasets[name].status()
+        if with_memory:
+            status["memory_bytes"] = self.memory_bytes(name)
+        return status
+
+    def all_ready(self) -> bool:
+        """
+        요청을 받을 준비가 되었는지 여부입니다. 아직 로드되지 않은 데이터셋이 로드 중이거나,
+        warm-up 이 예약되었는데 차례를 기다리는 중이면 False 입니다.
+        (로드에 실패한 데이터셋은 준비 상태를 막지 않으며 /readyz 에 degraded 로 표시됩니다.)
+        """
+        for dataset in self._datasets.values():
+            if dataset.loaded:
+                continue
+            if dataset.state == LOADING or (dataset.state == PENDING and dataset.warmup_scheduled):
+                return False
+        return True
+
+    def any_failed(self) -> bool:
+        return any(dataset.state == FAILED for dataset in self._datasets.values())
+
+    def warm_up(self):
+        """등록된 모든 데이터셋을 미리 로드합니다. 하나가 실패해도 나머지는 계속 로드합니다."""
+        for dataset in list(self._datasets.values()):
+            try:
+                dataset.get()
+                print(f"정보: '{dataset.name}' 데이터셋을 {dataset.load_seconds:.2f}초 만에 로드했습니다.")
+            except Exception as e:
+                print(f"경고: '{dataset.name}' 데이터셋 로드 중 오류 발생: {e}")
+
+    def start_warm_up(self) -> threading.Thread:
+        """백그라운드 스레드에서 warm_up() 을 시작합니다. 이후 로드 전 요청은 503 으로 응답합니다."""
+        for dataset in self._datasets.values():
+            dataset.warmup_scheduled = True
+        thread = threading.Thread(target=self.warm_up, name="data-warmup", daemon=True)
+        thread.start()
+        return thread
+
+
+def _build_stock_service(progress=None) -> StockService:
+    """
+    주가 서비스를 만듭니다. 데이터를 불러오지 못했으면 빈 서비스를 새 버전으로 내놓지 않고 예외를 발생시킵니다.
+    (LazyService 가 첫 로드는 실패로 기록하고, 재로드는 기존 인스턴스를 유지하며 변경분 알림도 보내지 않습니다.)
+    """
+    service = StockService(progress=progress)
+    if service.load_error:
+        raise RuntimeError(service.load_error)
+    return service
+
+
+def _build_financials_service() -> FinancialsInfoService:
+    service = FinancialsInfoService()
+    service.load_csv_data()
+    return service
+
+
+def _build_news_service() -> LocalNewsService:
+    # 재로드할 때는 직전 버전의 제목 역색인을 이어서 사용할 수 있도록 현재 인스턴스를 넘깁니다.
+    return LocalNewsService(previous=registry.dataset("news").current)
+
+
+# 애플리케이션 전역 레지스트리
+registry = DataRegistry()
+registry.register("prices", _build_stock_service, with_progress=True)
+registry.register("news", _build_news_service)
+registry.register("financial_info", _build_financials_service)
+registry.register("disclosures", DisclosureService)
+
+# 주가/뉴스 데이터셋이 새 버전으로 로드될 때마다 변경분을 SSE 이벤트(/events/stream)로 발행합니다.
+live_updates = LiveUpdatePublisher(events.bus, max_bars=settings.SSE_MAX_BARS_PER_EVENT)
+registry.add_listener("prices", live_updates.on_prices)
+registry.add_listener("news", live_updates.on_news)
+
+
+# --- 의존성 주입 --- #
+# 라우터는 아래 함수로 레지스트리의 서비스를 가져옵니다.
+# (warm-up 중 아직 로드되지 않았다면 503 + Retry-After 로 응답합니다.)
+def get_stock_service() -> StockService:
+    return registry.require("prices")
+
+def get_news_service() -> LocalNewsService:
+    return registry.require("news")
+
+def get_financials_service() -> FinancialsInfoService:
+    return registry.require("financial_info")
+
+def get_disclosure_service() -> DisclosureService:
+    return registry.require("disclosures")
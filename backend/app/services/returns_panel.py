@@ -0,0 +1,159 @@
+"""
+날짜 정렬 수익률 패널(returns panel) 모듈입니다.
+
+이력 테이블(긴 형식)을 데이터 버전마다 한 번 (날짜 × 종목) 밀집 행렬로 펼쳐 일간 수익률을 계산해 두고,
+임의의 종목 부분집합과 기간에 대한 상관계수/공분산 행렬을 행렬 곱(BLAS GEMM)으로 계산합니다.
+
+수익률이 없는 칸(상장 전, 거래 정지 등)은 NaN 이며, 상관계수/공분산은 pandas DataFrame.corr()/cov() 와 같이
+두 종목 모두 값이 있는 날짜만 사용(pairwise complete)합니다. 이를 종목 쌍마다 반복하지 않고,
+값 존재 여부 행렬 M 과 0 으로 채운 수익률 행렬 X 에 대해 MᵀM, XᵀM, XᵀX, (X²)ᵀM 네 번의 행렬 곱으로 한꺼번에 구합니다.
+
+펼친 종가 행렬(close)도 함께 보관하여 포트폴리오 평가(app.services.portfolio)에서 사용합니다.
+"""
+import numpy as np
+import pandas as pd
+
+
+class ReturnsPanel:
+    """(날짜 × 종목) 일간 수익률 행렬과 상관/공분산 계산"""
+
+    def __init__(self, df: pd.DataFrame, data_version: int = 0):
+        """
+        (Symbol, Date) 순으로 정렬된 이력 테이블로부터 수익률 행렬을 만듭니다.
+        수익률은 전체 거래일 기준 직전 거래일 종가 대비 단순 수익률이며, 어느 한쪽 종가가 없으면 NaN 입니다.
+        """
+        self.data_version = data_version
+        self.dates = np.array([], dtype='datetime64[D]')
+        self.symbols: list[str] = []
+        self._symbol_index: dict[str, int] = {}
+        self.returns = np.empty((0, 0))
+        # 종가 행렬은 첫 거래일도 포함하므로 날짜 축이 수익률보다 한 행 깁니다.
+        self.close_dates = np.array([], dtype='datetime64[D]')
+        self.close = np.empty((0, 0))
+        if df.empty:
+            return
+
+        symbol_values = df['Symbol'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, symbol_values[1:] != symbol_values[:-1]])
+        symbol_ids = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(df))))
+        all_dates = df['Date'].to_numpy().astype('datetime64[D]')
+        dates = np.unique(all_dates)
+        date_ids = np.searchsorted(dates, all_dates)
+
+        close = np.full((len(dates), len(starts)), np.nan)
+        close[date_ids, symbol_ids] = df['Close'].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = close[1:] / close[:-1] - 1.0
+        returns[~np.isfinite(returns)] = np.nan
+
+        # 수익률 행렬은 열(종목) 단위로 잘라 쓰므로 열 우선(Fortran) 순서로 보관합니다.
+        self.returns = np.asfortranarray(returns)
+        self.dates = dates[1:]
+        self.close = np.asfortranarray(close)
+        self.close_dates = dates
+        self.symbols = [str(s) for s in symbol_values[starts]]
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.returns.shape
+
+    def resolve(self, symbols: list[str]) -> tuple[list[str], list[str]]:
+        """요청한 종목을 (패널에 있는 종목, 없는 종목) 으로 나눕니다. 중복은 제거하고 순서는 유지합니다."""
+        unique = list(dict.fromkeys(s.upper() for s in symbols))
+        return [s for s in unique if s in self._symbol_index], [s for s in unique if s not in self._symbol_index]
+
+    def date_range(self, start_date=None, end_date=None) -> tuple[int, int]:
+        """날짜 범위에 해당하는 행 범위 [lo, hi)"""
+        lo = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date), 'D'), side='left')) \
+            if start_date is not None else 0
+        hi = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date), 'D'), side='right')) \
+            if end_date is not None else len(self.dates)
+        return lo, max(lo, hi)
+
+    def matrix(self, symbols: list[str], start_date=None, end_date=None) -> np.ndarray:
+        """요청 종목 순서의 (날짜 × 종목) 수익률 부분 행렬"""
+        lo, hi = self.date_range(start_date, end_date)
+        columns = [self._symbol_index[s] for s in symbols]
+        return self.returns[lo:hi, columns]
+
+    def prices(self, symbols: list[str], start_date=None, end_date=None) -> tuple[np.ndarray, np.ndarray]:
+        """요청 종목 순서의 (날짜 × 종목) 종가 부분 행렬과 그 날짜 배열. 종가가 없는 칸은 NaN 입니다."""
+        dates = self.close_dates
+        lo = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date), 'D'), side='left')) \
+            if start_date is not None else 0
+        hi = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date), 'D'), side='right')) \
+            if end_date is not None else len(dates)
+        hi = max(lo, hi)
+        columns = [self._symbol_index[s] for s in symbols]
+        return dates[lo:hi], self.close[lo:hi, columns]
+
+    def statistics(self, symbols: list[str], kind: str = 'correlation', start_date=None, end_date=None,
+                   min_periods: int = 2) -> tuple[np.ndarray, np.ndarray]:
+        """
+        기간 내 상관계수(kind='correlation') 또는 공분산(kind='covariance') 행렬과 종목 쌍별 관측 수 행렬을 반환합니다.
+        관측 수가 min_periods 보다 적은 쌍은 NaN 입니다.
+        """
+        return pairwise_statistics(self.matrix(symbols, start_date, end_date), kind, min_periods)
+
+    def rolling(self, symbols: list[str], window: int, kind: str = 'correlation', step: int = 1,
+                start_date=None, end_date=None, min_periods: int = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        window 거래일 이동 구간의 상관계수/공분산 행렬을 step 거래일마다 계산합니다.
+        반환값: (구간 끝 날짜 배열, (구간 수 × 종목 × 종목) 행렬)
+        """
+        min_periods = window if min_periods is None else min_periods
+        lo, hi = self.date_range(start_date, end_date)
+        data = self.matrix(symbols, start_date, end_date)
+        ends = np.arange(window, hi - lo + 1, step)
+        result = np.empty((len(ends), len(symbols), len(symbols)))
+        for i, end in enumerate(ends):
+            result[i], _ = pairwise_statistics(data[end - window:end], kind, min_periods)
+        return self.dates[lo + ends - 1], result
+
+
+def _dense_statistics(data: np.ndarray, kind: str, min_periods: int) -> tuple[np.ndarray, np.ndarray]:
+    """NaN 이 없는 행렬의 상관계수/공분산 (행렬 곱 한 번)"""
+    n = data.shape[0]
+    counts = np.full((data.shape[1], data.shape[1]), float(n))
+    centered = data - data.mean(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = (centered.T @ centered) / (n - 1)
+        if kind == 'correlation':
+            std = np.sqrt(np.diag(result))
+            result = np.clip(result / np.outer(std, std), -1.0, 1.0)
+    if n < max(min_periods, 2):
+        result[:] = np.nan
+    return result, counts
+
+
+def pairwise_statistics(data: np.ndarray, kind: str = 'correlation', min_periods: int = 2) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (관측 × 변수) 행렬의 NaN 을 쌍별로 제외한 상관계수 또는 공분산 행렬과 쌍별 관측 수를 계산합니다.
+    """
+    if kind not in ('correlation', 'covariance'):
+        raise ValueError(f"지원하지 않는 통계입니다: {kind}")
+    present = ~np.isnan(data)
+    if present.all():
+        return _dense_statistics(data, kind, min_periods)
+    mask = present.astype(np.float64)
+    # 공분산은 열별 평균 이동에 영향을 받지 않으므로, 열 평균을 빼 두어 큰 값끼리의 뺄셈(정밀도 손실)을 줄입니다.
+    filled = np.where(present, data, 0.0)
+    column_mean = filled.sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+    centered = np.where(present, filled - column_mean, 0.0)
+
+    counts = mask.T @ mask                   # 쌍별 관측 수
+    sums = centered.T @ mask                 # sums[i, j]: j 도 값이 있는 날의 i 합
+    cross = centered.T @ centered            # 쌍별 곱의 합
+    squares = (centered * centered).T @ mask  # squares[i, j]: j 도 값이 있는 날의 i 제곱합
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = (cross - sums * sums.T / counts) / (counts - 1)
+        if kind == 'covariance':
+            result = covariance
+        else:
+            variance_i = (squares - sums * sums / counts) / (counts - 1)
+            result = covariance / np.sqrt(variance_i * variance_i.T)
+            result = np.clip(result, -1.0, 1.0)
+    result[counts < max(min_periods, 2)] = np.nan
+    return result, counts
@@ -0,0 +1,160 @@
+"""
+종목 스크리너 모듈입니다.
+
+df_stocks_enriched 에서 종목별로 특정 일자(기본: 최신) 기준 마지막 행만 뽑은 횡단면 스냅샷을 만들고,
+수치 컬럼마다 정렬 인덱스를 미리 만들어 둡니다. 필터/정렬/limit 표현식은 전체 이력을 건드리지 않고
+스냅샷(종목 수 만큼의 행) 위에서만 평가됩니다.
+
+필터 표현식 예:
+    "RSI_14<30,Close>MA_60"   -> RSI_14 < 30 AND Close > MA_60
+정렬 표현식 예:
+    "-RSI_14"                 -> RSI_14 내림차순 ("RSI_14" 는 오름차순)
+"""
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+_CONDITION_PATTERN = re.compile(r'^\s*([^\W\d]\w*)\s*(<=|>=|==|!=|<|>)\s*(.+?)\s*$')
+
+_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def parse_filters(expression: str) -> list[tuple[str, str, object]]:
+    """
+    쉼표로 구분된 필터 표현식을 (컬럼, 연산자, 비교값) 리스트로 변환합니다.
+    비교값은 숫자(float) 또는 다른 컬럼 이름(str)입니다.
+    형식이 잘못된 경우 ValueError를 발생시킵니다.
+    """
+    conditions = []
+    if not expression:
+        return conditions
+
+    for part in expression.split(','):
+        if not part.strip():
+            continue
+        match = _CONDITION_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"잘못된 필터 표현식입니다: '{part.strip()}'")
+        column, op, operand = match.groups()
+        try:
+            operand = float(operand)
+        except ValueError:
+            pass  # 숫자가 아니면 컬럼 이름으로 취급합니다.
+        conditions.append((column, op, operand))
+    return conditions
+
+
+class MarketSnapshot:
+    """
+    특정 일자 기준 종목별 최신 행으로 이루어진 횡단면 스냅샷입니다.
+    수치 컬럼마다 정렬 인덱스(argsort)를 보관하여 범위 필터와 정렬을 빠르게 처리합니다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        self.columns: dict[str, np.ndarray] = {col: self.df[col].to_numpy() for col in self.df.columns}
+        # 수치 컬럼별 정렬 인덱스와 정렬된 값 (NaN은 맨 뒤로 정렬됩니다)
+        self._order: dict[str, np.ndarray] = {}
+        self._sorted: dict[str, np.ndarray] = {}
+        self._valid_count: dict[str, int] = {}
+        for col, values in self.columns.items():
+            if values.dtype.kind not in 'fiu':
+                continue
+            order = np.argsort(values, kind='stable')
+            self._order[col] = order
+            self._sorted[col] = values[order]
+            self._valid_count[col] = int(np.count_nonzero(~np.isnan(values.astype(np.float64))))
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, as_of=None) -> 'MarketSnapshot':
+        """
+        (Symbol, Date) 순으로 정렬된 이력 테이블에서 스냅샷을 만듭니다.
+        as_of 가 주어지면 해당 일자 이전(포함)의 마지막 행을, 없으면 종목별 마지막 행을 사용합니다.
+        """
+        if df.empty:
+            return cls(df)
+
+        symbols = df['Symbol'].to_numpy()
+        is_group_end = np.ones(len(df), dtype=bool)
+        is_group_end[:-1] = symbols[1:] != symbols[:-1]
+
+        if as_of is None:
+            return cls(df.iloc[np.flatnonzero(is_group_end)])
+
+        # 종목 내 날짜는 오름차순이므로 as_of 이전 행은 각 그룹의 앞부분(prefix)을 이룹니다.
+        eligible = df['Date'].to_numpy() <= np.datetime64(as_of)
+        next_ineligible = np.ones(len(df), dtype=bool)
+        next_ineligible[:-1] = ~eligible[1:]
+        return cls(df.iloc[np.flatnonzero(eligible & (is_group_end | next_ineligible))])
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def _check_column(self, column: str, numeric: bool = True):
+        if column not in self.columns:
+            raise ValueError(f"알 수 없는 컬럼입니다: {column}")
+        if numeric and column not in self._order:
+            raise ValueError(f"수치형 컬럼만 사용할 수 있습니다: {column}")
+
+    def _range_mask(self, column: str, op: str, value: float) -> np.ndarray:
+        """정렬 인덱스와 이진 탐색으로 '컬럼 op 상수' 조건의 마스크를 계산합니다."""
+        sorted_values = self._sorted[column][:self._valid_count[column]]
+        left = int(np.searchsorted(sorted_values, value, side='left'))
+        right = int(np.searchsorted(sorted_values, value, side='right'))
+        ranges = {
+            '<': [(0, left)],
+            '<=': [(0, right)],
+            '>': [(right, len(sorted_values))],
+            '>=': [(left, len(sorted_values))],
+            '==': [(left, right)],
+            '!=': [(0, left), (right, len(sorted_values))],
+        }[op]
+
+        mask = np.zeros(len(self.df), dtype=bool)
+        for lo, hi in ranges:
+            mask[self._order[column][lo:hi]] = True
+        return mask
+
+    def filter_mask(self, conditions: list[tuple[str, str, object]]) -> np.ndarray:
+        """모든 조건을 AND로 결합한 마스크를 반환합니다."""
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, op, operand in conditions:
+            self._check_column(column)
+            if isinstance(operand, str):
+                # 컬럼 간 비교 (예: Close > MA_60) 는 스냅샷 위에서 바로 벡터 비교합니다.
+                self._check_column(operand)
+                with np.errstate(invalid='ignore'):
+                    mask &= _OPERATORS[op](self.columns[column], self.columns[operand])
+            else:
+                mask &= self._range_mask(column, op, operand)
+        return mask
+
+    def screen(self, filters: str = None, sort: str = None, limit: int = 50) -> pd.DataFrame:
+        """
+        필터/정렬/limit 표현식을 평가하여 조건에 맞는 스냅샷 행을 반환합니다.
+        표현식이 잘못되었거나 알 수 없는 컬럼을 참조하면 ValueError를 발생시킵니다.
+        """
+        mask = self.filter_mask(parse_filters(filters))
+
+        if sort:
+            descending = sort.startswith('-')
+            column = sort.lstrip('+-').strip()
+            self._check_column(column)
+            order = self._order[column]
+            valid = self._valid_count[column]
+            # 내림차순일 때도 NaN은 맨 뒤에 둡니다.
+            order = np.concatenate((order[:valid][::-1], order[valid:])) if descending else order
+            positions = order[mask[order]][:limit]
+        else:
+            positions = np.flatnonzero(mask)[:limit]
+
+        return self.df.iloc[positions]
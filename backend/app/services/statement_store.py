@@ -0,0 +1,171 @@
+"""
+긴(long) 형식 재무제표 저장소입니다.
+
+재무제표를 (Symbol, Name, Date, period, statement, line_item, value) 행으로 보관합니다.
+    - 값이 있는 항목만 행으로 저장하므로 종목마다 항목이 달라도 빈 칸(NaN) 컬럼이 생기지 않고,
+      제공자가 새 항목을 추가해도 스키마가 바뀌지 않습니다.
+    - 문자열 컬럼(Symbol, Name, period, statement, line_item)은 category(사전 인코딩)로 보관하므로
+      행마다 정수 코드만 차지합니다.
+    - 행은 (Symbol, period, Date) 순으로 정렬하고 종목별 행 범위를 인덱싱하여, 종목 조회는 전체 스캔 없이 처리합니다.
+
+pivot() 은 요청한 항목만 골라 (Symbol, Name, Date) × 항목 형태의 wide DataFrame 으로 반환합니다.
+같은 항목이 여러 제표에 있으면(예: Net Income 은 손익계산서와 현금흐름표에 모두 있음) STATEMENT_PRIORITY 순서의 첫 값을 사용합니다.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services import indicators
+
+# 같은 항목이 여러 제표에 있을 때의 우선순위
+STATEMENT_PRIORITY = ['income', 'balance_sheet', 'cash_flow']
+# 기존 wide CSV 에서 변환한 행의 제표 이름 (원래 어느 제표의 항목인지 알 수 없음)
+LEGACY_STATEMENT = 'legacy'
+ID_COLUMNS = ['Symbol', 'Name', 'Date']
+LONG_COLUMNS = ['Symbol', 'Name', 'Date', 'period', 'statement', 'line_item', 'value']
+CATEGORY_COLUMNS = ['Symbol', 'Name', 'period', 'statement', 'line_item']
+
+
+def wide_to_long(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    기존 wide 재무제표(nasdaq_financials_{annual,quarterly}_all.csv)를 긴 형식으로 변환합니다.
+    식별 컬럼(Symbol, Name, Date) 외의 모든 컬럼을 항목으로 보고, 값이 없는 칸은 버립니다.
+    """
+    id_columns = [c for c in ID_COLUMNS if c in df.columns]
+    long_df = df.melt(id_vars=id_columns, var_name='line_item', value_name='value')
+    long_df = long_df.dropna(subset=['value'])
+    long_df['period'] = period
+    long_df['statement'] = LEGACY_STATEMENT
+    return long_df
+
+
+class StatementStore:
+    """긴 형식 재무제표를 보관하고 항목별 pivot 조회를 제공합니다."""
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        :param df: 긴 형식 재무제표 DataFrame (LONG_COLUMNS). 정렬/타입 변환은 여기서 합니다.
+        """
+        df = df[[c for c in LONG_COLUMNS if c in df.columns]].copy()
+        if 'Name' not in df.columns:
+            df['Name'] = df['Symbol']
+        for column in CATEGORY_COLUMNS:
+            if not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype('category')
+        if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+            df['Date'] = pd.to_datetime(df['Date'])
+        df['value'] = df['value'].astype('float64')
+
+        # (Symbol, period, Date, 제표 우선순위) 순으로 정렬합니다. (category 코드와 정수로 정렬하므로 문자열 비교가 없습니다.)
+        statements = df['statement'].cat.categories
+        rank = np.array([STATEMENT_PRIORITY.index(s) if s in STATEMENT_PRIORITY else len(STATEMENT_PRIORITY)
+                         for s in statements], dtype=np.int64)
+        order = np.lexsort((
+            rank[df['statement'].cat.codes.to_numpy()] if len(statements) else np.zeros(len(df), dtype=np.int64),
+            df['Date'].to_numpy(),
+            df['period'].cat.codes.to_numpy(),
+            df['Symbol'].cat.codes.to_numpy(),
+        ))
+        self.df = df.iloc[order].reset_index(drop=True)
+
+        symbol_codes = self.df['Symbol'].cat.codes.to_numpy()
+        starts = indicators.group_starts(symbol_codes)
+        ends = np.append(starts[1:], len(self.df))
+        categories = self.df['Symbol'].cat.categories
+        self.symbol_slices: dict[str, tuple[int, int]] = {
+            categories[symbol_codes[start]]: (int(start), int(end)) for start, end in zip(starts, ends)
+        }
+
+    @classmethod
+    def from_frames(cls, frames: list[pd.DataFrame]) -> 'StatementStore':
+        """여러 긴 형식 DataFrame(예: 연간/분기 변환 결과)을 합쳐 저장소를 만듭니다."""
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return cls(pd.DataFrame(columns=LONG_COLUMNS))
+        # category 컬럼의 범주가 달라도 합칠 수 있도록 문자열로 맞춘 뒤 다시 인코딩합니다.
+        frames = [frame.astype({c: 'object' for c in CATEGORY_COLUMNS if c in frame.columns}) for frame in frames]
+        return cls(pd.concat(frames, ignore_index=True))
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def _code_mask(self, df: pd.DataFrame, column: str, values) -> np.ndarray:
+        """category 컬럼이 values 중 하나인 행 (정수 코드 비교)"""
+        wanted = df[column].cat.categories.get_indexer(list(values))
+        return np.isin(df[column].cat.codes.to_numpy(), wanted[wanted >= 0])
+
+    def line_items(self, period: Optional[str] = None, statement: Optional[str] = None) -> list[str]:
+        """저장된 항목 이름 목록 (기간/제표로 거를 수 있음)"""
+        df = self.df
+        mask = np.ones(len(df), dtype=bool)
+        if period:
+            mask &= self._code_mask(df, 'period', [period])
+        if statement:
+            mask &= self._code_mask(df, 'statement', [statement])
+        codes = np.unique(df['line_item'].cat.codes.to_numpy()[mask])
+        return sorted(df['line_item'].cat.categories[codes[codes >= 0]])
+
+    def pivot(self, period: str = 'annual', symbols: Optional[list[str]] = None,
+              line_items: Optional[list[str]] = None, statement: Optional[str] = None,
+              start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        요청한 항목만 골라 wide DataFrame (Symbol, Name, Date, 항목...) 으로 반환합니다.
+        종목별로 최근 날짜가 먼저 옵니다.
+        :param period: 'annual' 또는 'quarterly'
+        :param symbols: 종목 목록 (None 이면 전체, 요청 순서대로 반환)
+        :param line_items: 항목 목록 (None 이면 조건에 맞는 모든 항목). 요청한 항목은 값이 없어도 컬럼으로 포함됩니다.
+        :param statement: 제표 이름으로 제한 ('income', 'balance_sheet', 'cash_flow')
+        """
+        df = self.df
+        if symbols is not None:
+            slices = [self.symbol_slices[s] for s in dict.fromkeys(symbols) if s in self.symbol_slices]
+            rows = np.concatenate([np.arange(lo, hi) for lo, hi in slices]) if slices else np.array([], dtype=np.int64)
+            df = df.iloc[rows]
+
+        mask = self._code_mask(df, 'period', [period])
+        if line_items is not None:
+            mask &= self._code_mask(df, 'line_item', line_items)
+        if statement:
+            mask &= self._code_mask(df, 'statement', [statement])
+        dates = df['Date'].to_numpy()
+        if start_date is not None:
+            mask &= dates >= np.datetime64(pd.Timestamp(start_date))
+        if end_date is not None:
+            mask &= dates <= np.datetime64(pd.Timestamp(end_date))
+        df = df[mask]
+
+        item_categories = df['line_item'].cat.categories
+        item_codes = df['line_item'].cat.codes.to_numpy()
+        if line_items is None:
+            observed = np.unique(item_codes)
+            line_items = list(item_categories[observed])
+        # 항목 코드 -> 결과 컬럼 위치
+        column_of_code = np.full(len(item_categories), -1, dtype=np.int64)
+        requested = item_categories.get_indexer(line_items)
+        column_of_code[requested[requested >= 0]] = np.flatnonzero(requested >= 0)
+
+        # 행은 (Symbol, Date) 단위로 연속해 있으므로 값이 바뀌는 위치로 결과 행 번호를 매깁니다.
+        symbol_codes = df['Symbol'].cat.codes.to_numpy()
+        dates = df['Date'].to_numpy()
+        symbol_changed = np.concatenate(([True], symbol_codes[1:] != symbol_codes[:-1]))[:len(df)]
+        changed = symbol_changed | np.concatenate(([True], dates[1:] != dates[:-1]))[:len(df)]
+        row_ids = np.cumsum(changed) - 1
+        first_rows = np.flatnonzero(changed)
+
+        # 같은 (행, 항목)이 여러 번 있으면 우선순위가 높은(먼저 정렬된) 값을 사용합니다.
+        columns = column_of_code[item_codes]
+        keys = row_ids * max(len(line_items), 1) + columns
+        _, first = np.unique(keys, return_index=True)
+        values = np.full((len(first_rows), len(line_items)), np.nan)
+        values[row_ids[first], columns[first]] = df['value'].to_numpy()[first]
+
+        result = pd.DataFrame(values, columns=line_items)
+        result.insert(0, 'Symbol', df['Symbol'].iloc[first_rows].astype(object).to_numpy())
+        result.insert(1, 'Name', df['Name'].iloc[first_rows].astype(object).to_numpy())
+        result.insert(2, 'Date', dates[first_rows])
+
+        # 종목 순서(요청 순서 또는 저장 순서)는 유지하고, 종목 안에서는 최근 날짜가 먼저 오도록 뒤집습니다.
+        symbol_group = np.cumsum(symbol_changed)[first_rows]
+        order = np.lexsort((-np.arange(len(result)), symbol_group))
+        return result.iloc[order].reset_index(drop=True)
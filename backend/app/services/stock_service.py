@@ -1,7 +1,71 @@
+import itertools
+import threading
+from typing import Callable, Optional
+
+import numpy as np
 import pandas as pd
-import duckdb
 
 from app.core.config import settings
+from app.core.metrics import phase
+from app.services import csv_loader, enrichment, indicators, downsampling, portfolio
+from app.services.screener import MarketSnapshot
+from app.services.rankings import DailyRankings
+from app.services.returns_panel import ReturnsPanel
+
+class _IndexedTable:
+    """
+    (Symbol, Date) 순으로 정렬된 DataFrame 위에 종목별 행 범위 인덱스를 만들어 두는 내부 클래스입니다.
+    종목 조회는 전체 스캔 대신 사전 조회 + 날짜 이진 탐색으로 처리됩니다.
+    """
+    DATE_COLUMN = 'Date'
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        symbols = df['Symbol'].to_numpy()
+        starts = indicators.group_starts(symbols)
+        ends = np.append(starts[1:], len(df))
+        self.symbol_slices: dict[str, tuple[int, int]] = {
+            symbols[start]: (int(start), int(end)) for start, end in zip(starts, ends)
+        }
+        self.columns: dict[str, np.ndarray] = {col: df[col].to_numpy() for col in df.columns}
+
+    def locate(self, ticker: str, start_dt=None, end_dt=None) -> tuple[int, int]:
+        """
+        티커와 날짜 범위에 해당하는 행 범위 [lo, hi) 를 반환합니다.
+        데이터가 없으면 (0, 0)을 반환합니다.
+        """
+        bounds = self.symbol_slices.get(ticker.upper())
+        if bounds is None:
+            return 0, 0
+
+        lo, hi = bounds
+        dates = self.columns[self.DATE_COLUMN][lo:hi]
+        new_lo = lo + int(np.searchsorted(dates, start_dt, side='left')) if start_dt is not None else lo
+        new_hi = lo + int(np.searchsorted(dates, end_dt, side='right')) if end_dt is not None else hi
+        return new_lo, max(new_lo, new_hi)
+
+    def row_positions(self, lo: int, hi: int, max_points: int = None):
+        """
+        [lo, hi) 구간에서 반환할 행 위치를 계산합니다.
+        max_points 가 지정되고 구간이 더 길면 종가(Close) 기준 LTTB 다운샘플링을 적용합니다.
+        """
+        if max_points and hi - lo > max_points:
+            return lo + downsampling.lttb_indices(self.columns['Close'][lo:hi], max_points)
+        return slice(lo, hi)
+
+    def records(self, positions) -> list[dict]:
+        """지정한 행들을 레코드(dict) 리스트로 변환합니다."""
+        return self.df.iloc[positions].to_dict(orient="records")
+
+    def column_values(self, column: str, positions) -> list:
+        """지정한 행들의 컬럼 값을 JSON으로 직렬화 가능한 리스트로 변환합니다."""
+        values = self.columns[column][positions]
+        if column == self.DATE_COLUMN:
+            return np.datetime_as_string(values, unit='D').tolist()
+        if values.dtype.kind == 'f':
+            return np.where(np.isnan(values), None, values).tolist()
+        return values.tolist()
+
 
 class StockService:
     """
@@ -10,12 +74,32 @@ class StockService:
     """
     df_stocks_enriched: pd.DataFrame
 
-    def __init__(self):
+    # 데이터를 새로 불러올 때마다 증가하는 데이터 버전 (파생 캐시의 무효화 기준)
+    _version_counter = itertools.count(1)
+
+    def __init__(self, progress: Optional[Callable[[str, float], None]] = None):
         """
         서비스를 초기화합니다. CSV 파일을 불러온 다음, DuckDB를 사용하여
-        모든 주식에 대한 모든 기술적 지표(이동 평균, RSI)를 미리 계산합니다.
+        모든 주식에 대한 모든 기술적 지표(이동 평균, EMA, RSI)를 미리 계산합니다.
+        :param progress: 진행 상황 콜백 (단계 이름, 0~1 진행률). 백그라운드 warm-up 에서 사용합니다.
         """
+        progress = progress or (lambda step, fraction: None)
         self.df_stocks_enriched = pd.DataFrame()  # 초기 빈 DataFrame
+        self.data_version = 0  # 데이터가 없으면 0
+        # 데이터를 불러오거나 처리하지 못한 이유 (성공했거나 DATA_FILE_PATH 가 없으면 None)
+        self.load_error: Optional[str] = None
+        # 봉 간격('1d', '1w', '1M')별로 미리 집계하고 인덱싱한 테이블
+        self._tables: dict[str, _IndexedTable] = {}
+        # 일자별 횡단면 스냅샷 캐시 (키 None = 최신 스냅샷)
+        self._snapshots: dict = {}
+        # 일자별 순위 사전 집계
+        self.rankings = DailyRankings(self.df_stocks_enriched)
+        # (날짜 × 종목) 수익률 패널. 처음 요청될 때 한 번 만듭니다. (데이터 버전마다 새 서비스가 만들어집니다.)
+        self._returns_panel: Optional[ReturnsPanel] = None
+        self._returns_panel_lock = threading.Lock()
+        # 포트폴리오 평가 결과 캐시 ((데이터 버전, 요청 해시) -> 결과). 오래된 항목부터 제거합니다.
+        self._portfolio_cache: dict[tuple[int, str], dict] = {}
+        self._portfolio_cache_lock = threading.Lock()
         csv_path = settings.DATA_FILE_PATH
 
         if not csv_path:
@@ -23,75 +107,43 @@ class StockService:
             return
 
         try:
-            df_stocks = pd.read_csv(csv_path)
-            df_stocks['Date'] = pd.to_datetime(df_stocks['Date'])
+            progress("load_csv", 0.0)
+            # 선언된 스키마로 읽으며 Date 컬럼은 읽는 동안 datetime 으로 변환됩니다.
+            df_stocks = csv_loader.read_table(csv_path, csv_loader.STOCK_PRICES)
             df_stocks['Symbol'] = df_stocks['Symbol'].str.upper()
+            progress("enrichment", 0.3)
 
-            # 성능 향상을 위해 SQL과 DuckDB를 사용하여 지표를 효율적으로 계산합니다.
-            con = duckdb.connect(database=':memory:', read_only=False)
-            con.register('stocks', df_stocks)
-
-            query = """
-            WITH PriceDiff AS (
-                SELECT
-                    *,
-                    "Close" - LAG("Close", 1, "Close") OVER (
-                        PARTITION BY "Symbol" 
-                        ORDER BY "Date"
-                    ) AS diff
-                FROM stocks
-            ),
-            GainsAndLosses AS (
-                SELECT
-                    *,
-                    CASE WHEN diff > 0 THEN diff ELSE 0 END AS gain,
-                    CASE WHEN diff < 0 THEN -diff ELSE 0 END AS loss
-                FROM PriceDiff
+            # 이동 평균(DuckDB 윈도 함수)과 EMA/RSI(지표 커널)를 종목 파티션 단위로 나누어 병렬 계산하고,
+            # 결과를 (Symbol, Date) 순으로 합칩니다.
+            df_enriched = enrichment.enrich(
+                df_stocks,
+                workers=settings.ENRICHMENT_WORKERS,
+                executor=settings.ENRICHMENT_EXECUTOR,
+                output_dir=settings.ENRICHMENT_OUTPUT_DIR or None,
             )
-            SELECT
-                *,
-                AVG("Close") OVER (
-                    PARTITION BY "Symbol" 
-                    ORDER BY "Date" ROWS 
-                    BETWEEN 4 PRECEDING AND CURRENT ROW
-                ) AS MA_5,
-                AVG("Close") OVER (
-                    PARTITION BY "Symbol" 
-                    ORDER BY "Date" ROWS 
-                    BETWEEN 19 PRECEDING AND CURRENT ROW
-                ) AS MA_20,
-                AVG("Close") OVER (
-                    PARTITION BY "Symbol" 
-                    ORDER BY "Date" ROWS 
-                    BETWEEN 59 PRECEDING AND CURRENT ROW
-                ) AS MA_60,
-                
-                (
-                    100 - (100 / (1 + (
-                        AVG(gain) OVER (
-                            PARTITION BY "Symbol" 
-                            ORDER BY "Date" ROWS 
-                            BETWEEN 13 PRECEDING AND CURRENT ROW
-                        ) /
-                        NULLIF(AVG(loss) OVER (
-                            PARTITION BY "Symbol" 
-                            ORDER BY "Date" ROWS 
-                            BETWEEN 13 PRECEDING AND CURRENT ROW
-                        ), 0)
-                    )))
-                ) AS RSI_14
-            FROM GainsAndLosses
-            """
-
-            self.df_stocks_enriched = con.execute(query).fetchdf()
-            con.close()
+            del df_stocks
+            self.df_stocks_enriched = df_enriched
 
+            # 주봉/월봉은 요청마다 계산하지 않도록 로드 시점에 한 번만 집계해 둡니다.
+            progress("resample_and_index", 0.7)
+            self._tables = {
+                interval: _IndexedTable(downsampling.resample_ohlcv(df_enriched, interval))
+                for interval in downsampling.INTERVALS
+            }
+            self.data_version = next(self._version_counter)
+            progress("snapshot_and_rankings", 0.85)
+            self._snapshots = {None: MarketSnapshot.from_history(df_enriched)}
+            self.rankings = DailyRankings(df_enriched, self.data_version)
+
+            progress("done", 1.0)
             print(f"정보: {csv_path} 파일을 성공적으로 불러오고 처리했습니다. 총 행 수: {len(self.df_stocks_enriched)}.")
 
         except FileNotFoundError:
-            print(f"경고: {csv_path} 파일을 찾을 수 없습니다. 서비스가 데이터 없이 실행됩니다.")
+            self.load_error = f"{csv_path} 파일을 찾을 수 없습니다."
+            print(f"경고: {self.load_error} 서비스가 데이터 없이 실행됩니다.")
         except Exception as e:
-            print(f"경고: 데이터를 불러오거나 처리하는 중 오류가 발생했습니다: {e}. 서비스가 데이터 없이 실행됩니다.")
+            self.load_error = f"데이터를 불러오거나 처리하는 중 오류가 발생했습니다: {e}"
+            print(f"경고: {self.load_error}. 서비스가 데이터 없이 실행됩니다.")
 
     def get_all_stocks(self) -> list[dict]:
         """
@@ -99,7 +151,8 @@ class StockService:
         """
         if self.df_stocks_enriched.empty:
             return []
-        return self.df_stocks_enriched.to_dict(orient="records")
+        with phase("serialize"):
+            return self.df_stocks_enriched.to_dict(orient="records")
 
     def get_stock_by_ticker(self, ticker: str) -> list[dict]:
         """
@@ -107,28 +160,193 @@ class StockService:
         """
         return self.get_stock_by_ticker_and_date_range(ticker)
 
-    def get_stock_by_ticker_and_date_range(self, ticker: str, start_date: str = None, end_date: str = None) -> list[dict]:
+    @staticmethod
+    def _parse_date(value: str):
+        """날짜 문자열을 변환합니다. 유효하지 않은 형식이면 None을 반환합니다."""
+        if not value:
+            return None
+        try:
+            return np.datetime64(pd.to_datetime(value))
+        except ValueError:
+            return None  # 유효하지 않은 날짜 형식은 무시합니다.
+
+    def _table(self, interval: str) -> _IndexedTable:
+        """봉 간격에 해당하는 테이블을 반환합니다."""
+        if interval not in downsampling.INTERVALS:
+            raise ValueError(f"지원하지 않는 interval 입니다: {interval}")
+        return self._tables[interval]
+
+    def get_stock_by_ticker_and_date_range(self, ticker: str, start_date: str = None, end_date: str = None,
+                                           interval: str = '1d', max_points: int = None) -> list[dict]:
         """
         미리 계산된 데이터에서 지정된 날짜 범위 내의 특정 티커 데이터를 반환합니다.
+
+        - interval: '1d'(일봉), '1w'(주봉), '1M'(월봉)
+        - max_points: 지정하면 최대 해당 개수의 점만 남도록 LTTB 다운샘플링합니다.
+        """
+        if self.df_stocks_enriched.empty:
+            return []
+
+        table = self._table(interval)
+        with phase("filter"):
+            lo, hi = table.locate(ticker, self._parse_date(start_date), self._parse_date(end_date))
+            positions = table.row_positions(lo, hi, max_points)
+        with phase("serialize"):
+            return table.records(positions)
+
+    def get_stocks_batch(self, symbols: list[str], start_date: str = None, end_date: str = None,
+                         fields: list[str] = None, interval: str = '1d',
+                         max_points: int = None) -> dict[str, dict[str, list]]:
+        """
+        여러 종목의 데이터를 한 번에 조회하여 종목별 컬럼형(column-oriented) 딕셔너리로 반환합니다.
+
+        반환 형식: {"AAPL": {"Date": [...], "Close": [...]}, ...}
+        - fields 를 지정하면 해당 컬럼만 직렬화합니다. (Date는 항상 포함)
+        - interval, max_points 는 get_stock_by_ticker_and_date_range 와 같습니다.
+        - 데이터가 없는 종목은 결과에서 제외됩니다.
+        - NaN 값은 None으로, 날짜는 'YYYY-MM-DD' 문자열로 변환됩니다.
+        """
+        if self.df_stocks_enriched.empty:
+            return {}
+
+        table = self._table(interval)
+        columns = fields or list(table.columns)
+        if table.DATE_COLUMN not in columns:
+            columns = [table.DATE_COLUMN] + list(columns)
+        start_dt, end_dt = self._parse_date(start_date), self._parse_date(end_date)
+
+        result = {}
+        for symbol in dict.fromkeys(s.upper() for s in symbols):
+            with phase("filter"):
+                lo, hi = table.locate(symbol, start_dt, end_dt)
+                positions = table.row_positions(lo, hi, max_points) if lo < hi else None
+            if positions is None:
+                continue
+            with phase("serialize"):
+                result[symbol] = {col: table.column_values(col, positions) for col in columns}
+        return result
+
+    # 날짜 지정 스냅샷을 몇 개까지 캐시할지
+    SNAPSHOT_CACHE_SIZE = 32
+
+    def get_snapshot(self, as_of: str = None) -> MarketSnapshot:
+        """
+        종목별 최신 행으로 이루어진 횡단면 스냅샷을 반환합니다.
+        as_of 를 지정하면 해당 일자 기준 스냅샷을 만들어 캐시합니다.
+        날짜 형식이 잘못되면 ValueError를 발생시킵니다.
+        """
+        if not as_of:
+            snapshot = self._snapshots.get(None)
+            return snapshot if snapshot is not None else MarketSnapshot.from_history(self.df_stocks_enriched)
+
+        key = pd.to_datetime(as_of)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            dated = [k for k in self._snapshots if k is not None]
+            if len(dated) >= self.SNAPSHOT_CACHE_SIZE:
+                # 가장 오래된 날짜 지정 스냅샷을 제거합니다. (최신 스냅샷은 유지하며 개수에 포함하지 않습니다)
+                del self._snapshots[dated[0]]
+            snapshot = MarketSnapshot.from_history(self.df_stocks_enriched, key)
+            self._snapshots[key] = snapshot
+        return snapshot
+
+    def screen_stocks(self, filters: str = None, sort: str = None, limit: int = 50, as_of: str = None) -> list[dict]:
+        """
+        스냅샷 위에서 필터/정렬/limit 표현식을 평가하여 조건에 맞는 종목의 행을 반환합니다.
+        예: filters="RSI_14<30,Close>MA_60", sort="-거래액"
         """
         if self.df_stocks_enriched.empty:
             return []
+        with phase("filter"):
+            matched = self.get_snapshot(as_of).screen(filters, sort, limit)
+        with phase("serialize"):
+            return matched.to_dict(orient="records")
 
-        # 이미 처리된 DataFrame에서 필터링
-        filtered_df = self.df_stocks_enriched[self.df_stocks_enriched['Symbol'] == ticker.upper()].copy()
+    def get_rankings(self, metric: str = 'change_pct', date: str = None, top: int = 10,
+                     ascending: bool = False) -> list[dict]:
+        """
+        지정한 일자(기본: 최근 거래일)의 지표별 상위 N개 종목을 반환합니다.
+        metric: 'change_pct'(등락률), 'volume'(거래량), 'trading_value'(거래액)
+        """
+        with phase("filter"):
+            return self.rankings.top(metric, date, top, ascending)
 
-        if start_date:
-            try:
-                start_date_dt = pd.to_datetime(start_date)
-                filtered_df = filtered_df[filtered_df['Date'] >= start_date_dt]
-            except ValueError:
-                pass  # 유효하지 않은 날짜 형식은 무시합니다.
+    def get_returns_panel(self) -> ReturnsPanel:
+        """
+        상관계수/공분산 계산용 (날짜 × 종목) 수익률 패널을 반환합니다.
+        처음 호출될 때 한 번만 만들며, 동시에 여러 요청이 와도 한 번만 만듭니다.
+        """
+        if self._returns_panel is None:
+            with self._returns_panel_lock:
+                if self._returns_panel is None:
+                    self._returns_panel = ReturnsPanel(self.df_stocks_enriched, self.data_version)
+        return self._returns_panel
+
+    # 포트폴리오 평가 결과를 몇 개까지 캐시할지
+    PORTFOLIO_CACHE_SIZE = 256
+
+    def evaluate_portfolio(self, holdings: list[dict], rebalance: str = 'none', start_date: str = None,
+                           end_date: str = None, initial_value: float = 10000.0) -> Optional[dict]:
+        """
+        포트폴리오 가치 시계열, 낙폭, 변동성, 종목별 기여도를 계산합니다. (app.services.portfolio.evaluate 참고)
+        결과는 (데이터 버전, 요청 해시) 를 키로 캐시하므로 같은 요청은 다시 계산하지 않습니다.
+        모든 종목의 가격이 있는 날짜가 없으면 None, 잘못된 입력이면 ValueError를 발생시킵니다.
+        """
+        key = (self.data_version, portfolio.holdings_key(holdings, rebalance, start_date, end_date, initial_value))
+        with self._portfolio_cache_lock:
+            cached = self._portfolio_cache.get(key)
+            if cached is not None:
+                # 최근에 사용한 항목이 가장 늦게 제거되도록 뒤로 옮깁니다.
+                self._portfolio_cache[key] = self._portfolio_cache.pop(key)
+                return cached
+
+        with phase("filter"):
+            result = portfolio.evaluate(self.get_returns_panel(), holdings, rebalance, start_date, end_date,
+                                        initial_value)
+        if result is None:
+            return None
+        result['data_version'] = self.data_version
+        with self._portfolio_cache_lock:
+            while len(self._portfolio_cache) >= self.PORTFOLIO_CACHE_SIZE:
+                del self._portfolio_cache[next(iter(self._portfolio_cache))]
+            self._portfolio_cache[key] = result
+        return result
 
-        if end_date:
-            try:
-                end_date_dt = pd.to_datetime(end_date)
-                filtered_df = filtered_df[filtered_df['Date'] <= end_date_dt]
-            except ValueError:
-                pass  # 유효하지 않은 날짜 형식은 무시합니다.
+    def last_bar_dates(self) -> dict[str, np.datetime64]:
+        """종목별 마지막 일봉 날짜. (다음 데이터 버전의 새 봉을 찾는 기준)"""
+        if self.df_stocks_enriched.empty:
+            return {}
+        table = self._table('1d')
+        dates = table.columns[table.DATE_COLUMN]
+        return {symbol: dates[hi - 1] for symbol, (lo, hi) in table.symbol_slices.items()}
+
+    def get_bars_since(self, last_dates: dict[str, np.datetime64], max_bars: int = None) -> dict[str, dict]:
+        """
+        종목별로 last_dates 의 날짜보다 뒤의 일봉을 컬럼형으로 반환합니다. last_dates 에 없는 종목은 모든 봉이 새 봉입니다.
+        max_bars 를 넘으면 최근 봉만 남기고 truncated 를 True 로 표시합니다.
+
+        반환 형식: {"AAPL": {"bars": {"Date": [...], "Close": [...], ...}, "truncated": False}, ...}
+        """
+        if self.df_stocks_enriched.empty:
+            return {}
+        table = self._table('1d')
+        dates = table.columns[table.DATE_COLUMN]
+        result = {}
+        for symbol, (lo, hi) in table.symbol_slices.items():
+            last = last_dates.get(symbol)
+            start = lo if last is None else lo + int(np.searchsorted(dates[lo:hi], last, side='right'))
+            if start >= hi:
+                continue
+            truncated = bool(max_bars) and hi - start > max_bars
+            if truncated:
+                start = hi - max_bars
+            result[symbol] = {
+                "bars": {col: table.column_values(col, slice(start, hi)) for col in table.columns},
+                "truncated": truncated,
+            }
+        return result
 
-        return filtered_df.to_dict(orient="records")
\ No newline at end of file
+    @property
+    def available_fields(self) -> list[str]:
+        """조회 가능한 컬럼 목록을 반환합니다."""
+        return list(self.df_stocks_enriched.columns)
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def history():
+    """
+    수익률 패널/포트폴리오 테스트용 종가 이력 (Symbol, Date, Close).
+    3 종목 × 120 거래일(2024-01-01 부터)의 랜덤 워크이며, NVDA 는 10일 늦게(2024-01-15) 상장했고,
+    MSFT 는 2024-01-22 종가가 없습니다.
+    """
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2024-01-01', periods=120)
+    frames = []
+    for symbol in ('AAPL', 'MSFT', 'NVDA'):
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.02, len(dates)))
+        frames.append(pd.DataFrame({'Symbol': symbol, 'Date': dates, 'Close': close}))
+    df = pd.concat(frames, ignore_index=True)
+    late_listing = (df['Symbol'] == 'NVDA') & (df['Date'] < dates[10])
+    missing_day = (df['Symbol'] == 'MSFT') & (df['Date'] == dates[15])
+    return df[~(late_listing | missing_day)].reset_index(drop=True)
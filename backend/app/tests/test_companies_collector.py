@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('FinanceDataReader')
+
+# 수집기 모듈은 data_fetchers 폴더 기준 import 를 사용하므로 해당 폴더를 sys.path에 추가합니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pipeline', 'data_fetchers'))
+
+import companiesCollector
+from companiesCollector import diff_universe, get_universe, get_universe_diff, load_index
+
+
+def _listing(rows):
+    return pd.DataFrame(rows, columns=['Symbol', 'Name', 'Industry'])
+
+
+V1 = _listing([('AAPL', 'Apple Inc', 'Tech'), ('FB', 'Meta Platforms', 'Tech'), ('OLD', 'Old Corp', 'Retail'),
+               ('NA', 'Nano Labs', 'Tech')])
+V2 = _listing([('AAPL', 'Apple Inc.', 'Tech'), ('META', 'Meta Platforms', 'Tech'), ('NEW', 'New Corp', 'Tech'),
+               ('NA', 'Nano Labs', 'Tech')])
+
+
+@pytest.fixture
+def listing(monkeypatch):
+    """fdr.StockListing 대신 준비한 목록을 반환하고 호출 횟수를 셉니다."""
+    state = {'df': V1, 'calls': 0}
+
+    def fake_listing(market):
+        state['calls'] += 1
+        return state['df'].copy()
+
+    monkeypatch.setattr(companiesCollector.fdr, 'StockListing', fake_listing)
+    return state
+
+
+def test_snapshot_is_reused_within_ttl(tmp_path, listing):
+    """TTL 이내에는 네트워크 대신 스냅샷을 사용하고, 목록이 같으면 새 버전을 만들지 않는지 테스트합니다."""
+    df = get_universe(max_age_hours=24, universe_dir=str(tmp_path))
+    assert listing['calls'] == 1
+    assert 'NA' in df['Symbol'].tolist()  # 'NA' 티커가 결측값으로 바뀌지 않아야 합니다.
+
+    get_universe(max_age_hours=24, universe_dir=str(tmp_path))
+    assert listing['calls'] == 1
+
+    # TTL 이 지나도 목록이 같으면 버전은 그대로이고 확인 시각만 갱신됩니다.
+    get_universe(max_age_hours=0, universe_dir=str(tmp_path))
+    assert listing['calls'] == 2
+    assert [v['version'] for v in load_index(str(tmp_path))['versions']] == [1]
+
+
+def test_changed_listing_creates_version_and_diff(tmp_path, listing):
+    """목록이 바뀌면 새 버전을 만들고 직전 버전과의 차이를 구할 수 있는지 테스트합니다."""
+    get_universe(universe_dir=str(tmp_path))
+    listing['df'] = V2
+    get_universe(refresh=True, universe_dir=str(tmp_path))
+
+    diff = get_universe_diff(universe_dir=str(tmp_path))
+
+    assert (diff['from_version'], diff['to_version']) == (1, 2)
+    assert diff['added'] == ['NEW']
+    assert diff['removed'] == ['OLD']
+    assert diff['renamed'] == [{'old_symbol': 'FB', 'new_symbol': 'META', 'name': 'Meta Platforms'}]
+    assert diff['name_changed'] == [{'symbol': 'AAPL', 'old_name': 'Apple Inc', 'new_name': 'Apple Inc.'}]
+
+
+def test_fetch_failure_falls_back_to_stale_snapshot(tmp_path, listing, monkeypatch):
+    get_universe(universe_dir=str(tmp_path))
+
+    def broken(market):
+        raise ConnectionError('offline')
+
+    monkeypatch.setattr(companiesCollector.fdr, 'StockListing', broken)
+    df = get_universe(max_age_hours=0, universe_dir=str(tmp_path))
+    assert sorted(df['Symbol']) == sorted(V1['Symbol'])
+
+
+def test_first_snapshot_diff_lists_everything_as_added():
+    diff = diff_universe(V1.iloc[0:0], V1)
+    assert diff['added'] == sorted(V1['Symbol'])
+    assert diff['removed'] == [] and diff['renamed'] == []
@@ -0,0 +1,146 @@
+import gzip
+import os
+import sys
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core import compression
+from app.core.middleware import CompressionMiddleware
+from app.core.response_cache import ResponseCache, cached_response
+
+
+def test_negotiate_respects_q_values_and_server_preference():
+    available = ('zstd', 'br', 'gzip')
+    assert compression.negotiate(None, available) is None
+    assert compression.negotiate('gzip, br', available) == 'br'
+    assert compression.negotiate('gzip;q=1.0, br;q=0.5', available) == 'gzip'
+    assert compression.negotiate('*;q=0.5, zstd;q=0', available) == 'br'
+    assert compression.negotiate('identity', available) is None
+    assert compression.negotiate('br, zstd', ('gzip',)) is None
+
+
+@pytest.mark.parametrize("encoding", ['gzip', 'br', 'zstd'])
+def test_stream_compressor_chunks_decode_incrementally(encoding):
+    if encoding == 'br':
+        brotli = pytest.importorskip('brotli')
+        decoder = brotli.Decompressor()
+        decode = decoder.process
+    elif encoding == 'zstd':
+        zstandard = pytest.importorskip('zstandard')
+        decode = zstandard.ZstdDecompressor().decompressobj().decompress
+    else:
+        decode = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+
+    compressor = compression.StreamCompressor(encoding)
+    # 청크마다 flush 되므로 다음 청크를 기다리지 않고 바로 풀 수 있어야 합니다.
+    for i in range(3):
+        event = f'data: {{"i": {i}}}\n\n'.encode()
+        assert decode(compressor.compress(event)) == event
+    decode(compressor.finish())
+
+
+def test_response_cache_drops_old_versions_and_evicts_by_size():
+    cache = ResponseCache(max_bytes=10_000)
+    cache.put("prices", 1, "a", b"x" * 3000)
+    assert cache.get("prices", 1, "a") is not None
+    # 새 데이터 버전이 들어오면 이전 버전 항목은 모두 버려집니다.
+    cache.put("prices", 2, "b", b"y" * 3000)
+    assert cache.get("prices", 1, "a") is None and len(cache) == 1
+    # 이전 버전으로 만든 본문은 저장하지 않습니다.
+    cache.put("prices", 1, "a", b"x" * 3000)
+    assert len(cache) == 1
+
+    cache.put("prices", 2, "c", b"z" * 3000)
+    cache.get("prices", 2, "b")
+    cache.put("prices", 2, "d", b"w" * 5000)
+    # 가장 오래 사용하지 않은 'c' 가 버려집니다.
+    assert cache.get("prices", 2, "c") is None and cache.get("prices", 2, "b") is not None
+    assert cache.total_bytes <= 10_000
+
+
+def test_cached_response_compresses_once_and_honours_etag():
+    cache = ResponseCache()
+    body = b'[' + b','.join(b'{"Close":%d}' % i for i in range(500)) + b']'
+    hot = cache.put("prices", 7, "all", body, hot=True)
+    cold = cache.put("prices", 7, "ticker:AAPL", body)
+    entries = {"all": hot, "ticker": cold}
+
+    app = FastAPI()
+
+    @app.get("/cached/{key}")
+    async def cached_route(request: Request, key: str):
+        return await cached_response(request, entries[key], cache)
+
+    client = TestClient(app)
+    first = client.get("/cached/all", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/cached/all", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip" and first.content == body
+    # 많은 요청이 다시 쓰는 항목만 한 단계 높은 수준으로, 나머지는 동적 응답과 같은 수준으로 압축합니다.
+    assert second.content == body and hot.variants["gzip"] == gzip.compress(body, compression.CACHED_LEVELS["gzip"], mtime=0)
+    assert client.get("/cached/ticker", headers={"Accept-Encoding": "gzip"}).content == body
+    assert cold.variants["gzip"] == gzip.compress(body, compression.DYNAMIC_LEVELS["gzip"], mtime=0)
+    assert cache.total_bytes == 2 * len(body) + len(hot.variants["gzip"]) + len(cold.variants["gzip"])
+
+    plain = client.get("/cached/all", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.content == body
+    # 원본과 압축 본문이 같은 ETag 를 쓰므로 약한 ETag 이며, If-None-Match 는 약한 비교로 확인합니다.
+    assert first.headers["etag"] == plain.headers["etag"] and first.headers["etag"].startswith('W/"')
+    for tag in (first.headers["etag"], first.headers["etag"][2:], f'"other", {first.headers["etag"]}'):
+        not_modified = client.get("/cached/all", headers={"If-None-Match": tag})
+        assert not_modified.status_code == 304 and not_modified.content == b""
+    assert client.get("/cached/all", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_compression_middleware_handles_plain_and_streaming_responses():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/large")
+    async def large():
+        return JSONResponse(content=list(range(1000)), headers={"ETag": '"v1"'})
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(3):
+                yield f"data: {i}\n\n".encode()
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    client = TestClient(app)
+    headers = {"Accept-Encoding": "gzip"}
+    assert "content-encoding" not in client.get("/small", headers=headers).headers
+
+    large = client.get("/large", headers=headers)
+    assert large.headers["content-encoding"] == "gzip" and large.headers["vary"] == "Accept-Encoding"
+    assert large.json() == list(range(1000))
+    assert int(large.headers["content-length"]) < len(JSONResponse(content=list(range(1000))).body)
+    # 압축한 본문은 원본과 바이트가 다르므로 강한 ETag 를 약한 ETag 로 바꿉니다.
+    assert large.headers["etag"] == 'W/"v1"'
+    assert client.get("/large", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"v1"'
+
+    streamed = client.get("/stream", headers=headers)
+    assert streamed.headers["content-encoding"] == "gzip" and "content-length" not in streamed.headers
+    assert streamed.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+
+
+def test_cache_key_normalizes_equivalent_requests():
+    """서비스가 같은 결과를 내는 요청(대소문자, 중복 티커, 날짜 표기)이 같은 캐시 키가 되는지 테스트합니다."""
+    from app.api.routers.stock_v2 import _cache_key
+
+    assert _cache_key("ticker", ["aapl"], "2024-1-2", None, "1d", None) == \
+        _cache_key("ticker", ["AAPL"], "2024-01-02", "", "1d", None)
+    assert _cache_key("batch", ["msft", "AAPL", "MSFT"], None, "not a date") == \
+        _cache_key("batch", ["MSFT", "aapl"], None, None)
+    # 티커 순서는 응답 순서이므로 키에 남깁니다.
+    assert _cache_key("batch", ["AAPL", "MSFT"], None, None) != _cache_key("batch", ["MSFT", "AAPL"], None, None)
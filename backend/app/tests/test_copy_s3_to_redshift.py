@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('boto3')
+
+# 적재 스크립트는 processing 폴더 기준 import 를 사용하므로 해당 폴더를 sys.path에 추가합니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pipeline', 'processing'))
+
+from copy_s3_to_redshift import build_incremental_sqls, fetch_loaded_objects, select_new_objects
+
+CONF = {
+    's3_bucket_name': 'test-bucket', 'b_account_iam_role_arn': 'arn:role', 'region_name': 'us-east-1',
+    'workgroup_name': 'wg', 'database_name': 'db', 'b_account_secret_arn': 'arn:secret',
+    'load_history_table': 'etl_load_history',
+}
+TABLE_CONF = {
+    'target_table': 'nasdaq_stocks', 's3_file_path': None, 'format': 'PARQUET', 'ignoreheader': '1',
+    'source_file': 'nasdaq_all_stocks.parquet', 'load_mode': 'incremental', 'merge_keys': ['Symbol', 'Date'],
+}
+OBJECT = {'key': 'nasdaq/dt=2024-01-03/nasdaq_all_stocks.parquet', 'etag': 'abc-2', 'sha256': 'f00'}
+
+
+class FakeDataApi:
+    """get_statement_result 를 페이지 단위로 돌려주는 Redshift Data API 대역"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.sql = None
+
+    def execute_statement(self, Sql, **kwargs):
+        self.sql = Sql
+        return {'Id': 'q1'}
+
+    def describe_statement(self, Id):
+        return {'Status': 'FINISHED'}
+
+    def get_statement_result(self, Id, NextToken=None):
+        index = int(NextToken or 0)
+        result = {'Records': self.pages[index]}
+        if index + 1 < len(self.pages):
+            result['NextToken'] = str(index + 1)
+        return result
+
+
+def _row(key, etag):
+    return [{'stringValue': key}, {'stringValue': etag}]
+
+
+def test_incremental_sqls_stage_merge_and_record_history():
+    """staging COPY -> 자연키 기준 삭제/삽입 -> 이력 기록 순서의 SQL 을 만드는지 테스트합니다."""
+    manifest_url = 's3://test-bucket/nasdaq/manifests/run/nasdaq_all_stocks.parquet.manifest'
+    sqls = build_incremental_sqls(CONF, TABLE_CONF, [OBJECT], manifest_url, 'run-1')
+
+    assert sqls[0] == 'CREATE TEMP TABLE nasdaq_stocks_staging (LIKE nasdaq_stocks);'
+    assert 'COPY nasdaq_stocks_staging' in sqls[1]
+    assert f"FROM '{manifest_url}'" in sqls[1] and 'MANIFEST' in sqls[1]
+    assert sqls[2] == ('DELETE FROM nasdaq_stocks USING nasdaq_stocks_staging WHERE '
+                       'nasdaq_stocks."Symbol" = nasdaq_stocks_staging."Symbol" AND '
+                       'nasdaq_stocks."Date" = nasdaq_stocks_staging."Date";')
+    assert sqls[3] == 'INSERT INTO nasdaq_stocks SELECT * FROM nasdaq_stocks_staging;'
+    assert 'INSERT INTO etl_load_history' in sqls[4]
+    assert "('nasdaq_stocks', 'nasdaq/dt=2024-01-03/nasdaq_all_stocks.parquet', 'abc-2', 'f00', 'run-1')" in sqls[4]
+
+
+def test_loaded_objects_are_not_loaded_twice():
+    """이력 테이블에 있는 (키, ETag) 객체는 제외하는지 테스트합니다. (여러 페이지 결과 포함)"""
+    client = FakeDataApi([[_row('old/key.parquet', 'e1')], [_row(OBJECT['key'], OBJECT['etag'])]])
+
+    loaded = fetch_loaded_objects(client, CONF, 'nasdaq_stocks')
+
+    assert loaded == {('old/key.parquet', 'e1'), (OBJECT['key'], OBJECT['etag'])}
+    assert "WHERE target_table = 'nasdaq_stocks'" in client.sql
+    assert select_new_objects([OBJECT], loaded) == []
+    # 같은 키라도 내용(ETag)이 바뀌면 다시 적재합니다.
+    changed = {**OBJECT, 'etag': 'def-2'}
+    assert select_new_objects([changed], loaded) == [changed]
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.downsampling import resample_ohlcv, lttb_indices
+
+
+def test_resample_ohlcv_weekly():
+    """일봉이 종목별 주봉으로 올바르게 집계되는지 테스트합니다."""
+    # 2024-01-04(목), 01-05(금), 01-08(월), 01-09(화)
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-04', '2024-01-05', '2024-01-08', '2024-01-09', '2024-01-05']),
+        'Symbol': ['AAPL', 'AAPL', 'AAPL', 'AAPL', 'MSFT'],
+        'Open': [10.0, 11.0, 12.0, 13.0, 100.0],
+        'High': [15.0, 12.0, 14.0, 13.5, 101.0],
+        'Low': [9.0, 10.5, 11.0, 12.5, 99.0],
+        'Close': [11.0, 11.5, 13.0, 13.2, 100.5],
+        'Volume': [100, 200, 300, 400, 50],
+        'RSI_14': [40.0, 45.0, 50.0, 55.0, 60.0],
+    })
+
+    weekly = resample_ohlcv(df, '1w')
+
+    assert weekly['Symbol'].tolist() == ['AAPL', 'AAPL', 'MSFT']
+    assert weekly['Date'].dt.strftime('%Y-%m-%d').tolist() == ['2024-01-05', '2024-01-09', '2024-01-05']
+    assert weekly['Open'].tolist() == [10.0, 12.0, 100.0]
+    assert weekly['High'].tolist() == [15.0, 14.0, 101.0]
+    assert weekly['Low'].tolist() == [9.0, 11.0, 99.0]
+    assert weekly['Close'].tolist() == [11.5, 13.2, 100.5]
+    assert weekly['Volume'].tolist() == [300, 700, 50]
+    # 지표는 기간 마지막 거래일의 값
+    assert weekly['RSI_14'].tolist() == [45.0, 55.0, 60.0]
+
+    monthly = resample_ohlcv(df, '1M')
+    assert monthly['Volume'].tolist() == [1000, 50]
+
+
+def test_resample_ohlcv_skips_missing_values():
+    """하루의 고가/저가/거래량이 비어 있어도 주봉/월봉 전체가 NaN 이 되지 않는지 테스트합니다."""
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-08', '2024-01-09', '2024-01-10']),
+        'Symbol': ['AAPL'] * 3,
+        'Open': [10.0, 11.0, 12.0],
+        'High': [15.0, np.nan, 14.0],
+        'Low': [np.nan, 10.5, 11.0],
+        'Close': [11.0, 11.5, 13.0],
+        'Volume': [100.0, np.nan, 300.0],
+    })
+
+    for interval in ('1w', '1M'):
+        bars = resample_ohlcv(df, interval)
+        assert bars[['High', 'Low', 'Volume']].iloc[0].tolist() == [15.0, 10.5, 400.0]
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    """LTTB가 첫/마지막 점과 급격한 변화 지점을 유지하는지 테스트합니다."""
+    y = np.zeros(1000)
+    y[500] = 100.0  # 스파이크
+
+    idx = lttb_indices(y, 50)
+
+    assert len(idx) == 50
+    assert idx[0] == 0 and idx[-1] == 999
+    assert 500 in idx
+    assert (np.diff(idx) > 0).all()
+    # 요청한 점 개수보다 데이터가 적으면 그대로 반환
+    assert lttb_indices(y[:10], 50).tolist() == list(range(10))
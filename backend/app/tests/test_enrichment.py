@@ -0,0 +1,63 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import enrichment
+
+
+@pytest.fixture(scope='module')
+def prices():
+    """23개 종목 × 90일 랜덤 워크 종가. 입력 순서가 섞여 있어도 결과는 (Symbol, Date) 순이어야 합니다."""
+    rng = np.random.default_rng(0)
+    n_symbols, n_days = 23, 90
+    df = pd.DataFrame({
+        'Date': np.tile(pd.bdate_range('2023-01-02', periods=n_days), n_symbols),
+        'Symbol': np.repeat([f'S{i:02d}' for i in range(n_symbols)], n_days),
+        'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_symbols * n_days))),
+    })
+    return df.sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+
+def test_split_keeps_each_symbol_in_one_partition(prices):
+    parts = enrichment.split_by_symbol(prices, 5)
+
+    assert len(parts) == 5
+    assert sum(len(part) for part in parts) == len(prices)
+    symbol_sets = [set(part['Symbol']) for part in parts]
+    for i, symbols in enumerate(symbol_sets):
+        assert all(symbols.isdisjoint(other) for other in symbol_sets[i + 1:])
+    # 파티션은 종목 코드 순서대로 이어집니다.
+    assert [max(s) for s in symbol_sets] == sorted(max(s) for s in symbol_sets)
+    assert max(symbol_sets[0]) < min(symbol_sets[1])
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_enrichment_matches_single_partition(prices, executor):
+    """파티션을 나누어 병렬로 계산한 결과가 한 번에 계산한 결과와 같은지 테스트합니다."""
+    expected = enrichment.enrich(prices, workers=1)
+    result = enrichment.enrich(prices, workers=3, executor=executor)
+
+    assert expected[['Symbol', 'Date']].equals(expected.sort_values(['Symbol', 'Date'], ignore_index=True)[['Symbol', 'Date']])
+    pd.testing.assert_frame_equal(result, expected)
+    assert {'MA_5', 'MA_20', 'MA_60', 'EMA_12', 'EMA_26', 'RSI_14'} <= set(result.columns)
+
+
+def test_partitions_are_written_independently(prices, tmp_path):
+    pytest.importorskip('pyarrow')
+    result = enrichment.enrich(prices, workers=2, num_partitions=4, output_dir=str(tmp_path))
+
+    files = sorted(os.listdir(tmp_path))
+    assert files == [f'part-{i:05d}.parquet' for i in range(4)]
+    written = pd.concat([pd.read_parquet(tmp_path / name) for name in files], ignore_index=True)
+    pd.testing.assert_frame_equal(written, result, check_dtype=False)
+
+
+def test_unknown_executor_is_rejected(prices):
+    with pytest.raises(ValueError):
+        enrichment.enrich(prices, executor='gpu')
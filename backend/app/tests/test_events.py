@@ -0,0 +1,158 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.events import EventBus, Subscriber, RESET
+from app.services.live_updates import LiveUpdatePublisher
+from app.services.stock_service import StockService
+
+
+def _drain(subscriber: Subscriber) -> list:
+    items = []
+    while not subscriber.queue.empty():
+        items.append(subscriber.queue.get_nowait())
+    return items
+
+
+def test_bus_serializes_once_and_filters_by_symbol_and_channel():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        bus = EventBus()
+        aapl = Subscriber(loop, ['bars', 'version'], ['aapl'])
+        everything = Subscriber(loop, ['bars', 'news', 'version'])
+        news_only = Subscriber(loop, ['news'], ['MSFT'])
+        for subscriber in (aapl, everything, news_only):
+            bus.subscribe(subscriber)
+
+        bus.publish_many([
+            ('bars', {'symbol': 'AAPL', 'Close': [1.5]}, 'AAPL'),
+            ('bars', {'symbol': 'MSFT'}, 'MSFT'),
+            ('version', {'data_version': 2}, None),
+        ])
+        await asyncio.sleep(0)
+        return _drain(aapl), _drain(everything), _drain(news_only)
+
+    aapl, everything, news_only = asyncio.run(scenario())
+    assert aapl[0] == b'id: 1\nevent: bars\ndata: {"symbol":"AAPL","Close":[1.5]}\n\n'
+    assert len(aapl) == 2 and len(everything) == 3 and news_only == []
+    # 같은 이벤트는 모든 구독자가 같은 bytes 객체를 공유합니다.
+    assert aapl[0] is everything[0] and aapl[1] is everything[2]
+
+
+def test_bus_replays_after_last_event_id_and_resets_slow_subscribers():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        bus = EventBus(buffer_size=3)
+        for i in range(4):
+            bus.publish('bars', {'i': i}, 'AAPL')
+
+        resumed = bus.subscribe(Subscriber(loop, ['bars'], ['AAPL']), last_event_id=2)
+        too_old = bus.subscribe(Subscriber(loop, ['bars']), last_event_id=0)
+
+        slow = Subscriber(loop, ['bars'], max_pending=2)
+        bus.subscribe(slow)
+        bus.publish_many([('bars', {'i': i}, 'AAPL') for i in range(3)])
+        await asyncio.sleep(0)
+        return resumed, too_old, _drain(slow), slow.closed
+
+    resumed, too_old, slow, closed = asyncio.run(scenario())
+    assert [payload.split(b'\n')[0] for payload in resumed] == [b'id: 3', b'id: 4']
+    assert too_old[0] == RESET and len(too_old) == 4
+    # 대기열이 넘친 구독자는 reset 후 종료(None)됩니다.
+    assert slow == [RESET, None] and closed
+
+
+@patch('pandas.read_csv')
+def test_publisher_emits_new_bars_and_alerts_between_versions(mock_read_csv):
+    base = pd.DataFrame({
+        'Date': ['2023-01-02', '2023-01-03', '2023-01-02', '2023-01-03'],
+        'Symbol': ['aapl', 'aapl', 'msft', 'msft'],
+        'Open': [1.0] * 4,
+        'Close': [100.0, 101.0, 200.0, 199.0],
+    })
+    published = []
+    bus = EventBus()
+    bus.publish_many = published.extend
+    publisher = LiveUpdatePublisher(bus, alert_rules={'big_close': 'Close>150'}, max_bars=5)
+
+    mock_read_csv.return_value = base
+    publisher.on_prices(StockService())
+    assert [channel for channel, _, _ in published] == ['version']
+
+    published.clear()
+    mock_read_csv.return_value = pd.concat([base, pd.DataFrame({
+        'Date': ['2023-01-04'], 'Symbol': ['aapl'], 'Open': [1.0], 'Close': [160.0],
+    })], ignore_index=True)
+    service = StockService()
+    publisher.on_prices(service)
+
+    channels = {(channel, symbol): data for channel, data, symbol in published}
+    assert set(channels) == {('bars', 'AAPL'), ('alerts', 'AAPL'), ('version', None)}
+    bars = channels[('bars', 'AAPL')]
+    assert bars['bars']['Date'] == ['2023-01-04'] and bars['bars']['Close'] == [160.0]
+    assert bars['data_version'] == service.data_version and not bars['truncated']
+    assert channels[('alerts', 'AAPL')]['rule'] == 'big_close'
+
+
+@patch('pandas.read_csv')
+def test_failed_or_empty_price_load_keeps_the_baseline(mock_read_csv):
+    """빈(또는 실패한) 주가 버전이 변경분 기준을 지우지 않고, 레지스트리도 기존 인스턴스를 유지하는지 테스트합니다."""
+    from app.core.lazy import LazyService, READY
+    from app.services.registry import _build_stock_service
+
+    base = pd.DataFrame({
+        'Date': ['2023-01-02', '2023-01-03'], 'Symbol': ['aapl', 'aapl'], 'Open': [1.0, 1.0], 'Close': [100.0, 101.0],
+    })
+    published = []
+    bus = EventBus()
+    bus.publish_many = published.extend
+    publisher = LiveUpdatePublisher(bus, alert_rules={}, max_bars=5)
+    prices = LazyService('prices', _build_stock_service, with_progress=True)
+    prices.add_listener(publisher.on_prices)
+
+    mock_read_csv.return_value = base
+    first = prices.get()
+
+    published.clear()
+    mock_read_csv.side_effect = OSError('disk error')
+    with pytest.raises(RuntimeError):
+        prices.reload()
+    assert prices.get() is first and prices.state == READY and prices.version == 1
+    # 빈 버전을 직접 받아도 기준을 바꾸지 않습니다.
+    mock_read_csv.side_effect, mock_read_csv.return_value = None, base.iloc[0:0]
+    publisher.on_prices(StockService())
+    assert published == []
+
+    mock_read_csv.return_value = pd.concat([base, pd.DataFrame({
+        'Date': ['2023-01-04'], 'Symbol': ['aapl'], 'Open': [1.0], 'Close': [102.0],
+    })], ignore_index=True)
+    prices.reload()
+    bars = [data for channel, data, _ in published if channel == 'bars']
+    assert len(bars) == 1 and bars[0]['bars']['Date'] == ['2023-01-04']
+
+
+def test_news_without_symbol_is_published_without_a_symbol():
+    """종목 코드가 빈 새 뉴스는 'NONE' 이 아니라 종목 없이(None) 발행되는지 테스트합니다."""
+    from types import SimpleNamespace
+
+    published = []
+    bus = EventBus()
+    bus.publish_many = published.extend
+    publisher = LiveUpdatePublisher(bus, alert_rules={})
+
+    base = pd.DataFrame({'Symbol': ['aapl'], 'title': ['a'], 'url': ['https://news.example.com/0']})
+    publisher.on_news(SimpleNamespace(_df=base))
+    published.clear()
+
+    added = pd.DataFrame({'Symbol': ['NA', None], 'title': ['b', 'c'],
+                          'url': ['https://news.example.com/1', 'https://news.example.com/2']})
+    publisher.on_news(SimpleNamespace(_df=pd.concat([base, added], ignore_index=True)))
+    assert [(channel, symbol) for channel, _, symbol in published] == [
+        ('news', 'NA'), ('news', None), ('version', None)]
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+import os
+import sys
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import indicators
+
+# Wilder RSI 검증에 널리 쓰이는 예제 종가 (StockCharts "RSI" 예제 데이터)
+WILDER_CLOSES = [
+    44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08, 45.89,
+    46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64, 46.21, 46.25,
+    45.71, 46.45, 45.78, 45.35, 44.03, 44.18, 44.22, 44.57, 43.42, 42.66, 43.13,
+]
+
+# 중간값을 반올림하지 않고 계산한 기대값 (TA-Lib 등과 동일)
+WILDER_RSI_14 = [
+    70.46, 66.25, 66.48, 69.35, 66.29, 57.92, 62.88, 63.21, 56.01, 62.34,
+    54.67, 50.39, 40.02, 41.49, 41.90, 45.50, 37.32, 33.09, 37.79,
+]
+
+
+def test_group_starts():
+    """정렬된 심볼 배열에서 그룹 시작 위치를 올바르게 찾는지 테스트합니다."""
+    symbols = np.array(['AAPL', 'AAPL', 'AAPL', 'MSFT', 'NVDA', 'NVDA'])
+    assert indicators.group_starts(symbols).tolist() == [0, 3, 4]
+    assert indicators.group_starts(np.array([])).tolist() == []
+
+
+def test_rsi_wilder_golden_values():
+    """Wilder RSI가 알려진 기대값과 일치하는지 테스트합니다."""
+    rsi = indicators.rsi_wilder(WILDER_CLOSES, 14)
+
+    # 처음 14개 행은 평균을 초기화하기 위한 구간이므로 NaN 이어야 함
+    assert np.isnan(rsi[:14]).all()
+    assert rsi[14:] == pytest.approx(WILDER_RSI_14, abs=0.01)
+
+
+def test_ema_golden_values():
+    """EMA가 SMA로 초기화된 뒤 재귀식을 따르는지 테스트합니다."""
+    # span=3 -> alpha=0.5, 첫 값은 (1 + 2 + 3) / 3 = 2
+    result = indicators.ema(np.arange(1.0, 8.0), 3)
+    assert np.isnan(result[:2]).all()
+    assert result[2:].tolist() == [2.0, 3.0, 4.0, 5.0, 6.0]
+
+    # wilder_smooth는 alpha = 1 / period 인 EMA와 같아야 함
+    result = indicators.wilder_smooth([2.0, 4.0, 6.0, 10.0], 2)
+    assert np.isnan(result[0])
+    assert result[1:].tolist() == [3.0, 4.5, 7.25]
+
+
+def test_indicators_are_computed_per_symbol():
+    """여러 종목을 한 번에 계산해도 종목별로 따로 계산한 결과와 같아야 합니다."""
+    other = [100.0 + (i % 7) - (i % 3) for i in range(40)]
+    close = np.array(WILDER_CLOSES + other + [10.0, 11.0])
+    starts = np.array([0, len(WILDER_CLOSES), len(WILDER_CLOSES) + len(other)])
+
+    rsi = indicators.rsi_wilder(close, 14, starts)
+    np.testing.assert_allclose(rsi[:len(WILDER_CLOSES)], indicators.rsi_wilder(WILDER_CLOSES, 14))
+    np.testing.assert_allclose(rsi[starts[1]:starts[2]], indicators.rsi_wilder(other, 14))
+    # 데이터가 부족한 종목은 모두 NaN
+    assert np.isnan(rsi[starts[2]:]).all()
+
+    ema = indicators.ema(close, 12, starts)
+    np.testing.assert_allclose(ema[starts[1]:starts[2]], indicators.ema(other, 12))
+
+
+def test_rsi_flat_series_is_neutral():
+    """가격 변화가 전혀 없으면 RSI는 중립값 50 이어야 합니다."""
+    rsi = indicators.rsi_wilder([5.0] * 20, 14)
+    assert rsi[14:].tolist() == [50.0] * 6
+
+
+def test_missing_close_is_skipped_like_pandas_ignore_na():
+    """종가가 NaN 인 행은 건너뛰고, 이후 EMA/RSI 가 계속 계산되는지 테스트합니다."""
+    import pandas as pd
+
+    close = np.array(WILDER_CLOSES)
+    close[20] = np.nan
+
+    # EMA: 유효한 값으로 SMA 초기화 후 pandas ewm(adjust=False, ignore_na=True) 와 같은 재귀식
+    span = 5
+    result = indicators.ema(close, span)
+    seed = close[:span].mean()
+    expected = pd.Series(np.r_[seed, close[span:]]).ewm(span=span, adjust=False, ignore_na=True).mean()
+    np.testing.assert_allclose(result[span - 1:], expected.to_numpy())
+    # NaN 행은 직전 값을 유지합니다.
+    assert result[20] == result[19] and not np.isnan(result[-1])
+
+    # RSI: NaN 행을 뺀 종가로 계산한 값과 같고, NaN 행은 직전 값을 유지합니다.
+    rsi = indicators.rsi_wilder(close, 14)
+    without_gap = indicators.rsi_wilder(np.delete(close, 20), 14)
+    np.testing.assert_allclose(np.delete(rsi, 20), without_gap)
+    assert rsi[20] == rsi[19] and not np.isnan(rsi[-1])
+
+
+def test_panels_are_chunked_by_symbol_length(monkeypatch):
+    """패널을 작은 묶음으로 나누어 계산해도 한 번에 계산한 결과와 같은지 테스트합니다."""
+    rng = np.random.default_rng(0)
+    lengths = [400, 30, 3, 120, 60]
+    close = 100 + np.cumsum(rng.normal(size=sum(lengths)))
+    close[rng.choice(len(close), 10, replace=False)] = np.nan
+    starts = np.cumsum([0] + lengths[:-1])
+
+    expected_rsi = indicators.rsi_wilder(close, 14, starts)
+    expected_ema = indicators.ema(close, 12, starts)
+    monkeypatch.setattr(indicators, 'PANEL_CELLS', 150)
+    np.testing.assert_array_equal(indicators.rsi_wilder(close, 14, starts), expected_rsi)
+    np.testing.assert_array_equal(indicators.ema(close, 12, starts), expected_ema)
+    for start, length in zip(starts, lengths):
+        np.testing.assert_array_equal(expected_rsi[start:start + length],
+                                      indicators.rsi_wilder(close[start:start + length], 14))
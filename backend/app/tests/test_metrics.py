@@ -0,0 +1,78 @@
+import os
+import sys
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core import metrics
+from app.core.middleware import CompressionMiddleware, TimingMiddleware
+
+
+def test_phase_is_recorded_only_inside_request():
+    """요청 범위 안에서만 단계 시간이 누적되는지 테스트합니다."""
+    with metrics.phase("filter"):
+        pass  # 요청 밖에서는 아무 것도 기록하지 않아야 함
+
+    token = metrics.start_request()
+    with metrics.phase("filter"):
+        pass
+    with metrics.phase("filter"):
+        pass
+    phases = metrics.finish_request(token)
+    assert list(phases) == ["filter"]
+    assert phases["filter"] >= 0
+
+
+def test_timing_middleware_exposes_prometheus_histograms():
+    """미들웨어가 라우트 템플릿 기준으로 히스토그램을 기록하는지 테스트합니다."""
+    registry = metrics.MetricsRegistry()
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware, registry=registry)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: str):
+        with metrics.phase("filter"):
+            return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            yield b"data: 1\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    client = TestClient(app)
+    client.get("/items/a")
+    client.get("/items/b")
+    client.get("/stream")
+
+    text = registry.render_prometheus()
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2' in text
+    assert 'http_request_phase_duration_seconds_count{method="GET",route="/items/{item_id}",phase="filter"} 2' in text
+    assert 'phase="other"' in text and 'phase="validate"' not in text
+    # SSE 스트림은 지연 시간 히스토그램에 기록하지 않습니다.
+    assert 'route="/stream"' not in text
+
+
+def test_compression_is_recorded_as_its_own_phase():
+    """TimingMiddleware 안쪽의 CompressionMiddleware 압축 시간이 compress 단계로 기록되는지 테스트합니다."""
+    registry = metrics.MetricsRegistry()
+    app = FastAPI()
+    # main_v2 와 같은 순서: 나중에 추가한 TimingMiddleware 가 바깥쪽입니다.
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+    app.add_middleware(TimingMiddleware, registry=registry)
+
+    @app.get("/text")
+    async def read_text():
+        return PlainTextResponse("x" * 5000)
+
+    response = TestClient(app).get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+    text = registry.render_prometheus()
+    assert 'http_request_phase_duration_seconds_count{method="GET",route="/text",phase="compress"} 1' in text
+    assert 'http_request_phase_duration_seconds_count{method="GET",route="/text",phase="other"} 1' in text
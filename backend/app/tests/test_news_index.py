@@ -0,0 +1,124 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.local_news_service import LocalNewsService
+from app.services.news_index import NewsIndex, parse_query
+
+
+def _news(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=['Symbol', 'title', 'publishedAt'])
+    df['Name'] = df['Symbol'] + ' Inc.'
+    df['url'] = [f'https://news.example.com/{i}' for i in range(len(df))]
+    df['publishedAt'] = pd.to_datetime(df['publishedAt'], utc=True)
+    return df
+
+
+NEWS = _news([
+    ('AAPL', 'Apple earnings beat estimates', '2024-01-01T10:00:00Z'),
+    ('AAPL', 'Apple announces product recall', '2024-01-02T10:00:00Z'),
+    ('MSFT', 'Microsoft earnings: cloud earnings surge', '2024-01-03T10:00:00Z'),
+    ('NVDA', 'Nvidia unveils new chips', '2024-01-04T10:00:00Z'),
+    ('TSLA', 'Tesla recall widens after earnings', '2024-01-05T10:00:00Z'),
+])
+
+
+def test_parse_query_splits_or_groups_and_tokens():
+    assert parse_query('Apple earnings OR recall') == [['apple', 'earnings'], ['recall']]
+    assert parse_query('S&P 500 or') == [['s', 'p', '500', 'or']]
+    with pytest.raises(ValueError):
+        parse_query('  !! ')
+
+
+def test_search_combines_terms_symbols_and_since():
+    index = NewsIndex(NEWS)
+    # 최신순: 같은 조건이면 나중에 발행된 뉴스가 먼저 옵니다.
+    assert index.search('earnings')[0].tolist() == [4, 2, 0]
+    assert index.search('earnings recall')[0].tolist() == [4]
+    assert index.search('apple earnings OR chips')[0].tolist() == [3, 0]
+    assert index.search('earnings OR recall', symbols=['aapl'])[0].tolist() == [1, 0]
+    assert index.search('earnings', symbols=['UNKNOWN'])[0].tolist() == []
+    assert index.search('earnings', since='2024-01-03')[0].tolist() == [4, 2]
+    assert index.search('earnings', limit=1)[0].tolist() == [4]
+    with pytest.raises(ValueError):
+        index.search('earnings', since='not a date')
+
+
+def test_relevance_ranks_by_bm25():
+    positions, scores = NewsIndex(NEWS).search('earnings', sort='relevance')
+    # 'earnings' 가 두 번 나오는 제목의 점수가 가장 높습니다.
+    assert positions[0] == 2
+    assert np.all(np.diff(scores) <= 0) and scores[-1] > 0
+
+
+def test_extend_matches_full_rebuild_and_service_reuses_index():
+    extra = _news([
+        ('NVDA', 'Nvidia earnings record', '2024-01-06T10:00:00Z'),
+        ('AAPL', 'Apple recall expands', '2023-12-31T10:00:00Z'),
+    ])
+    extra['url'] = ['https://news.example.com/new-0', 'https://news.example.com/new-1']
+    appended = pd.concat([NEWS, extra], ignore_index=True)
+
+    index = NewsIndex(NEWS)
+    assert index.is_prefix_of(appended) and not index.is_prefix_of(appended.iloc[1:])
+    extended, rebuilt = index.extend(appended), NewsIndex(appended)
+    for query in ('earnings', 'apple recall', 'record OR chips'):
+        for sort in ('recency', 'relevance'):
+            a, b = extended.search(query, sort=sort), rebuilt.search(query, sort=sort)
+            assert a[0].tolist() == b[0].tolist()
+            if sort == 'relevance':
+                np.testing.assert_allclose(a[1], b[1])
+    # 기존 색인은 바뀌지 않습니다.
+    assert index.search('earnings')[0].tolist() == [4, 2, 0]
+
+
+def test_news_service_is_rebuilt_per_version_and_keeps_old_data(tmp_path):
+    """재로드마다 새 서비스 인스턴스를 만들고, 직전 색인을 이어 쓰며, 재로드 실패 시 기존 인스턴스를 유지하는지 테스트합니다."""
+    from app.core.lazy import LazyService
+
+    csv_path = tmp_path / 'news.csv'
+    NEWS.to_csv(csv_path, index=False)
+    news = LazyService('news', lambda: LocalNewsService(str(csv_path), previous=news.current))
+    first = news.get()
+
+    extra = _news([('NVDA', 'Nvidia earnings record', '2024-01-06T10:00:00Z')])
+    extra['url'] = ['https://news.example.com/new-0']
+    pd.concat([NEWS, extra], ignore_index=True).to_csv(csv_path, index=False)
+    second = news.reload()
+    assert second is not first and len(first._df) == len(NEWS) and len(second._df) == len(NEWS) + 1
+    # 추가된 행만 색인하므로 변경되지 않은 토큰은 직전 색인의 배열을 그대로 공유합니다.
+    assert second._index._postings['apple'][0] is first._index._postings['apple'][0]
+    results = second.search_news('earnings', symbols=['NVDA'], sort='relevance')
+    assert [r['url'] for r in results] == ['https://news.example.com/new-0'] and results[0]['score'] > 0
+
+    csv_path.unlink()
+    with pytest.raises(FileNotFoundError):
+        news.reload()
+    assert news.get() is second
+
+
+def test_search_serializes_news_with_na_or_blank_symbols(tmp_path):
+    """종목 코드가 'NA' 이거나 비어 있는 뉴스도 검색되고 응답 스키마로 직렬화되는지 테스트합니다."""
+    from pydantic import TypeAdapter
+    from app.schemas.news import NewsSearchItem
+
+    csv_path = tmp_path / 'news.csv'
+    csv_path.write_text(
+        'id,Symbol,Name,title,url,publishedAt\n'
+        '1,NA,National Instruments,Apple supplier deal,https://news.example.com/0,2024-01-01T10:00:00Z\n'
+        '2,,,Apple market wrap,https://news.example.com/1,2024-01-02T10:00:00Z\n'
+        '3,AAPL,Apple Inc.,Apple earnings,https://news.example.com/2,2024-01-03T10:00:00Z\n',
+        encoding='utf-8',
+    )
+    service = LocalNewsService(str(csv_path))
+
+    results = TypeAdapter(list[NewsSearchItem]).validate_python(service.search_news('apple'))
+    assert [r.Symbol for r in results] == ['AAPL', '', 'NA']
+    assert [r['url'] for r in service.search_news('apple', symbols=['na'])] == ['https://news.example.com/0']
+    assert [r['Symbol'] for r in service.get_news_by_symbol('NA')] == ['NA']
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import portfolio
+from app.services.returns_panel import ReturnsPanel
+
+
+def _naive_values(history, symbols, weights, rule, initial_value=10000.0):
+    """날짜를 하나씩 따라가며 리밸런싱하는 기준 구현"""
+    close = history.pivot(index='Date', columns='Symbol', values='Close')[symbols]
+    close = close.loc[close.notna().all(axis=1).idxmax():].ffill()
+    periods = {'none': None, 'monthly': close.index.to_period('M'), 'weekly': close.index.to_period('W')}[rule]
+    shares = initial_value * weights / close.iloc[0].to_numpy()
+    values = []
+    for t in range(len(close)):
+        value = float(shares @ close.iloc[t].to_numpy())
+        values.append(value)
+        if periods is not None and t < len(close) - 1 and periods[t] != periods[t + 1]:
+            shares = value * weights / close.iloc[t].to_numpy()
+    return close.index, np.array(values)
+
+
+@pytest.mark.parametrize('rule', ['none', 'weekly', 'monthly'])
+def test_evaluate_matches_naive_rebalancing(history, rule):
+    panel = ReturnsPanel(history)
+    holdings = [{'symbol': 'aapl', 'weight': 2.0}, {'symbol': 'MSFT', 'weight': 1.0}, {'symbol': 'NVDA', 'weight': 1.0}]
+    result = portfolio.evaluate(panel, holdings, rule)
+
+    dates, expected = _naive_values(history, ['AAPL', 'MSFT', 'NVDA'], np.array([0.5, 0.25, 0.25]), rule)
+    assert result['start_date'] == '2024-01-15'  # 모든 종목의 가격이 있는 첫 날 (NVDA 상장일)
+    assert result['dates'] == dates.strftime('%Y-%m-%d').tolist()
+    np.testing.assert_allclose(result['value'], expected, rtol=1e-12)
+
+    # 종목별 기여도의 합은 전체 수익률과 같습니다.
+    contributions = sum(asset['contribution'] for asset in result['assets'])
+    assert contributions == pytest.approx(result['total_return'], abs=1e-12)
+    assert sum(asset['final_weight'] for asset in result['assets']) == pytest.approx(1.0)
+    assert min(result['drawdown']) == result['max_drawdown'] <= 0
+
+
+def test_evaluate_with_shares_and_statistics(history):
+    panel = ReturnsPanel(history)
+    result = portfolio.evaluate(panel, [{'symbol': 'AAPL', 'shares': 3}], start_date='2024-02-01')
+
+    close = history[(history['Symbol'] == 'AAPL') & (history['Date'] >= '2024-02-01')]['Close'].to_numpy()
+    np.testing.assert_allclose(result['value'], 3 * close)
+    assert result['initial_value'] == pytest.approx(3 * close[0])
+    daily = close[1:] / close[:-1] - 1
+    assert result['annualized_volatility'] == pytest.approx(daily.std(ddof=1) * np.sqrt(252))
+    assert result['assets'][0]['contribution'] == pytest.approx(close[-1] / close[0] - 1)
+
+
+def test_evaluate_rejects_invalid_input(history):
+    panel = ReturnsPanel(history)
+    with pytest.raises(ValueError):
+        portfolio.evaluate(panel, [{'symbol': 'AAPL', 'weight': 1.0}], 'hourly')
+    with pytest.raises(ValueError):
+        portfolio.evaluate(panel, [{'symbol': 'AAPL', 'weight': 1.0}, {'symbol': 'MSFT', 'shares': 1.0}])
+    with pytest.raises(ValueError):
+        portfolio.evaluate(panel, [{'symbol': 'TSLA', 'weight': 1.0}])
+    assert portfolio.evaluate(panel, [{'symbol': 'AAPL', 'weight': 1.0}], start_date='2030-01-01') is None
+
+
+def test_rebalance_points_use_last_trading_day_of_period():
+    dates = pd.to_datetime(['2024-01-29', '2024-01-31', '2024-02-01', '2024-02-05', '2024-03-28', '2024-04-01']).values
+    assert portfolio.rebalance_points(dates, 'monthly').tolist() == [0, 1, 3, 4]
+    assert portfolio.rebalance_points(dates, 'weekly').tolist() == [0, 2, 3, 4]
+    assert portfolio.rebalance_points(dates, 'quarterly').tolist() == [0, 4]
+    assert portfolio.rebalance_points(dates, 'none').tolist() == [0]
+
+
+def test_holdings_key_normalizes_request():
+    key = portfolio.holdings_key([{'symbol': 'aapl', 'weight': 1}], 'monthly', '2024-01-01')
+    assert key == portfolio.holdings_key([{'symbol': 'AAPL', 'weight': 1.0, 'shares': None}], 'monthly', '2024-01-01')
+    assert key != portfolio.holdings_key([{'symbol': 'AAPL', 'weight': 1.0}], 'none', '2024-01-01')
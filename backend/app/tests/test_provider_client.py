@@ -0,0 +1,203 @@
+import os
+import sys
+
+import pytest
+
+# 수집기 모듈은 data_fetchers 폴더 기준 import 를 사용하므로 해당 폴더를 sys.path에 추가합니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pipeline', 'data_fetchers'))
+
+import provider_client
+from provider_client import (
+    CLOSED, HALF_OPEN, OPEN, CircuitOpenError, ProviderClient, RateLimitError, SharedTokenBucket,
+    is_provider_failure, is_rate_limited,
+)
+
+
+class FakeClock:
+    """sleep 하면 시간이 흐르는 가짜 시계 (테스트가 실제로 기다리지 않도록)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TooManyRequests(Exception):
+    def __init__(self):
+        super().__init__('429 Client Error: Too Many Requests')
+
+
+def _client(clock, **kwargs):
+    options = dict(rate=2.0, max_rate=4.0, burst=1, increase=0.5, clock=clock, sleep=clock.sleep)
+    options.update(kwargs)
+    return ProviderClient('yahoo', **options)
+
+
+def test_token_bucket_paces_calls():
+    """토큰이 없으면 rate 에 맞춰 기다린 뒤 호출하는지 테스트합니다."""
+    clock = FakeClock()
+    client = _client(clock, increase=0.0)
+
+    for _ in range(5):
+        client.call(lambda: None)
+
+    # burst 1 이후 4번의 호출은 0.5초(초당 2회)씩 기다립니다.
+    assert clock.now == pytest.approx(2.0)
+    assert client.stats()['requests'] == 5
+
+
+def test_shared_bucket_paces_calls_across_processes(tmp_path, monkeypatch):
+    """같은 PROVIDER_QUOTA_DB 를 쓰는 클라이언트(프로세스)들이 한도를 합쳐서 지키는지 테스트합니다."""
+    clock = FakeClock()
+    path = str(tmp_path / 'quota.db')
+    # 프로세스마다 ProviderClient 와 버킷을 따로 만든 상황
+    clients = [
+        _client(clock, increase=0.0, bucket=SharedTokenBucket(path, 'yahoo', 2.0, 1, clock=clock, sleep=clock.sleep))
+        for _ in range(2)
+    ]
+    for _ in range(3):
+        for client in clients:
+            client.call(lambda: None)
+
+    # 프로세스마다 초당 2회가 아니라 합쳐서 초당 2회: burst 1 이후 5번의 호출이 0.5초씩 기다립니다.
+    assert clock.now == pytest.approx(2.5)
+
+    # AIMD 로 줄인 속도도 공유합니다.
+    clients[0].bucket.rate = 0.5
+    assert clients[1].rate == 0.5
+
+    monkeypatch.setenv('PROVIDER_QUOTA_DB', path)
+    monkeypatch.setattr(provider_client, '_clients', {})
+    assert isinstance(provider_client.get_client('yahoo').bucket, SharedTokenBucket)
+
+
+def test_rate_limit_backs_off_and_slows_down():
+    """429 를 받으면 속도를 절반으로 줄이고 백오프 후 다시 시도하는지 테스트합니다."""
+    clock = FakeClock()
+    client = _client(clock)
+    responses = [TooManyRequests(), TooManyRequests(), 'ok']
+
+    def flaky():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert client.call(flaky) == 'ok'
+    # 2.0 -> 1.0 -> 0.5 (429 두 번) -> 1.0 (성공 한 번, +0.5)
+    assert client.rate == pytest.approx(1.0)
+    stats = client.stats()
+    assert stats['rate_limited'] == 2
+    assert stats['error_rate'] == pytest.approx(2 / 3, abs=1e-3)
+
+
+def test_rate_limit_gives_up_after_retries():
+    clock = FakeClock()
+    client = _client(clock, max_retries=2, failure_threshold=100)
+
+    with pytest.raises(RateLimitError):
+        client.call(lambda: (_ for _ in ()).throw(TooManyRequests()))
+    assert client.stats()['rate_limited'] == 3
+
+
+def test_circuit_breaker_opens_and_waits_out_reset_timeout():
+    """연속 장애 시 서킷이 열리고, 다음 호출은 reset_timeout 까지 기다렸다가 시험 호출하여 성공하면 닫히는지 테스트합니다."""
+    clock = FakeClock()
+    client = _client(clock, failure_threshold=2, reset_timeout=30.0)
+
+    def broken():
+        raise ConnectionError('connection reset')
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            client.call(broken)
+    assert client.breaker.state == OPEN
+    opened_at = clock.now
+
+    assert client.call(lambda: 'ok') == 'ok'
+    assert clock.now >= opened_at + 30.0
+    assert client.breaker.state == CLOSED
+    assert client.stats()['rejected'] == 0
+
+
+def test_persistent_outage_aborts_with_circuit_open_error():
+    """시험 호출도 계속 실패하면 max_trips 번째에 CircuitOpenError 로 중단하는지 테스트합니다."""
+    clock = FakeClock()
+    client = _client(clock, failure_threshold=2, reset_timeout=30.0, max_trips=2)
+    calls = []
+
+    def down():
+        calls.append(clock.now)
+        raise ConnectionError('connection refused')
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            client.call(down)
+    # 두 번 실패로 열린 뒤, 세 번째 호출은 30초 기다린 시험 호출이었고 실패하여 다시 열렸습니다.
+    assert client.breaker.trips == 2 and calls[2] >= calls[1] + 30.0
+    with pytest.raises(CircuitOpenError):
+        client.call(lambda: 'ok')
+    assert client.stats()['rejected'] == 1
+
+
+def test_symbol_errors_do_not_open_circuit():
+    """없는 종목 같은 종목별 오류는 연속으로 나도 서킷을 열지 않는지 테스트합니다."""
+    clock = FakeClock()
+    client = _client(clock, failure_threshold=2)
+
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            client.call(lambda: (_ for _ in ()).throw(ValueError('No data found, symbol may be delisted')))
+    assert client.breaker.state == CLOSED
+    assert client.call(lambda: 'ok') == 'ok'
+    assert client.stats()['errors'] == 5
+
+
+def test_half_open_failure_reopens_circuit():
+    clock = FakeClock()
+    client = _client(clock, failure_threshold=1, reset_timeout=10.0)
+
+    with pytest.raises(TimeoutError):
+        client.call(lambda: (_ for _ in ()).throw(TimeoutError('read timed out')))
+    clock.now += 10.0
+    assert client.breaker.allow() and client.breaker.state == HALF_OPEN
+    client.breaker.record_failure()
+    assert client.breaker.state == OPEN
+
+
+def test_is_rate_limited_detects_provider_errors():
+    class Response:
+        status_code = 429
+
+    class HttpError(Exception):
+        response = Response()
+
+    assert is_rate_limited(HttpError('boom'))
+    assert is_rate_limited(Exception("{'code': 'rateLimited', 'message': '...'}"))
+    assert not is_rate_limited(ValueError('No data found, symbol may be delisted'))
+
+
+def test_is_provider_failure_counts_only_outages():
+    class Response:
+        def __init__(self, status_code):
+            self.status_code = status_code
+
+    class HTTPError(OSError):
+        def __init__(self, status_code):
+            super().__init__(f'{status_code} Error')
+            self.response = Response(status_code)
+
+    class ReadTimeout(OSError):
+        pass
+
+    assert is_provider_failure(HTTPError(503)) and is_provider_failure(HTTPError(429))
+    assert not is_provider_failure(HTTPError(404))
+    assert is_provider_failure(ConnectionError('reset')) and is_provider_failure(ReadTimeout('timed out'))
+    assert not is_provider_failure(KeyError('shortName'))
+    assert not is_provider_failure(ValueError('No data found, symbol may be delisted'))
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+import os
+import sys
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.rankings import DailyRankings
+
+
+@pytest.fixture
+def rankings():
+    """(Symbol, Date) 순으로 정렬된 테스트용 이력으로 순위 집계를 만듭니다."""
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-02', '2024-01-03'] * 3),
+        'Symbol': ['AAPL', 'AAPL', 'MSFT', 'MSFT', 'NVDA', 'NVDA'],
+        'Close': [100.0, 110.0, 200.0, 190.0, 50.0, 51.0],
+        'Volume': [10, 30, 20, 5, 40, 50],
+        '거래액': [1000.0, 3300.0, 4000.0, 950.0, 2000.0, 2550.0],
+    })
+    return DailyRankings(df, data_version=1)
+
+
+def test_top_change_pct_latest_date(rankings):
+    """최근 거래일의 등락률 상위/하위 종목을 올바르게 반환하는지 테스트합니다."""
+    result = rankings.top('change_pct', top=2)
+    assert [r['Symbol'] for r in result] == ['AAPL', 'NVDA']
+    assert result[0]['rank'] == 1
+    assert result[0]['Date'] == '2024-01-03'
+    assert result[0]['value'] == pytest.approx(10.0)
+
+    losers = rankings.top('change_pct', top=1, ascending=True)
+    assert losers[0]['Symbol'] == 'MSFT'
+    assert losers[0]['value'] == pytest.approx(-5.0)
+
+
+def test_top_by_date_and_metric(rankings):
+    """특정 일자의 거래액 순위와 등락률이 없는 날(첫 거래일)의 처리를 테스트합니다."""
+    result = rankings.top('trading_value', date='2024-01-02', top=5)
+    assert [r['Symbol'] for r in result] == ['MSFT', 'NVDA', 'AAPL']
+
+    # 첫 거래일에는 전일 종가가 없으므로 등락률 순위가 비어 있어야 함
+    assert rankings.top('change_pct', date='2024-01-02') == []
+    assert rankings.top('volume', date='2023-12-29') == []
+
+    with pytest.raises(ValueError):
+        rankings.top('unknown')
+
+
+def test_rows_without_close_are_not_ranked():
+    """종가가 없는(NaN) 행은 순위에서 제외되어 응답에 NaN 이 나오지 않는지 테스트합니다."""
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-02', '2024-01-03'] * 2),
+        'Symbol': ['AAPL', 'AAPL', 'MSFT', 'MSFT'],
+        'Close': [100.0, float('nan'), 200.0, 210.0],
+        'Volume': [10, 30, 20, 5],
+        '거래액': [1000.0, 3300.0, 4000.0, 1050.0],
+    })
+    result = DailyRankings(df).top('volume', date='2024-01-03', top=5)
+    assert [r['Symbol'] for r in result] == ['MSFT']
+    assert result[0]['Close'] == 210.0
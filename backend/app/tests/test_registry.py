@@ -0,0 +1,133 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.lazy import LazyService, ServiceNotReady
+from app.services.registry import DataRegistry, estimate_memory_bytes
+
+
+def test_lazy_service_builds_once_and_versions_reloads():
+    """LazyService 가 한 번만 생성되고, 재로드할 때마다 버전이 증가하는지 테스트합니다."""
+    calls = []
+    service = LazyService("test", lambda: calls.append(1) or object())
+    assert not service.loaded and service.version == 0
+
+    first = service.get()
+    assert service.get() is first
+    assert len(calls) == 1
+    assert service.version == 1
+    assert service.load_seconds is not None
+
+    second = service.reload()
+    assert second is not first
+    assert service.get() is second
+    assert service.version == 2
+
+
+def test_registry_require_returns_503_while_warming_up():
+    """warm-up 이 예약된 뒤 아직 로드되지 않은 데이터셋은 ServiceNotReady 를 발생시키는지 테스트합니다."""
+    registry = DataRegistry()
+    registry.register("prices", object)
+    registry.dataset("prices").warmup_scheduled = True
+
+    with pytest.raises(ServiceNotReady) as excinfo:
+        registry.require("prices")
+    assert excinfo.value.retry_after > 0
+    assert not registry.all_ready()
+
+    registry.warm_up()  # warm-up 스레드가 로드를 마친 상황
+    assert registry.all_ready()
+    assert registry.require("prices") is registry.get("prices")
+    assert registry.describe("prices")["state"] == "ready"
+
+
+def test_registry_reports_memory_per_dataset():
+    """데이터셋별 메모리 사용량이 DataFrame/ndarray 크기로 계산되는지 테스트합니다."""
+    class Holder:
+        def __init__(self):
+            self.df = pd.DataFrame({'Close': np.zeros(1000)})
+            self.arrays = {'close': self.df['Close'].to_numpy(), 'volume': np.zeros(500, dtype='int64')}
+
+    holder = Holder()
+    # df 의 열을 가리키는 뷰는 중복으로 세지 않습니다.
+    expected = int(holder.df.memory_usage(index=True, deep=True).sum()) + 500 * 8
+    assert estimate_memory_bytes(holder) == expected
+
+    registry = DataRegistry()
+    registry.register("holder", Holder)
+    assert registry.memory_bytes("holder") is None
+    registry.get("holder")
+    assert registry.describe("holder")["memory_bytes"] == expected
+
+
+def test_health_responds_without_loading_data():
+    """앱 import 와 /health, /healthz, /datasets 호출만으로는 주가 데이터를 로드하지 않는지 테스트합니다."""
+    from app.main_v2 import app
+
+    # with 블록 없이 사용하면 lifespan(warm-up)이 실행되지 않습니다.
+    client = TestClient(app)
+    assert client.get("/healthz").json() == {"status": "alive"}
+
+    body = client.get("/health").json()
+    assert body["status"] == "ok"
+    assert body["datasets"]["prices"]["state"] == "pending"
+
+    datasets = client.get("/datasets").json()["datasets"]
+    assert set(datasets) == {"prices", "news", "financial_info", "disclosures"}
+    assert datasets["prices"]["memory_bytes"] is None
+
+
+def test_legacy_app_returns_503_while_warming_up(monkeypatch):
+    """main.py 의 라우트도 warm-up 중에는 500 대신 503 + Retry-After 로 응답하는지 테스트합니다."""
+    from app.main import app
+    from app.services.registry import registry
+
+    prices = registry.dataset("prices")
+    monkeypatch.setattr(prices, "_instance", None)
+    monkeypatch.setattr(prices, "state", "pending")
+    monkeypatch.setattr(prices, "warmup_scheduled", True)
+
+    response = TestClient(app).get("/stocks/AAPL")
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_failed_dataset_returns_503_without_reloading_per_request(monkeypatch):
+    """로드에 실패한 데이터셋은 요청마다 다시 로드하지 않고 대기 시간 동안 503 + Retry-After 로 응답하는지 테스트합니다."""
+    from app.core.config import settings
+    from app.main_v2 import app
+    from app.services.registry import registry
+
+    calls = []
+
+    def broken_factory(progress=None):
+        calls.append(1)
+        raise RuntimeError("Close 열이 없습니다")
+
+    prices = registry.dataset("prices")
+    monkeypatch.setattr(prices, "factory", broken_factory)
+    monkeypatch.setattr(prices, "_instance", None)
+    monkeypatch.setattr(prices, "state", "pending")
+    monkeypatch.setattr(prices, "error", None)
+    monkeypatch.setattr(prices, "failed_at", None)
+    monkeypatch.setattr(settings, "DATASET_RETRY_BACKOFF", 60)
+
+    client = TestClient(app)
+    responses = [client.get("/stocks/AAPL") for _ in range(3)]
+    assert [r.status_code for r in responses] == [503, 503, 503]
+    assert all(int(r.headers["Retry-After"]) > 0 for r in responses)
+    assert "Close 열이 없습니다" in responses[-1].json()["detail"]
+    assert len(calls) == 1
+    assert client.get("/readyz").json()["status"] == "degraded"
+
+    # 대기 시간이 지나면 요청 하나가 다시 로드를 시도합니다.
+    monkeypatch.setattr(prices, "failed_at", prices.failed_at - 60)
+    assert client.get("/stocks/AAPL").status_code == 503
+    assert len(calls) == 2
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.returns_panel import ReturnsPanel, pairwise_statistics
+
+
+def _pandas_returns(history):
+    close = history.pivot(index='Date', columns='Symbol', values='Close')
+    close = close.reindex(sorted(history['Date'].unique()))
+    return (close / close.shift(1) - 1).iloc[1:]
+
+
+def test_panel_matches_pandas_pairwise_statistics(history):
+    panel = ReturnsPanel(history, data_version=3)
+    expected = _pandas_returns(history)
+
+    assert panel.shape == (119, 3) and panel.data_version == 3
+    for kind, method in (('correlation', 'corr'), ('covariance', 'cov')):
+        matrix, counts = panel.statistics(['NVDA', 'AAPL', 'MSFT'], kind)
+        reference = getattr(expected[['NVDA', 'AAPL', 'MSFT']], method)()
+        np.testing.assert_allclose(matrix, reference.to_numpy(), rtol=1e-10)
+    # NVDA 는 상장 다음 날부터, MSFT 는 종가가 빠진 날과 그 다음 날의 수익률이 없습니다.
+    assert counts[0, 1] == 109 and counts[1, 2] == 117
+
+
+def test_dense_path_and_min_periods():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(50, 4))
+    matrix, counts = pairwise_statistics(data, 'correlation')
+    np.testing.assert_allclose(matrix, np.corrcoef(data, rowvar=False), atol=1e-12)
+    assert (counts == 50).all()
+
+    data[:45, 0] = np.nan
+    matrix, _ = pairwise_statistics(data, 'covariance', min_periods=10)
+    assert np.isnan(matrix[0]).all() and not np.isnan(matrix[1:, 1:]).any()
+    with pytest.raises(ValueError):
+        pairwise_statistics(data, 'beta')
+
+
+def test_resolve_and_date_range(history):
+    panel = ReturnsPanel(history)
+    assert panel.resolve(['msft', 'AAPL', 'MSFT', 'TSLA']) == (['MSFT', 'AAPL'], ['TSLA'])
+
+    lo, hi = panel.date_range('2024-01-10', '2024-01-19')
+    assert str(panel.dates[lo]) == '2024-01-10' and str(panel.dates[hi - 1]) == '2024-01-19'
+    assert panel.matrix(['AAPL'], '2024-01-10', '2024-01-19').shape == (8, 1)
+    assert ReturnsPanel(pd.DataFrame(columns=['Symbol', 'Date', 'Close'])).shape == (0, 0)
+
+
+def test_rolling_windows(history):
+    panel = ReturnsPanel(history)
+    dates, matrices = panel.rolling(['AAPL', 'MSFT'], window=10, step=5)
+    expected = _pandas_returns(history)[['AAPL', 'MSFT']]
+
+    assert matrices.shape == (len(dates), 2, 2) and len(dates) == 22
+    for end_date, matrix in zip(dates, matrices):
+        window = expected.loc[:pd.Timestamp(end_date)].tail(10)
+        reference = window.corr(min_periods=10).to_numpy()
+        np.testing.assert_allclose(matrix, reference, rtol=1e-10)
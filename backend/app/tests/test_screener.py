@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+import os
+import sys
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.screener import MarketSnapshot, parse_filters
+
+
+@pytest.fixture
+def history():
+    """(Symbol, Date) 순으로 정렬된 테스트용 지표 이력"""
+    return pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-02', '2024-01-03', '2024-01-02']),
+        'Symbol': ['AAPL', 'AAPL', 'MSFT', 'MSFT', 'NVDA'],
+        'Close': [190.0, 185.0, 370.0, 375.0, 480.0],
+        'MA_60': [180.0, 188.0, 360.0, 362.0, 470.0],
+        'RSI_14': [35.0, 25.0, 55.0, 28.0, float('nan')],
+    })
+
+
+def test_parse_filters():
+    """필터 표현식이 (컬럼, 연산자, 비교값)으로 파싱되는지 테스트합니다."""
+    assert parse_filters("RSI_14<30, Close>=MA_60") == [('RSI_14', '<', 30.0), ('Close', '>=', 'MA_60')]
+    with pytest.raises(ValueError):
+        parse_filters("RSI_14 ~ 30")
+
+
+def test_snapshot_latest_and_as_of(history):
+    """최신 스냅샷과 기준일 스냅샷이 종목별 올바른 행을 고르는지 테스트합니다."""
+    latest = MarketSnapshot.from_history(history)
+    assert latest.df['Symbol'].tolist() == ['AAPL', 'MSFT', 'NVDA']
+    assert latest.df['Close'].tolist() == [185.0, 375.0, 480.0]
+
+    as_of = MarketSnapshot.from_history(history, pd.Timestamp('2024-01-02'))
+    assert as_of.df['Close'].tolist() == [190.0, 370.0, 480.0]
+
+
+def test_screen_filters_and_sort(history):
+    """필터, 컬럼 간 비교, 정렬, limit 이 함께 동작하는지 테스트합니다."""
+    snapshot = MarketSnapshot.from_history(history)
+
+    result = snapshot.screen("RSI_14<30,Close>MA_60")
+    assert result['Symbol'].tolist() == ['MSFT']
+
+    result = snapshot.screen("RSI_14<30", sort="-RSI_14")
+    assert result['Symbol'].tolist() == ['MSFT', 'AAPL']
+
+    # 내림차순 정렬에서도 NaN은 맨 뒤에 위치해야 함
+    result = snapshot.screen(sort="-RSI_14", limit=3)
+    assert result['Symbol'].tolist() == ['MSFT', 'AAPL', 'NVDA']
+
+    with pytest.raises(ValueError):
+        snapshot.screen("Unknown>1")
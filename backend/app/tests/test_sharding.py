@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# 수집기 모듈은 data_fetchers 폴더 기준 import 를 사용하므로 해당 폴더를 sys.path에 추가합니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pipeline', 'data_fetchers'))
+
+import sharding
+from provider_client import CircuitOpenError
+from sharding import DONE, FAILED, PENDING, ShardCoordinator, merge_shards, run_worker, shard_of, split_universe
+
+COMPANIES = pd.DataFrame({'Symbol': [f'SYM{i}' for i in range(40)], 'Name': [f'Company {i}' for i in range(40)]})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_stage(companies_df, output_dir):
+    """종목마다 한 행을 쓰는 가짜 수집 단계"""
+    pd.DataFrame({'Symbol': companies_df['Symbol'], 'id': range(len(companies_df))}).to_csv(
+        os.path.join(output_dir, 'rows.csv'), index=False)
+
+
+def _worker_process(db_path, output_root, worker_id):
+    coordinator = ShardCoordinator(db_path, run_id='run-1', stage='prices', lease_seconds=30)
+    run_worker(fake_stage, COMPANIES, coordinator, num_shards=8, worker_id=worker_id, output_root=output_root)
+
+
+def test_shard_of_is_stable_and_covers_universe():
+    assert shard_of('AAPL', 16) == shard_of('AAPL', 16)
+    shards = split_universe(COMPANIES, 4)
+    assert sorted(shards) == [0, 1, 2, 3]
+    assert sum(len(df) for df in shards.values()) == len(COMPANIES)
+    for shard, df in shards.items():
+        assert all(shard_of(symbol, 4) == shard for symbol in df['Symbol'])
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    """임대를 연장하지 않은 워커의 샤드를 만료 뒤 다른 워커가 가져가는지 테스트합니다."""
+    clock = FakeClock()
+    coordinator = ShardCoordinator(str(tmp_path / 'c.db'), run_id='r', lease_seconds=10, clock=clock)
+    coordinator.init_run(1)
+
+    assert coordinator.claim('dead-worker') == 0
+    assert coordinator.claim('worker-2') is None
+
+    clock.now += 11
+    assert coordinator.claim('worker-2') == 0
+    # 임대를 빼앗긴 워커는 완료 처리할 수 없습니다.
+    assert not coordinator.complete('dead-worker', 0, 'x')
+    assert coordinator.complete('worker-2', 0, 'x')
+    assert coordinator.status() == {DONE: 1}
+
+
+def test_shard_fails_after_max_attempts(tmp_path):
+    coordinator = ShardCoordinator(str(tmp_path / 'c.db'), run_id='r', max_attempts=2)
+    coordinator.init_run(1)
+
+    for _ in range(2):
+        shard = coordinator.claim('w')
+        coordinator.fail('w', shard, 'boom')
+    assert coordinator.claim('w') is None
+    assert coordinator.status() == {FAILED: 1}
+
+
+def test_circuit_open_releases_shard_without_spending_attempts(tmp_path):
+    """제공자 장애(CircuitOpenError)로 멈춘 워커가 샤드를 시도 횟수 차감 없이 반납하고 중단하는지 테스트합니다."""
+    coordinator = ShardCoordinator(str(tmp_path / 'c.db'), run_id='r', max_attempts=1)
+    calls = []
+
+    def outage(companies_df, output_dir):
+        calls.append(output_dir)
+        raise CircuitOpenError('fdr 제공자 장애')
+
+    assert run_worker(outage, COMPANIES, coordinator, num_shards=4, output_root=str(tmp_path)) == []
+    assert len(calls) == 1
+    assert coordinator.status() == {PENDING: 4}
+
+    # 제공자가 복구되면 같은 샤드를 다시 처리할 수 있습니다. (max_attempts=1 이어도 실패로 끝나지 않음)
+    assert sorted(run_worker(fake_stage, COMPANIES, coordinator, num_shards=4, output_root=str(tmp_path))) == [0, 1, 2, 3]
+    assert coordinator.status() == {DONE: 4}
+
+
+def test_universe_is_pinned_per_run(tmp_path):
+    """먼저 시작한 노드의 유니버스로 모든 노드가 샤드를 나누는지 테스트합니다."""
+    db_path = str(tmp_path / 'c.db')
+    first = ShardCoordinator(db_path, run_id='r')
+    assert first.universe() is None
+
+    universe = pd.DataFrame({'Symbol': ['NA', 'AAPL'], 'Name': ['National', 'Apple']})
+    assert first.pin_universe(universe).equals(universe)
+    # 다른 노드가 다른 스냅샷을 가지고 있어도 고정된 목록을 사용합니다.
+    second = ShardCoordinator(db_path, run_id='r', stage='news')
+    assert second.pin_universe(COMPANIES).equals(universe)
+    assert ShardCoordinator(db_path, run_id='other').universe() is None
+
+
+def test_workers_process_each_shard_once_and_merge(tmp_path):
+    """여러 프로세스의 워커가 모든 샤드를 정확히 한 번씩 처리하고, 결과를 합칠 수 있는지 테스트합니다."""
+    db_path, output_root = str(tmp_path / 'coordinator.db'), str(tmp_path / 'shards')
+    ShardCoordinator(db_path, run_id='run-1', stage='prices').init_run(8)
+
+    ctx = multiprocessing.get_context('spawn')
+    workers = [ctx.Process(target=_worker_process, args=(db_path, output_root, f'w{i}')) for i in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    coordinator = ShardCoordinator(db_path, run_id='run-1', stage='prices')
+    assert coordinator.status() == {DONE: 8}
+
+    merged = merge_shards(coordinator.done_outputs(), str(tmp_path / 'data'))
+    df = pd.read_csv(merged['rows.csv'])
+    assert sorted(df['Symbol']) == sorted(COMPANIES['Symbol'])
+    assert df['id'].tolist() == list(range(len(COMPANIES)))
+
+
+def test_merge_keeps_symbols_that_look_like_missing_values(tmp_path):
+    """'NA' 같은 종목 코드가 병합 중에 빈 값으로 바뀌지 않는지 테스트합니다."""
+    shard_dirs = []
+    for shard, symbols in enumerate([['NA', 'AAPL'], ['NULL', 'MSFT']]):
+        shard_dir = tmp_path / f'shard={shard}'
+        shard_dir.mkdir()
+        pd.DataFrame({'Symbol': symbols, 'Name': [f'{s} Corp' for s in symbols], 'Close': [1.5, None]}).to_csv(
+            shard_dir / 'prices.csv', index=False)
+        shard_dirs.append(str(shard_dir))
+
+    merged = merge_shards(shard_dirs, str(tmp_path / 'data'))
+    with open(merged['prices.csv'], encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    # 종목 코드와 이름은 그대로, 값 컬럼의 빈 칸은 계속 빈 칸입니다.
+    assert lines == ['Symbol,Name,Close', 'NA,NA Corp,1.5', 'AAPL,AAPL Corp,', 'NULL,NULL Corp,1.5', 'MSFT,MSFT Corp,']
+
+
+@pytest.mark.parametrize("command", ['worker', 'merge'])
+def test_cli_requires_explicit_run_id(monkeypatch, tmp_path, command):
+    """실행 ID 를 지정하지 않으면 노드마다 다른 기본값을 쓰지 않고 종료하는지 테스트합니다."""
+    monkeypatch.delenv('PIPELINE_RUN_ID', raising=False)
+    monkeypatch.setattr(sys, 'argv', ['sharding.py', command, '--db', str(tmp_path / 'coordinator.db')])
+    with pytest.raises(SystemExit) as exit_info:
+        sharding.main()
+    assert exit_info.value.code == 2
+    assert not (tmp_path / 'coordinator.db').exists()
@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+
+import pytest
+
+# 수집기 모듈은 data_fetchers 폴더 기준 import 를 사용하므로 해당 폴더를 sys.path에 추가합니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pipeline', 'data_fetchers'))
+
+from stage_metrics import stage_run
+
+
+def _load_single_report(reports_dir):
+    files = os.listdir(reports_dir)
+    assert len(files) == 1
+    with open(os.path.join(reports_dir, files[0]), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_stage_run_writes_report(tmp_path):
+    """단계가 끝나면 카운터와 구간 시간이 담긴 리포트가 저장되는지 테스트합니다."""
+    with stage_run('fetch_and_save_data', reports_dir=str(tmp_path), symbols_total=3) as metrics:
+        for _ in range(2):
+            with metrics.timer('network'):
+                pass
+            metrics.count('symbols_succeeded')
+        metrics.count('symbols_failed')
+        metrics.count('rows_written', 500)
+
+    report = _load_single_report(tmp_path)
+    assert report['stage'] == 'fetch_and_save_data'
+    assert report['status'] == 'completed'
+    assert report['params'] == {'symbols_total': 3}
+    assert report['counters'] == {'symbols_succeeded': 2, 'symbols_failed': 1, 'rows_written': 500}
+    assert set(report['timers_sec']) == {'network'}
+    assert report['duration_sec'] >= report['timers_sec']['network']
+
+
+def test_stage_run_records_failure(tmp_path):
+    """단계 도중 예외가 발생해도 실패 상태로 리포트를 남기고 예외를 다시 발생시키는지 테스트합니다."""
+    with pytest.raises(RuntimeError):
+        with stage_run('copy_s3_to_redshift', reports_dir=str(tmp_path)) as metrics:
+            metrics.count('tables_succeeded')
+            raise RuntimeError("boom")
+
+    report = _load_single_report(tmp_path)
+    assert report['status'] == 'failed'
+    assert 'boom' in report['error']
+    assert report['counters'] == {'tables_succeeded': 1}
@@ -0,0 +1,97 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.statement_store import StatementStore, wide_to_long
+
+
+def _rows(symbol, period, date, statement, items):
+    return [(symbol, f'{symbol} Inc.', date, period, statement, item, value) for item, value in items.items()]
+
+
+@pytest.fixture
+def store():
+    rows = (
+        _rows('MSFT', 'annual', '2023-06-30', 'income', {'Total Revenue': 212.0, 'Net Income': 72.0})
+        + _rows('MSFT', 'annual', '2023-06-30', 'cash_flow', {'Net Income': 71.9, 'Free Cash Flow': 59.0})
+        + _rows('AAPL', 'annual', '2022-09-30', 'income', {'Total Revenue': 394.0})
+        + _rows('AAPL', 'annual', '2023-09-30', 'income', {'Total Revenue': 383.0, 'Net Income': 97.0})
+        + _rows('AAPL', 'annual', '2023-09-30', 'balance_sheet', {'Total Assets': 352.0})
+        + _rows('AAPL', 'quarterly', '2023-12-30', 'income', {'Total Revenue': 119.0})
+    )
+    columns = ['Symbol', 'Name', 'Date', 'period', 'statement', 'line_item', 'value']
+    return StatementStore(pd.DataFrame(rows, columns=columns))
+
+
+def test_pivot_returns_only_requested_items(store):
+    result = store.pivot('annual', ['AAPL'], ['Net Income', 'Total Revenue', 'EBITDA'])
+
+    assert list(result.columns) == ['Symbol', 'Name', 'Date', 'Net Income', 'Total Revenue', 'EBITDA']
+    # 최근 날짜가 먼저 오고, 값이 없는 항목/날짜는 NaN 입니다.
+    assert result['Date'].dt.strftime('%Y-%m-%d').tolist() == ['2023-09-30', '2022-09-30']
+    assert result['Total Revenue'].tolist() == [383.0, 394.0]
+    assert result['Net Income'].iloc[0] == 97.0 and np.isnan(result['Net Income'].iloc[1])
+    assert result['EBITDA'].isna().all()
+
+
+def test_pivot_prefers_income_statement_for_duplicate_items(store):
+    """같은 항목이 여러 제표에 있으면 우선순위가 높은 제표(손익계산서)의 값을 사용합니다."""
+    result = store.pivot('annual', ['MSFT'], ['Net Income'])
+    assert result['Net Income'].tolist() == [72.0]
+
+    cash_flow = store.pivot('annual', ['MSFT'], ['Net Income'], statement='cash_flow')
+    assert cash_flow['Net Income'].tolist() == [71.9]
+
+
+def test_pivot_filters_period_symbols_and_dates(store):
+    result = store.pivot('annual', ['MSFT', 'AAPL', 'NONE'], ['Total Revenue'], start_date='2023-01-01')
+    assert result['Symbol'].tolist() == ['MSFT', 'AAPL']
+
+    quarterly = store.pivot('quarterly')
+    assert quarterly[['Symbol', 'Total Revenue']].values.tolist() == [['AAPL', 119.0]]
+    assert store.pivot('annual', ['NONE']).empty
+
+
+def test_line_items_and_categorical_storage(store):
+    assert store.line_items(statement='cash_flow') == ['Free Cash Flow', 'Net Income']
+    assert store.line_items('quarterly') == ['Total Revenue']
+    assert isinstance(store.df['line_item'].dtype, pd.CategoricalDtype)
+
+
+def test_wide_to_long_drops_empty_cells():
+    wide = pd.DataFrame({
+        'Symbol': ['AAPL', 'MSFT'], 'Name': ['Apple', 'Microsoft'], 'Date': ['2023-09-30', '2023-06-30'],
+        'Total Revenue': [383.0, np.nan], 'Net Income_fin': [np.nan, 72.0],
+    })
+    long_df = wide_to_long(wide, 'annual')
+
+    assert len(long_df) == 2
+    store = StatementStore.from_frames([long_df])
+    assert store.pivot('annual', ['MSFT'], ['Net Income_fin'])['Net Income_fin'].tolist() == [72.0]
+
+
+def test_legacy_wide_output_matches_old_layout(store):
+    """수집기가 긴 형식과 함께 저장하는 기존 wide 파일이 예전 컬럼 구성(접미사 포함)을 따르는지 테스트합니다."""
+    pytest.importorskip('yfinance')
+    pytest.importorskip('tqdm')
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'pipeline', 'data_fetchers'))
+    from datareader_yfinance import to_legacy_wide
+
+    annual = to_legacy_wide(store.df, 'annual')
+    # 손익계산서와 현금흐름표에 모두 있는 Net Income 은 예전처럼 _comb/_cash 접미사로 나뉩니다.
+    assert list(annual.columns[:3]) == ['Symbol', 'Name', 'Date']
+    assert {'Total Revenue', 'Total Assets', 'Net Income_comb', 'Net Income_cash'} <= set(annual.columns)
+    msft = annual[annual['Symbol'] == 'MSFT'].iloc[0]
+    assert msft['Net Income_comb'] == 72.0 and msft['Net Income_cash'] == 71.9
+
+    # 기존 wide CSV 를 읽는 경로(wide_to_long)로 다시 읽어도 같은 값이 나옵니다.
+    restored = StatementStore.from_frames([wide_to_long(annual, 'annual')])
+    assert restored.pivot('annual', ['AAPL'], ['Total Revenue'])['Total Revenue'].tolist() == [383.0, 394.0]
+    assert to_legacy_wide(store.df, 'quarterly')['Total Revenue'].tolist() == [119.0]
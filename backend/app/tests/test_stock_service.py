@@ -34,10 +34,10 @@ def test_service_initialization(mock_read_csv, mock_stock_data):
     
     service = StockService()
 
-    # CSV 파일 로드 시 Symbol이 대문자로 변환되었는지 확인
-    assert service.df_stocks['Symbol'].tolist() == ['AAPL', 'MSFT', 'AAPL']
+    # CSV 파일 로드 시 Symbol이 대문자로 변환되고 (Symbol, Date) 순으로 정렬되었는지 확인
+    assert service.df_stocks_enriched['Symbol'].tolist() == ['AAPL', 'AAPL', 'MSFT']
     # Date 컬럼이 datetime 객체로 변환되었는지 확인
-    assert pd.api.types.is_datetime64_any_dtype(service.df_stocks['Date'])
+    assert pd.api.types.is_datetime64_any_dtype(service.df_stocks_enriched['Date'])
     # mock_read_csv가 한 번 호출되었는지 확인
     mock_read_csv.assert_called_once()
 
@@ -80,3 +80,112 @@ def test_get_stock_by_ticker_and_date_range(mock_read_csv, mock_stock_data):
     # 잘못된 날짜 형식에도 에러 없이 빈 결과를 반환해야 함
     result = service.get_stock_by_ticker_and_date_range('aapl', start_date='invalid-date')
     assert len(result) == 2 # 날짜 필터링이 적용되지 않은 원래 결과
+
+@patch('pandas.read_csv')
+def test_get_stocks_batch(mock_read_csv, mock_stock_data):
+    """여러 종목을 컬럼형으로 한 번에 조회하고, 요청한 컬럼만 반환하는지 테스트합니다."""
+    mock_read_csv.return_value = mock_stock_data
+    service = StockService()
+
+    result = service.get_stocks_batch(['aapl', 'MSFT', 'GOOG'], fields=['Close'])
+
+    # 데이터가 없는 종목(GOOG)은 제외되고, Date 컬럼은 항상 포함되어야 함
+    assert list(result) == ['AAPL', 'MSFT']
+    assert set(result['AAPL']) == {'Date', 'Close'}
+    assert result['AAPL']['Date'] == ['2023-01-01', '2023-01-01']
+    assert result['MSFT']['Close'] == [305.0]
+
+    # 날짜 범위 필터링
+    result = service.get_stocks_batch(['msft'], start_date='2023-01-02', end_date='2023-01-02')
+    assert result['MSFT']['Date'] == ['2023-01-02']
+    assert service.get_stocks_batch(['msft'], start_date='2023-02-01') == {}
+
+@patch('pandas.read_csv')
+def test_evaluate_portfolio_is_cached(mock_read_csv):
+    """같은 포트폴리오 평가 요청은 (데이터 버전, 요청 해시) 캐시에서 반환되는지 테스트합니다."""
+    mock_read_csv.return_value = pd.DataFrame({
+        'Date': ['2023-01-02', '2023-01-03', '2023-01-04'] * 2,
+        'Symbol': ['aapl'] * 3 + ['msft'] * 3,
+        'Open': [1.0] * 6,
+        'Close': [100.0, 110.0, 99.0, 200.0, 210.0, 220.0],
+    })
+    service = StockService()
+    holdings = [{'symbol': 'AAPL', 'weight': 0.5}, {'symbol': 'MSFT', 'weight': 0.5}]
+
+    result = service.evaluate_portfolio(holdings)
+    assert result['value'] == pytest.approx([10000.0, 10750.0, 10450.0])
+    assert result['data_version'] == service.data_version
+    assert service.evaluate_portfolio([{'symbol': 'aapl', 'weight': 1}, {'symbol': 'msft', 'weight': 1}]) is result
+    assert service.evaluate_portfolio(holdings, rebalance='daily') is not result
+    assert service.evaluate_portfolio(holdings, start_date='2024-01-01') is None
+
+@patch('pandas.read_csv')
+def test_dated_snapshot_cache_is_bounded(mock_read_csv, mock_stock_data):
+    """날짜 지정 스냅샷 캐시가 SNAPSHOT_CACHE_SIZE 개를 넘지 않는지 테스트합니다."""
+    mock_read_csv.return_value = mock_stock_data
+    service = StockService()
+    service.SNAPSHOT_CACHE_SIZE = 3
+
+    for day in range(1, 6):
+        service.get_snapshot(f'2023-01-0{day}')
+    dated = [k for k in service._snapshots if k is not None]
+    assert [k.day for k in dated] == [3, 4, 5]
+    assert None in service._snapshots
+
+def test_blank_volume_does_not_drop_the_dataset(tmp_path, monkeypatch):
+    """거래량이 빈 행이 있어도 주가 CSV 를 읽고, 빈 값이 없으면 거래량은 정수로 유지되는지 테스트합니다."""
+    from app.core.config import settings
+    from app.services import csv_loader
+
+    csv_path = tmp_path / 'prices.csv'
+    csv_path.write_text(
+        'Date,Symbol,Open,High,Low,Close,Volume,거래액\n'
+        '2023-01-02,aapl,1.0,2.0,0.5,1.5,100,150.0\n'
+        '2023-01-03,aapl,1.0,2.0,0.5,1.6,,160.0\n',
+        encoding='utf-8',
+    )
+    monkeypatch.setattr(settings, 'DATA_FILE_PATH', str(csv_path))
+    service = StockService()
+    assert len(service.df_stocks_enriched) == 2
+    assert service.df_stocks_enriched['Volume'].isna().tolist() == [False, True]
+
+    complete = tmp_path / 'complete.csv'
+    complete.write_text(csv_path.read_text(encoding='utf-8').replace(',,', ',200,'), encoding='utf-8')
+    df = csv_loader.read_csv(str(complete), csv_loader.STOCK_PRICES)
+    assert str(df['Volume'].dtype) == 'int64' and df['Volume'].tolist() == [100, 200]
+
+@pytest.mark.parametrize('use_pyarrow', [False, True])
+@pytest.mark.parametrize('large', [False, True])
+def test_loader_keeps_tickers_that_look_like_missing_values(tmp_path, monkeypatch, use_pyarrow, large):
+    """종목 코드 'NA', 'NULL' 은 문자열 그대로 읽고, 빈 칸과 숫자 컬럼의 'NA' 만 빈 값이 되는지 테스트합니다."""
+    from app.core.config import settings
+    from app.services import csv_loader
+
+    if use_pyarrow and not csv_loader.PYARROW_AVAILABLE:
+        pytest.skip('pyarrow 가 설치되어 있지 않습니다.')
+    monkeypatch.setattr(csv_loader, 'PYARROW_AVAILABLE', use_pyarrow)
+    # 임계값이 0 이면 모든 파일을 큰 파일 방식(pyarrow.csv 직접 읽기 / 나누어 읽기)으로 읽습니다.
+    monkeypatch.setattr(settings, 'CSV_CHUNK_THRESHOLD_MB', 0 if large else 1024)
+
+    prices = tmp_path / 'prices.csv'
+    prices.write_text(
+        'Date,Symbol,Open,High,Low,Close,Volume,거래액\n'
+        '2023-01-02,NA,1.0,2.0,0.5,1.5,100,150.0\n'
+        '2023-01-02,NULL,1.0,2.0,0.5,NA,100,150.0\n'
+        '2023-01-02,,1.0,2.0,0.5,1.5,100,150.0\n',
+        encoding='utf-8',
+    )
+    df = csv_loader.read_csv(str(prices), csv_loader.STOCK_PRICES)
+    assert df['Symbol'].iloc[:2].tolist() == ['NA', 'NULL']
+    assert pd.isna(df['Symbol'].iloc[2])
+    assert df['Close'].isna().tolist() == [False, True, False]
+    assert str(df['Volume'].dtype) == 'int64'
+
+    news = tmp_path / 'news.csv'
+    news.write_text(
+        'id,Symbol,Name,title,url,publishedAt\n'
+        '1,NA,None,t,u,2024-01-02T00:00:00Z\n',
+        encoding='utf-8',
+    )
+    df = csv_loader.read_csv(str(news), csv_loader.NEWS)
+    assert df[['Symbol', 'Name']].iloc[0].tolist() == ['NA', 'None']
@@ -0,0 +1,130 @@
+import json
+import os
+import sys
+
+import pytest
+
+boto3 = pytest.importorskip('boto3')
+moto = pytest.importorskip('moto')
+from boto3.s3.transfer import TransferConfig
+
+# 적재 스크립트는 processing 폴더 기준 import 를 사용하므로 해당 폴더를 sys.path에 추가합니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pipeline', 'processing'))
+
+import upload_to_s3
+from copy_s3_to_redshift import build_copy_command
+
+BUCKET = 'test-bucket'
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """moto 로 띄운 로컬 S3 (실제 AWS 에 접속하지 않습니다.)"""
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data = tmp_path / 'data'
+    data.mkdir()
+    (data / 'nasdaq_all_stocks.csv').write_text('Date,Symbol,Close\n2024-01-02,AAPL,1.0\n', encoding='utf-8')
+    (data / 'nasdaq_news_all.csv').write_text('id,Symbol,title\n0,AAPL,hello\n', encoding='utf-8')
+    (data / 'reports').mkdir()
+    return data
+
+
+def _run(s3, data_dir, run_date, previous=None, transfer_config=None):
+    paths = upload_to_s3.list_upload_files(str(data_dir))
+    manifest = upload_to_s3.upload_files(s3, BUCKET, paths, 'nasdaq', run_date=run_date, previous=previous,
+                                         transfer_config=transfer_config)
+    local_path = str(data_dir / 'manifests' / 'upload_manifest.json')
+    return upload_to_s3.write_manifests(s3, BUCKET, 'nasdaq', manifest, local_path=local_path), local_path
+
+
+def test_upload_writes_partitioned_objects_and_manifests(s3, data_dir):
+    """날짜 파티션 키로 업로드하고 실행 manifest 와 파일별 COPY manifest 를 남기는지 테스트합니다."""
+    manifest, local_path = _run(s3, data_dir, '2024-01-02')
+
+    entry = manifest['files']['nasdaq_all_stocks.csv']
+    assert entry['status'] == 'uploaded'
+    assert entry['key'] == 'nasdaq/dt=2024-01-02/nasdaq_all_stocks.csv'
+    head = s3.head_object(Bucket=BUCKET, Key=entry['key'])
+    assert head['Metadata']['sha256'] == entry['sha256']
+
+    with open(local_path, encoding='utf-8') as f:
+        assert json.load(f)['files'].keys() == manifest['files'].keys()
+
+    manifest_key = entry['copy_manifest_url'].replace(f"s3://{BUCKET}/", '')
+    copy_manifest = json.loads(s3.get_object(Bucket=BUCKET, Key=manifest_key)['Body'].read())
+    assert copy_manifest['entries'] == [
+        {'url': f"s3://{BUCKET}/{entry['key']}", 'mandatory': True, 'meta': {'content_length': entry['size']}}
+    ]
+
+
+def test_unchanged_files_are_skipped(s3, data_dir):
+    """내용이 같은 파일은 다음 실행에서 업로드하지 않고 이전 객체를 재사용하는지 테스트합니다."""
+    first, local_path = _run(s3, data_dir, '2024-01-02')
+    (data_dir / 'nasdaq_news_all.csv').write_text('id,Symbol,title\n0,AAPL,changed\n', encoding='utf-8')
+
+    second, _ = _run(s3, data_dir, '2024-01-03', previous=upload_to_s3.load_previous_manifest(local_path))
+
+    stocks = second['files']['nasdaq_all_stocks.csv']
+    assert stocks['status'] == 'skipped'
+    assert stocks['key'] == first['files']['nasdaq_all_stocks.csv']['key']
+    news = second['files']['nasdaq_news_all.csv']
+    assert news['status'] == 'uploaded'
+    assert news['key'] == 'nasdaq/dt=2024-01-03/nasdaq_news_all.csv'
+
+
+def test_multipart_etag_matches_s3(s3, data_dir):
+    """multipart 로 올린 객체의 ETag 를 로컬에서 같게 계산하여, 메타데이터가 없는 객체도 건너뛰는지 테스트합니다."""
+    big = data_dir / 'big.parquet'
+    big.write_bytes(os.urandom(11 * MB))
+    config = TransferConfig(multipart_threshold=5 * MB, multipart_chunksize=5 * MB)
+
+    # 메타데이터 없이 직접 올린 객체 (수동 업로드와 같은 상황)
+    key = 'nasdaq/dt=2024-01-02/big.parquet'
+    s3.upload_file(str(big), BUCKET, key, Config=config)
+    digests = upload_to_s3.file_digests(str(big), config.multipart_chunksize, config.multipart_threshold)
+    assert s3.head_object(Bucket=BUCKET, Key=key)['ETag'].strip('"') == digests['etag']
+    assert digests['etag'].endswith('-3')
+
+    entry = upload_to_s3.upload_file(s3, BUCKET, str(big), key, config)
+    assert entry['status'] == 'skipped'
+
+
+def test_copy_command_uses_upload_manifest():
+    conf = {'s3_bucket_name': BUCKET, 'b_account_iam_role_arn': 'arn:role', 'region_name': 'us-east-1'}
+    table_conf = {'target_table': 'stocks', 's3_file_path': None, 'format': 'PARQUET', 'ignoreheader': '1'}
+
+    command = build_copy_command(conf, table_conf, f"s3://{BUCKET}/nasdaq/manifests/run/stocks.parquet.manifest")
+
+    assert f"FROM 's3://{BUCKET}/nasdaq/manifests/run/stocks.parquet.manifest'" in command
+    assert 'MANIFEST' in command
+    assert 'FORMAT AS PARQUET' in command
+    assert 'IGNOREHEADER' not in command
+
+
+def test_failed_upload_is_recorded_in_manifest(s3, data_dir, monkeypatch):
+    """업로드에 실패한 파일이 status='failed' 로 manifest 에 남고 COPY manifest 는 만들어지지 않는지 테스트합니다."""
+    upload_file = s3.upload_file
+
+    def flaky_upload(path, *args, **kwargs):
+        if path.endswith('nasdaq_news_all.csv'):
+            raise ConnectionError('connection reset')
+        return upload_file(path, *args, **kwargs)
+
+    monkeypatch.setattr(s3, 'upload_file', flaky_upload)
+    manifest, _ = _run(s3, data_dir, '2024-01-02')
+
+    news = manifest['files']['nasdaq_news_all.csv']
+    assert news['status'] == 'failed' and 'connection reset' in news['error']
+    assert 'copy_manifest_url' not in news
+    assert manifest['files']['nasdaq_all_stocks.csv']['status'] == 'uploaded'
@@ -0,0 +1,73 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+# 수집기 모듈은 data_fetchers 폴더 기준 import 를 사용하므로 해당 폴더를 sys.path에 추가합니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pipeline', 'data_fetchers'))
+
+from writers import row_group_bounds, save_table
+from app.services import csv_loader
+
+
+@pytest.fixture
+def prices_df():
+    """종목 순서가 섞인 주가 데이터 (수집 순서 그대로)"""
+    dates = pd.date_range('2023-01-02', periods=4)
+    frames = [
+        pd.DataFrame({'Date': dates, 'Symbol': symbol, 'Open': 1.0, 'High': 2.0, 'Low': 0.5,
+                      'Close': [1.0, 1.1, 1.2, 1.3], 'Volume': 100, '거래액': 130.0})
+        for symbol in ['MSFT', 'AAPL', 'GOOG']
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_row_group_bounds_split_on_group_boundaries():
+    """row group 구간이 그룹 경계에서만 나뉘는지 테스트합니다."""
+    groups = ['A'] * 3 + ['B'] * 3 + ['C'] * 5 + ['D']
+    assert row_group_bounds(groups, 4) == [(0, 6), (6, 11), (11, 12)]
+    assert row_group_bounds(groups, 100) == [(0, 12)]
+    assert row_group_bounds([], 4) == []
+
+
+def test_save_table_writes_csv_and_parquet(tmp_path, prices_df):
+    """CSV 와 Parquet 를 함께 저장하고, Parquet 는 종목 순 정렬 및 종목 경계 row group 으로 저장되는지 테스트합니다."""
+    paths = save_table(prices_df, str(tmp_path / 'prices'), formats=['csv', 'parquet'])
+
+    assert paths == {'csv': str(tmp_path / 'prices.csv'), 'parquet': str(tmp_path / 'prices.parquet')}
+    pd.testing.assert_frame_equal(pd.read_csv(paths['csv'], parse_dates=['Date']), prices_df, check_dtype=False)
+
+    parquet_file = pq.ParquetFile(paths['parquet'])
+    df = parquet_file.read().to_pandas()
+    assert list(df['Symbol'].unique()) == ['AAPL', 'GOOG', 'MSFT']
+    # 같은 종목 안의 날짜 순서는 유지됩니다.
+    assert df[df['Symbol'] == 'MSFT']['Close'].tolist() == [1.0, 1.1, 1.2, 1.3]
+    assert df['Volume'].dtype == 'int64'
+
+
+def test_save_table_rejects_unknown_format(tmp_path, prices_df):
+    with pytest.raises(ValueError):
+        save_table(prices_df, str(tmp_path / 'prices'), formats=['xlsx'])
+
+
+def test_read_table_prefers_fresh_parquet(tmp_path, prices_df):
+    """CSV 옆에 최신 Parquet 가 있으면 Parquet 를 스키마 타입대로 읽는지 테스트합니다."""
+    csv_path = str(tmp_path / 'prices.csv')
+    save_table(prices_df, str(tmp_path / 'prices'), formats=['csv'])
+    assert not csv_loader._use_parquet(csv_path)
+
+    save_table(prices_df, str(tmp_path / 'prices'), formats=['parquet'])
+    assert csv_loader._use_parquet(csv_path)
+
+    df = csv_loader.read_table(csv_path, csv_loader.STOCK_PRICES)
+    assert str(df['Date'].dtype) == 'datetime64[ns]'
+    assert len(df) == len(prices_df)
+    assert set(df['Symbol']) == {'AAPL', 'GOOG', 'MSFT'}
+
+    # CSV 가 더 최근에 저장되면 오래된 Parquet 대신 CSV 를 읽습니다.
+    parquet_mtime = os.path.getmtime(str(tmp_path / 'prices.parquet'))
+    os.utime(csv_path, (parquet_mtime + 10, parquet_mtime + 10))
+    assert not csv_loader._use_parquet(csv_path)
@@ -0,0 +1,84 @@
+"""
+지표 계산(enrichment) 병렬 확장성 벤치마크
+
+합성 주가 데이터(기본 5,000개 종목 × 10년)에 대해 app.services.enrichment.enrich 를
+작업자 수별로 실행하여 실행 시간과 1 작업자 대비 속도 향상을 출력합니다.
+(기존 방식: 전체 테이블에 대한 단일 DuckDB 쿼리 + 단일 스레드 fetchdf 도 함께 측정합니다.)
+속도 향상은 CPU 수 이하의 작업자 수에서만 의미가 있습니다. CPU 가 1개인 환경에서는 다중 코어 확장성을 측정할 수 없으며,
+CPU 수보다 많은 작업자 수의 결과는 파티션 분할/전환 오버헤드만 보여 줍니다. (실행 시 경고를 출력합니다)
+
+실행 예 (backend 폴더에서):
+    python benchmarks/bench_enrichment.py                                  # 5000 종목 × 2520일, 1/2/4/.../CPU 수
+    python benchmarks/bench_enrichment.py --symbols 1000 --workers 1 2 4 --executor process
+"""
+import argparse
+import os
+import sys
+import time
+
+import duckdb
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import enrichment
+from synthetic import make_synthetic_prices
+
+
+def default_worker_counts() -> list[int]:
+    """1, 2, 4, ... CPU 수 까지의 작업자 수"""
+    cpus = os.cpu_count() or 1
+    counts, n = [], 1
+    while n < cpus:
+        counts.append(n)
+        n *= 2
+    return counts + [cpus]
+
+
+def best_of(fn, repeat: int) -> float:
+    """repeat 번 실행하여 가장 빠른 실행 시간(초)을 반환합니다."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종목 파티션 병렬 지표 계산 벤치마크")
+    parser.add_argument('--symbols', type=int, default=5000, help="합성 데이터 종목 수")
+    parser.add_argument('--days', type=int, default=2520, help="종목당 거래일 수 (기본 10년)")
+    parser.add_argument('--workers', type=int, nargs='+', default=None, help="측정할 작업자 수 목록")
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--repeat', type=int, default=1, help="반복 횟수 (최소값 사용)")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or default_worker_counts()
+    df = make_synthetic_prices(args.symbols, args.days)
+    print(f"합성 데이터: {args.symbols:,}개 종목 × {args.days:,}일 = {len(df):,}행, CPU {cpus}개")
+    if cpus == 1:
+        print("경고: CPU 가 1개라 다중 코어 확장성은 측정되지 않습니다. 확장성은 CPU 가 여러 개인 환경에서 측정하세요.")
+    elif max(worker_counts) > cpus:
+        print(f"경고: CPU {cpus}개보다 많은 작업자 수의 결과는 확장성이 아니라 분할/전환 오버헤드를 보여 줍니다.")
+
+    def run_monolithic():
+        con = duckdb.connect(database=':memory:')
+        con.register('stocks', df)
+        con.execute(enrichment.MOVING_AVERAGE_QUERY).fetchdf()
+        con.close()
+
+    monolithic_sec = best_of(run_monolithic, args.repeat)
+    print(f"{'단일 DuckDB 쿼리 (이동 평균만)':<32}: {monolithic_sec:8.2f} s")
+
+    baseline = None
+    for workers in worker_counts:
+        seconds = best_of(lambda: enrichment.enrich(df, workers=workers, executor=args.executor), args.repeat)
+        baseline = baseline or seconds
+        label = f"enrich ({args.executor}, 작업자 {workers})"
+        print(f"{label:<32}: {seconds:8.2f} s  (x{baseline / seconds:.2f})")
+
+
+if __name__ == '__main__':
+    main()
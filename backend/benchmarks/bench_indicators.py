@@ -0,0 +1,104 @@
+"""
+RSI 계산 방식 벤치마크
+
+기존 DuckDB 윈도 함수 방식(14행 단순 평균 RSI)과 지표 커널(app.services.indicators)의
+Wilder RSI 계산 시간을 전체 종목에 대해 비교합니다.
+
+실행 방법 (backend 폴더에서):
+    python benchmarks/bench_indicators.py                 # DATA_FILE_PATH 의 실제 데이터 사용
+    python benchmarks/bench_indicators.py --symbols 3000 --days 2520   # 합성 데이터 사용
+"""
+import argparse
+import os
+import sys
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import indicators
+from synthetic import make_synthetic_prices
+
+DUCKDB_WINDOW_RSI_QUERY = """
+WITH PriceDiff AS (
+    SELECT
+        *,
+        "Close" - LAG("Close", 1, "Close") OVER (PARTITION BY "Symbol" ORDER BY "Date") AS diff
+    FROM stocks
+),
+GainsAndLosses AS (
+    SELECT
+        *,
+        CASE WHEN diff > 0 THEN diff ELSE 0 END AS gain,
+        CASE WHEN diff < 0 THEN -diff ELSE 0 END AS loss
+    FROM PriceDiff
+)
+SELECT
+    "Symbol", "Date",
+    100 - (100 / (1 + (
+        AVG(gain) OVER (PARTITION BY "Symbol" ORDER BY "Date" ROWS BETWEEN 13 PRECEDING AND CURRENT ROW) /
+        NULLIF(AVG(loss) OVER (PARTITION BY "Symbol" ORDER BY "Date" ROWS BETWEEN 13 PRECEDING AND CURRENT ROW), 0)
+    ))) AS RSI_14
+FROM GainsAndLosses
+ORDER BY "Symbol", "Date"
+"""
+
+
+def load_prices(args) -> pd.DataFrame:
+    """실제 데이터 파일이 있으면 사용하고, 없으면 합성 데이터를 생성합니다."""
+    csv_path = os.getenv('DATA_FILE_PATH')
+    if args.symbols is None and csv_path and os.path.exists(csv_path):
+        print(f"실제 데이터 사용: {csv_path}")
+        df = pd.read_csv(csv_path, usecols=['Symbol', 'Date', 'Close'])
+        df['Date'] = pd.to_datetime(df['Date'])
+        df['Symbol'] = df['Symbol'].str.upper()
+        return df
+    n_symbols = args.symbols or 1000
+    print(f"합성 데이터 사용: {n_symbols}개 종목 × {args.days}일")
+    return make_synthetic_prices(n_symbols, args.days)
+
+
+def best_of(fn, repeat: int) -> float:
+    """repeat 번 실행하여 가장 빠른 실행 시간(초)을 반환합니다."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DuckDB 윈도 RSI vs 지표 커널 Wilder RSI 벤치마크")
+    parser.add_argument('--symbols', type=int, default=None, help="합성 데이터 종목 수")
+    parser.add_argument('--days', type=int, default=2520, help="합성 데이터 종목당 거래일 수")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수 (최소값 사용)")
+    args = parser.parse_args()
+
+    df = load_prices(args).sort_values(['Symbol', 'Date'], ignore_index=True)
+    print(f"총 행 수: {len(df):,}, 종목 수: {df['Symbol'].nunique():,}")
+
+    def run_duckdb():
+        con = duckdb.connect(database=':memory:')
+        con.register('stocks', df)
+        con.execute(DUCKDB_WINDOW_RSI_QUERY).fetchnumpy()
+        con.close()
+
+    def run_kernel():
+        starts = indicators.group_starts(df['Symbol'].to_numpy())
+        indicators.rsi_wilder(df['Close'].to_numpy(dtype='float64'), 14, starts)
+
+    duckdb_sec = best_of(run_duckdb, args.repeat)
+    kernel_sec = best_of(run_kernel, args.repeat)
+
+    print(f"DuckDB 윈도 RSI (단순 평균) : {duckdb_sec * 1000:10.1f} ms")
+    print(f"지표 커널 Wilder RSI         : {kernel_sec * 1000:10.1f} ms")
+    print(f"속도 비율 (DuckDB / 커널)    : {duckdb_sec / kernel_sec:10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
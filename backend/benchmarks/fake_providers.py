@@ -0,0 +1,115 @@
+"""
+벤치마크용 가짜 데이터 제공자
+
+FinanceDataReader(fdr), yfinance(yf), NewsAPI 를 흉내 내어 네트워크 없이
+수집기(fetcher)의 파싱/병합/저장 비용만 측정할 수 있도록 합니다.
+각 모듈의 전역 이름(fdr, yf, NewsApiClient)을 이 객체로 교체하여 사용합니다.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _seed(symbol: str) -> int:
+    """심볼별로 항상 같은 난수를 얻기 위한 시드"""
+    return sum(ord(c) for c in symbol)
+
+
+class FakeFdr:
+    """FinanceDataReader 모듈 대용"""
+
+    def __init__(self, n_days: int = 1260, symbols: list[str] = None):
+        self.n_days = n_days
+        self.symbols = symbols or []
+
+    def StockListing(self, market: str) -> pd.DataFrame:
+        return pd.DataFrame({
+            'Symbol': self.symbols,
+            'Name': [f'{s} Inc.' for s in self.symbols],
+            'Industry': 'Software',
+            'IndustryCode': '000000',
+        })
+
+    def DataReader(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        rng = np.random.default_rng(_seed(symbol))
+        index = pd.bdate_range(start or '2020-01-01', periods=self.n_days, name='Date')
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, self.n_days)))
+        return pd.DataFrame({
+            'Open': close * 0.99,
+            'High': close * 1.01,
+            'Low': close * 0.98,
+            'Close': close,
+            'Volume': rng.integers(10_000, 5_000_000, self.n_days),
+            'Change': np.r_[np.nan, np.diff(close) / close[:-1]],
+        }, index=index)
+
+
+class FakeTicker:
+    """yfinance.Ticker 대용"""
+
+    LINE_ITEMS = {
+        'financials': ['Total Revenue', 'Net Income', 'EBITDA', 'Basic Average Shares', 'Operating Income'],
+        'balance_sheet': ['Total Assets', 'Stockholders Equity', 'Total Liabilities Net Minority Interest'],
+        'cashflow': ['Operating Cash Flow', 'Free Cash Flow', 'Capital Expenditure'],
+    }
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._rng = np.random.default_rng(_seed(symbol))
+        self.info = {
+            'symbol': symbol, 'shortName': f'{symbol} Inc.', 'sector': 'Technology',
+            'trailingEps': 3.2, 'trailingPE': 25.0, 'bookValue': 20.0, 'priceToBook': 4.0,
+            'returnOnEquity': 0.2, 'returnOnAssets': 0.1, 'ebitda': 1e9, 'enterpriseValue': 5e10,
+        }
+
+    def _statement(self, kind: str, freq: str, periods: int) -> pd.DataFrame:
+        dates = pd.date_range(end='2024-12-31', periods=periods, freq=freq)
+        items = self.LINE_ITEMS[kind]
+        values = self._rng.uniform(1e6, 1e10, size=(len(items), periods))
+        return pd.DataFrame(values, index=items, columns=dates)
+
+    @property
+    def financials(self):
+        return self._statement('financials', 'YE', 4)
+
+    @property
+    def balance_sheet(self):
+        return self._statement('balance_sheet', 'YE', 4)
+
+    @property
+    def cashflow(self):
+        return self._statement('cashflow', 'YE', 4)
+
+    @property
+    def quarterly_financials(self):
+        return self._statement('financials', 'QE', 5)
+
+    @property
+    def quarterly_balance_sheet(self):
+        return self._statement('balance_sheet', 'QE', 5)
+
+    @property
+    def quarterly_cashflow(self):
+        return self._statement('cashflow', 'QE', 5)
+
+    def history(self, start=None, period=None, **kwargs) -> pd.DataFrame:
+        index = pd.bdate_range(start or '2024-01-01', periods=1)
+        return pd.DataFrame({'Close': [100.0]}, index=index)
+
+
+class FakeYf:
+    """yfinance 모듈 대용"""
+    Ticker = FakeTicker
+
+
+class FakeNewsApiClient:
+    """newsapi.NewsApiClient 대용"""
+
+    def __init__(self, api_key=None, articles_per_query: int = 20):
+        self.articles_per_query = articles_per_query
+
+    def get_everything(self, q, from_param=None, to=None, language=None, sort_by=None, **kwargs):
+        return {'articles': [
+            {'title': f'{q} headline {i}', 'url': f'https://news.example.com/{q}/{i}',
+             'publishedAt': '2024-01-01T00:00:00Z'}
+            for i in range(self.articles_per_query)
+        ]}
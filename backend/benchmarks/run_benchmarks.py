@@ -0,0 +1,363 @@
+"""
+API 핫패스 및 파이프라인 단계 벤치마크 실행기
+
+합성 데이터(benchmarks/synthetic.py)를 생성한 뒤 다음 항목의 실행 시간을 측정하고,
+커밋 간 비교가 가능하도록 JSON 결과 파일로 저장합니다.
+
+    - 앱 콜드 import (새 인터프리터에서 app.main_v2 import, 데이터 로드 없이)
+    - 주가 CSV 읽기 (타입 추론 + 별도 날짜 변환 vs 스키마 선언 로더)
+    - StockService 생성 (CSV 로드 + 지표 계산)
+    - 종목별 조회, /stocks/ 전체 응답 직렬화
+    - 뉴스/재무정보 조회
+    - 수집기(fetcher) 단계 (가짜 데이터 제공자 사용, 네트워크/대기 없음)
+
+실행 예 (backend 폴더에서):
+    python benchmarks/run_benchmarks.py --symbols 500 --days 1260 --output bench_results.json
+    python benchmarks/run_benchmarks.py --compare bench_results.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FETCHERS_DIR = os.path.join(BACKEND_DIR, 'app', 'pipeline', 'data_fetchers')
+
+# backend 폴더를 sys.path에 추가하여 'app' 모듈을 찾을 수 있도록 합니다.
+sys.path.insert(0, BACKEND_DIR)
+
+from synthetic import generate_dataset, symbol_names
+from fake_providers import FakeFdr, FakeYf, FakeNewsApiClient
+
+# 이름 -> 벤치마크 함수. 각 함수는 (ctx) 를 받아 측정할 호출 가능 객체와 1회 실행당 연산 수를 반환합니다.
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """벤치마크 함수를 등록하는 데코레이터"""
+    def decorator(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return decorator
+
+
+class SkipBenchmark(Exception):
+    """필요한 패키지가 없는 등의 이유로 벤치마크를 건너뛸 때 사용합니다."""
+
+
+@contextmanager
+def working_directory(path: str):
+    """수집기가 상대 경로 'data' 에 파일을 쓰므로 임시 폴더에서 실행합니다."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def import_fetcher(module_name: str):
+    """수집기 모듈을 가져옵니다. 수집기는 같은 폴더 기준 import 를 사용하므로 경로를 추가합니다."""
+    if FETCHERS_DIR not in sys.path:
+        sys.path.insert(0, FETCHERS_DIR)
+    try:
+        return __import__(module_name)
+    except ImportError as e:
+        raise SkipBenchmark(f"{module_name} 을(를) 불러올 수 없습니다: {e}")
+
+
+@contextmanager
+def unthrottled_providers():
+    """
+    수집기가 get_client() 로 공유하는 제공자 클라이언트를 호출 제한 없는 클라이언트로 바꿉니다.
+    (TokenBucket 은 time.sleep 을 기본 인자로 잡아 두므로 patch('time.sleep') 으로는 대기가 없어지지 않습니다.)
+    """
+    provider_client = import_fetcher('provider_client')
+    clients = {
+        name: provider_client.ProviderClient(name, rate=1e9, burst=10 ** 9, sleep=lambda seconds: None)
+        for name in provider_client.PROVIDER_DEFAULTS
+    }
+    with patch.dict(provider_client._clients, clients, clear=True):
+        yield
+
+
+# --- API 핫패스 --- #
+
+@benchmark('app_cold_import')
+def bench_app_cold_import(ctx):
+    # 서비스는 지연 생성되므로 import 시간에는 데이터 로드가 포함되지 않아야 합니다.
+    command = [sys.executable, '-c', 'import app.main_v2']
+
+    def run():
+        subprocess.run(command, cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return run, 1
+
+
+@benchmark('csv_read_prices_inferred')
+def bench_csv_read_inferred(ctx):
+    import pandas as pd
+    path = ctx['paths']['DATA_FILE_PATH']
+
+    def run():
+        # 기존 방식: 전체 타입 추론 후 날짜를 별도 패스로 변환
+        df = pd.read_csv(path)
+        df['Date'] = pd.to_datetime(df['Date'])
+    return run, 1
+
+
+@benchmark('csv_read_prices_typed')
+def bench_csv_read_typed(ctx):
+    from app.services import csv_loader
+    path = ctx['paths']['DATA_FILE_PATH']
+
+    def run():
+        csv_loader.read_csv(path, csv_loader.STOCK_PRICES)
+    return run, 1
+
+
+@benchmark('stock_service_init')
+def bench_stock_service_init(ctx):
+    from app.services.stock_service import StockService
+    return StockService, 1
+
+
+@benchmark('stock_lookup_per_ticker')
+def bench_stock_lookup(ctx):
+    service = ctx['stock_service']
+    tickers = ctx['sample_symbols']
+
+    def run():
+        for ticker in tickers:
+            service.get_stock_by_ticker_and_date_range(ticker, '2016-01-01', '2018-12-31')
+    return run, len(tickers)
+
+
+@benchmark('stocks_all_serialization')
+def bench_stocks_all_serialization(ctx):
+    from typing import List
+    from pydantic import TypeAdapter
+    from app.schemas.stock import StockPrice
+
+    service = ctx['stock_service']
+    adapter = TypeAdapter(List[StockPrice])
+
+    def run():
+        # /stocks/ 라우트와 같이 조회 -> 응답 모델 검증 -> JSON 직렬화 순서로 처리합니다.
+        adapter.dump_json(adapter.validate_python(service.get_all_stocks()), by_alias=True)
+    return run, 1
+
+
+@benchmark('news_lookup_per_symbol')
+def bench_news_lookup(ctx):
+    from app.services.local_news_service import LocalNewsService
+
+    service = LocalNewsService(csv_path=ctx['paths']['NEWS_PATH'])
+    tickers = ctx['sample_symbols']
+
+    def run():
+        for ticker in tickers:
+            service.get_news_by_symbol(ticker)
+    return run, len(tickers)
+
+
+@benchmark('financial_info_lookup_per_symbol')
+def bench_financial_info_lookup(ctx):
+    from app.services.financials_info_service import FinancialsInfoService
+
+    service = FinancialsInfoService()
+    service.load_csv_data()
+    tickers = ctx['sample_symbols']
+
+    def run():
+        for ticker in tickers:
+            service.get_info_by_symbol(ticker)
+    return run, len(tickers)
+
+
+# --- 파이프라인 단계 (가짜 데이터 제공자) --- #
+
+@benchmark('fetch_and_save_data')
+def bench_fetch_prices(ctx):
+    module = import_fetcher('datareader_fdr')
+    companies = ctx['fetch_companies']
+
+    def run():
+        with patch.object(module, 'fdr', FakeFdr(ctx['days'])), unthrottled_providers(), \
+                working_directory(ctx['workdir']):
+            module.fetch_and_save_data(companies)
+    return run, len(companies)
+
+
+@benchmark('fetch_and_save_all_financial_data')
+def bench_fetch_financials(ctx):
+    module = import_fetcher('datareader_yfinance')
+    companies = ctx['fetch_companies']
+
+    def run():
+        with patch.object(module, 'yf', FakeYf), unthrottled_providers(), working_directory(ctx['workdir']):
+            module.fetch_and_save_all_financial_data(companies, start_date='2020-01-01')
+    return run, len(companies)
+
+
+@benchmark('fetch_and_save_historical_info')
+def bench_fetch_historical_info(ctx):
+    module = import_fetcher('info_datareader_yfinance_NYrs')
+    companies = ctx['fetch_companies']
+
+    def run():
+        with patch.object(module, 'yf', FakeYf), unthrottled_providers(), working_directory(ctx['workdir']):
+            module.fetch_and_save_historical_info(companies, years=4)
+    return run, len(companies)
+
+
+@benchmark('fetch_and_save_news_urls')
+def bench_fetch_news(ctx):
+    module = import_fetcher('news_crawler')
+    companies = ctx['fetch_companies']
+
+    def run():
+        with patch.object(module, 'NewsApiClient', FakeNewsApiClient), \
+                patch.object(module, 'load_api_key', lambda *a, **k: 'fake'), \
+                unthrottled_providers(), working_directory(ctx['workdir']):
+            module.fetch_and_save_news_urls(companies, days=10)
+    return run, len(companies)
+
+
+# --- 실행 및 비교 --- #
+
+def git_revision() -> str:
+    """현재 커밋 해시를 반환합니다. git 을 사용할 수 없으면 'unknown'."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return 'unknown'
+
+
+def measure(fn, ops: int, repeat: int) -> dict:
+    """fn 을 repeat 번 실행하여 통계를 계산합니다."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        'runs': repeat,
+        'ops_per_run': ops,
+        'min_sec': min(timings),
+        'median_sec': median,
+        'mean_sec': statistics.fmean(timings),
+        'median_sec_per_op': median / ops,
+    }
+
+
+def run_all(args, selected: list[str]) -> dict:
+    """합성 데이터를 만들고 선택된 벤치마크를 실행합니다."""
+    workdir = tempfile.mkdtemp(prefix='stock_bench_')
+    print(f"합성 데이터 생성 중... ({args.symbols}개 종목 × {args.days}일) -> {workdir}")
+    paths = generate_dataset(os.path.join(workdir, 'input'), args.symbols, args.days)
+
+    # 설정 객체는 import 시점에 환경 변수를 읽으므로, app 모듈을 가져오기 전에 경로를 지정합니다.
+    os.environ.update(paths)
+    import pandas as pd
+    from app.services.stock_service import StockService
+
+    symbols = symbol_names(args.symbols)
+    ctx = {
+        'paths': paths,
+        'days': args.days,
+        'workdir': workdir,
+        'sample_symbols': symbols[:: max(1, len(symbols) // 100)][:100],
+        'fetch_companies': pd.DataFrame({
+            'Symbol': symbols[:args.fetch_symbols],
+            'Name': [f'{s} Inc.' for s in symbols[:args.fetch_symbols]],
+            'Industry': 'Software',
+        }),
+    }
+    ctx['stock_service'] = StockService()
+
+    results = {}
+    for name in selected:
+        try:
+            fn, ops = BENCHMARKS[name](ctx)
+        except SkipBenchmark as e:
+            print(f"  - {name:<36} 건너뜀 ({e})")
+            results[name] = {'skipped': str(e)}
+            continue
+        results[name] = measure(fn, ops, args.repeat)
+        print(f"  - {name:<36} median {results[name]['median_sec'] * 1000:10.2f} ms "
+              f"({results[name]['median_sec_per_op'] * 1000:.3f} ms/op)")
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """기준 결과와 비교하여 표를 출력하고, 성능이 threshold 이상 나빠진 항목 이름을 반환합니다."""
+    regressions = []
+    print(f"\n{'benchmark':<36} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or 'median_sec_per_op' not in base or 'median_sec_per_op' not in result:
+            continue
+        ratio = result['median_sec_per_op'] / base['median_sec_per_op']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  <-- 성능 저하'
+            regressions.append(name)
+        print(f"{name:<36} {base['median_sec_per_op'] * 1000:10.3f}ms {result['median_sec_per_op'] * 1000:10.3f}ms "
+              f"{ratio:7.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 핫패스 및 파이프라인 단계 벤치마크")
+    parser.add_argument('--symbols', type=int, default=500, help="합성 데이터 종목 수")
+    parser.add_argument('--days', type=int, default=1260, help="종목당 거래일 수")
+    parser.add_argument('--fetch-symbols', type=int, default=50, help="수집기 벤치마크에 사용할 종목 수")
+    parser.add_argument('--repeat', type=int, default=3, help="벤치마크별 반복 횟수")
+    parser.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS), help="실행할 벤치마크 이름")
+    parser.add_argument('--output', default='bench_results.json', help="결과 JSON 파일 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument('--threshold', type=float, default=0.2, help="성능 저하로 판단할 비율 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # 결과 파일과 비교 기준 파일이 같을 수 있으므로 기준 결과를 먼저 읽어 둡니다.
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    current = {
+        'meta': {
+            'git_revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'params': {'symbols': args.symbols, 'days': args.days,
+                       'fetch_symbols': args.fetch_symbols, 'repeat': args.repeat},
+        },
+        'results': run_all(args, args.only or list(BENCHMARKS)),
+    }
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print(f"\n결과가 {args.output} 에 저장되었습니다.")
+
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n성능 저하 감지: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+벤치마크용 합성 데이터 생성기
+
+N개 종목 × M 거래일의 OHLCV 데이터와 뉴스, 재무정보, 연간/분기 재무제표 CSV를
+실제 파이프라인 출력과 같은 컬럼 구성으로 생성합니다.
+
+실행 예 (backend 폴더에서):
+    python benchmarks/synthetic.py --symbols 500 --days 1260 --output-dir /tmp/bench_data
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def symbol_names(n_symbols: int) -> list[str]:
+    """합성 티커 목록을 생성합니다. (예: SYM00000, SYM00001, ...)"""
+    return [f'SYM{i:05d}' for i in range(n_symbols)]
+
+
+def make_synthetic_prices(n_symbols: int, n_days: int, seed: int = 42, start: str = '2015-01-01') -> pd.DataFrame:
+    """
+    랜덤 워크로 nasdaq_all_stocks.csv 와 같은 형식의 일봉 데이터를 생성합니다.
+    컬럼: Date, Symbol, Open, High, Low, Close, Volume, 거래액
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=n_days)
+    returns = rng.normal(0, 0.02, size=(n_symbols, n_days))
+    close = 100 * np.exp(np.cumsum(returns, axis=1))
+    spread = np.abs(rng.normal(0, 0.01, size=close.shape))
+    open_ = close * (1 + rng.normal(0, 0.005, size=close.shape))
+    volume = rng.integers(10_000, 5_000_000, size=close.shape)
+
+    df = pd.DataFrame({
+        'Date': np.tile(dates, n_symbols),
+        'Symbol': np.repeat(symbol_names(n_symbols), n_days),
+        'Open': open_.ravel(),
+        'High': (np.maximum(open_, close) * (1 + spread)).ravel(),
+        'Low': (np.minimum(open_, close) * (1 - spread)).ravel(),
+        'Close': close.ravel(),
+        'Volume': volume.ravel(),
+    })
+    df['거래액'] = df['Close'] * df['Volume']
+    return df
+
+
+def make_synthetic_news(n_symbols: int, per_symbol: int, seed: int = 42) -> pd.DataFrame:
+    """nasdaq_news_all.csv 와 같은 형식의 뉴스 데이터를 생성합니다."""
+    rng = np.random.default_rng(seed)
+    words = np.array(['earnings', 'recall', 'merger', 'guidance', 'dividend', 'lawsuit',
+                      'upgrade', 'downgrade', 'launch', 'buyback', 'outlook', 'record'])
+    symbols = np.repeat(symbol_names(n_symbols), per_symbol)
+    n = len(symbols)
+    titles = [' '.join(row) for row in rng.choice(words, size=(n, 6))]
+    published = pd.Timestamp('2024-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 30 * 24 * 3600, n), unit='s')
+    df = pd.DataFrame({
+        'Symbol': symbols,
+        'Name': [f'{s} Inc.' for s in symbols],
+        'title': titles,
+        'url': [f'https://news.example.com/{i}' for i in range(n)],
+        'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+    })
+    df.index.name = 'id'
+    return df
+
+
+def make_synthetic_financial_info(n_symbols: int, years: int = 5, seed: int = 42) -> pd.DataFrame:
+    """nasdaq_financial_info_n_yrs.csv 와 같은 형식의 재무지표 데이터를 생성합니다."""
+    rng = np.random.default_rng(seed)
+    symbols = np.repeat(symbol_names(n_symbols), years)
+    n = len(symbols)
+    dates = np.tile([f'{2024 - y}-12-31' for y in range(years)], n_symbols)
+    return pd.DataFrame({
+        'Date': dates,
+        'Symbol': symbols,
+        'Name': [f'{s} Inc.' for s in symbols],
+        'EPS': rng.normal(3, 2, n),
+        'PER': rng.uniform(5, 60, n),
+        'BPS': rng.uniform(1, 80, n),
+        'PBR': rng.uniform(0.5, 20, n),
+        'ROE': rng.normal(0.12, 0.1, n),
+        'ROA': rng.normal(0.05, 0.05, n),
+        'EBITDA': rng.uniform(1e7, 1e11, n),
+        'EV': np.nan,
+    })
+
+
+def make_synthetic_financials(n_symbols: int, periods: int, freq: str, seed: int = 42) -> pd.DataFrame:
+    """nasdaq_financials_{annual,quarterly}_all.csv 와 같은 형식의 재무제표 데이터를 생성합니다."""
+    rng = np.random.default_rng(seed)
+    symbols = np.repeat(symbol_names(n_symbols), periods)
+    n = len(symbols)
+    dates = pd.date_range(end='2024-12-31', periods=periods, freq=freq).strftime('%Y-%m-%d')
+    revenue = rng.uniform(1e7, 1e11, n)
+    return pd.DataFrame({
+        'Symbol': symbols,
+        'Name': [f'{s} Inc.' for s in symbols],
+        'Date': np.tile(dates, n_symbols),
+        'Total Revenue': revenue,
+        'Cost Of Revenue': revenue * rng.uniform(0.3, 0.8, n),
+        'Gross Profit': revenue * rng.uniform(0.2, 0.7, n),
+        'Operating Income': revenue * rng.uniform(-0.1, 0.4, n),
+        'Net Income': revenue * rng.uniform(-0.1, 0.3, n),
+        'Diluted EPS': rng.normal(3, 2, n),
+        'Stockholders Equity': revenue * rng.uniform(0.5, 3, n),
+    })
+
+
+def generate_dataset(output_dir: str, n_symbols: int = 500, n_days: int = 1260,
+                     news_per_symbol: int = 20, seed: int = 42) -> dict[str, str]:
+    """
+    모든 합성 CSV 파일을 output_dir 에 생성하고, 설정(.env) 키 이름 -> 파일 경로 딕셔너리를 반환합니다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        'DATA_FILE_PATH': os.path.join(output_dir, 'nasdaq_all_stocks.csv'),
+        'NEWS_PATH': os.path.join(output_dir, 'nasdaq_news_all.csv'),
+        'FINANCIALS_INFO_PATH': os.path.join(output_dir, 'nasdaq_financial_info_n_yrs.csv'),
+        'ANNUAL_FINANCIALS_PATH': os.path.join(output_dir, 'nasdaq_financials_annual_all.csv'),
+        'QUARTERLY_FINANCIALS_PATH': os.path.join(output_dir, 'nasdaq_financials_quarterly_all.csv'),
+    }
+
+    prices = make_synthetic_prices(n_symbols, n_days, seed)
+    prices['Date'] = prices['Date'].dt.strftime('%Y-%m-%d')
+    prices.to_csv(paths['DATA_FILE_PATH'], index=False, encoding='utf-8')
+    make_synthetic_news(n_symbols, news_per_symbol, seed).to_csv(paths['NEWS_PATH'], index=True, encoding='utf-8')
+    make_synthetic_financial_info(n_symbols, seed=seed).to_csv(paths['FINANCIALS_INFO_PATH'], index=False, encoding='utf-8')
+    make_synthetic_financials(n_symbols, 4, 'YE', seed).to_csv(paths['ANNUAL_FINANCIALS_PATH'], index=False, encoding='utf-8')
+    make_synthetic_financials(n_symbols, 8, 'QE', seed).to_csv(paths['QUARTERLY_FINANCIALS_PATH'], index=False, encoding='utf-8')
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 데이터 생성")
+    parser.add_argument('--symbols', type=int, default=500, help="종목 수")
+    parser.add_argument('--days', type=int, default=1260, help="종목당 거래일 수")
+    parser.add_argument('--news-per-symbol', type=int, default=20, help="종목당 뉴스 수")
+    parser.add_argument('--output-dir', default='bench_data', help="출력 폴더")
+    args = parser.parse_args()
+
+    for key, path in generate_dataset(args.output_dir, args.symbols, args.days, args.news_per_symbol).items():
+        print(f"{key}={path}")